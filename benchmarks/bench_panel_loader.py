@@ -0,0 +1,144 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+面板读取基准：SELECT + fetchall vs 二进制 COPY
+=============================================
+
+在线（连数据库）：
+    python -m benchmarks.bench_panel_loader --start 2020-01-01 --end 2024-12-31
+离线（只比较客户端解码成本，不需要数据库）：
+    python -m benchmarks.bench_panel_loader --offline --rows 2000000
+
+在线模式对比：
+- prices : get_price_panel(adj_close, volume) + pd.to_numeric  vs  load_price_panel
+- factors: get_factor_values(...)[cols] + pd.to_numeric         vs  load_factor_panel
+"""
+import argparse
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# 作为脚本直接运行时把项目根目录加入路径；被 import 时不修改 sys.path
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from database.utils.binary_copy import decode_binary_copy, encode_binary_copy
+
+
+def _timeit(fn, repeat: int):
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def _report(name: str, slow: float, fast: float, rows: int):
+    print(
+        f"{name:<10} rows={rows:>10,}  fetchall={slow:8.3f}s  binary_copy={fast:8.3f}s  "
+        f"speedup={slow / fast if fast else float('inf'):6.1f}x"
+    )
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 离线：tuple(Decimal) -> DataFrame  vs  PGCOPY bytes -> ndarray
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def bench_offline(rows: int, repeat: int):
+    rng = np.random.default_rng(0)
+    ids = rng.integers(1, 5000, rows)
+    days = pd.Timestamp("2010-01-01") + pd.to_timedelta(rng.integers(0, 5000, rows), unit="D")
+    px = np.round(rng.uniform(1, 500, rows), 6)
+
+    spec = [("instrument_id", "int8"), ("date", "date"), ("adj_close", "float8")]
+    day_list = days.date.tolist()
+    tuples = [(int(i), d, Decimal(f"{p:.6f}")) for i, d, p in zip(ids, day_list, px)]
+    blob = encode_binary_copy(list(zip(ids.tolist(), days.values.astype("datetime64[D]"), px.tolist())), spec)
+
+    def slow():
+        df = pd.DataFrame(tuples, columns=["instrument_id", "date", "adj_close"])
+        df["date"] = pd.to_datetime(df["date"])
+        df["adj_close"] = pd.to_numeric(df["adj_close"], errors="coerce").astype(float)
+        return df
+
+    def fast():
+        return pd.DataFrame(decode_binary_copy(blob, spec))
+
+    t_slow, _ = _timeit(slow, repeat)
+    t_fast, _ = _timeit(fast, repeat)
+    _report("decode", t_slow, t_fast, rows)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 在线
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def bench_online(start: str, end: str, factors, repeat: int):
+    from database.utils.db_utils import get_db_connection
+    from database.readwrite.rw_market_prices import get_price_panel, load_price_panel
+    from database.readwrite.rw_factor_values import get_factor_values, load_factor_panel
+
+    with get_db_connection() as conn:
+        def slow_prices():
+            df = get_price_panel(conn, start, end, columns=["adj_close", "volume"])
+            df["date"] = pd.to_datetime(df["date"])
+            for c in ("adj_close", "volume"):
+                df[c] = pd.to_numeric(df[c], errors="coerce").astype(float)
+            return df
+
+        def fast_prices():
+            return load_price_panel(conn, ["adj_close", "volume"], start, end)
+
+        t_slow, df = _timeit(slow_prices, repeat)
+        t_fast, _ = _timeit(fast_prices, repeat)
+        _report("prices", t_slow, t_fast, len(df))
+
+        def slow_factors():
+            df = get_factor_values(conn, factor_names=list(factors), factor_version="v1",
+                                   start_date=start, end_date=end)
+            df = df[["instrument_id", "date", "factor_name", "factor_value"]].copy()
+            df["date"] = pd.to_datetime(df["date"])
+            df["factor_value"] = pd.to_numeric(df["factor_value"], errors="coerce").astype(float)
+            return df
+
+        def fast_factors():
+            return load_factor_panel(conn, list(factors), start, end)
+
+        t_slow, df = _timeit(slow_factors, repeat)
+        t_fast, _ = _timeit(fast_factors, repeat)
+        _report("factors", t_slow, t_fast, len(df))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--offline", action="store_true")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--start", default="2020-01-01")
+    parser.add_argument("--end", default=None)
+    parser.add_argument("--factors", nargs="+", default=["mom_21d", "vol_20d_ann252", "mdd_252d"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.offline:
+        bench_offline(args.rows, args.repeat)
+    else:
+        bench_online(args.start, args.end, args.factors, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+下载器共用的磁盘 HTTP 缓存
+==========================
+
+目录结构（cache_dir 下）：
+- meta/<sha256(url)>.json   : 每个 URL 一条元数据（etag / last_modified / fetched_at / blob）
+- blobs/<sha256(body)>      : 响应体，按内容寻址（相同内容只存一份）
+
+读取规则：
+1) fetched_at 距今 < ttl：直接读磁盘，不发请求
+2) 否则带 If-None-Match / If-Modified-Since 发条件请求
+   - 304：刷新 fetched_at，复用磁盘内容（几乎零流量）
+   - 200：写入新 blob + 元数据
+3) max_age 之外的条目由 evict() 清理，未被引用的 blob 一并删除
+
+注意：缓存 key 只由 URL（含 query 参数）决定，请求头（如 Tiingo Token）不参与，
+也不会写入磁盘。
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+
+try:
+    # orjson 解析大 JSON（SEC companyfacts 常见 5~20MB）比标准库快数倍；未安装时退回 json
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - 取决于运行环境
+    _json_loads = json.loads
+
+from data_download.rate_limiter import RateLimiter
+from utils.config_loader import PROJECT_ROOT, get_config_value
+from utils.logger import get_logger
+
+log = get_logger("http_cache")
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def build_url(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """把 query 参数编码进 URL（缓存 key 与实际请求使用同一个 URL）"""
+    if not params:
+        return url
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+class HttpCache:
+    """
+    内容寻址的 HTTP 响应缓存（ETag / Last-Modified 条件请求 + TTL）
+
+    线程安全：元数据和 blob 都用「临时文件 + os.replace」原子写入，
+    多个下载线程共享同一个实例即可。
+    """
+
+    def __init__(
+        self,
+        cache_dir,
+        *,
+        default_ttl: float = 86400,
+        max_age: float = 120 * 86400,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.meta_dir = self.cache_dir / "meta"
+        self.blob_dir = self.cache_dir / "blobs"
+        self.default_ttl = default_ttl
+        self.max_age = max_age
+
+        self.meta_dir.mkdir(parents=True, exist_ok=True)
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+
+        # 统计：hit=未发请求，revalidated=304，fetched=200 下载
+        self.stats = {"hit": 0, "revalidated": 0, "fetched": 0, "bytes_downloaded": 0}
+        self._stats_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 文件读写
+    # ------------------------------------------------------------------
+    def _meta_path(self, url: str) -> Path:
+        return self.meta_dir / f"{_sha256(url.encode('utf-8'))}.json"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest
+
+    def _atomic_write(self, path: Path, data: bytes):
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _load_meta(self, url: str) -> Optional[Dict[str, Any]]:
+        path = self._meta_path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        # blob 丢失（被手动删除）时视为未缓存
+        if not self._blob_path(meta.get("blob", "")).exists():
+            return None
+        return meta
+
+    def _save_meta(self, url: str, meta: Dict[str, Any]):
+        payload = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+        self._atomic_write(self._meta_path(url), payload)
+
+    def _read_blob(self, digest: str) -> bytes:
+        with open(self._blob_path(digest), "rb") as f:
+            return f.read()
+
+    def _write_blob(self, body: bytes) -> str:
+        digest = _sha256(body)
+        path = self._blob_path(digest)
+        if not path.exists():
+            self._atomic_write(path, body)
+        return digest
+
+    def _count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[key] += n
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get(
+        self,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        ttl: Optional[float] = None,
+        timeout: float = 30,
+        session: Optional[requests.Session] = None,
+        limiter: Optional[RateLimiter] = None,
+    ) -> bytes:
+        """
+        获取 URL 内容（bytes）。非 2xx/304 响应直接 raise（不吞错）。
+
+        limiter 只在真正发请求前取令牌，缓存命中不占配额。
+        """
+        full_url = build_url(url, params)
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+
+        meta = self._load_meta(full_url)
+        if meta is not None and now - meta["fetched_at"] < ttl:
+            self._count("hit")
+            return self._read_blob(meta["blob"])
+
+        req_headers = dict(headers or {})
+        if meta is not None:
+            if meta.get("etag"):
+                req_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                req_headers["If-Modified-Since"] = meta["last_modified"]
+
+        if limiter is not None:
+            limiter.acquire()
+        http = session if session is not None else requests
+        resp = http.get(full_url, headers=req_headers, timeout=timeout)
+
+        if resp.status_code == 304 and meta is not None:
+            meta["fetched_at"] = now
+            self._save_meta(full_url, meta)
+            self._count("revalidated")
+            return self._read_blob(meta["blob"])
+
+        resp.raise_for_status()
+
+        body = resp.content
+        digest = self._write_blob(body)
+        self._save_meta(
+            full_url,
+            {
+                "url": full_url,
+                "blob": digest,
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "fetched_at": now,
+                "size": len(body),
+            },
+        )
+        self._count("fetched")
+        self._count("bytes_downloaded", len(body))
+        return body
+
+    @property
+    def network_requests(self) -> int:
+        """真正发出的请求数（304 也算一次请求，需要计入节流）"""
+        return self.stats["revalidated"] + self.stats["fetched"]
+
+    def get_json(self, url: str, **kwargs) -> Any:
+        return _json_loads(self.get(url, **kwargs))
+
+    def evict(self, max_age: Optional[float] = None) -> int:
+        """
+        TTL 淘汰：删除 fetched_at 超过 max_age 的元数据，再删除无人引用的 blob。
+        返回删除的元数据条数。
+        """
+        max_age = self.max_age if max_age is None else max_age
+        cutoff = time.time() - max_age
+
+        removed = 0
+        live_blobs = set()
+        for path in self.meta_dir.glob("*.json"):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (FileNotFoundError, ValueError):
+                path.unlink(missing_ok=True)
+                removed += 1
+                continue
+
+            if meta.get("fetched_at", 0) < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                live_blobs.add(meta.get("blob"))
+
+        for path in self.blob_dir.iterdir():
+            if path.name not in live_blobs:
+                path.unlink(missing_ok=True)
+
+        if removed:
+            log.info(f"[http_cache] evicted {removed} entries from {self.cache_dir}")
+        return removed
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 进程级单例（由 config.yaml 的 http_cache 段配置）
+# ----------------------------------------------------------------------------------------------------------------------------------------
+_CACHE: Optional[HttpCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """返回共享缓存；http_cache.enabled=false 时返回 None"""
+    global _CACHE
+
+    if not get_config_value("http_cache.enabled", True):
+        return None
+
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                cache_dir = Path(get_config_value("http_cache.cache_dir", "cache/http"))
+                if not cache_dir.is_absolute():
+                    cache_dir = PROJECT_ROOT / cache_dir
+                _CACHE = HttpCache(
+                    cache_dir,
+                    default_ttl=get_config_value("http_cache.default_ttl_seconds", 86400),
+                    max_age=get_config_value("http_cache.max_age_days", 120) * 86400,
+                )
+    return _CACHE
+
+
+def cached_get(
+    url: str,
+    *,
+    headers: Optional[Dict[str, str]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    ttl: Optional[float] = None,
+    timeout: float = 30,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> bytes:
+    """
+    下载器统一入口：启用缓存时走 HttpCache，否则直接请求。
+    """
+    cache = get_http_cache()
+    if cache is not None:
+        return cache.get(
+            url,
+            headers=headers,
+            params=params,
+            ttl=ttl,
+            timeout=timeout,
+            session=session,
+            limiter=limiter,
+        )
+
+    if limiter is not None:
+        limiter.acquire()
+    http = session if session is not None else requests
+    resp = http.get(build_url(url, params), headers=headers, timeout=timeout)
+    resp.raise_for_status()
+    return resp.content
+
+
+def cached_get_json(url: str, **kwargs) -> Any:
+    return _json_loads(cached_get(url, **kwargs))
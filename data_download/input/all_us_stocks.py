@@ -26,9 +26,9 @@ import sys
 import os
 from pathlib import Path
 
-# 添加项目根目录到 Python 路径
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
+# 作为脚本直接运行时把项目根目录加入路径；被 import 时不修改 sys.path
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import zipfile
 import pandas as pd
@@ -36,6 +36,7 @@ import requests
 from io import BytesIO
 from datetime import date
 from typing import Optional
+from data_download.http_cache import cached_get
 from utils.config_loader import get_config_value
 from utils.logger import get_logger
 
@@ -63,14 +64,13 @@ def download_tiingo_supported_tickers() -> Optional[pd.DataFrame]:
     try:
         logger.info(f"📥 开始下载 Tiingo 股票列表: {url}")
         
-        # 下载 ZIP 文件
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
+        # 下载 ZIP 文件（Tiingo 每日更新一次，缓存 12 小时）
+        content = cached_get(url, ttl=12 * 3600, timeout=30)
         
-        logger.info(f"✅ 下载成功，文件大小: {len(response.content) / 1024:.1f} KB")
+        logger.info(f"✅ 下载成功，文件大小: {len(content) / 1024:.1f} KB")
         
         # 解压 ZIP 文件
-        with zipfile.ZipFile(BytesIO(response.content)) as z:
+        with zipfile.ZipFile(BytesIO(content)) as z:
             # 获取 ZIP 中的第一个文件（通常是 supported_tickers.csv）
             csv_filename = z.namelist()[0]
             logger.info(f"📂 解压文件: {csv_filename}")
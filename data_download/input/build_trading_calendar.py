@@ -14,8 +14,9 @@
 import sys
 from pathlib import Path
 
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
+# 作为脚本直接运行时把项目根目录加入路径；被 import 时不修改 sys.path
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from datetime import date, timedelta
 import pandas as pd
@@ -30,20 +30,13 @@
   => 不会被用户传 end_date=2090 这种污染
 """
 
-import sys
-from pathlib import Path
 from database.readwrite.rw_market_prices import get_price_max_date, get_price_min_date
 from utils.time import to_date
-
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
 from datetime import date, timedelta
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Tuple
 
 from database.utils.db_utils import get_db_connection
 from database.readwrite.rw_system_state import get_state, set_state
-from database.readwrite.rw_corporate_actions import batch_insert_corporate_actions
 from utils.logger import get_logger
 
 log = get_logger("corporate_actions_extractor")
@@ -77,61 +70,48 @@ def _resolve_date_range(
     return to_date(min_dt), to_date(end_date)
 
 
-def _extract_actions_from_market_prices(
+def _upsert_actions_from_market_prices(
     conn,
     start_date: date,
     end_date: date,
-) -> List[Dict[str, Any]]:
+) -> int:
+    """
+    一条 SQL 完成抽取 + 写入（数据不出数据库）
+
+    - 分红、拆股各一个 SELECT，UNION ALL 合并
+    - ON CONFLICT 幂等，可重复执行
+    返回写入（含 upsert）的行数
+    """
     cursor = conn.cursor()
     cursor.execute(
         """
-        SELECT instrument_id, date, dividends, stock_splits
+        INSERT INTO corporate_actions (
+            instrument_id, action_date, action_type,
+            action_value, currency, data_source
+        )
+        SELECT instrument_id, date, 'DIVIDEND_CASH', dividends, 'USD', 'tiingo'
         FROM market_prices
-        WHERE date >= %s AND date <= %s
-          AND (
-              (dividends IS NOT NULL AND dividends <> 0)
-           OR (stock_splits IS NOT NULL AND stock_splits <> 1)
-          )
-        ORDER BY date, instrument_id
+        WHERE date >= %(start)s AND date <= %(end)s
+          AND dividends IS NOT NULL AND dividends <> 0
+
+        UNION ALL
+
+        SELECT instrument_id, date,
+               CASE WHEN stock_splits > 1 THEN 'SPLIT' ELSE 'REVERSE_SPLIT' END,
+               stock_splits, 'USD', 'tiingo'
+        FROM market_prices
+        WHERE date >= %(start)s AND date <= %(end)s
+          AND stock_splits IS NOT NULL AND stock_splits <> 1
+
+        ON CONFLICT (instrument_id, action_date, action_type) DO UPDATE SET
+            action_value = EXCLUDED.action_value,
+            currency = EXCLUDED.currency,
+            data_source = EXCLUDED.data_source,
+            ingested_at = now()
         """,
-        (start_date.isoformat(), end_date.isoformat()),
+        {"start": start_date.isoformat(), "end": end_date.isoformat()},
     )
-
-    rows = cursor.fetchall()
-    actions: List[Dict[str, Any]] = []
-
-    for instrument_id, dt, dividends, stock_splits in rows:
-        action_date = dt.isoformat() if hasattr(dt, "isoformat") else str(dt)
-
-        if dividends is not None and dividends != 0:
-            actions.append(
-                {
-                    "instrument_id": instrument_id,
-                    "action_date": action_date,
-                    "action_type": "DIVIDEND_CASH",
-                    "action_value": float(dividends),
-                    "currency": "USD",
-                    "data_source": "tiingo",
-                    "raw_payload": None,
-                }
-            )
-
-        if stock_splits is not None and stock_splits != 1:
-            sf = float(stock_splits)
-            action_type = "SPLIT" if sf > 1 else "REVERSE_SPLIT"
-            actions.append(
-                {
-                    "instrument_id": instrument_id,
-                    "action_date": action_date,
-                    "action_type": action_type,
-                    "action_value": sf,
-                    "currency": "USD",
-                    "data_source": "tiingo",
-                    "raw_payload": None,
-                }
-            )
-
-    return actions
+    return max(cursor.rowcount, 0)
 
 
 # -----------------------------------------------------------------------------
@@ -140,7 +120,6 @@ def _extract_actions_from_market_prices(
 def extract_corporate_actions(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    batch_size: int = 50000,
     state_key: str = "last_corporate_actions_extract",
 ) -> Dict[str, int]:
     """
@@ -169,18 +148,13 @@ def extract_corporate_actions(
 
         log.info(f"📅 抽取区间: {start_date} → {end_date}")
 
-        actions = _extract_actions_from_market_prices(conn, start_date, end_date)
-        events = len(actions)
+        inserted = _upsert_actions_from_market_prices(conn, start_date, end_date)
+        events = inserted
+        conn.commit()
 
-        if not actions:
+        if inserted == 0:
             log.info("🟢 本区间无公司行为事件")
         else:
-            for i in range(0, len(actions), batch_size):
-                chunk = actions[i : i + batch_size]
-                batch_insert_corporate_actions(conn, chunk)
-                conn.commit()
-                inserted += len(chunk)
-
             log.info(f"✅ 写入公司行为: {inserted} 条（含 upsert）")
 
         # 推进 state：永远以 market_prices MAX(date) 为准
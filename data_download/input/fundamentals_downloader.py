@@ -11,24 +11,52 @@
 # Unauthorized copying, modification, distribution, or use of this file,
 # via any medium, is strictly prohibited without prior written consent.
 # =============================================================================
-import sys
-from pathlib import Path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
-import time
-from typing import Optional, Dict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
+from data_download.http_cache import get_http_cache
+from data_download.input.sec_metric_map import MetricSpec, load_metric_map
+from data_download.rate_limiter import RateLimiter
 from database.utils.db_utils import get_db_connection
 from database.readwrite.rw_instruments import get_all_instruments
+from database.readwrite.rw_data_update_logs import (
+    create_log,
+    get_resumable_log,
+    reopen_log,
+    update_log_failure,
+    update_log_partial,
+    update_log_progress,
+    update_log_success,
+)
+from utils.config_loader import get_config_value
 from utils.logger import get_logger
 
 from data_download.input.sec_edgar_fundamental_single import (
-    download_one_ticker_fundamental_data,
+    _ticker_cik_map,
+    build_fundamental_rows,
+    copy_fundamental_data,
+    fetch_companyfacts,
 )
 
 log = get_logger("fundamentals_downloader")
 
+DATASET = "fundamental_data"
+SOURCE = "sec_edgar"
+
+
+# -----------------------------------------------------------------------------
+# Worker（线程中执行：只做网络 + 解析，不碰数据库）
+# -----------------------------------------------------------------------------
+def _fetch_rows(
+    instrument_id: int,
+    ticker: str,
+    limiter: RateLimiter,
+    metric_map: Mapping[str, MetricSpec],
+) -> List[Dict[str, Any]]:
+    _, facts = fetch_companyfacts(ticker, limiter=limiter)
+    return build_fundamental_rows(instrument_id, facts, SOURCE, metric_map=metric_map)
+
 
 # -----------------------------------------------------------------------------
 # Main orchestrator
@@ -36,8 +64,13 @@ log = get_logger("fundamentals_downloader")
 def download_fundamentals(
     *,
     tradable_only: bool = True,
-    sleep_seconds: float = 0.25,
     exchange: Optional[str] = None,
+    max_workers: int = 8,
+    requests_per_second: float = 8.0,
+    batch_rows: int = 50_000,
+    resume: bool = True,
+    resume_max_age_hours: Optional[float] = None,
+    max_in_flight: Optional[int] = None,
 ) -> Dict[str, int]:
     """
     批量下载 instruments 中的基本面数据（SEC EDGAR）。
@@ -45,7 +78,15 @@ def download_fundamentals(
     规则：
     - 跳过 asset_type == 'ETF'
     - tradable_only=True 时，只下载 is_tradable=True
-    - 每个 ticker 调用后 sleep，避免 SEC 临时封禁
+    - max_workers 个线程并发下载 + 解析，共享令牌桶限速
+      （requests_per_second 默认 8，低于 SEC 的 10 req/s 上限；缓存命中不占配额）
+    - 只写入 sec_metric_map 中的标准指标（同义 tag 合并）
+    - 同时在途的任务不超过 max_in_flight（默认 max_workers * 4），结果取出后即释放，
+      内存峰值只与 batch_rows 和在途任务数有关
+    - 主线程单连接写库：累计 batch_rows 行后 COPY 批量写入并 commit
+    - 进度记录在 data_update_logs；resume=True 时，若上次运行中断（running / failed）
+      且未超过 resume_max_age_hours（默认 fundamentals.resume_max_age_hours），
+      跳过日志 processed_ids 中已处理完的 instruments（含没有数据可写的）；partial 视为已结束，开始新一轮
     - 不写 system_state
     - 不吞异常：单 ticker 失败只计数，不影响其他
 
@@ -56,15 +97,19 @@ def download_fundamentals(
     log.info("🚀 SEC EDGAR fundamentals downloader")
     log.info("=" * 70)
     log.info(f"tradable_only = {tradable_only}")
-    log.info(f"sleep_seconds = {sleep_seconds}")
     log.info(f"exchange filter = {exchange or 'ALL'}")
+    log.info(f"workers = {max_workers}, rate = {requests_per_second} req/s")
+
+    stats = {"total": 0, "success": 0, "failed": 0, "skipped": 0, "resumed": 0}
 
     conn = get_db_connection()
     if not conn:
         log.error("❌ 无法创建数据库连接")
-        return {"total": 0, "success": 0, "failed": 0, "skipped": 0}
+        return stats
 
-    total = success = failed = skipped = 0
+    cache = get_http_cache()
+    rows_written = 0
+    log_id = None
 
     try:
         instruments = get_all_instruments(conn, asset_type=None)
@@ -77,44 +122,118 @@ def download_fundamentals(
 
         if instruments.empty:
             log.warning("⚠️ 没有符合条件的 instruments")
-            return {"total": 0, "success": 0, "failed": 0, "skipped": 0}
+            return stats
+
+        stats["total"] = len(instruments)
+
+        # ETF 明确跳过
+        is_etf = instruments["asset_type"] == "ETF"
+        stats["skipped"] = int(is_etf.sum())
+        instruments = instruments[~is_etf]
 
-        total = len(instruments)
-        log.info(f"📊 待处理 instruments: {total}")
+        # ---------------- 断点续跑 ----------------
+        if resume_max_age_hours is None:
+            resume_max_age_hours = get_config_value("fundamentals.resume_max_age_hours", 48)
+        previous = (
+            get_resumable_log(conn, DATASET, SOURCE, max_age_hours=resume_max_age_hours)
+            if resume else None
+        )
+        if previous is not None:
+            log_id = previous["log_id"]
+            rows_written = previous["rows_inserted"]
+            reopen_log(conn, log_id)
 
-        for idx, row in instruments.iterrows():
-            ticker = row["ticker"]
-            asset_type = row["asset_type"]
-            exch = row["exchange"]
+            already = instruments["instrument_id"].isin(previous["processed_ids"])
+            stats["resumed"] = int(already.sum())
+            instruments = instruments[~already]
+            log.info(f"♻️ 续跑 log_id={log_id}：跳过已完成 {stats['resumed']} 个")
+        else:
+            log_id = create_log(conn, DATASET, SOURCE, instruments_count=stats["total"])
+        conn.commit()
 
-            # ETF 明确跳过
-            if asset_type == "ETF":
-                skipped += 1
-                continue
+        log.info(f"📊 待处理 instruments: {len(instruments)}")
 
-            if (success + failed + skipped) % 20 == 0:
-                log.info(
-                    f"[{success + failed + skipped}/{total}] "
-                    f"✅{success} ❌{failed} ⏭️{skipped}"
-                )
+        # 映射表在主线程先拉一次，避免多个线程同时下载
+        _ticker_cik_map()
 
+        limiter = RateLimiter(requests_per_second)
+        metric_map = load_metric_map()
+        buffer: List[Dict[str, Any]] = []
+        buffered_tickers: List[Tuple[int, str]] = []
+
+        def flush():
+            nonlocal rows_written
+            if not buffered_tickers:
+                return
             try:
-                rows = download_one_ticker_fundamental_data(
-                    conn,
-                    ticker=ticker,
-                    exchange=exch,
-                )
+                # 没有任何标准指标的 ticker 也算成功：无需写库，但同样记入 processed_ids，续跑时不再重下
+                if buffer:
+                    copy_fundamental_data(conn, buffer)
+                    rows_written += len(buffer)
+                update_log_progress(conn, log_id, rows_written, [iid for iid, _ in buffered_tickers])
                 conn.commit()
-                success += 1
-                log.info(f"✅ {ticker}: wrote {rows} rows")
-
+                stats["success"] += len(buffered_tickers)
             except Exception as e:
                 conn.rollback()
-                failed += 1
-                log.error(f"❌ {ticker}: {e}")
+                stats["failed"] += len(buffered_tickers)
+                log.error(f"❌ 批量写入失败（{len(buffered_tickers)} tickers）: {e}")
+            buffer.clear()
+            buffered_tickers.clear()
+
+        max_in_flight = max_in_flight or max_workers * 4
+        n_todo = len(instruments)
+        todo = instruments.itertuples(index=False)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pending: Dict[Future, Tuple[int, str]] = {}
+
+            def submit_more():
+                for row in islice(todo, max_in_flight - len(pending)):
+                    fut = pool.submit(_fetch_rows, row.instrument_id, row.ticker, limiter, metric_map)
+                    pending[fut] = (row.instrument_id, row.ticker)
+
+            submit_more()
+            i = 0
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    # pop 后 Future 不再被引用，其结果（整只 ticker 的行）随 buffer flush 释放
+                    instrument_id, ticker = pending.pop(fut)
+                    i += 1
+                    try:
+                        rows = fut.result()
+                    except Exception as e:
+                        stats["failed"] += 1
+                        log.error(f"❌ {ticker}: {e}")
+                    else:
+                        buffer.extend(rows)
+                        buffered_tickers.append((instrument_id, ticker))
+                        if len(buffer) >= batch_rows:
+                            flush()
+
+                    if i % 100 == 0:
+                        log.info(
+                            f"[{i}/{n_todo}] "
+                            f"✅{stats['success']} ❌{stats['failed']} rows={rows_written}"
+                        )
+                submit_more()
+
+        flush()
+
+        if stats["failed"]:
+            update_log_partial(
+                conn, log_id, rows_written, f"{stats['failed']} instruments failed"
+            )
+        else:
+            update_log_success(conn, log_id, rows_inserted=rows_written)
+        conn.commit()
 
-            # 🔒 SEC 节流（非常重要）
-            time.sleep(sleep_seconds)
+    except Exception as e:
+        conn.rollback()
+        if log_id is not None:
+            update_log_failure(conn, log_id, str(e))
+            conn.commit()
+        raise
 
     finally:
         conn.close()
@@ -122,15 +241,18 @@ def download_fundamentals(
     log.info("=" * 70)
     log.info("✅ fundamentals download finished")
     log.info("=" * 70)
-    log.info(f"Total   : {total}")
-    log.info(f"Success : {success}")
-    log.info(f"Failed  : {failed}")
-    log.info(f"Skipped : {skipped}")
+    log.info(f"Total   : {stats['total']}")
+    log.info(f"Success : {stats['success']}")
+    log.info(f"Failed  : {stats['failed']}")
+    log.info(f"Skipped : {stats['skipped']}")
+    log.info(f"Resumed : {stats['resumed']}")
+    log.info(f"Rows    : {rows_written}")
+    if cache is not None:
+        log.info(
+            f"HTTP    : hit={cache.stats['hit']} revalidated={cache.stats['revalidated']} "
+            f"fetched={cache.stats['fetched']} downloaded={cache.stats['bytes_downloaded'] / 1e6:.1f}MB"
+        )
+        cache.evict()
     log.info("=" * 70)
 
-    return {
-        "total": total,
-        "success": success,
-        "failed": failed,
-        "skipped": skipped,
-    }
+    return stats
@@ -20,14 +20,8 @@
 4) 状态追踪：仅在失败率足够低时推进 system_state，避免数据缺口
 """
 
-import sys
-from pathlib import Path
 from database.readwrite.rw_trading_calendar import get_prev_trading_day
 from utils.time import DATE_TODAY, to_date
-
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
 from datetime import date, timedelta
 from typing import Optional, Dict, Tuple
 import requests
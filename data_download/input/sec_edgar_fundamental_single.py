@@ -11,17 +11,13 @@
 # Unauthorized copying, modification, distribution, or use of this file,
 # via any medium, is strictly prohibited without prior written consent.
 # =============================================================================
-import sys
-from pathlib import Path
-
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
 from datetime import date
-from typing import Any, Dict, List, Optional, Tuple
-
-import requests
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
+from data_download.http_cache import cached_get_json
+from data_download.input.sec_metric_map import MetricSpec, load_metric_map
+from data_download.rate_limiter import RateLimiter
 from utils.logger import get_logger
 
 log = get_logger("fundamentals_downloader")
@@ -43,33 +39,57 @@ SEC_HEADERS_WWW = {
 }
 
 # =============================================================================
-# HTTP helpers（不吞错）
+# HTTP helpers（不吞错；走磁盘缓存 + 条件请求）
 # =============================================================================
-def _get_json(url: str, headers: Dict[str, str]) -> Any:
-    r = requests.get(url, headers=headers, timeout=30)
-    r.raise_for_status()
-    return r.json()
+SEC_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+SEC_COMPANYFACTS_URL = "https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
+
+# ticker->CIK 映射每天最多拉一次；companyfacts 过期后用 ETag/Last-Modified 复核
+SEC_TICKERS_TTL = 86400
+SEC_COMPANYFACTS_TTL = 86400
+
+
+def _get_json(
+    url: str,
+    headers: Dict[str, str],
+    ttl: Optional[float] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> Any:
+    return cached_get_json(url, headers=headers, ttl=ttl, timeout=30, limiter=limiter)
+
+
+@lru_cache(maxsize=1)
+def _ticker_cik_map() -> Dict[str, str]:
+    """
+    SEC 官方 ticker -> CIK（10 位零填充）映射，进程内只构建一次
+    """
+    data = _get_json(SEC_TICKERS_URL, SEC_HEADERS_WWW, ttl=SEC_TICKERS_TTL)
+    return {
+        obj["ticker"].upper(): str(int(obj["cik_str"])).zfill(10)
+        for obj in data.values()
+    }
 
 
 def _cik_from_ticker(ticker: str) -> str:
     """
     从 SEC 官方 mapping 拿 CIK（10 位零填充）
     """
-    url = "https://www.sec.gov/files/company_tickers.json"
-    data = _get_json(url, SEC_HEADERS_WWW)
-
     t = ticker.upper().strip()
-    for _, obj in data.items():
-        if obj["ticker"].upper() == t:
-            return str(int(obj["cik_str"])).zfill(10)
+    cik = _ticker_cik_map().get(t)
+    if cik is None:
+        raise ValueError(f"Ticker not found in SEC mapping: {ticker}")
+    return cik
 
-    raise ValueError(f"Ticker not found in SEC mapping: {ticker}")
 
-
-def fetch_companyfacts(ticker: str) -> Tuple[str, Dict[str, Any]]:
+def fetch_companyfacts(
+    ticker: str, limiter: Optional[RateLimiter] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    limiter：多线程批量下载时共享的限速器（单 ticker 调用可不传）
+    """
     cik = _cik_from_ticker(ticker)
-    url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
-    facts = _get_json(url, SEC_HEADERS_DATA)
+    url = SEC_COMPANYFACTS_URL.format(cik=cik)
+    facts = _get_json(url, SEC_HEADERS_DATA, ttl=SEC_COMPANYFACTS_TTL, limiter=limiter)
     return cik, facts
 
 
@@ -111,18 +131,19 @@ def upsert_fundamental_data(conn, rows: List[Dict[str, Any]]):
         INSERT INTO fundamental_data (
             instrument_id, report_date, metric_name,
             metric_value, period_type, period_start, period_end,
-            currency, data_source
+            filed_date, currency, data_source
         )
         VALUES (
             %(instrument_id)s, %(report_date)s, %(metric_name)s,
             %(metric_value)s, %(period_type)s, %(period_start)s, %(period_end)s,
-            %(currency)s, %(data_source)s
+            %(filed_date)s, %(currency)s, %(data_source)s
         )
         ON CONFLICT (instrument_id, report_date, metric_name, period_type)
         DO UPDATE SET
             metric_value = EXCLUDED.metric_value,
             period_start = EXCLUDED.period_start,
             period_end   = EXCLUDED.period_end,
+            filed_date   = EXCLUDED.filed_date,
             currency     = EXCLUDED.currency,
             data_source  = EXCLUDED.data_source,
             ingested_at  = now()
@@ -131,6 +152,69 @@ def upsert_fundamental_data(conn, rows: List[Dict[str, Any]]):
     )
 
 
+_FUNDAMENTAL_COLUMNS = (
+    "instrument_id", "report_date", "metric_name",
+    "metric_value", "period_type", "period_start", "period_end",
+    "filed_date", "currency", "data_source",
+)
+
+
+def copy_fundamental_data(conn, rows: List[Dict[str, Any]]) -> int:
+    """
+    批量写入（COPY -> 临时表 -> 一条 INSERT ... ON CONFLICT）
+
+    用于多 ticker 批量下载：比 executemany 逐行 upsert 快一个数量级。
+    同一批次内主键重复（同一 tag 的多个 unit）时保留最后一条，
+    与 executemany 逐行覆盖的结果一致。
+    """
+    if not rows:
+        return 0
+
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS _stage_fundamental_data (
+            seq BIGSERIAL,
+            instrument_id BIGINT,
+            report_date DATE,
+            metric_name TEXT,
+            metric_value NUMERIC(38,10),
+            period_type TEXT,
+            period_start DATE,
+            period_end DATE,
+            filed_date DATE,
+            currency TEXT,
+            data_source TEXT
+        ) ON COMMIT DELETE ROWS
+        """
+    )
+
+    cols = ", ".join(_FUNDAMENTAL_COLUMNS)
+    with cursor.copy(f"COPY _stage_fundamental_data ({cols}) FROM STDIN") as copy:
+        for r in rows:
+            copy.write_row([r[c] for c in _FUNDAMENTAL_COLUMNS])
+
+    cursor.execute(
+        f"""
+        INSERT INTO fundamental_data ({cols})
+        SELECT DISTINCT ON (instrument_id, report_date, metric_name, period_type) {cols}
+        FROM _stage_fundamental_data
+        ORDER BY instrument_id, report_date, metric_name, period_type, seq DESC
+        ON CONFLICT (instrument_id, report_date, metric_name, period_type)
+        DO UPDATE SET
+            metric_value = EXCLUDED.metric_value,
+            period_start = EXCLUDED.period_start,
+            period_end   = EXCLUDED.period_end,
+            filed_date   = EXCLUDED.filed_date,
+            currency     = EXCLUDED.currency,
+            data_source  = EXCLUDED.data_source,
+            ingested_at  = now()
+        """
+    )
+    cursor.execute("TRUNCATE _stage_fundamental_data")
+    return len(rows)
+
+
 # =============================================================================
 # 清洗规则
 # =============================================================================
@@ -194,20 +278,21 @@ def normalize_and_dedupe_records(
             continue
         filtered.append(r)
 
+    # point-in-time：每个报告期只取首次披露的数值（as first reported），filed_date 即该数值自己的披露日。
+    # 之后的修订（10-K/A、次年年报对比期的重述）不回写到首次披露日，避免前视偏差。
+    # 同一天披露的多条记录保留先出现的一条；缺少 filed 的记录排在最后。
     best: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
     for r in filtered:
-        end = r.get("end")
-        fp = r.get("fp")
-        filed = r.get("filed") or "0000-00-00"
-        k = (metric_name, end, fp)
-        if k not in best or filed > (best[k].get("filed") or "0000-00-00"):
+        filed = r.get("filed") or "9999-99-99"
+        k = (metric_name, r.get("end"), r.get("fp"))
+        if k not in best or filed < (best[k].get("filed") or "9999-99-99"):
             best[k] = r
 
     return list(best.values())
 
 
 # =============================================================================
-# 遍历所有 SEC 原生 tag（核心改动）
+# 遍历所有 SEC 原生 tag（探索用；入库走 iterate_selected_series）
 # =============================================================================
 def iterate_all_fact_tags(facts: Dict[str, Any]):
     facts_root = facts.get("facts", {})
@@ -221,6 +306,90 @@ def iterate_all_fact_tags(facts: Dict[str, Any]):
             yield taxonomy, tag, units
 
 
+# =============================================================================
+# 选取 tag：标准指标映射（默认）或显式 raw tag 列表
+# =============================================================================
+def _unit_records(facts: Dict[str, Any], taxonomy: str, tag: str, unit: str) -> List[Dict[str, Any]]:
+    obj = facts.get("facts", {}).get(taxonomy, {}).get(tag) or {}
+    records = (obj.get("units") or {}).get(unit)
+    return records if isinstance(records, list) else []
+
+
+def iterate_selected_series(
+    facts: Dict[str, Any],
+    *,
+    metric_map: Optional[Mapping[str, MetricSpec]] = None,
+    tags: Optional[Sequence[Tuple[str, str, str]]] = None,
+):
+    """
+    yield (metric_name, unit, records)，同一 metric_name 内按 tag 优先级排列
+
+    - tags 给定：只取这些 (taxonomy, tag, unit)，metric_name 保留原始 "taxonomy.tag"
+    - 否则按 metric_map（默认 load_metric_map()）映射为标准指标名
+    """
+    if tags is not None:
+        for taxonomy, tag, unit in tags:
+            yield f"{taxonomy}.{tag}", unit, _unit_records(facts, taxonomy, tag, unit)
+        return
+
+    if metric_map is None:
+        metric_map = load_metric_map()
+
+    for name, spec in metric_map.items():
+        for taxonomy, tag in spec.tags:
+            yield name, spec.unit, _unit_records(facts, taxonomy, tag, spec.unit)
+
+
+# =============================================================================
+# 解析：companyfacts -> fundamental_data 行（纯函数，可在线程中执行）
+# =============================================================================
+def build_fundamental_rows(
+    instrument_id: int,
+    facts: Dict[str, Any],
+    data_source: str = "sec_edgar",
+    *,
+    metric_map: Optional[Mapping[str, MetricSpec]] = None,
+    tags: Optional[Sequence[Tuple[str, str, str]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    同义 tag 合并：同一 (metric_name, report_date, period_type) 只保留优先级最高的 tag，
+    低优先级 tag 只用来补齐高优先级 tag 缺失的报告期（公司换口径时常见）。
+    """
+    best: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+
+    for metric_name, unit, records in iterate_selected_series(
+        facts, metric_map=metric_map, tags=tags
+    ):
+        picked = normalize_and_dedupe_records(records, metric_name)
+        if not picked:
+            continue
+
+        currency = unit.upper()
+
+        for r in picked:
+            period_type = _period_type_from_fp(r["fp"])
+            key = (metric_name, r["end"][:10], period_type)
+            if key in best:
+                continue
+
+            best[key] = {
+                "instrument_id": instrument_id,
+                "report_date": r["end"][:10],
+                "metric_name": metric_name,
+                "metric_value": float(r["val"]),
+                "period_type": period_type,
+                "period_start": r.get("start", None)[:10]
+                if r.get("start")
+                else None,
+                "period_end": r["end"][:10],
+                "filed_date": r["filed"][:10] if r.get("filed") else None,
+                "currency": currency,
+                "data_source": data_source,
+            }
+
+    return list(best.values())
+
+
 # =============================================================================
 # Public API：下载单 ticker（raw）
 # =============================================================================
@@ -230,46 +399,23 @@ def download_one_ticker_fundamental_data(
     ticker: str,
     exchange: Optional[str] = None,
     data_source: str = "sec_edgar",
+    metric_map: Optional[Mapping[str, MetricSpec]] = None,
+    tags: Optional[Sequence[Tuple[str, str, str]]] = None,
 ) -> int:
+    """
+    下载单个 ticker 的 companyfacts，只写入映射内的标准指标。
+
+    tags：显式指定 [(taxonomy, tag, unit), ...] 时改为写入这些原始 tag（调试/补数用）
+    """
     instrument_id = get_instrument_id(conn, ticker=ticker, exchange=exchange)
 
     cik, facts = fetch_companyfacts(ticker)
     entity = facts.get("entityName")
     log.info(f"[SEC] fetched companyfacts: {ticker} cik={cik} entity={entity}")
 
-    to_insert: List[Dict[str, Any]] = []
-
-    for taxonomy, tag, units in iterate_all_fact_tags(facts):
-        metric_name = f"{taxonomy}.{tag}"
-
-        for unit, records in units.items():
-            if not isinstance(records, list):
-                continue
-
-            picked = normalize_and_dedupe_records(records, metric_name)
-            if not picked:
-                continue
-
-            currency = unit.upper()
-
-            for r in picked:
-                period_type = _period_type_from_fp(r["fp"])
-
-                to_insert.append(
-                    {
-                        "instrument_id": instrument_id,
-                        "report_date": r["end"][:10],
-                        "metric_name": metric_name,
-                        "metric_value": float(r["val"]),
-                        "period_type": period_type,
-                        "period_start": r.get("start", None)[:10]
-                        if r.get("start")
-                        else None,
-                        "period_end": r["end"][:10],
-                        "currency": currency,
-                        "data_source": data_source,
-                    }
-                )
+    to_insert = build_fundamental_rows(
+        instrument_id, facts, data_source, metric_map=metric_map, tags=tags
+    )
 
     upsert_fundamental_data(conn, to_insert)
     log.info(f"[SEC] {ticker}: wrote {len(to_insert)} rows")
@@ -0,0 +1,164 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+SEC XBRL tag -> 标准指标名 映射
+================================
+
+companyfacts 每家公司有上千个 tag，下游只用其中十几个。入库前只保留映射内的 tag，
+并把同义 tag（公司换报表口径、不同年份用不同 tag）合并成一个标准名：
+
+    revenue <- us-gaap.Revenues / RevenueFromContractWithCustomer... / SalesRevenueNet ...
+
+规则：
+- tags 按优先级排列；同一报告期（end + fp）取第一个有值的 tag
+- 只取指定 unit（金额 USD，股数 shares，每股 USD/shares）
+- config.yaml 的 fundamentals.metric_map 可覆盖/新增指标：
+
+    fundamentals:
+      metric_map:
+        revenue:
+          unit: USD
+          tags: [us-gaap.Revenues, us-gaap.SalesRevenueNet]
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from utils.config_loader import get_config_value
+
+
+@dataclass(frozen=True)
+class MetricSpec:
+    unit: str
+    tags: Tuple[Tuple[str, str], ...]  # ((taxonomy, tag), ...) 按优先级
+
+
+def _spec(unit: str, *tags: str) -> MetricSpec:
+    return MetricSpec(unit=unit, tags=tuple(_split_tag(t) for t in tags))
+
+
+def _split_tag(name: str) -> Tuple[str, str]:
+    taxonomy, sep, tag = name.partition(".")
+    if not sep or not taxonomy or not tag:
+        raise ValueError(f"metric tag must look like 'taxonomy.Tag', got {name!r}")
+    return taxonomy, tag
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 默认映射
+# ----------------------------------------------------------------------------------------------------------------------------------------
+DEFAULT_METRIC_MAP: Dict[str, MetricSpec] = {
+    # 利润表
+    "revenue": _spec(
+        "USD",
+        "us-gaap.Revenues",
+        "us-gaap.RevenueFromContractWithCustomerExcludingAssessedTax",
+        "us-gaap.RevenueFromContractWithCustomerIncludingAssessedTax",
+        "us-gaap.SalesRevenueNet",
+        "us-gaap.SalesRevenueGoodsNet",
+    ),
+    "gross_profit": _spec("USD", "us-gaap.GrossProfit"),
+    "operating_income": _spec("USD", "us-gaap.OperatingIncomeLoss"),
+    "net_income": _spec(
+        "USD",
+        "us-gaap.NetIncomeLoss",
+        "us-gaap.NetIncomeLossAvailableToCommonStockholdersBasic",
+        "us-gaap.ProfitLoss",
+    ),
+    "depreciation_amortization": _spec(
+        "USD",
+        "us-gaap.DepreciationDepletionAndAmortization",
+        "us-gaap.DepreciationAndAmortization",
+        "us-gaap.DepreciationAmortizationAndAccretionNet",
+        "us-gaap.Depreciation",
+    ),
+    "eps_diluted": _spec(
+        "USD/shares",
+        "us-gaap.EarningsPerShareDiluted",
+        "us-gaap.EarningsPerShareBasicAndDiluted",
+    ),
+
+    # 现金流量表
+    "operating_cash_flow": _spec(
+        "USD",
+        "us-gaap.NetCashProvidedByUsedInOperatingActivities",
+        "us-gaap.NetCashProvidedByUsedInOperatingActivitiesContinuingOperations",
+    ),
+    "capex": _spec(
+        "USD",
+        "us-gaap.PaymentsToAcquirePropertyPlantAndEquipment",
+        "us-gaap.PaymentsToAcquireProductiveAssets",
+    ),
+    "dividends_paid": _spec(
+        "USD",
+        "us-gaap.PaymentsOfDividends",
+        "us-gaap.PaymentsOfDividendsCommonStock",
+    ),
+
+    # 资产负债表
+    "total_assets": _spec("USD", "us-gaap.Assets"),
+    "total_liabilities": _spec("USD", "us-gaap.Liabilities"),
+    "stockholders_equity": _spec(
+        "USD",
+        "us-gaap.StockholdersEquity",
+        "us-gaap.StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest",
+    ),
+    "cash": _spec(
+        "USD",
+        "us-gaap.CashAndCashEquivalentsAtCarryingValue",
+        "us-gaap.CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalents",
+    ),
+    "long_term_debt": _spec(
+        "USD",
+        "us-gaap.LongTermDebt",
+        "us-gaap.LongTermDebtNoncurrent",
+    ),
+
+    # 股本
+    "shares_outstanding": _spec(
+        "shares",
+        "dei.EntityCommonStockSharesOutstanding",
+        "us-gaap.CommonStockSharesOutstanding",
+    ),
+    "shares_diluted": _spec(
+        "shares",
+        "us-gaap.WeightedAverageNumberOfDilutedSharesOutstanding",
+    ),
+}
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 加载（默认 + config 覆盖）
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def _spec_from_config(name: str, raw: Mapping, default: Optional[MetricSpec]) -> MetricSpec:
+    if not isinstance(raw, Mapping):
+        raise ValueError(f"fundamentals.metric_map.{name} must be a mapping with 'tags'")
+
+    unit = raw.get("unit") or (default.unit if default else None)
+    tags = raw.get("tags")
+    if not unit or not tags:
+        raise ValueError(f"fundamentals.metric_map.{name} requires 'unit' and 'tags'")
+    return _spec(unit, *tags)
+
+
+def load_metric_map() -> Dict[str, MetricSpec]:
+    overrides = get_config_value("fundamentals.metric_map", None) or {}
+
+    metric_map = dict(DEFAULT_METRIC_MAP)
+    for name, raw in overrides.items():
+        metric_map[name] = _spec_from_config(name, raw, DEFAULT_METRIC_MAP.get(name))
+    return metric_map
+
+
+def metric_names(metric_map: Optional[Mapping[str, MetricSpec]] = None) -> List[str]:
+    return sorted(metric_map if metric_map is not None else load_metric_map())
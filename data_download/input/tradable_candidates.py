@@ -16,9 +16,9 @@ import re
 from io import StringIO
 from pathlib import Path
 
-# 添加项目根目录到 Python 路径
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
+# 作为脚本直接运行时把项目根目录加入路径；被 import 时不修改 sys.path
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import pandas as pd
 import requests
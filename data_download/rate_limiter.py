@@ -0,0 +1,72 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+线程安全的令牌桶限速器
+======================
+
+多个下载线程共享一个实例，保证整体请求速率不超过数据源上限
+（SEC EDGAR：10 requests/second）。
+
+- rate  : 每秒补充的令牌数（长期平均速率）
+- burst : 桶容量（允许的瞬时突发请求数）
+"""
+import threading
+import time
+from typing import Callable
+
+# 浮点累加误差容忍（避免 0.9999999999 个令牌时无限小步等待）
+_EPS = 1e-9
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError(f"rate must be > 0, got {rate}")
+        if burst < 1:
+            raise ValueError(f"burst must be >= 1, got {burst}")
+
+        self.rate = float(rate)
+        self.burst = int(burst)
+        self._clock = clock
+        self._sleep = sleep
+
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def acquire(self):
+        """取一个令牌；桶空时阻塞到下一个令牌可用"""
+        while True:
+            with self._lock:
+                self._refill(self._clock())
+                if self._tokens >= 1 - _EPS:
+                    self._tokens = max(0.0, self._tokens - 1)
+                    return
+                wait = (1 - self._tokens) / self.rate
+
+            # 在锁外等待，其他线程可以继续检查
+            self._sleep(wait)
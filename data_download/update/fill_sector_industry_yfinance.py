@@ -15,9 +15,11 @@ import sys
 from pathlib import Path
 import os
 
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-os.chdir(project_root)
+# 作为脚本直接运行时把项目根目录加入路径；被 import 时不修改 sys.path
+if __package__ in (None, ""):
+    project_root = Path(__file__).parent.parent.parent
+    sys.path.insert(0, str(project_root))
+    os.chdir(project_root)
 
 import yfinance as yf
 from time import sleep
@@ -0,0 +1,299 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+复权价格重算 / 校验（raw OHLCV + corporate_actions）
+===================================================
+
+复权口径（与 Tiingo / CRSP 一致，最新价格不变，向历史回溯）：
+- 拆股 s（ex-date t）：t 之前的价格 ÷ s，成交量 × s
+- 现金分红 d（ex-date t）：t 之前的价格 × (1 − d / close_{t−1})
+
+每个事件日的价格乘子 m_t = (1 − d_t / close_{t−1}) / s_t，
+某日 u 的复权因子 = ∏_{t > u} m_t —— 按 instrument 分组的「反向累乘」，
+整个面板一次向量化完成，不需要逐 instrument 循环。
+
+用途：
+- validate_adjusted_prices：全市场校验 Tiingo 的 adj_* 字段
+- rebuild_adjusted_prices ：本地重建 adj_*，无需重新下载历史
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from database.utils.db_utils import get_db_connection
+from database.readwrite.rw_corporate_actions import get_corporate_actions_panel
+from database.readwrite.rw_instruments import get_tradable_instrument_ids
+from database.readwrite.rw_market_prices import load_price_panel
+from utils.logger import get_logger
+
+log = get_logger("price_adjustments")
+
+RAW_COLUMNS = ["open_price", "high_price", "low_price", "close_price", "volume"]
+ADJ_COLUMNS = ["adj_open", "adj_high", "adj_low", "adj_close", "adj_volume"]
+
+_DIVIDEND_TYPES = ("DIVIDEND_CASH", "SPECIAL_DIVIDEND")
+_SPLIT_TYPES = ("SPLIT", "REVERSE_SPLIT")
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 纯计算
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def _reverse_cumprod_after(values: pd.Series, groups: pd.Series) -> pd.Series:
+    """
+    每行返回同组内「严格晚于本行」的所有值的乘积（要求已按 group, date 排序）
+    """
+    nxt = values.groupby(groups, sort=False).shift(-1).fillna(1.0)
+    rev = nxt.iloc[::-1].groupby(groups.iloc[::-1], sort=False).cumprod()
+    return rev.iloc[::-1]
+
+
+def compute_adjustment_factors(prices: pd.DataFrame, actions: pd.DataFrame) -> pd.DataFrame:
+    """
+    prices : instrument_id, date, close_price（可含其它列，原样保留）
+    actions: instrument_id, action_date, action_type, action_value
+
+    返回 prices（按 instrument_id, date 排序）并附加：
+      price_factor  : 价格复权因子
+      volume_factor : 成交量复权因子
+    """
+    px = prices.copy()
+    px["date"] = pd.to_datetime(px["date"]).astype("datetime64[ns]")
+    px = px.sort_values(["instrument_id", "date"]).reset_index(drop=True)
+    close = pd.to_numeric(px["close_price"], errors="coerce").astype(float)
+
+    dividend = pd.Series(0.0, index=px.index)
+    split = pd.Series(1.0, index=px.index)
+
+    if actions is not None and not actions.empty:
+        act = actions.copy()
+        act["date"] = pd.to_datetime(act["action_date"]).astype("datetime64[ns]")
+        act["action_value"] = pd.to_numeric(act["action_value"], errors="coerce").astype(float)
+
+        div = (
+            act[act["action_type"].isin(_DIVIDEND_TYPES)]
+            .groupby(["instrument_id", "date"])["action_value"].sum()
+        )
+        spl = (
+            act[act["action_type"].isin(_SPLIT_TYPES) & (act["action_value"] > 0)]
+            .groupby(["instrument_id", "date"])["action_value"].prod()
+        )
+
+        key = pd.MultiIndex.from_frame(px[["instrument_id", "date"]])
+        dividend = pd.Series(div.reindex(key).fillna(0.0).to_numpy(), index=px.index)
+        split = pd.Series(spl.reindex(key).fillna(1.0).to_numpy(), index=px.index)
+
+    # 分红乘子用前一交易日（同 instrument）的未复权收盘价
+    prev_close = close.groupby(px["instrument_id"], sort=False).shift(1)
+    div_ratio = (1.0 - dividend / prev_close).where((dividend != 0) & (prev_close > 0), 1.0)
+    # 异常数据（分红 >= 前收盘）不做调整，避免因子变 0 或负数
+    div_ratio = div_ratio.where(div_ratio > 0, 1.0)
+
+    multiplier = div_ratio / split
+
+    px["price_factor"] = _reverse_cumprod_after(multiplier, px["instrument_id"]).to_numpy()
+    px["volume_factor"] = _reverse_cumprod_after(split, px["instrument_id"]).to_numpy()
+    return px
+
+
+def apply_adjustments(prices: pd.DataFrame, actions: pd.DataFrame) -> pd.DataFrame:
+    """
+    由 raw OHLCV + 公司行为计算 adj_*（列名与 market_prices 一致，后缀 _calc）
+    """
+    px = compute_adjustment_factors(prices, actions)
+
+    for raw, adj in zip(RAW_COLUMNS[:4], ADJ_COLUMNS[:4]):
+        if raw in px.columns:
+            px[f"{adj}_calc"] = pd.to_numeric(px[raw], errors="coerce").astype(float) * px["price_factor"]
+
+    if "volume" in px.columns:
+        vol = pd.to_numeric(px["volume"], errors="coerce").astype(float) * px["volume_factor"]
+        px["adj_volume_calc"] = vol.round().astype("Int64")
+
+    return px
+
+
+def compare_adjusted(calc: pd.DataFrame, *, tolerance: float = 1e-3) -> pd.DataFrame:
+    """
+    比较 adj_close 与 adj_close_calc，按 instrument 汇总
+
+    返回：instrument_id, rows, mismatches, max_rel_diff, first_mismatch_date
+    """
+    reported = pd.to_numeric(calc["adj_close"], errors="coerce").astype(float)
+    rel = (calc["adj_close_calc"] - reported).abs() / reported.abs()
+    bad = rel > tolerance
+
+    df = pd.DataFrame(
+        {
+            "instrument_id": calc["instrument_id"],
+            "rel_diff": rel,
+            "bad": bad,
+            "bad_date": calc["date"].where(bad),
+        }
+    )
+    summary = df.groupby("instrument_id").agg(
+        rows=("rel_diff", "size"),
+        mismatches=("bad", "sum"),
+        max_rel_diff=("rel_diff", "max"),
+        first_mismatch_date=("bad_date", "min"),
+    )
+    return summary.reset_index().sort_values("max_rel_diff", ascending=False)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# DB 入口
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def _iter_batches(ids: List[int], batch_size: int):
+    for i in range(0, len(ids), batch_size):
+        yield ids[i : i + batch_size]
+
+
+def _load_batch(conn, ids: List[int]) -> pd.DataFrame:
+    prices = load_price_panel(
+        conn, [*RAW_COLUMNS, *ADJ_COLUMNS], instrument_ids=ids
+    )
+    if prices.empty:
+        return prices
+    actions = get_corporate_actions_panel(conn, instrument_ids=ids)
+    return apply_adjustments(prices, actions)
+
+
+def validate_adjusted_prices(
+    instrument_ids: Optional[List[int]] = None,
+    *,
+    tolerance: float = 1e-3,
+    batch_size: int = 200,
+) -> pd.DataFrame:
+    """
+    用 raw 价格 + corporate_actions 重算复权价，与库中 Tiingo 的 adj_close 对比。
+    返回每个 instrument 的差异汇总（max_rel_diff 降序）。
+    """
+    conn = get_db_connection()
+    if not conn:
+        raise RuntimeError("failed to get db connection")
+
+    reports = []
+    try:
+        ids = instrument_ids if instrument_ids is not None else get_tradable_instrument_ids(conn)
+        for batch in _iter_batches(list(ids), batch_size):
+            calc = _load_batch(conn, batch)
+            if not calc.empty:
+                reports.append(compare_adjusted(calc, tolerance=tolerance))
+    finally:
+        conn.close()
+
+    if not reports:
+        return pd.DataFrame(columns=["instrument_id", "rows", "mismatches", "max_rel_diff", "first_mismatch_date"])
+
+    report = pd.concat(reports, ignore_index=True).sort_values("max_rel_diff", ascending=False)
+    n_bad = int((report["mismatches"] > 0).sum())
+    log.info(f"[adjust] validated {len(report)} instruments, {n_bad} with mismatches (tol={tolerance})")
+    return report
+
+
+def _write_adjusted(conn, calc: pd.DataFrame) -> int:
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS _stage_adjusted_prices (
+            instrument_id BIGINT,
+            date DATE,
+            adj_open NUMERIC(20,6),
+            adj_high NUMERIC(20,6),
+            adj_low NUMERIC(20,6),
+            adj_close NUMERIC(20,6),
+            adj_volume BIGINT
+        ) ON COMMIT DELETE ROWS
+        """
+    )
+
+    cols = ["instrument_id", "date", *[f"{c}_calc" for c in ADJ_COLUMNS]]
+    out = calc[cols].copy()
+    out["date"] = out["date"].dt.date
+    out = out.astype(object).where(out.notna(), None)
+
+    with cursor.copy(
+        "COPY _stage_adjusted_prices (instrument_id, date, adj_open, adj_high, adj_low, adj_close, adj_volume) "
+        "FROM STDIN"
+    ) as copy:
+        for row in out.itertuples(index=False, name=None):
+            copy.write_row(row)
+
+    cursor.execute(
+        """
+        UPDATE market_prices p SET
+            adj_open   = s.adj_open,
+            adj_high   = s.adj_high,
+            adj_low    = s.adj_low,
+            adj_close  = s.adj_close,
+            adj_volume = s.adj_volume
+        FROM _stage_adjusted_prices s
+        WHERE p.instrument_id = s.instrument_id
+          AND p.date = s.date
+          AND s.adj_close IS NOT NULL
+        """
+    )
+    n = max(cursor.rowcount, 0)
+
+    # latest_prices 快照里同一 (instrument_id, date) 的复权列保持一致
+    cursor.execute(
+        """
+        UPDATE latest_prices l SET
+            adj_open   = s.adj_open,
+            adj_high   = s.adj_high,
+            adj_low    = s.adj_low,
+            adj_close  = s.adj_close,
+            adj_volume = s.adj_volume,
+            updated_at = now()
+        FROM _stage_adjusted_prices s
+        WHERE l.instrument_id = s.instrument_id
+          AND l.date = s.date
+          AND s.adj_close IS NOT NULL
+        """
+    )
+    cursor.execute("TRUNCATE _stage_adjusted_prices")
+    return n
+
+
+def rebuild_adjusted_prices(
+    instrument_ids: Optional[List[int]] = None,
+    *,
+    batch_size: int = 200,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """
+    用 raw 价格 + corporate_actions 本地重建 market_prices.adj_*（按 instrument 分批提交）
+    """
+    conn = get_db_connection()
+    if not conn:
+        raise RuntimeError("failed to get db connection")
+
+    updated = instruments = 0
+    try:
+        ids = instrument_ids if instrument_ids is not None else get_tradable_instrument_ids(conn)
+        for batch in _iter_batches(list(ids), batch_size):
+            calc = _load_batch(conn, batch)
+            if calc.empty:
+                continue
+            instruments += calc["instrument_id"].nunique()
+            if dry_run:
+                continue
+            updated += _write_adjusted(conn, calc)
+            conn.commit()
+            log.info(f"[adjust] rebuilt {instruments} instruments, rows={updated}")
+    finally:
+        conn.close()
+
+    return {"instruments": instruments, "rows_updated": updated}
@@ -11,7 +11,28 @@
 # Unauthorized copying, modification, distribution, or use of this file,
 # via any medium, is strictly prohibited without prior written consent.
 # =============================================================================
-from database.readwrite.rw_market_prices import get_price_max_date
+"""
+每日可交易标的池（instruments.is_tradable）差量更新
+
+一条 SQL 完成：计算目标状态 -> 只 UPDATE 状态真正变化的行 -> 变化写入
+instrument_tradable_history。未变化的行不改写（不产生新元组、不动索引和 updated_at），
+写入量与变化数成正比；行锁只加在变化的行上，读者不受影响（MVCC）。
+
+判定规则：
+- Stock：最新价格（latest_prices，当日）>= min_price，
+         且 log(近 lookback_days 平均成交额) >= log(min_avg_dollar_volume)
+- ETF  ：永远可交易
+- 其他（Cash）：不可交易
+
+平均成交额直接复用因子 dv_{lookback_days}d_log（latest_factor_values 中当日的值）；
+因子只对可交易标的计算，其余股票（以及因子缺失的标的）才回退到 market_prices
+现算窗口均值，通常只是一小部分。回退与旧规则同口径：窗口内有几行平均几行，
+不要求满 lookback_days 行，新上市股票只要均值达标即可进入。
+"""
+import math
+from typing import Dict
+
+from database.readwrite.rw_latest_snapshots import get_latest_price_date
 from database.utils.db_utils import get_db_connection
 from utils.config_values import DEFAULT_PRICE_FLOOR
 from utils.logger import get_logger
@@ -19,117 +40,135 @@ from utils.logger import get_logger
 log = get_logger("update_tradable_universe")
 
 
+_DIFF_UPDATE_SQL = """
+    WITH px AS (
+        SELECT instrument_id, adj_close
+        FROM latest_prices
+        WHERE date = %(asof)s
+    ),
+    dv AS (
+        SELECT instrument_id, factor_value AS dv_log
+        FROM latest_factor_values
+        WHERE factor_name = %(dv_factor)s
+          AND factor_version = 'v1'
+          AND date = %(asof)s
+    ),
+    dv_fallback AS (
+        -- 没有当日 dv 因子的股票：只对这些标的在窗口内现算（与因子同口径 adj_close * adj_volume）
+        -- 与旧规则一致：窗口内有几行就平均几行（新上市 / 个别缺失日不会被排除），均值为 0 时为 NULL
+        SELECT m.instrument_id, LN(NULLIF(AVG(m.adj_close * m.adj_volume), 0)) AS dv_log
+        FROM market_prices m
+        JOIN px ON px.instrument_id = m.instrument_id
+        JOIN instruments i ON i.instrument_id = m.instrument_id AND i.asset_type = 'Stock'
+        WHERE m.date >= %(window_start)s
+          AND m.date <= %(asof)s
+          AND NOT EXISTS (SELECT 1 FROM dv WHERE dv.instrument_id = m.instrument_id)
+        GROUP BY m.instrument_id
+    ),
+    target AS (
+        SELECT
+            i.instrument_id,
+            CASE
+                WHEN i.asset_type = 'ETF' THEN TRUE
+                WHEN i.asset_type = 'Stock' THEN COALESCE(
+                    px.adj_close >= %(min_price)s
+                    AND COALESCE(dv.dv_log, f.dv_log) >= %(min_dv_log)s,
+                    FALSE
+                )
+                ELSE FALSE
+            END AS new_tradable,
+            px.adj_close AS last_price,
+            COALESCE(dv.dv_log, f.dv_log) AS dv_log
+        FROM instruments i
+        LEFT JOIN px ON px.instrument_id = i.instrument_id
+        LEFT JOIN dv ON dv.instrument_id = i.instrument_id
+        LEFT JOIN dv_fallback f ON f.instrument_id = i.instrument_id
+    ),
+    changed AS (
+        UPDATE instruments i
+        SET is_tradable = t.new_tradable,
+            updated_at = now()
+        FROM target t
+        WHERE i.instrument_id = t.instrument_id
+          AND i.is_tradable IS DISTINCT FROM t.new_tradable
+        RETURNING i.instrument_id, t.new_tradable, t.last_price, t.dv_log
+    )
+    INSERT INTO instrument_tradable_history (instrument_id, asof_date, is_tradable, last_price, dv_log)
+    SELECT instrument_id, %(asof)s, new_tradable, last_price, dv_log
+    FROM changed
+    RETURNING instrument_id, is_tradable
+"""
+
+
 def update_tradable_universe(
     *,
     min_price: float = None,
     min_avg_dollar_volume: float = 1_000_000,
     lookback_days: int = 60,
-):
+    commit: bool = True,
+) -> Dict[str, object]:
     """
-    每日更新可交易标的逻辑：
-
-    1️⃣ 股票：
-        - 最近 lookback_days 平均成交额 >= min_avg_dollar_volume
-        - 最新价格 >= min_price
-
-    2️⃣ ETF：
-        - 永远可交易
+    差量更新可交易标的池，返回 {asof_date, added, removed}
 
+    lookback_days 对应因子 dv_{lookback_days}d_log（compute_dollar_volume 中的窗口：20 / 60）。
+    commit=False 时只计算并回滚（查看会变化的标的）。
     不做容错，缺数据直接炸。
     """
-
     if min_price is None:
         min_price = DEFAULT_PRICE_FLOOR()
+    if min_avg_dollar_volume <= 0:
+        raise ValueError("min_avg_dollar_volume must be > 0")
 
     conn = get_db_connection()
-    cursor = conn.cursor()
-
-    asof_date = get_price_max_date(conn)
-    if not asof_date:
-        raise ValueError("market_prices empty, cannot update universe")
-
-    # 1️⃣ 取最近 N 个交易日
-    cursor.execute(
-        """
-        SELECT date
-        FROM trading_calendar
-        WHERE date <= %s
-        ORDER BY date DESC
-        LIMIT %s
-        """,
-        (asof_date, lookback_days),
-    )
-
-    rows = cursor.fetchall()
-    if len(rows) < lookback_days:
-        raise ValueError("not enough trading days for lookback window")
-
-    lookback_start = rows[-1][0]
-    lookback_end = rows[0][0]
-
-    # 2️⃣ 计算符合条件的股票
-    cursor.execute(
-        """
-        WITH recent_data AS (
-            SELECT
-                instrument_id,
-                AVG(adj_close * volume) AS avg_dollar_vol,
-                MAX(adj_close) FILTER (WHERE date = %s) AS last_price
-            FROM market_prices
-            WHERE date >= %s
-              AND date <= %s
-            GROUP BY instrument_id
-        )
-        SELECT i.instrument_id
-        FROM recent_data r
-        JOIN instruments i ON r.instrument_id = i.instrument_id
-        WHERE i.asset_type = 'Stock'
-          AND r.avg_dollar_vol >= %s
-          AND r.last_price >= %s
-        """,
-        (
-            asof_date,
-            lookback_start,
-            lookback_end,
-            min_avg_dollar_volume,
-            min_price,
-        ),
-    )
+    try:
+        cursor = conn.cursor()
 
-    tradable_stock_ids = [r[0] for r in cursor.fetchall()]
-
-    # 3️⃣ 全部设为 false
-    cursor.execute(
-        """
-        UPDATE instruments
-        SET is_tradable = false
-        """
-    )
+        asof_date = get_latest_price_date(conn)
+        if not asof_date:
+            raise ValueError("market_prices empty, cannot update universe")
 
-    # 4️⃣ 股票符合规则的设为 true
-    if tradable_stock_ids:
+        # 回退路径的窗口起点：最近 lookback_days 个交易日
         cursor.execute(
             """
-            UPDATE instruments
-            SET is_tradable = true
-            WHERE instrument_id = ANY(%s)
+            SELECT date
+            FROM trading_calendar
+            WHERE date <= %s
+            ORDER BY date DESC
+            LIMIT %s
             """,
-            (tradable_stock_ids,),
+            (asof_date, lookback_days),
         )
+        rows = cursor.fetchall()
+        if len(rows) < lookback_days:
+            raise ValueError("not enough trading days for lookback window")
 
-    # 5️⃣ ETF 永远可交易
-    cursor.execute(
-        """
-        UPDATE instruments
-        SET is_tradable = true
-        WHERE asset_type = 'ETF'
-        """
-    )
+        cursor.execute(
+            _DIFF_UPDATE_SQL,
+            {
+                "asof": asof_date,
+                "window_start": rows[-1][0],
+                "dv_factor": f"dv_{lookback_days}d_log",
+                "min_price": min_price,
+                "min_dv_log": math.log(min_avg_dollar_volume),
+            },
+        )
+        changes = cursor.fetchall()
+
+        added = sorted(iid for iid, tradable in changes if tradable)
+        removed = sorted(iid for iid, tradable in changes if not tradable)
 
-    conn.commit()
-    conn.close()
+        if commit:
+            conn.commit()
+        else:
+            conn.rollback()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
 
     log.info(
-        f"[✔] Tradable universe updated | "
-        f"stocks={len(tradable_stock_ids)} | ETFs forced tradable"
+        f"[✔] Tradable universe {'updated' if commit else 'dry-run'} @ {asof_date} | "
+        f"+{len(added)} / -{len(removed)}"
     )
+    return {"asof_date": asof_date, "added": added, "removed": removed}
@@ -14,15 +14,16 @@
 import sys
 from pathlib import Path
 
-# 添加项目根目录到 Python 路径
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
+# 作为脚本直接运行时把项目根目录加入路径；被 import 时不修改 sys.path
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import pandas as pd
 import requests
 from time import sleep
 from typing import List, Optional, Dict
 from datetime import datetime
+from data_download.http_cache import cached_get_json
 from database.utils.db_utils import get_db_connection
 from utils.config_loader import get_config_value
 from utils.logger import get_logger
@@ -51,14 +52,16 @@ def read_tickers_from_csv(csv_path: Path, column_name: str = "ticker") -> List[s
 
 
 # ----------------------------------------------------------------------------------------------------------------------------------------
-# 从 Tiingo Meta API 获取元数据
+# 从 Tiingo Meta API 获取元数据（元数据很少变化，走磁盘缓存，7 天内不重复请求）
 # ----------------------------------------------------------------------------------------------------------------------------------------
+TIINGO_META_TTL = 7 * 86400
+
+
 def fetch_tiingo_meta(ticker: str, api_token: str, session: requests.Session) -> Optional[Dict]:
     url = f"https://api.tiingo.com/tiingo/daily/{ticker}"
     headers = {'Content-Type': 'application/json', 'Authorization': f'Token {api_token}'}
     try:
-        response = session.get(url, headers=headers, timeout=10)
-        return response.json() if response.status_code == 200 else None
+        return cached_get_json(url, headers=headers, ttl=TIINGO_META_TTL, timeout=10, session=session)
     except:
         return None
 
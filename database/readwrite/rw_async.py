@@ -0,0 +1,163 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+核心读写函数的异步版本（psycopg.AsyncConnection）
+
+与同步版本共用 SQL 构造和结果整理（_prices_query / _factor_values_query / _price_map ...），
+返回值完全相同，只是需要 await：
+
+    from database.utils.async_db_utils import async_db_connection
+
+    async with async_db_connection() as c1, async_db_connection() as c2:
+        prices, snap = await asyncio.gather(
+            aget_prices_on_date(c1, ids, "2026-01-30"),
+            aget_factor_values(c2, factor_names=["mom_21d"], date="2026-01-30"),
+        )
+
+一个连接同一时刻只能跑一条语句：并发的查询各自使用一个连接。
+"""
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from database.readwrite.rw_factor_values import (
+    _BATCH_INSERT_FACTOR_SQL,
+    _factor_values_query,
+    _normalize_factor_rows,
+)
+from database.readwrite.rw_latest_snapshots import latest_factor_values_upsert
+from database.readwrite.rw_market_prices import (
+    _BATCH_INSERT_PRICE_SQL,
+    _PRICES_ON_DATE_SQL,
+    _batch_price_params,
+    _price_map,
+    _prices_query,
+)
+from database.schema.partitions import ensure_partitions_for_dates, partitions_covered
+from utils.logger import get_logger
+
+log = get_logger("rw_async")
+
+
+async def _fetch_df(conn, query: str, params) -> pd.DataFrame:
+    cursor = conn.cursor()
+    await cursor.execute(query, params)
+    columns = [desc[0] for desc in cursor.description]
+    return pd.DataFrame(await cursor.fetchall(), columns=columns)
+
+
+def _ensure_partitions_blocking(table: str, dates: List[Any]):
+    # 分区 DDL 用一个短的同步连接单独提交（幂等），不占用调用方的异步事务
+    from database.utils.db_utils import db_connection
+
+    with db_connection() as conn:
+        ensure_partitions_for_dates(conn, table, dates)
+
+
+async def _aensure_partitions(table: str, dates: Iterable):
+    dates = [d for d in set(dates) if d is not None]
+    if not partitions_covered(table, dates):
+        await asyncio.to_thread(_ensure_partitions_blocking, table, dates)
+
+
+# -----------------------------------------------------------------------------
+# Query
+# -----------------------------------------------------------------------------
+async def aget_prices(
+    conn, instrument_id: int, start_date: str = None, end_date: str = None
+) -> pd.DataFrame:
+    """rw_market_prices.get_prices 的异步版本"""
+    query, params = _prices_query(instrument_id, start_date, end_date)
+    return await _fetch_df(conn, query, params)
+
+
+async def aget_prices_on_date(
+    conn, instrument_ids: List[int], date: str, strict: bool = False
+) -> Dict[int, float]:
+    """rw_market_prices.get_prices_on_date 的异步版本"""
+    if not instrument_ids:
+        return {}
+
+    cursor = conn.cursor()
+    await cursor.execute(_PRICES_ON_DATE_SQL, (instrument_ids, date))
+    return _price_map(await cursor.fetchall(), instrument_ids, date, strict)
+
+
+async def aget_factor_values(
+    conn,
+    *,
+    factor_name: Optional[str] = None,
+    factor_names: Optional[List[str]] = None,
+    factor_version: Optional[str] = None,
+    instrument_id: Optional[int] = None,
+    instrument_ids: Optional[List[int]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    date: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """rw_factor_values.get_factor_values 的异步版本（参数校验相同）"""
+    query, params = _factor_values_query(
+        factor_name=factor_name,
+        factor_names=factor_names,
+        factor_version=factor_version,
+        instrument_id=instrument_id,
+        instrument_ids=instrument_ids,
+        start_date=start_date,
+        end_date=end_date,
+        date=date,
+        columns=columns,
+    )
+    return await _fetch_df(conn, query, params)
+
+
+# -----------------------------------------------------------------------------
+# Bulk write
+# -----------------------------------------------------------------------------
+async def abatch_insert_prices(conn, prices: List[Dict]) -> int:
+    """
+    rw_market_prices.batch_insert_prices 的异步版本（同样逐行维护 latest_prices）
+
+    executemany 在异步连接上走 pipeline，一次往返发送整批。
+    """
+    if not prices:
+        return 0
+
+    await _aensure_partitions("market_prices", (p["date"] for p in prices))
+
+    cursor = conn.cursor()
+    await cursor.executemany(_BATCH_INSERT_PRICE_SQL, [_batch_price_params(p) for p in prices])
+
+    log.info(f"[✔] 批量插入 {len(prices)} 条价格数据 (async)")
+    return len(prices)
+
+
+async def abatch_insert_factor_values(conn, rows: List[Dict[str, Any]]) -> int:
+    """rw_factor_values.batch_insert_factor_values 的异步版本（含 latest_factor_values 快照）"""
+    if not rows:
+        return 0
+
+    normalized = _normalize_factor_rows(rows)
+    await _aensure_partitions("factor_values", (r["date"] for r in normalized))
+
+    cursor = conn.cursor()
+    await cursor.executemany(_BATCH_INSERT_FACTOR_SQL, normalized)
+
+    stmt = latest_factor_values_upsert(normalized)
+    if stmt is not None:
+        await cursor.execute(*stmt)
+
+    log.info(f"[rw_async] wrote {len(normalized)} factor rows")
+    return len(normalized)
@@ -122,6 +122,36 @@ def get_corporate_actions(
     return pd.DataFrame(cursor.fetchall(), columns=columns)
 
 
+def get_corporate_actions_panel(
+    conn,
+    instrument_ids: Optional[List[int]] = None,
+    action_types: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """批量读取多个 instrument 的公司行为（复权重算用）"""
+    query = """
+        SELECT instrument_id, action_date, action_type, action_value
+        FROM corporate_actions
+        WHERE 1=1
+    """
+    params: List[Any] = []
+
+    if instrument_ids is not None:
+        query += " AND instrument_id = ANY(%s)"
+        params.append(list(instrument_ids))
+
+    if action_types:
+        query += " AND action_type = ANY(%s)"
+        params.append(list(action_types))
+
+    query += " ORDER BY instrument_id, action_date"
+
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+
+    columns = [desc[0] for desc in cursor.description]
+    return pd.DataFrame(cursor.fetchall(), columns=columns)
+
+
 def get_latest_corporate_action_date(
     conn,
     instrument_id: int,
@@ -11,7 +11,7 @@
 # Unauthorized copying, modification, distribution, or use of this file,
 # via any medium, is strictly prohibited without prior written consent.
 # =============================================================================
-from typing import Optional
+from typing import Optional, Sequence
 import pandas as pd
 from utils.logger import get_logger
 
@@ -64,6 +64,90 @@ def update_log_failure(conn, log_id: int, error_message: str):
     log.error(f"[✖] 数据更新失败: log_id={log_id}, error={error_message}")
 
 
+def update_log_progress(conn, log_id: int, rows_inserted: int, processed_ids: Optional[Sequence[int]] = None):
+    """
+    长任务中途记录进度（仍为 running），进程中断后可据此续跑
+
+    processed_ids：本批处理完的 instrument_id，追加到 processed_ids（续跑时据此跳过，
+    不依赖是否写出了行——没有数据可写的标的同样记为已处理）
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        UPDATE data_update_logs SET
+            rows_inserted = %s,
+            processed_ids = COALESCE(processed_ids, '{}'::BIGINT[]) || %s::BIGINT[],
+            duration_seconds = EXTRACT(EPOCH FROM (now() - started_at))::INT
+        WHERE log_id = %s
+    """, (rows_inserted, [int(i) for i in processed_ids or ()], log_id))
+
+
+def update_log_partial(conn, log_id: int, rows_inserted: int = 0, error_message: str = None):
+    """更新日志为部分完成状态（部分 instrument 失败；本轮已结束，不再续跑）"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        UPDATE data_update_logs SET
+            status = 'partial',
+            rows_inserted = %s,
+            error_message = %s,
+            completed_at = now(),
+            duration_seconds = EXTRACT(EPOCH FROM (now() - started_at))::INT
+        WHERE log_id = %s
+    """, (rows_inserted, error_message, log_id))
+
+    log.warning(f"[⚠] 数据更新部分完成: log_id={log_id}, error={error_message}")
+
+
+# 可续跑的状态：进程中断（running）或整体异常（failed）；completed / partial 都视为一轮已结束
+RESUMABLE_STATUSES = ("running", "failed")
+
+
+def get_resumable_log(conn, dataset: str, source: str, max_age_hours: Optional[float] = None) -> Optional[dict]:
+    """
+    获取最近一次中断（running / failed）的日志，用于断点续跑。
+
+    - 最近一次为 completed / partial 时返回 None（应开始新一轮）
+    - max_age_hours：started_at 早于该时长的中断日志不再续跑（否则之后写入过的 instruments 永远不会刷新）
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT log_id, status, started_at, rows_inserted,
+               EXTRACT(EPOCH FROM (now() - started_at)) / 3600.0 AS age_hours,
+               processed_ids
+        FROM data_update_logs
+        WHERE dataset = %s AND source = %s
+        ORDER BY started_at DESC
+        LIMIT 1
+    """, (dataset, source))
+
+    row = cursor.fetchone()
+    if not row or row[1] not in RESUMABLE_STATUSES:
+        return None
+    if max_age_hours is not None and row[4] is not None and float(row[4]) > max_age_hours:
+        log.info(f"[i] 日志 {row[0]} 已超过 {max_age_hours}h，不再续跑")
+        return None
+    return {
+        "log_id": row[0],
+        "status": row[1],
+        "started_at": row[2],
+        "rows_inserted": row[3] or 0,
+        "processed_ids": set(row[5] or ()),
+    }
+
+
+def reopen_log(conn, log_id: int):
+    """续跑时把旧日志重新标记为 running"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        UPDATE data_update_logs SET
+            status = 'running',
+            error_message = NULL,
+            completed_at = NULL
+        WHERE log_id = %s
+    """, (log_id,))
+
+    log.info(f"[✔] 续跑数据更新日志: {log_id}")
+
+
 def get_recent_logs(conn, dataset: str = None, limit: int = 10) -> pd.DataFrame:
     """获取最近的更新日志"""
     query = "SELECT * FROM data_update_logs WHERE 1=1"
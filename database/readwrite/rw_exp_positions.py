@@ -11,8 +11,9 @@
 # Unauthorized copying, modification, distribution, or use of this file,
 # via any medium, is strictly prohibited without prior written consent.
 # =============================================================================
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
 import pandas as pd
+from database.utils.stream_utils import DEFAULT_CHUNKSIZE, iter_query
 from utils.logger import get_logger
 from engine.constants import CASH_INSTRUMENT_ID
 
@@ -115,6 +116,36 @@ def get_exp_positions(
     return pd.DataFrame(cursor.fetchall(), columns=columns)
 
 
+def iter_exp_positions(
+    conn,
+    start_date: str = None,
+    end_date: str = None,
+    instrument_id: int = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[pd.DataFrame]:
+    """
+    流式读取实验持仓（服务端游标，按 date, instrument_id 升序分块 yield）
+    """
+    query = "SELECT * FROM exp_positions WHERE 1=1"
+    params = []
+
+    if start_date:
+        query += " AND date >= %s"
+        params.append(start_date)
+
+    if end_date:
+        query += " AND date <= %s"
+        params.append(end_date)
+
+    if instrument_id:
+        query += " AND instrument_id = %s"
+        params.append(instrument_id)
+
+    query += " ORDER BY date, instrument_id"
+
+    yield from iter_query(conn, query, params, chunksize=chunksize, name="exp_positions")
+
+
 def get_exp_nav(conn, start_date: str = None, end_date: str = None) -> pd.DataFrame:
     """
     计算实验 NAV（按日期聚合 market_value）
@@ -208,6 +239,47 @@ def get_stock_positions_only(
     return pd.DataFrame(cursor.fetchall(), columns=columns)
 
 
+def get_exp_positions_with_sector(
+    conn, start_date: str = None, end_date: str = None
+) -> pd.DataFrame:
+    """
+    一次读出全部持仓快照并关联 instruments.sector（持仓分析用）
+
+    返回 date, instrument_id, quantity, market_value(float), sector；
+    现金行 sector = 'Cash'，instruments 中没有行业的标的为 'Unknown'。
+    """
+    query = f"""
+        SELECT
+            p.date,
+            p.instrument_id,
+            p.quantity::float8 AS quantity,
+            p.market_value::float8 AS market_value,
+            CASE
+                WHEN p.instrument_id = {CASH_INSTRUMENT_ID} THEN 'Cash'
+                ELSE COALESCE(NULLIF(i.sector, ''), 'Unknown')
+            END AS sector
+        FROM exp_positions p
+        LEFT JOIN instruments i ON i.instrument_id = p.instrument_id
+        WHERE 1=1
+    """
+    params = []
+
+    if start_date:
+        query += " AND p.date >= %s"
+        params.append(start_date)
+    if end_date:
+        query += " AND p.date <= %s"
+        params.append(end_date)
+
+    query += " ORDER BY p.date, p.instrument_id"
+
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+
+    columns = ["date", "instrument_id", "quantity", "market_value", "sector"]
+    return pd.DataFrame(cursor.fetchall(), columns=columns)
+
+
 # ============================================================
 # Delete
 # ============================================================
@@ -0,0 +1,118 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+factor_ic 读写
+
+写入走 COPY -> 临时表 -> INSERT ... ON CONFLICT（一次分析常有 30 因子 × 4 周期 × 2 方法 × 5000 天 ≈ 百万行）。
+"""
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from utils.logger import get_logger
+
+log = get_logger("rw_factor_ic")
+
+IC_COLUMNS = ["date", "factor_name", "horizon", "method", "ic", "n_obs"]
+
+
+def copy_factor_ic(conn, df: pd.DataFrame, factor_version: str = "v1") -> int:
+    """
+    批量写入逐日 IC（长表 DataFrame：date, factor_name, horizon, method, ic, n_obs）
+
+    同键已存在时覆盖（重跑分析即刷新）。
+    """
+    if df is None or df.empty:
+        return 0
+
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS _stage_factor_ic (
+            factor_name TEXT,
+            horizon INT,
+            method TEXT,
+            date DATE,
+            ic DOUBLE PRECISION,
+            n_obs INT
+        ) ON COMMIT DELETE ROWS
+        """
+    )
+
+    with cursor.copy("COPY _stage_factor_ic (factor_name, horizon, method, date, ic, n_obs) FROM STDIN") as copy:
+        for r in df[IC_COLUMNS].itertuples(index=False):
+            ic = None if r.ic is None or np.isnan(r.ic) else float(r.ic)
+            copy.write_row((r.factor_name, int(r.horizon), r.method, r.date, ic, int(r.n_obs)))
+
+    cursor.execute(
+        """
+        INSERT INTO factor_ic (factor_name, factor_version, horizon, method, date, ic, n_obs)
+        SELECT factor_name, %s, horizon, method, date, ic, n_obs
+        FROM _stage_factor_ic
+        ON CONFLICT (factor_name, factor_version, horizon, method, date)
+        DO UPDATE SET
+            ic = EXCLUDED.ic,
+            n_obs = EXCLUDED.n_obs,
+            computed_at = now()
+        """,
+        (factor_version,),
+    )
+    cursor.execute("TRUNCATE _stage_factor_ic")
+
+    log.info(f"[✔] 批量写入 {len(df)} 条 factor_ic 数据")
+    return len(df)
+
+
+def get_factor_ic(
+    conn,
+    factor_names: Optional[Sequence[str]] = None,
+    horizon: Optional[int] = None,
+    method: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    factor_version: str = "v1",
+) -> pd.DataFrame:
+    """读取逐日 IC，按 factor_name, horizon, method, date 排序"""
+    query = """
+        SELECT date, factor_name, horizon, method, ic, n_obs
+        FROM factor_ic
+        WHERE factor_version = %s
+    """
+    params: List[Any] = [factor_version]
+
+    if factor_names is not None:
+        query += " AND factor_name = ANY(%s)"
+        params.append(list(factor_names))
+    if horizon is not None:
+        query += " AND horizon = %s"
+        params.append(int(horizon))
+    if method is not None:
+        query += " AND method = %s"
+        params.append(method)
+    if start_date:
+        query += " AND date >= %s"
+        params.append(start_date)
+    if end_date:
+        query += " AND date <= %s"
+        params.append(end_date)
+
+    query += " ORDER BY factor_name, horizon, method, date"
+
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    df = pd.DataFrame(cursor.fetchall(), columns=IC_COLUMNS)
+    if not df.empty:
+        df["ic"] = df["ic"].astype(float)
+    return df
@@ -0,0 +1,194 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+factor_monitor 读写
+
+每日增量只追加几十行（因子数 × 新日期），回填历史时一次可达数十万行：统一走 COPY -> 临时表 -> upsert。
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from utils.logger import get_logger
+
+log = get_logger("rw_factor_monitor")
+
+MONITOR_COLUMNS = [
+    "factor_name",
+    "date",
+    "ic",
+    "ls_return",
+    "n_obs",
+    "n_days",
+    "ic_longrun",
+    "rolling_ic",
+    "rolling_icir",
+    "hit_rate",
+    "rolling_ls",
+    "val_spread",
+    "crowding_z",
+    "status",
+]
+_FLOAT_COLUMNS = [
+    "ic", "ls_return", "ic_longrun", "rolling_ic", "rolling_icir", "hit_rate", "rolling_ls", "val_spread", "crowding_z",
+]
+
+
+def _nullable(v) -> Optional[float]:
+    return None if v is None or np.isnan(v) else float(v)
+
+
+def copy_factor_monitor(conn, df: pd.DataFrame, factor_version: str = "v1", horizon: int = 21) -> int:
+    """
+    批量写入监控行（DataFrame 含 MONITOR_COLUMNS），同键已存在时覆盖
+    """
+    if df is None or df.empty:
+        return 0
+
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS _stage_factor_monitor (
+            factor_name TEXT,
+            date DATE,
+            ic REAL,
+            ls_return REAL,
+            n_obs INT,
+            n_days INT,
+            ic_longrun REAL,
+            rolling_ic REAL,
+            rolling_icir REAL,
+            hit_rate REAL,
+            rolling_ls REAL,
+            val_spread REAL,
+            crowding_z REAL,
+            status TEXT
+        ) ON COMMIT DELETE ROWS
+        """
+    )
+
+    cols = ", ".join(MONITOR_COLUMNS)
+    with cursor.copy(f"COPY _stage_factor_monitor ({cols}) FROM STDIN") as copy:
+        for r in df[MONITOR_COLUMNS].itertuples(index=False):
+            copy.write_row((
+                r.factor_name,
+                r.date,
+                _nullable(r.ic),
+                _nullable(r.ls_return),
+                int(r.n_obs),
+                int(r.n_days),
+                _nullable(r.ic_longrun),
+                _nullable(r.rolling_ic),
+                _nullable(r.rolling_icir),
+                _nullable(r.hit_rate),
+                _nullable(r.rolling_ls),
+                _nullable(r.val_spread),
+                _nullable(r.crowding_z),
+                r.status,
+            ))
+
+    updates = ",\n            ".join(f"{c} = EXCLUDED.{c}" for c in MONITOR_COLUMNS[2:])
+    cursor.execute(
+        f"""
+        INSERT INTO factor_monitor (factor_version, horizon, {cols})
+        SELECT %s, %s, {cols}
+        FROM _stage_factor_monitor
+        ON CONFLICT (factor_name, factor_version, horizon, date)
+        DO UPDATE SET
+            {updates}
+        """,
+        (factor_version, int(horizon)),
+    )
+    cursor.execute("TRUNCATE _stage_factor_monitor")
+
+    log.info(f"[✔] 批量写入 {len(df)} 条 factor_monitor 数据")
+    return len(df)
+
+
+def get_last_monitor_dates(conn, factor_version: str = "v1", horizon: int = 21) -> Dict[str, Any]:
+    """每个因子各自已监控到的最新日期 {factor_name: date}（新加入的因子不在其中）"""
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT factor_name, MAX(date)
+        FROM factor_monitor
+        WHERE factor_version = %s AND horizon = %s
+        GROUP BY factor_name
+        """,
+        (factor_version, int(horizon)),
+    )
+    return {name: d for name, d in cursor.fetchall()}
+
+
+def _frame(rows) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=MONITOR_COLUMNS)
+    if not df.empty:
+        df[_FLOAT_COLUMNS] = df[_FLOAT_COLUMNS].astype(float)
+    return df
+
+
+def get_monitor_tail(conn, n_rows: int, factor_version: str = "v1", horizon: int = 21) -> pd.DataFrame:
+    """每个因子最近 n_rows 行（增量更新滚动窗口用），按 factor_name, date 升序"""
+    cols = ", ".join(MONITOR_COLUMNS)
+    cursor = conn.cursor()
+    cursor.execute(
+        f"""
+        SELECT {cols}
+        FROM (
+            SELECT {cols},
+                   ROW_NUMBER() OVER (PARTITION BY factor_name ORDER BY date DESC) AS rn
+            FROM factor_monitor
+            WHERE factor_version = %s AND horizon = %s
+        ) t
+        WHERE rn <= %s
+        ORDER BY factor_name, date
+        """,
+        (factor_version, int(horizon), int(n_rows)),
+    )
+    return _frame(cursor.fetchall())
+
+
+def get_latest_monitor(
+    conn,
+    factor_version: str = "v1",
+    horizon: int = 21,
+    statuses: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """每个因子的最新一行（可按 status 过滤，如 ('weak', 'decayed')）"""
+    cols = ", ".join(MONITOR_COLUMNS)
+    query = f"""
+        SELECT DISTINCT ON (factor_name) {cols}
+        FROM factor_monitor
+        WHERE factor_version = %s AND horizon = %s
+        ORDER BY factor_name, date DESC
+    """
+    params: List[Any] = [factor_version, int(horizon)]
+    if statuses is not None:
+        query = f"SELECT {cols} FROM ({query}) t WHERE status = ANY(%s) ORDER BY factor_name"
+        params.append(list(statuses))
+
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    return _frame(cursor.fetchall())
+
+
+def delete_factor_monitor(conn, factor_version: str = "v1", horizon: int = 21) -> int:
+    """删除某版本 / 周期的全部监控行，返回删除行数"""
+    cursor = conn.cursor()
+    cursor.execute(
+        "DELETE FROM factor_monitor WHERE factor_version = %s AND horizon = %s",
+        (factor_version, int(horizon)),
+    )
+    return cursor.rowcount
@@ -13,14 +13,29 @@
 # =============================================================================
 from __future__ import annotations
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Iterator, Optional, Any, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 from psycopg.types.json import Jsonb
+from database.readwrite.rw_latest_snapshots import (
+    LATEST_FACTOR_VALUES_FROM_INS,
+    LATEST_FACTOR_VALUES_RETURNING,
+    rebuild_latest_factor_values,
+    upsert_latest_factor_values,
+)
+from database.schema.partitions import ensure_partitions_for_dates
+from database.utils.binary_copy import copy_to_numpy, select_expr
+from database.utils.stream_utils import DEFAULT_CHUNKSIZE, iter_query
 from utils.logger import get_logger
 
 log = get_logger("rw_factor_values")
 
+FACTOR_COLUMNS = (
+    "instrument_id", "date", "factor_name", "factor_value", "factor_version",
+    "factor_args", "config", "data_source", "ingested_at",
+)
+
 
 # -----------------------------------------------------------------------------
 # Insert / Upsert
@@ -37,9 +52,11 @@ def insert_factor_value(
     config: Optional[Dict] = None,
     data_source: str = "internal",
 ):
+    # 同一语句内更新 latest_factor_values
     cursor = conn.cursor()
     cursor.execute(
         """
+        WITH ins AS (
         INSERT INTO factor_values (
             instrument_id, date, factor_name,
             factor_value, factor_version,
@@ -53,7 +70,10 @@ def insert_factor_value(
             config       = EXCLUDED.config,
             data_source  = EXCLUDED.data_source,
             ingested_at  = now()
-        """,
+        RETURNING """
+        + LATEST_FACTOR_VALUES_RETURNING
+        + ")"
+        + LATEST_FACTOR_VALUES_FROM_INS,
         (
             instrument_id,
             date,
@@ -67,28 +87,24 @@ def insert_factor_value(
     )
 
 
-def batch_insert_factor_values(conn, rows: List[Dict[str, Any]]):
-    if not rows:
-        return
+def _normalize_factor_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """补默认值并包装 Jsonb（batch_insert_factor_values / rw_async 共用）"""
+    return [
+        {
+            "instrument_id": r["instrument_id"],
+            "date": r["date"],
+            "factor_name": r["factor_name"],
+            "factor_value": r["factor_value"],
+            "factor_version": r.get("factor_version", "v1"),
+            "factor_args": Jsonb(r.get("factor_args", {})),
+            "config": Jsonb(r.get("config", {})),
+            "data_source": r.get("data_source", "internal"),
+        }
+        for r in rows
+    ]
 
-    normalized = []
-    for r in rows:
-        normalized.append(
-            {
-                "instrument_id": r["instrument_id"],
-                "date": r["date"],
-                "factor_name": r["factor_name"],
-                "factor_value": r["factor_value"],
-                "factor_version": r.get("factor_version", "v1"),
-                "factor_args": Jsonb(r.get("factor_args", {})),
-                "config": Jsonb(r.get("config", {})),
-                "data_source": r.get("data_source", "internal"),
-            }
-        )
 
-    cursor = conn.cursor()
-    cursor.executemany(
-        """
+_BATCH_INSERT_FACTOR_SQL = """
         INSERT INTO factor_values (
             instrument_id, date, factor_name,
             factor_value, factor_version,
@@ -111,9 +127,23 @@ def batch_insert_factor_values(conn, rows: List[Dict[str, Any]]):
             config       = EXCLUDED.config,
             data_source  = EXCLUDED.data_source,
             ingested_at  = now()
-        """,
-        normalized,
-    )
+"""
+
+
+def batch_insert_factor_values(conn, rows: List[Dict[str, Any]]):
+    if not rows:
+        return
+
+    normalized = _normalize_factor_rows(rows)
+
+    # 分区表：先补建本批日期涉及的分区（未开启分区时不做任何事）
+    ensure_partitions_for_dates(conn, "factor_values", {r["date"] for r in normalized})
+
+    cursor = conn.cursor()
+    cursor.executemany(_BATCH_INSERT_FACTOR_SQL, normalized)
+
+    # 快照表：每个 key 只写批内最新日期（历史回填时不必逐行维护）
+    upsert_latest_factor_values(conn, normalized)
 
     log.info(f"[rw_factor_values] wrote {len(normalized)} rows")
 
@@ -121,8 +151,7 @@ def batch_insert_factor_values(conn, rows: List[Dict[str, Any]]):
 # -----------------------------------------------------------------------------
 # Query
 # -----------------------------------------------------------------------------
-def get_factor_values(
-    conn,
+def _factor_values_query(
     *,
     factor_name: Optional[str] = None,
     factor_names: Optional[List[str]] = None,
@@ -132,22 +161,18 @@ def get_factor_values(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     date: Optional[str] = None,
-) -> pd.DataFrame:
-    """
-    查询因子值
-    
-    Parameters
-    ----------
-    factor_name : 单个因子名（与 factor_names 二选一）
-    factor_names : 因子名列表（与 factor_name 二选一）
-    factor_version : 因子版本
-    instrument_id : 单个标的 ID（与 instrument_ids 二选一）
-    instrument_ids : 标的 ID 列表（与 instrument_id 二选一）
-    start_date : 起始日期（>=）
-    end_date : 结束日期（<=）
-    date : 精确日期（与 start_date/end_date 互斥）
-    """
-    query = "SELECT * FROM factor_values WHERE 1=1"
+    columns: Optional[Sequence[str]] = None,
+) -> Tuple[str, List[Any]]:
+    """get_factor_values / iter_factor_values 共用的 SQL 构造（含参数互斥校验）"""
+    if columns is None:
+        select = "*"
+    else:
+        unknown = [c for c in columns if c not in FACTOR_COLUMNS]
+        if unknown or not columns:
+            raise ValueError(f"invalid factor_values columns: {list(columns)}")
+        select = ", ".join(columns)
+
+    query = f"SELECT {select} FROM factor_values WHERE 1=1"
     params: List[Any] = []
 
     # 因子名：单个或列表
@@ -196,6 +221,49 @@ def get_factor_values(
             params.append(end_date)
 
     query += " ORDER BY date, instrument_id"
+    return query, params
+
+
+def get_factor_values(
+    conn,
+    *,
+    factor_name: Optional[str] = None,
+    factor_names: Optional[List[str]] = None,
+    factor_version: Optional[str] = None,
+    instrument_id: Optional[int] = None,
+    instrument_ids: Optional[List[int]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    date: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    查询因子值
+
+    Parameters
+    ----------
+    factor_name : 单个因子名（与 factor_names 二选一）
+    factor_names : 因子名列表（与 factor_name 二选一）
+    factor_version : 因子版本
+    instrument_id : 单个标的 ID（与 instrument_ids 二选一）
+    instrument_ids : 标的 ID 列表（与 instrument_id 二选一）
+    start_date : 起始日期（>=）
+    end_date : 结束日期（<=）
+    date : 精确日期（与 start_date/end_date 互斥）
+    columns : 只取这些列（默认 SELECT *）；只取 instrument_id / date / factor_name /
+              factor_value / factor_version 时可走覆盖索引的 Index Only Scan
+    """
+    query, params = _factor_values_query(
+        factor_name=factor_name,
+        factor_names=factor_names,
+        factor_version=factor_version,
+        instrument_id=instrument_id,
+        instrument_ids=instrument_ids,
+        start_date=start_date,
+        end_date=end_date,
+        date=date,
+        columns=columns,
+    )
 
     cursor = conn.cursor()
     cursor.execute(query, params)
@@ -204,6 +272,90 @@ def get_factor_values(
     return pd.DataFrame(cursor.fetchall(), columns=cols)
 
 
+def iter_factor_values(
+    conn,
+    *,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    **filters,
+) -> Iterator[pd.DataFrame]:
+    """
+    流式版 get_factor_values：服务端游标，每次 yield 至多 chunksize 行的 DataFrame
+
+    filters 与 get_factor_values 的关键字参数相同；行顺序为 (date, instrument_id)。
+    全表级研究查询用它可以把客户端内存控制在一个 chunk 以内。
+    """
+    query, params = _factor_values_query(**filters)
+    yield from iter_query(conn, query, params, chunksize=chunksize, name="factor_values")
+
+
+def load_factor_panel(
+    conn,
+    factor_names: List[str],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    instrument_ids: Optional[List[int]] = None,
+    factor_version: Optional[str] = "v1",
+) -> pd.DataFrame:
+    """
+    因子面板快速读取（二进制 COPY 直接解码为 NumPy 列）
+
+    返回长表 instrument_id(int64), date(datetime64[ns]), factor_name, factor_value(float64)，
+    按 (date, instrument_id) 排序。factor_name 在 SQL 端编码成下标，客户端再映射回名字，
+    整个结果集不经过逐行的 Python 对象。factor_version=None 表示不过滤版本。
+    """
+    factor_names = list(factor_names)
+    if not factor_names:
+        raise ValueError("factor_names cannot be empty")
+    if instrument_ids is not None and len(instrument_ids) == 0:
+        raise ValueError("instrument_ids cannot be empty")
+
+    spec = [
+        ("instrument_id", "int8"),
+        ("date", "date"),
+        ("factor_idx", "int4"),
+        ("factor_value", "float8"),
+    ]
+    select = ", ".join(
+        [
+            select_expr("instrument_id", "int8", "instrument_id"),
+            select_expr("date", "date", "date"),
+            select_expr("array_position(%s::text[], factor_name) - 1", "int4", "factor_idx"),
+            select_expr("factor_value", "float8", "factor_value"),
+        ]
+    )
+    query = f"SELECT {select} FROM factor_values WHERE factor_name = ANY(%s)"
+    params: List[Any] = [factor_names, factor_names]
+
+    if factor_version is not None:
+        query += " AND factor_version = %s"
+        params.append(factor_version)
+
+    if instrument_ids is not None:
+        query += " AND instrument_id = ANY(%s)"
+        params.append(list(instrument_ids))
+
+    if start_date is not None:
+        query += " AND date >= %s"
+        params.append(start_date)
+
+    if end_date is not None:
+        query += " AND date <= %s"
+        params.append(end_date)
+
+    query += " ORDER BY date, instrument_id"
+
+    cols = copy_to_numpy(conn, query, params, spec)
+    names = np.asarray(factor_names, dtype=object)
+    return pd.DataFrame(
+        {
+            "instrument_id": cols["instrument_id"],
+            "date": cols["date"],
+            "factor_name": names[cols["factor_idx"]],
+            "factor_value": cols["factor_value"],
+        }
+    )
+
+
 def get_latest_factor_value(
     conn,
     *,
@@ -211,16 +363,15 @@ def get_latest_factor_value(
     factor_name: str,
     factor_version: str = "v1",
 ) -> Optional[float]:
+    """最新因子值（读 latest_factor_values 快照，单行主键查找）"""
     cursor = conn.cursor()
     cursor.execute(
         """
         SELECT factor_value
-        FROM factor_values
+        FROM latest_factor_values
         WHERE instrument_id = %s
           AND factor_name = %s
           AND factor_version = %s
-        ORDER BY date DESC
-        LIMIT 1
         """,
         (instrument_id, factor_name, factor_version),
     )
@@ -260,7 +411,15 @@ def delete_factor_values(
     *,
     factor_name: str,
     factor_version: Optional[str] = None,
-):
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> int:
+    """
+    删除某因子（可限定版本与日期区间），返回删除行数
+
+    指定 start_date / end_date 时，分区表只会扫描对应日期的分区（重算某段历史时使用）。
+    删除后按剩余数据重建该因子的 latest_factor_values。
+    """
     query = "DELETE FROM factor_values WHERE factor_name = %s"
     params = [factor_name]
 
@@ -268,9 +427,22 @@ def delete_factor_values(
         query += " AND factor_version = %s"
         params.append(factor_version)
 
+    if start_date is not None:
+        query += " AND date >= %s"
+        params.append(start_date)
+
+    if end_date is not None:
+        query += " AND date <= %s"
+        params.append(end_date)
+
     cursor = conn.cursor()
     cursor.execute(query, params)
+    deleted = cursor.rowcount
+
+    rebuild_latest_factor_values(conn, factor_name=factor_name, factor_version=factor_version)
 
     log.warning(
-        f"[rw_factor_values] deleted factor_name={factor_name}, version={factor_version}"
+        f"[rw_factor_values] deleted factor_name={factor_name}, version={factor_version}, "
+        f"range=[{start_date}, {end_date}]"
     )
+    return deleted
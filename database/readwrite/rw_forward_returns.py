@@ -0,0 +1,128 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+forward_returns 读写
+
+写入：按列 ndarray -> 二进制 COPY 临时表 -> 一条 INSERT ... ON CONFLICT（全市场 20 年约 1500 万行，不走逐行写入）
+读取：二进制 COPY 直接解码为 NumPy 列（与 load_price_panel / load_factor_panel 相同）
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from database.utils.binary_copy import copy_from_numpy, copy_to_numpy, select_expr
+from utils.logger import get_logger
+
+log = get_logger("rw_forward_returns")
+
+# 表中已物化的周期（交易日）；列名 fwd_{h}d
+FORWARD_HORIZONS = (1, 5, 21, 63)
+
+
+def horizon_column(h: int) -> str:
+    if int(h) not in FORWARD_HORIZONS:
+        raise ValueError(f"horizon {h} is not materialized (available: {FORWARD_HORIZONS})")
+    return f"fwd_{int(h)}d"
+
+
+_COLUMNS = [horizon_column(h) for h in FORWARD_HORIZONS]
+_STAGE_FIELDS = [("instrument_id", "int8"), ("date", "date")] + [(c, "float8") for c in _COLUMNS]
+
+
+def copy_forward_returns(conn, cols: Dict[str, np.ndarray]) -> int:
+    """
+    批量写入前瞻收益
+
+    cols : {"instrument_id", "date", "fwd_1d", "fwd_5d", "fwd_21d", "fwd_63d"} -> 等长 ndarray，
+           NaN 写成 NULL；同键已存在时覆盖。
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        f"""
+        CREATE TEMP TABLE IF NOT EXISTS _stage_forward_returns (
+            instrument_id BIGINT,
+            date DATE,
+            {", ".join(f"{c} DOUBLE PRECISION" for c in _COLUMNS)}
+        ) ON COMMIT DELETE ROWS
+        """
+    )
+
+    n = copy_from_numpy(conn, "_stage_forward_returns", cols, _STAGE_FIELDS)
+    if n == 0:
+        return 0
+
+    cursor.execute(
+        f"""
+        INSERT INTO forward_returns (instrument_id, date, {", ".join(_COLUMNS)})
+        SELECT instrument_id, date, {", ".join(f"NULLIF({c}, 'NaN')" for c in _COLUMNS)}
+        FROM _stage_forward_returns
+        ON CONFLICT (instrument_id, date)
+        DO UPDATE SET
+            {", ".join(f"{c} = EXCLUDED.{c}" for c in _COLUMNS)},
+            updated_at = now()
+        """
+    )
+    cursor.execute("TRUNCATE _stage_forward_returns")
+
+    log.info(f"[✔] 批量写入 {n} 条 forward_returns 数据")
+    return n
+
+
+def load_forward_returns(
+    conn,
+    horizons: Sequence[int] = FORWARD_HORIZONS,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    instrument_ids: Optional[List[int]] = None,
+) -> pd.DataFrame:
+    """
+    前瞻收益快速读取（二进制 COPY）
+
+    返回长表 instrument_id(int64), date(datetime64[ns]), fwd_{h}d(float64, NULL -> NaN)，
+    按 (date, instrument_id) 排序。
+    """
+    cols = [horizon_column(h) for h in horizons]
+    if not cols:
+        raise ValueError("horizons cannot be empty")
+    if instrument_ids is not None and len(instrument_ids) == 0:
+        raise ValueError("instrument_ids cannot be empty")
+
+    spec = [("instrument_id", "int8"), ("date", "date")] + [(c, "float8") for c in cols]
+    select = ", ".join(select_expr(name, kind, name) for name, kind in spec)
+    query = f"SELECT {select} FROM forward_returns WHERE TRUE"
+    params: List[Any] = []
+
+    if instrument_ids is not None:
+        query += " AND instrument_id = ANY(%s)"
+        params.append(list(instrument_ids))
+    if start_date is not None:
+        query += " AND date >= %s"
+        params.append(start_date)
+    if end_date is not None:
+        query += " AND date <= %s"
+        params.append(end_date)
+
+    query += " ORDER BY date, instrument_id"
+    return pd.DataFrame(copy_to_numpy(conn, query, params, spec))
+
+
+def delete_forward_returns(conn, start_date: Optional[str] = None) -> int:
+    """删除 start_date 及之后（None = 全部）的前瞻收益，返回删除行数"""
+    cursor = conn.cursor()
+    if start_date is None:
+        cursor.execute("DELETE FROM forward_returns")
+    else:
+        cursor.execute("DELETE FROM forward_returns WHERE date >= %s", (start_date,))
+    return cursor.rowcount
@@ -79,6 +79,54 @@ def batch_insert_fundamental_daily(conn, records: List[Dict]):
     log.info(f"[✔] 批量插入 {len(records)} 条 fundamental_daily 数据")
 
 
+def copy_fundamental_daily(conn, df: pd.DataFrame, data_source: str = "internal") -> int:
+    """
+    批量写入（长表 DataFrame：instrument_id, date, metric_name, metric_value）
+
+    COPY -> 临时表 -> 一条 INSERT ... ON CONFLICT，适合全市场每日估值。
+    """
+    if df is None or df.empty:
+        return 0
+
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS _stage_fundamental_daily (
+            instrument_id BIGINT,
+            date DATE,
+            metric_name TEXT,
+            metric_value NUMERIC(38,10)
+        ) ON COMMIT DELETE ROWS
+        """
+    )
+
+    with cursor.copy(
+        "COPY _stage_fundamental_daily (instrument_id, date, metric_name, metric_value) FROM STDIN"
+    ) as copy:
+        for r in df[["instrument_id", "date", "metric_name", "metric_value"]].itertuples(index=False):
+            copy.write_row((int(r.instrument_id), r.date, r.metric_name, float(r.metric_value)))
+
+    cursor.execute(
+        """
+        INSERT INTO fundamental_daily (
+            instrument_id, date, metric_name, metric_value, currency, data_source
+        )
+        SELECT instrument_id, date, metric_name, metric_value, 'USD', %s
+        FROM _stage_fundamental_daily
+        ON CONFLICT (instrument_id, date, metric_name)
+        DO UPDATE SET
+            metric_value = EXCLUDED.metric_value,
+            data_source = EXCLUDED.data_source,
+            ingested_at = now()
+        """,
+        (data_source,),
+    )
+    cursor.execute("TRUNCATE _stage_fundamental_daily")
+
+    log.info(f"[✔] 批量写入 {len(df)} 条 fundamental_daily 数据")
+    return len(df)
+
+
 def get_fundamental_daily(
     conn,
     instrument_id: int,
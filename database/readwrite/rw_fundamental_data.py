@@ -92,6 +92,59 @@ def get_latest_fundamental(conn, instrument_id: int, metric_name: str) -> Option
     return result[0] if result else None
 
 
+def get_fundamental_panel(
+    conn,
+    metric_names: List[str],
+    instrument_ids: List[int] = None,
+    min_period_end: str = None,
+) -> pd.DataFrame:
+    """
+    批量读取多个 instrument 的基本面（估值计算用，带 filed_date）
+    """
+    query = """
+        SELECT instrument_id, metric_name, period_type,
+               period_start, period_end, filed_date, metric_value
+        FROM fundamental_data
+        WHERE metric_name = ANY(%s)
+          AND filed_date IS NOT NULL
+    """
+    params = [list(metric_names)]
+
+    if instrument_ids is not None:
+        query += " AND instrument_id = ANY(%s)"
+        params.append(list(instrument_ids))
+
+    if min_period_end:
+        query += " AND period_end >= %s"
+        params.append(min_period_end)
+
+    query += " ORDER BY instrument_id, metric_name, period_end"
+
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+
+    columns = [desc[0] for desc in cursor.description]
+    return pd.DataFrame(cursor.fetchall(), columns=columns)
+
+
+def delete_fundamentals_except(conn, metric_names: List[str], data_source: str = None) -> int:
+    """
+    删除不在 metric_names 中的指标（清理历史上全量入库的原始 SEC tag）
+    """
+    query = "DELETE FROM fundamental_data WHERE NOT (metric_name = ANY(%s))"
+    params = [list(metric_names)]
+
+    if data_source:
+        query += " AND data_source = %s"
+        params.append(data_source)
+
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    deleted = cursor.rowcount
+    log.warning(f"[⚠] 删除未映射的基本面指标: {deleted} 行")
+    return deleted
+
+
 def delete_fundamentals(conn, instrument_id: int, metric_name: str = None):
     """删除基本面数据"""
     query = "DELETE FROM fundamental_data WHERE instrument_id = %s"
@@ -0,0 +1,84 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+instrument_tradable_history 读取
+
+写入只发生在 update_tradable_universe 的差量更新语句里（与 instruments 更新同一条 SQL）。
+"""
+from typing import List, Optional
+
+import pandas as pd
+
+from utils.logger import get_logger
+
+log = get_logger("rw_instrument_tradable_history")
+
+
+def get_tradable_changes(
+    conn,
+    *,
+    instrument_id: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> pd.DataFrame:
+    """可交易状态变更记录（按 asof_date, instrument_id 排序）"""
+    query = """
+        SELECT instrument_id, asof_date, is_tradable, last_price, dv_log, changed_at
+        FROM instrument_tradable_history
+        WHERE 1=1
+    """
+    params: List = []
+
+    if instrument_id is not None:
+        query += " AND instrument_id = %s"
+        params.append(instrument_id)
+
+    if start_date is not None:
+        query += " AND asof_date >= %s"
+        params.append(start_date)
+
+    if end_date is not None:
+        query += " AND asof_date <= %s"
+        params.append(end_date)
+
+    query += " ORDER BY asof_date, instrument_id, history_id"
+
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    cols = [d[0] for d in cursor.description]
+    return pd.DataFrame(cursor.fetchall(), columns=cols)
+
+
+def get_tradable_ids_asof(conn, date: str) -> List[int]:
+    """
+    回放某日的可交易池：每个标的取 asof_date <= date 的最后一条变更
+
+    只覆盖有变更记录以来的日期（历史表启用之前的状态无法回放）。
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT instrument_id
+        FROM (
+            SELECT DISTINCT ON (instrument_id) instrument_id, is_tradable
+            FROM instrument_tradable_history
+            WHERE asof_date <= %s
+            ORDER BY instrument_id, asof_date DESC, history_id DESC
+        ) t
+        WHERE is_tradable
+        ORDER BY instrument_id
+        """,
+        (date,),
+    )
+    return [row[0] for row in cursor.fetchall()]
@@ -11,8 +11,9 @@
 # Unauthorized copying, modification, distribution, or use of this file,
 # via any medium, is strictly prohibited without prior written consent.
 # =============================================================================
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
 import pandas as pd
+from database.utils.stream_utils import DEFAULT_CHUNKSIZE, iter_query
 from utils.logger import get_logger
 
 log = get_logger("rw_instruments")
@@ -178,10 +179,7 @@ def get_instrument_by_id(conn, instrument_id: int) -> Optional[Dict]:
     }
 
 
-def get_all_instruments(
-    conn, asset_type: str = None, is_tradable: bool = None
-) -> pd.DataFrame:
-    """获取所有资产"""
+def _all_instruments_query(asset_type: str = None, is_tradable: bool = None):
     query = "SELECT * FROM instruments WHERE 1=1"
     params = []
 
@@ -194,6 +192,14 @@ def get_all_instruments(
         params.append(is_tradable)
 
     query += " ORDER BY ticker"
+    return query, params
+
+
+def get_all_instruments(
+    conn, asset_type: str = None, is_tradable: bool = None
+) -> pd.DataFrame:
+    """获取所有资产"""
+    query, params = _all_instruments_query(asset_type, is_tradable)
 
     cursor = conn.cursor()
     cursor.execute(query, params)
@@ -202,6 +208,17 @@ def get_all_instruments(
     return pd.DataFrame(cursor.fetchall(), columns=columns)
 
 
+def iter_all_instruments(
+    conn,
+    asset_type: str = None,
+    is_tradable: bool = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[pd.DataFrame]:
+    """流式版 get_all_instruments（服务端游标分块 yield，按 ticker 排序）"""
+    query, params = _all_instruments_query(asset_type, is_tradable)
+    yield from iter_query(conn, query, params, chunksize=chunksize, name="instruments")
+
+
 def update_instrument_tradable(conn, instrument_id: int, is_tradable: bool):
     """更新资产可交易状态"""
     cursor = conn.cursor()
@@ -287,3 +304,19 @@ def get_tradable_tickers(conn) -> List[str]:
         """
     )
     return [row[0] for row in cursor.fetchall()]
+
+
+def get_delisted_instrument_ids(conn) -> List[int]:
+    """
+    已退市标的的 instrument_id 列表（status = 'delisted' 或有 delist_date）
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT instrument_id
+        FROM instruments
+        WHERE status = 'delisted' OR delist_date IS NOT NULL
+        ORDER BY instrument_id
+        """
+    )
+    return [row[0] for row in cursor.fetchall()]
@@ -0,0 +1,301 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+latest_prices / latest_factor_values 的维护与读取
+
+维护方式（都在调用方的事务内，与明细表写入同时提交或回滚）：
+- 单条 / 逐行写入：writer 用 `WITH ins AS (INSERT ... RETURNING ...)` + 本模块的
+  LATEST_*_FROM_INS 片段，一条语句同时写明细表和快照表
+- 批量因子写入：按 (instrument_id, factor_name, factor_version) 取批内最新日期，
+  一次 unnest 数组 upsert（历史回填时快照表只写一次，而不是每行一次）
+- 删除：按受影响的 key 从明细表重新计算
+
+快照表只在新行日期 >= 现有日期时才更新，回填历史不会覆盖更新的数据。
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from utils.logger import get_logger
+
+log = get_logger("rw_latest_snapshots")
+
+LATEST_PRICE_COLUMNS = (
+    "instrument_id", "date",
+    "open_price", "high_price", "low_price", "close_price", "volume",
+    "adj_open", "adj_high", "adj_low", "adj_close", "adj_volume",
+    "dividends", "stock_splits", "data_source",
+)
+
+_PRICE_COLS = ", ".join(LATEST_PRICE_COLUMNS)
+_PRICE_SET = ",\n            ".join(f"{c} = EXCLUDED.{c}" for c in LATEST_PRICE_COLUMNS[1:])
+
+# writer 的 INSERT INTO market_prices ... 需要 RETURNING {LATEST_PRICES_RETURNING}
+LATEST_PRICES_RETURNING = _PRICE_COLS
+
+LATEST_PRICES_FROM_INS = f"""
+        INSERT INTO latest_prices ({_PRICE_COLS}, updated_at)
+        SELECT {_PRICE_COLS}, now() FROM ins
+        ON CONFLICT (instrument_id) DO UPDATE SET
+            {_PRICE_SET},
+            updated_at = now()
+        WHERE latest_prices.date <= EXCLUDED.date
+"""
+
+LATEST_FACTOR_VALUES_RETURNING = "instrument_id, factor_name, factor_version, date, factor_value"
+
+LATEST_FACTOR_VALUES_FROM_INS = """
+        INSERT INTO latest_factor_values (instrument_id, factor_name, factor_version, date, factor_value, updated_at)
+        SELECT instrument_id, factor_name, factor_version, date, factor_value, now() FROM ins
+        ON CONFLICT (instrument_id, factor_name, factor_version) DO UPDATE SET
+            date = EXCLUDED.date,
+            factor_value = EXCLUDED.factor_value,
+            updated_at = now()
+        WHERE latest_factor_values.date <= EXCLUDED.date
+"""
+
+
+def _iso(d) -> Optional[str]:
+    if d is None:
+        return None
+    return d.isoformat() if hasattr(d, "isoformat") else str(d)
+
+
+# -----------------------------------------------------------------------------
+# Maintain
+# -----------------------------------------------------------------------------
+def latest_factor_values_upsert(rows: Iterable[Dict[str, Any]]) -> Optional[Tuple[str, tuple]]:
+    """
+    批量因子写入对应的快照 upsert：每个 key 只保留批内最新日期，返回 (sql, params)；无行时返回 None
+
+    rows 需包含 instrument_id / date / factor_name / factor_value / factor_version。
+    """
+    latest: Dict[Tuple[int, str, str], Tuple[Any, Any]] = {}
+    for r in rows:
+        key = (int(r["instrument_id"]), r["factor_name"], r.get("factor_version", "v1"))
+        d = _iso(r["date"])
+        cur = latest.get(key)
+        if cur is None or d >= cur[0]:
+            latest[key] = (d, r["factor_value"])
+
+    if not latest:
+        return None
+
+    keys = list(latest)
+    return (
+        """
+        WITH ins AS (
+            SELECT * FROM unnest(%s::bigint[], %s::text[], %s::text[], %s::date[], %s::numeric[])
+                AS t(instrument_id, factor_name, factor_version, date, factor_value)
+        )
+        """
+        + LATEST_FACTOR_VALUES_FROM_INS,
+        (
+            [k[0] for k in keys],
+            [k[1] for k in keys],
+            [k[2] for k in keys],
+            [latest[k][0] for k in keys],
+            [latest[k][1] for k in keys],
+        ),
+    )
+
+
+def upsert_latest_factor_values(conn, rows: Iterable[Dict[str, Any]]) -> int:
+    """批量因子写入后调用：一条语句 upsert 快照表，返回写入的 key 数"""
+    stmt = latest_factor_values_upsert(rows)
+    if stmt is None:
+        return 0
+
+    cursor = conn.cursor()
+    cursor.execute(*stmt)
+    return len(stmt[1][0])
+
+
+def refresh_latest_prices(conn, instrument_ids: Iterable[int]) -> int:
+    """
+    从 market_prices 重新计算这些标的的快照（删除 / 批量改写复权列后调用）
+
+    每个标的走主键 (instrument_id, date) 倒序取 1 行；已无价格的标的从快照表删除。
+    """
+    ids = sorted({int(i) for i in instrument_ids})
+    if not ids:
+        return 0
+
+    cursor = conn.cursor()
+    cursor.execute(
+        f"""
+        INSERT INTO latest_prices ({_PRICE_COLS}, updated_at)
+        SELECT {", ".join(f"p.{c}" for c in LATEST_PRICE_COLUMNS)}, now()
+        FROM unnest(%s::bigint[]) AS u(instrument_id)
+        CROSS JOIN LATERAL (
+            SELECT * FROM market_prices m
+            WHERE m.instrument_id = u.instrument_id
+            ORDER BY m.date DESC
+            LIMIT 1
+        ) p
+        ON CONFLICT (instrument_id) DO UPDATE SET
+            {_PRICE_SET},
+            updated_at = now()
+        """,
+        (ids,),
+    )
+    cursor.execute(
+        """
+        DELETE FROM latest_prices l
+        WHERE l.instrument_id = ANY(%s)
+          AND NOT EXISTS (SELECT 1 FROM market_prices m WHERE m.instrument_id = l.instrument_id)
+        """,
+        (ids,),
+    )
+    return len(ids)
+
+
+def rebuild_latest_prices(conn) -> int:
+    """全量重建 latest_prices（首次建表 / 手工修数后使用）"""
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM latest_prices")
+    cursor.execute(
+        f"""
+        INSERT INTO latest_prices ({_PRICE_COLS}, updated_at)
+        SELECT DISTINCT ON (instrument_id) {_PRICE_COLS}, now()
+        FROM market_prices
+        ORDER BY instrument_id, date DESC
+        """
+    )
+    n = cursor.rowcount
+    log.info(f"[rw_latest_snapshots] rebuilt latest_prices: {n} rows")
+    return n
+
+
+def rebuild_latest_factor_values(
+    conn,
+    *,
+    factor_name: Optional[str] = None,
+    factor_version: Optional[str] = None,
+) -> int:
+    """重建 latest_factor_values（可限定因子 / 版本；delete_factor_values 后调用）"""
+    where = "WHERE 1=1"
+    params: List[Any] = []
+    if factor_name is not None:
+        where += " AND factor_name = %s"
+        params.append(factor_name)
+    if factor_version is not None:
+        where += " AND factor_version = %s"
+        params.append(factor_version)
+
+    cursor = conn.cursor()
+    cursor.execute(f"DELETE FROM latest_factor_values {where}", params)
+    cursor.execute(
+        f"""
+        INSERT INTO latest_factor_values (instrument_id, factor_name, factor_version, date, factor_value, updated_at)
+        SELECT DISTINCT ON (instrument_id, factor_name, factor_version)
+               instrument_id, factor_name, factor_version, date, factor_value, now()
+        FROM factor_values
+        {where}
+        ORDER BY instrument_id, factor_name, factor_version, date DESC
+        """,
+        params,
+    )
+    n = cursor.rowcount
+    log.info(
+        f"[rw_latest_snapshots] rebuilt latest_factor_values "
+        f"(factor_name={factor_name}, version={factor_version}): {n} rows"
+    )
+    return n
+
+
+def backfill_latest_snapshots(conn) -> Dict[str, int]:
+    """快照表为空而明细表有数据时回填（create_all_tables 调用；已有数据的库升级时生效）"""
+    cursor = conn.cursor()
+    done = {}
+    for snapshot, source, rebuild in (
+        ("latest_prices", "market_prices", rebuild_latest_prices),
+        ("latest_factor_values", "factor_values", rebuild_latest_factor_values),
+    ):
+        cursor.execute(
+            f"SELECT NOT EXISTS (SELECT 1 FROM {snapshot}) AND EXISTS (SELECT 1 FROM {source})"
+        )
+        if cursor.fetchone()[0]:
+            done[snapshot] = rebuild(conn)
+    return done
+
+
+# -----------------------------------------------------------------------------
+# Query
+# -----------------------------------------------------------------------------
+def get_latest_prices(conn, instrument_ids: Optional[Sequence[int]] = None) -> pd.DataFrame:
+    """每个标的最新一行价格（可限定 instrument_ids）"""
+    query = f"SELECT {_PRICE_COLS} FROM latest_prices"
+    params: List[Any] = []
+    if instrument_ids is not None:
+        query += " WHERE instrument_id = ANY(%s)"
+        params.append(list(instrument_ids))
+
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    return pd.DataFrame(cursor.fetchall(), columns=list(LATEST_PRICE_COLUMNS))
+
+
+def get_latest_factor_values(
+    conn,
+    factor_names: Optional[Sequence[str]] = None,
+    factor_version: str = "v1",
+    date: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    每个 (标的, 因子) 最新的因子值，长表 [instrument_id, date, factor_name, factor_value]
+
+    date 给定时只返回最新日期恰为 date 的行（截面快照）。
+    """
+    query = """
+        SELECT instrument_id, date, factor_name, factor_value
+        FROM latest_factor_values
+        WHERE factor_version = %s
+    """
+    params: List[Any] = [factor_version]
+    if factor_names is not None:
+        query += " AND factor_name = ANY(%s)"
+        params.append(list(factor_names))
+    if date is not None:
+        query += " AND date = %s"
+        params.append(date)
+
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    return pd.DataFrame(cursor.fetchall(), columns=["instrument_id", "date", "factor_name", "factor_value"])
+
+
+def get_latest_factor_date(conn, factor_version: str = "v1") -> Optional[str]:
+    """快照表中的最新因子日期（等价于 factor_values 的 MAX(date)，但只扫小表）"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT MAX(date) FROM latest_factor_values WHERE factor_version = %s", (factor_version,))
+    row = cursor.fetchone()
+    return _iso(row[0]) if row else None
+
+
+def get_latest_price_date(conn) -> Optional[str]:
+    cursor = conn.cursor()
+    cursor.execute("SELECT MAX(date) FROM latest_prices")
+    row = cursor.fetchone()
+    return _iso(row[0]) if row else None
+
+
+def list_factor_names(conn, factor_version: str = "v1") -> List[str]:
+    """库中已有的因子名（快照表每个因子只有 N 行，比 DISTINCT factor_values 便宜得多）"""
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT DISTINCT factor_name FROM latest_factor_values WHERE factor_version = %s ORDER BY factor_name",
+        (factor_version,),
+    )
+    return [r[0] for r in cursor.fetchall()]
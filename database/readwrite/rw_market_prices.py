@@ -11,13 +11,28 @@
 # Unauthorized copying, modification, distribution, or use of this file,
 # via any medium, is strictly prohibited without prior written consent.
 # =============================================================================
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional, Sequence
 import pandas as pd
 from datetime import date
+from database.readwrite.rw_latest_snapshots import (
+    LATEST_PRICES_FROM_INS,
+    LATEST_PRICES_RETURNING,
+    refresh_latest_prices,
+)
+from database.schema.partitions import ensure_partitions_for_dates
+from database.utils.binary_copy import copy_to_numpy, select_expr
+from database.utils.stream_utils import DEFAULT_CHUNKSIZE, iter_query
 from utils.logger import get_logger
 
 log = get_logger("rw_market_prices")
 
+# load_price_panel 可读取的数值列（全部以 float64 返回）
+PRICE_FIELDS = (
+    "open_price", "high_price", "low_price", "close_price", "volume",
+    "adj_open", "adj_high", "adj_low", "adj_close", "adj_volume",
+    "dividends", "stock_splits",
+)
+
 
 def insert_price(
     conn,
@@ -37,10 +52,11 @@ def insert_price(
     stock_splits: float = 1,
     data_source: str = "tiingo",
 ):
-    """插入单条价格数据"""
+    """插入单条价格数据（同一语句内更新 latest_prices）"""
     cursor = conn.cursor()
     cursor.execute(
         """
+        WITH ins AS (
         INSERT INTO market_prices (
             instrument_id, date, open_price, high_price, low_price, close_price, volume,
             adj_open, adj_high, adj_low, adj_close, adj_volume, dividends, stock_splits, data_source
@@ -60,7 +76,10 @@ def insert_price(
             dividends = EXCLUDED.dividends,
             stock_splits = EXCLUDED.stock_splits,
             ingested_at = now()
-    """,
+        RETURNING """
+        + LATEST_PRICES_RETURNING
+        + ")"
+        + LATEST_PRICES_FROM_INS,
         (
             instrument_id,
             date,
@@ -81,13 +100,10 @@ def insert_price(
     )
 
 
-def batch_insert_prices(conn, prices: List[Dict]):
-    """批量插入价格数据"""
-    cursor = conn.cursor()
-
-    for price in prices:
-        cursor.execute(
-            """
+# batch_insert_prices / rw_async.abatch_insert_prices 共用
+_BATCH_INSERT_PRICE_SQL = (
+    """
+            WITH ins AS (
             INSERT INTO market_prices (
                 instrument_id, date, open_price, high_price, low_price, close_price, volume,
                 adj_open, adj_high, adj_low, adj_close, adj_volume, dividends, stock_splits, data_source
@@ -98,33 +114,48 @@ def batch_insert_prices(conn, prices: List[Dict]):
                 adj_close = EXCLUDED.adj_close,
                 volume = EXCLUDED.volume,
                 ingested_at = now()
-        """,
-            (
-                price["instrument_id"],
-                price["date"],
-                price.get("open_price"),
-                price.get("high_price"),
-                price.get("low_price"),
-                price["close_price"],
-                price.get("volume"),
-                price.get("adj_open"),
-                price.get("adj_high"),
-                price.get("adj_low"),
-                price["adj_close"],
-                price.get("adj_volume"),
-                price.get("dividends", 0),
-                price.get("stock_splits", 1),
-                price.get("data_source", "tiingo"),
-            ),
-        )
+            RETURNING """
+    + LATEST_PRICES_RETURNING
+    + ")"
+    + LATEST_PRICES_FROM_INS
+)
+
+
+def _batch_price_params(price: Dict) -> tuple:
+    return (
+        price["instrument_id"],
+        price["date"],
+        price.get("open_price"),
+        price.get("high_price"),
+        price.get("low_price"),
+        price["close_price"],
+        price.get("volume"),
+        price.get("adj_open"),
+        price.get("adj_high"),
+        price.get("adj_low"),
+        price["adj_close"],
+        price.get("adj_volume"),
+        price.get("dividends", 0),
+        price.get("stock_splits", 1),
+        price.get("data_source", "tiingo"),
+    )
+
+
+def batch_insert_prices(conn, prices: List[Dict]):
+    """批量插入价格数据（每行同一语句内更新 latest_prices）"""
+    # 分区表：先补建本批日期涉及的分区（未开启分区时不做任何事）
+    ensure_partitions_for_dates(conn, "market_prices", {p["date"] for p in prices})
+
+    cursor = conn.cursor()
+
+    for price in prices:
+        cursor.execute(_BATCH_INSERT_PRICE_SQL, _batch_price_params(price))
 
     log.info(f"[✔] 批量插入 {len(prices)} 条价格数据")
 
 
-def get_prices(
-    conn, instrument_id: int, start_date: str = None, end_date: str = None
-) -> pd.DataFrame:
-    """获取价格数据"""
+def _prices_query(instrument_id: int, start_date: str = None, end_date: str = None):
+    """get_prices / rw_async.aget_prices 共用的 SQL 构造"""
     query = "SELECT * FROM market_prices WHERE instrument_id = %s"
     params = [instrument_id]
 
@@ -137,6 +168,14 @@ def get_prices(
         params.append(end_date)
 
     query += " ORDER BY date"
+    return query, params
+
+
+def get_prices(
+    conn, instrument_id: int, start_date: str = None, end_date: str = None
+) -> pd.DataFrame:
+    """获取价格数据"""
+    query, params = _prices_query(instrument_id, start_date, end_date)
 
     cursor = conn.cursor()
     cursor.execute(query, params)
@@ -145,15 +184,135 @@ def get_prices(
     return pd.DataFrame(cursor.fetchall(), columns=columns)
 
 
+def iter_prices(
+    conn,
+    *,
+    instrument_ids: Optional[List[int]] = None,
+    start_date: str = None,
+    end_date: str = None,
+    columns: Optional[Sequence[str]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[pd.DataFrame]:
+    """
+    流式读取价格：服务端游标，每次 yield 至多 chunksize 行
+
+    - instrument_ids=None 表示全部标的
+    - columns=None 表示 SELECT *；否则只取 instrument_id, date + 指定列（须在 PRICE_FIELDS 中）
+    - 按主键顺序 (instrument_id, date) 返回，同一标的的行连续出现（可能跨 chunk）
+    """
+    if columns is None:
+        select = "*"
+    else:
+        fields = [c for c in columns if c not in ("instrument_id", "date")]
+        unknown = [f for f in fields if f not in PRICE_FIELDS]
+        if unknown:
+            raise ValueError(f"unknown price fields: {unknown}")
+        select = ", ".join(["instrument_id", "date", *fields])
+
+    query = f"SELECT {select} FROM market_prices WHERE 1=1"
+    params: List = []
+
+    if instrument_ids is not None:
+        if len(instrument_ids) == 0:
+            raise ValueError("instrument_ids cannot be empty")
+        query += " AND instrument_id = ANY(%s)"
+        params.append(list(instrument_ids))
+
+    if start_date:
+        query += " AND date >= %s"
+        params.append(start_date)
+
+    if end_date:
+        query += " AND date <= %s"
+        params.append(end_date)
+
+    query += " ORDER BY instrument_id, date"
+
+    yield from iter_query(conn, query, params, chunksize=chunksize, name="market_prices")
+
+
+def get_price_panel(
+    conn,
+    start_date: str = None,
+    end_date: str = None,
+    instrument_ids: List[int] = None,
+    columns: List[str] = ("close_price", "stock_splits"),
+) -> pd.DataFrame:
+    """
+    批量读取多个 instrument 的价格面板（长表：instrument_id, date, columns...）
+    """
+    cols = ", ".join(["instrument_id", "date", *columns])
+    query = f"SELECT {cols} FROM market_prices WHERE 1=1"
+    params = []
+
+    if start_date:
+        query += " AND date >= %s"
+        params.append(start_date)
+
+    if end_date:
+        query += " AND date <= %s"
+        params.append(end_date)
+
+    if instrument_ids is not None:
+        query += " AND instrument_id = ANY(%s)"
+        params.append(list(instrument_ids))
+
+    query += " ORDER BY instrument_id, date"
+
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+
+    names = [desc[0] for desc in cursor.description]
+    return pd.DataFrame(cursor.fetchall(), columns=names)
+
+
+def load_price_panel(
+    conn,
+    fields: Sequence[str] = ("adj_close",),
+    start_date: str = None,
+    end_date: str = None,
+    instrument_ids: Optional[List[int]] = None,
+) -> pd.DataFrame:
+    """
+    价格面板快速读取（二进制 COPY 直接解码为 NumPy 列）
+
+    返回长表 instrument_id(int64), date(datetime64[ns]), fields...(float64，NULL 为 NaN)，
+    按 (instrument_id, date) 排序。与 get_price_panel 相比不经过 Decimal / tuple。
+    """
+    fields = list(fields)
+    unknown = [f for f in fields if f not in PRICE_FIELDS]
+    if unknown:
+        raise ValueError(f"unknown price fields: {unknown}")
+
+    spec = [("instrument_id", "int8"), ("date", "date"), *[(f, "float8") for f in fields]]
+    select = ", ".join(select_expr(name, kind, name) for name, kind in spec)
+    query = f"SELECT {select} FROM market_prices WHERE 1=1"
+    params: List = []
+
+    if start_date:
+        query += " AND date >= %s"
+        params.append(start_date)
+
+    if end_date:
+        query += " AND date <= %s"
+        params.append(end_date)
+
+    if instrument_ids is not None:
+        query += " AND instrument_id = ANY(%s)"
+        params.append(list(instrument_ids))
+
+    query += " ORDER BY instrument_id, date"
+
+    return pd.DataFrame(copy_to_numpy(conn, query, params, spec))
+
+
 def get_latest_price(conn, instrument_id: int) -> Optional[Dict]:
-    """获取最新价格"""
+    """获取最新价格（读 latest_prices 快照，单行主键查找）"""
     cursor = conn.cursor()
     cursor.execute(
         """
-        SELECT * FROM market_prices
+        SELECT * FROM latest_prices
         WHERE instrument_id = %s
-        ORDER BY date DESC
-        LIMIT 1
     """,
         (instrument_id,),
     )
@@ -185,6 +344,14 @@ def get_price_on_date(conn, instrument_id: int, date: str) -> Optional[Dict]:
     return dict(zip(columns, row))
 
 
+_PRICES_ON_DATE_SQL = """
+        SELECT instrument_id, adj_close
+        FROM market_prices
+        WHERE instrument_id = ANY(%s)
+          AND date = %s
+"""
+
+
 def get_prices_on_date(conn, instrument_ids: List[int], date: str, strict: bool = False) -> Dict[int, float]:
     """
     批量获取指定日期的 adj_close
@@ -196,25 +363,17 @@ def get_prices_on_date(conn, instrument_ids: List[int], date: str, strict: bool
         True: 所有标的必须有价格，否则抛出异常
         False: 返回有价格的标的，缺失的会在日志中警告
     """
-    from utils.logger import get_logger
-    log = get_logger("rw_market_prices")
-
     if not instrument_ids:
         return {}
 
     cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT instrument_id, adj_close
-        FROM market_prices
-        WHERE instrument_id = ANY(%s)
-          AND date = %s
-    """,
-        (instrument_ids, date),
-    )
+    cursor.execute(_PRICES_ON_DATE_SQL, (instrument_ids, date))
+
+    return _price_map(cursor.fetchall(), instrument_ids, date, strict)
 
-    rows = cursor.fetchall()
 
+def _price_map(rows, instrument_ids: List[int], date: str, strict: bool) -> Dict[int, float]:
+    """get_prices_on_date / rw_async.aget_prices_on_date 共用：行 -> {id: adj_close}，并检查缺失"""
     price_map = {row[0]: float(row[1]) for row in rows}
 
     missing_ids = set(instrument_ids) - set(price_map.keys())
@@ -236,7 +395,7 @@ def get_prices_on_date(conn, instrument_ids: List[int], date: str, strict: bool
 def delete_prices(
     conn, instrument_id: int, start_date: str = None, end_date: str = None
 ):
-    """删除价格数据"""
+    """删除价格数据（随后从剩余行重算该标的的 latest_prices）"""
     query = "DELETE FROM market_prices WHERE instrument_id = %s"
     params = [instrument_id]
 
@@ -250,6 +409,7 @@ def delete_prices(
 
     cursor = conn.cursor()
     cursor.execute(query, params)
+    refresh_latest_prices(conn, [instrument_id])
     log.warning(f"[⚠] 删除价格数据: instrument_id={instrument_id}")
 
 
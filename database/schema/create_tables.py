@@ -11,16 +11,43 @@
 # Unauthorized copying, modification, distribution, or use of this file,
 # via any medium, is strictly prohibited without prior written consent.
 # =============================================================================
+from utils.config_loader import get_config_value_as_date
 from utils.logger import get_logger
 from database.utils.db_utils import get_db_connection
+from database.readwrite.rw_latest_snapshots import backfill_latest_snapshots
+from database.schema.partitions import ensure_default_partitions, partitioning_enabled
 from database.schema.tables.corporate_actions import (
     create_corporate_actions_indexes,
     create_corporate_actions_table,
 )
+from database.schema.tables.factor_ic import (
+    create_factor_ic_indexes,
+    create_factor_ic_table,
+)
+from database.schema.tables.factor_monitor import (
+    create_factor_monitor_indexes,
+    create_factor_monitor_table,
+)
+from database.schema.tables.forward_returns import (
+    create_forward_returns_indexes,
+    create_forward_returns_table,
+)
 from database.schema.tables.factor_values import (
     create_factor_values_indexes,
     create_factor_values_table,
 )
+from database.schema.tables.latest_factor_values import (
+    create_latest_factor_values_indexes,
+    create_latest_factor_values_table,
+)
+from database.schema.tables.latest_prices import (
+    create_latest_prices_indexes,
+    create_latest_prices_table,
+)
+from database.schema.tables.instrument_tradable_history import (
+    create_instrument_tradable_history_indexes,
+    create_instrument_tradable_history_table,
+)
 from database.schema.tables.instruments import (
     create_instruments_table,
     create_instruments_indexes,
@@ -37,6 +64,10 @@ from database.schema.tables.fundamental_data import (
     create_fundamental_data_table,
     create_fundamental_data_indexes,
 )
+from database.schema.tables.fundamental_daily import (
+    create_fundamental_daily_table,
+    create_fundamental_daily_indexes,
+)
 from database.schema.tables.trading_calendar import (
     create_trading_calendar_table,
     create_trading_calendar_indexes,
@@ -61,25 +92,44 @@ from database.schema.tables.data_update_logs import (
 log = get_logger("database")
 
 
-def create_all_tables(conn, if_exists="skip"):
+def create_all_tables(conn, if_exists="skip", partitioned: bool = None):
     """
     创建所有数据库表
 
     Args:
         conn: 数据库连接
         if_exists: 表已存在时的处理方式 ('skip'=跳过, 'drop'=删除重建)
+        partitioned: market_prices / factor_values 是否按 date 分区
+                     （None = 读取 config database.partitioning.enabled）
     """
+    if partitioned is None:
+        partitioned = partitioning_enabled()
+
     create_instruments_table(conn, if_exists)
     create_instrument_identifiers_table(conn, if_exists)
-    create_market_prices_table(conn, if_exists)
+    create_instrument_tradable_history_table(conn, if_exists)
+    create_market_prices_table(conn, if_exists, partitioned=partitioned)
     create_fundamental_data_table(conn, if_exists)
+    create_fundamental_daily_table(conn, if_exists)
     create_trading_calendar_table(conn, if_exists)
     create_fills_table(conn, if_exists)
     create_positions_table(conn, if_exists)
     create_system_state_table(conn, if_exists)
     create_data_update_logs_table(conn, if_exists)
     create_corporate_actions_table(conn, if_exists)
-    create_factor_values_table(conn, if_exists)
+    create_factor_values_table(conn, if_exists, partitioned=partitioned)
+    create_latest_prices_table(conn, if_exists)
+    create_latest_factor_values_table(conn, if_exists)
+    create_factor_ic_table(conn, if_exists)
+    create_forward_returns_table(conn, if_exists)
+    create_factor_monitor_table(conn, if_exists)
+
+    if partitioned:
+        # 从数据起始日建到未来若干周期；之后写入时按需补建
+        ensure_default_partitions(conn, get_config_value_as_date("data.default_start_date", "2005-01-01"))
+
+    # 已有历史数据的库第一次建快照表时回填
+    backfill_latest_snapshots(conn)
 
     print("\n✅ 所有表创建完毕")
 
@@ -89,15 +139,22 @@ def create_indexes(conn):
 
     create_instruments_indexes(conn)
     create_instrument_identifiers_indexes(conn)
+    create_instrument_tradable_history_indexes(conn)
     create_market_prices_indexes(conn)
     create_fundamental_data_indexes(conn)
-    create_universe_definitions_indexes(conn)
-    create_universe_snapshots_indexes(conn)
-    create_universe_members_indexes(conn)
+    create_fundamental_daily_indexes(conn)
+    create_trading_calendar_indexes(conn)
+    create_fills_indexes(conn)
+    create_positions_indexes(conn)
     create_system_state_indexes(conn)
     create_data_update_logs_indexes(conn)
     create_corporate_actions_indexes(conn)
     create_factor_values_indexes(conn)
+    create_latest_prices_indexes(conn)
+    create_latest_factor_values_indexes(conn)
+    create_factor_ic_indexes(conn)
+    create_forward_returns_indexes(conn)
+    create_factor_monitor_indexes(conn)
 
     print("✅ 所有索引创建完毕")
 
@@ -0,0 +1,410 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+日常读路径的 EXPLAIN 审计
+
+对每日必跑的截面读取（因子快照 / 因子面板 / 当日价格 / 最新因子日期 ...）真正调用一次
+RW 函数，用代理连接截获它发出的 SQL（包括 COPY (...) TO STDOUT 内层查询），
+再以相同参数执行 EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)，汇总：
+- 扫描节点类型（Index Only Scan / Index Scan / Seq Scan / Bitmap Heap Scan）
+- Heap Fetches（Index Only Scan 仍需回表的行数；可见性图过旧时会很高，先 VACUUM）
+- shared hit / read buffers、执行耗时
+
+用法（项目根目录）：
+    python -m database.schema.explain_audit --date 2026-01-30
+    python -m database.schema.explain_audit --json
+    python -m database.schema.explain_audit --seed           # 本地空库：生成合成数据后再审计
+
+标记为 expect_index_only 的读路径如果计划里出现回表扫描，进程以非零状态退出，
+方便在改索引 / 改查询后回归检查。
+"""
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from utils.logger import get_logger
+
+log = get_logger("database")
+
+_COPY_RE = re.compile(r"^\s*COPY\s*\((?P<query>.*)\)\s*TO\s+STDOUT", re.IGNORECASE | re.DOTALL)
+
+# 会读取 heap 的扫描节点
+HEAP_SCAN_NODES = ("Seq Scan", "Index Scan", "Bitmap Heap Scan", "Tid Scan")
+INDEX_ONLY_NODE = "Index Only Scan"
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 截获 SQL 的代理连接
+# ----------------------------------------------------------------------------------------------------------------------------------------
+class _RecordingCursor:
+    """转发给真实 cursor；SELECT / COPY 在执行前先 EXPLAIN 一次并记录计划"""
+
+    def __init__(self, conn: "RecordingConnection", cursor):
+        self._conn = conn
+        self._cursor = cursor
+
+    def execute(self, query, params=None, *args, **kwargs):
+        if str(query).lstrip().upper().startswith(("SELECT", "WITH")):
+            self._conn.explain(str(query), params)
+        return self._cursor.execute(query, params, *args, **kwargs)
+
+    def copy(self, statement, params=None, *args, **kwargs):
+        m = _COPY_RE.match(str(statement))
+        if m:
+            self._conn.explain(m.group("query"), params)
+        return self._cursor.copy(statement, params, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+
+class RecordingConnection:
+    """包一层真实连接，记录经过它的每条读查询的执行计划"""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.plans: List[Dict[str, Any]] = []
+
+    def cursor(self, *args, **kwargs):
+        # 命名（服务端）cursor 不支持 EXPLAIN 前置执行，直接透传
+        if args or kwargs.get("name"):
+            return self._conn.cursor(*args, **kwargs)
+        return _RecordingCursor(self, self._conn.cursor())
+
+    def explain(self, query: str, params=None):
+        cur = self._conn.cursor()
+        try:
+            cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", params)
+            raw = cur.fetchone()[0]
+        finally:
+            cur.close()
+        plan = json.loads(raw) if isinstance(raw, (str, bytes)) else raw
+        self.plans.append({"query": " ".join(query.split()), "plan": plan[0]})
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 计划汇总
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def _walk(node: Dict[str, Any]):
+    yield node
+    for child in node.get("Plans", []) or []:
+        yield from _walk(child)
+
+
+def summarize_plan(plan: Dict[str, Any], tables: Sequence[str] = ("market_prices", "factor_values")) -> Dict[str, Any]:
+    """
+    汇总一条 EXPLAIN JSON 计划
+
+    只关心 tables 中大表（含其分区）的扫描节点：
+    index_only=True 表示这些表上全部是 Index Only Scan（小表上的 Seq Scan 不算）
+    """
+    root = plan["Plan"]
+    scans = []
+    for node in _walk(root):
+        relation = node.get("Relation Name")
+        if relation is None or not any(relation == t or relation.startswith(f"{t}_") for t in tables):
+            continue
+        scans.append(
+            {
+                "node": node["Node Type"],
+                "relation": relation,
+                "index": node.get("Index Name"),
+                "rows": node.get("Actual Rows"),
+                "heap_fetches": node.get("Heap Fetches", 0),
+            }
+        )
+
+    return {
+        "scans": scans,
+        "index_only": bool(scans) and all(s["node"] == INDEX_ONLY_NODE for s in scans),
+        "heap_fetches": sum(s["heap_fetches"] or 0 for s in scans),
+        "shared_hit": root.get("Shared Hit Blocks", 0),
+        "shared_read": root.get("Shared Read Blocks", 0),
+        "execution_ms": plan.get("Execution Time"),
+        "planning_ms": plan.get("Planning Time"),
+    }
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 审计对象：日常读路径
+# ----------------------------------------------------------------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class ReadPath:
+    name: str
+    run: Callable[[Any, str, List[str]], Any]
+    expect_index_only: bool = True
+    note: str = ""
+
+
+def _briefing_factor_names() -> List[str]:
+    from reports.daily_briefing import _FACTOR_NAMES
+
+    return list(_FACTOR_NAMES)
+
+
+def _read_paths() -> List[ReadPath]:
+    from database.readwrite.rw_factor_values import get_factor_snapshot, get_factor_values, load_factor_panel
+    from database.readwrite.rw_market_prices import get_prices, get_prices_on_date, load_price_panel
+    from engine.signals import fetch_factors_long_for_date
+    from reports.daily_briefing import _get_latest_factor_date
+
+    return [
+        ReadPath(
+            "get_factor_snapshot",
+            lambda conn, d, names: get_factor_snapshot(conn, factor_name=names[0], date=d),
+        ),
+        ReadPath(
+            "get_factor_values(columns=...)",
+            lambda conn, d, names: get_factor_values(
+                conn,
+                factor_names=names,
+                factor_version="v1",
+                date=d,
+                columns=("instrument_id", "date", "factor_name", "factor_value"),
+            ),
+        ),
+        ReadPath(
+            "load_factor_panel",
+            lambda conn, d, names: load_factor_panel(conn, names, start_date=d, end_date=d),
+        ),
+        ReadPath(
+            "fetch_factors_long_for_date",
+            lambda conn, d, names: fetch_factors_long_for_date(conn, asof_date=d, factor_names=names, factor_version="v1"),
+        ),
+        ReadPath(
+            "load_price_panel(briefing)",
+            lambda conn, d, names: load_price_panel(
+                conn,
+                ["adj_close", "adj_volume", "high_price", "low_price", "open_price"],
+                start_date=d,
+                end_date=d,
+            ),
+        ),
+        ReadPath(
+            "get_prices_on_date",
+            lambda conn, d, names: get_prices_on_date(conn, _sample_instruments(conn, d), d),
+        ),
+        ReadPath(
+            "_get_latest_factor_date",
+            lambda conn, d, names: _get_latest_factor_date(conn),
+            expect_index_only=False,
+            note="读 latest_factor_values 快照小表，不再扫 factor_values",
+        ),
+        ReadPath(
+            "get_prices",
+            lambda conn, d, names: get_prices(conn, _sample_instruments(conn, d, 1)[0], end_date=d),
+            expect_index_only=False,
+            note="单标的全历史 SELECT *，走主键 Index Scan 即可",
+        ),
+    ]
+
+
+def _sample_instruments(conn, date: str, limit: int = 500) -> List[int]:
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT instrument_id FROM market_prices WHERE date = %s ORDER BY instrument_id LIMIT %s",
+        (date, limit),
+    )
+    ids = [r[0] for r in cursor.fetchall()]
+    return ids or [0]
+
+
+def audit(conn, date: str, factor_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """逐个调用读路径并汇总计划；返回每个读路径一条结果"""
+    names = factor_names or _briefing_factor_names()
+    results = []
+    for path in _read_paths():
+        rec = RecordingConnection(conn)
+        try:
+            path.run(rec, date, names)
+            error = None
+        except Exception as e:
+            error = str(e)
+            conn.rollback()
+
+        summaries = [dict(summarize_plan(p["plan"]), query=p["query"]) for p in rec.plans]
+        index_only = bool(summaries) and all(s["index_only"] for s in summaries)
+        results.append(
+            {
+                "name": path.name,
+                "expect_index_only": path.expect_index_only,
+                "index_only": index_only,
+                "ok": error is None and (index_only or not path.expect_index_only),
+                "error": error,
+                "note": path.note,
+                "queries": summaries,
+            }
+        )
+    return results
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 合成数据（仅用于本地空库）
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def seed_synthetic(conn, *, n_instruments: int = 500, n_days: int = 260, end_date: str = None, force: bool = False):
+    """
+    用 generate_series 生成合成的 instruments / market_prices / factor_values
+
+    表非空时拒绝执行（除非 force=True），避免污染真实数据。
+    """
+    from datetime import date as _date, timedelta
+
+    from database.readwrite.rw_latest_snapshots import rebuild_latest_factor_values, rebuild_latest_prices
+    from database.schema.partitions import PARTITIONED_TABLES, ensure_partitions, is_partitioned
+
+    end_date = end_date or _date.today().isoformat()
+    end = _date.fromisoformat(end_date)
+    cursor = conn.cursor()
+
+    if not force:
+        for table in ("market_prices", "factor_values"):
+            cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {table})")
+            if cursor.fetchone()[0]:
+                raise RuntimeError(f"{table} is not empty; refusing to seed (use --force)")
+
+    factor_names = _briefing_factor_names()
+    for table in PARTITIONED_TABLES:
+        if is_partitioned(conn, table):
+            ensure_partitions(conn, table, end - timedelta(days=n_days), end)
+
+    cursor.execute(
+        """
+        INSERT INTO instruments (instrument_id, ticker, exchange, asset_type, is_tradable, status)
+        SELECT i, 'SYN' || i, 'SYN', 'Stock', TRUE, 'active'
+        FROM generate_series(1, %s) AS i
+        ON CONFLICT (instrument_id) DO NOTHING
+        """,
+        (n_instruments,),
+    )
+    cursor.execute(
+        """
+        INSERT INTO market_prices (instrument_id, date, open_price, high_price, low_price, close_price,
+                                   adj_close, volume, adj_volume, data_source)
+        SELECT i, d, p, p * 1.01, p * 0.99, p, p, 1000000, 1000000, 'synthetic'
+        FROM (
+            SELECT i, d::date AS d, 10 + random() * 90 AS p
+            FROM generate_series(1, %s) AS i,
+                 generate_series(%s::date - (%s - 1), %s::date, interval '1 day') AS d
+        ) AS x
+        ON CONFLICT DO NOTHING
+        """,
+        (n_instruments, end_date, n_days, end_date),
+    )
+    cursor.execute(
+        """
+        INSERT INTO factor_values (instrument_id, date, factor_name, factor_value, factor_version, data_source)
+        SELECT i, d::date, f, random(), 'v1', 'synthetic'
+        FROM generate_series(1, %s) AS i,
+             generate_series(%s::date - (%s - 1), %s::date, interval '1 day') AS d,
+             unnest(%s::text[]) AS f
+        ON CONFLICT DO NOTHING
+        """,
+        (n_instruments, end_date, n_days, end_date, factor_names),
+    )
+    rebuild_latest_prices(conn)
+    rebuild_latest_factor_values(conn)
+    conn.commit()
+
+    # 建完数据立即 VACUUM ANALYZE：刷新可见性图，否则 Index Only Scan 仍会大量回表
+    autocommit = conn.autocommit
+    conn.autocommit = True
+    try:
+        for table in ("instruments", "market_prices", "factor_values", "latest_prices", "latest_factor_values"):
+            cursor.execute(f"VACUUM (ANALYZE) {table}")
+    finally:
+        conn.autocommit = autocommit
+    log.info(f"[explain_audit] seeded {n_instruments} instruments x {n_days} days")
+    return end_date
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def format_results(results: List[Dict[str, Any]]) -> str:
+    lines = []
+    for r in results:
+        mark = "✅" if r["ok"] else "❌"
+        expect = "index-only" if r["expect_index_only"] else "any"
+        lines.append(f"{mark} {r['name']}  (expect: {expect})")
+        if r["error"]:
+            lines.append(f"    error: {r['error']}")
+        for q in r["queries"]:
+            scans = ", ".join(f"{s['node']} on {s['relation']}" + (f" using {s['index']}" if s["index"] else "") for s in q["scans"])
+            lines.append(
+                f"    {scans or '(no large-table scan)'} | heap_fetches={q['heap_fetches']} "
+                f"hit={q['shared_hit']} read={q['shared_read']} exec={q['execution_ms']}ms"
+            )
+        if r["note"]:
+            lines.append(f"    note: {r['note']}")
+
+    if any(q["heap_fetches"] for r in results for q in r["queries"]):
+        lines.append("")
+        lines.append("注意：Heap Fetches > 0 说明可见性图不是最新，对大表执行 VACUUM (ANALYZE) 后再审计。")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    from database.utils.db_utils import get_db_connection
+
+    parser = argparse.ArgumentParser(description="日常读路径 EXPLAIN 审计")
+    parser.add_argument("--date", default=None, help="审计日期（默认最新 factor_values 日期）")
+    parser.add_argument("--json", action="store_true", help="输出 JSON")
+    parser.add_argument("--seed", action="store_true", help="先写入合成数据（仅限空库）")
+    parser.add_argument("--force", action="store_true", help="配合 --seed：表非空也写入")
+    args = parser.parse_args(argv)
+
+    conn = get_db_connection()
+    try:
+        date = args.date
+        if args.seed:
+            date = seed_synthetic(conn, end_date=date, force=args.force)
+        if date is None:
+            from reports.daily_briefing import _get_latest_factor_date
+
+            date = _get_latest_factor_date(conn)
+        if date is None:
+            print("factor_values 为空，无法审计（可用 --seed 生成合成数据）")
+            return 1
+
+        results = audit(conn, date)
+        conn.rollback()
+    finally:
+        conn.close()
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2, default=str))
+    else:
+        print(f"EXPLAIN audit @ {date}")
+        print(format_results(results))
+
+    return 0 if all(r["ok"] for r in results) else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
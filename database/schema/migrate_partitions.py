@@ -0,0 +1,58 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+把现有 market_prices / factor_values 单表迁移为按 date 分区的表
+
+用法（项目根目录）：
+    python -m database.schema.migrate_partitions                       # 两张表，按年
+    python -m database.schema.migrate_partitions --table factor_values --interval month
+    python -m database.schema.migrate_partitions --drop-legacy         # 迁移后删除 *_legacy
+
+迁移在单个事务中完成，失败整体回滚。迁移后记得把 config.yaml 中
+database.partitioning.enabled 设为 true，写入时才会自动补建新分区。
+"""
+import argparse
+
+from database.schema.partitions import INTERVALS, PARTITIONED_TABLES, list_partitions, migrate_to_partitioned
+from database.utils.db_utils import get_db_connection
+from utils.logger import get_logger
+
+log = get_logger("database")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="迁移 market_prices / factor_values 为分区表")
+    parser.add_argument("--table", choices=PARTITIONED_TABLES, action="append")
+    parser.add_argument("--interval", choices=INTERVALS, default=None)
+    parser.add_argument("--drop-legacy", action="store_true")
+    args = parser.parse_args(argv)
+
+    tables = args.table or list(PARTITIONED_TABLES)
+
+    conn = get_db_connection()
+    try:
+        for table in tables:
+            moved = migrate_to_partitioned(conn, table, interval=args.interval, drop_legacy=args.drop_legacy)
+            print(f"✅ {table}: {moved} rows, partitions={list_partitions(conn, table)}")
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        log.error(f"[✖] 分区迁移失败: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
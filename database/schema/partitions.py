@@ -0,0 +1,308 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+market_prices / factor_values 按 date 范围分区（可选）
+=====================================================
+
+config.yaml:
+    database:
+      partitioning:
+        enabled: false      # true 时 create_tables 建分区父表并自动建分区
+        interval: year      # year | month
+        future_periods: 2   # 额外预建的未来分区数
+
+分区命名：<table>_y2024 / <table>_m2024_06，另有 <table>_default 兜底
+（超出已建分区范围的行落在 default，不会写入失败）。
+
+- 按日期切片的截面查询 / delete_factor_values(start_date, end_date) 由 PostgreSQL
+  分区裁剪只扫描相关分区
+- 写入前 ensure_partitions_for_dates 按需补建分区（进程内缓存，已覆盖的范围不再查库）
+- migrate_to_partitioned 把现有单表迁移为分区表（旧表保留为 <table>_legacy）
+"""
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.config_loader import get_config_value
+from utils.logger import get_logger
+
+log = get_logger("database")
+
+PARTITIONED_TABLES = ("market_prices", "factor_values")
+INTERVALS = ("year", "month")
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 配置
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def partitioning_enabled() -> bool:
+    return bool(get_config_value("database.partitioning.enabled", False))
+
+
+def partition_interval() -> str:
+    interval = get_config_value("database.partitioning.interval", "year")
+    if interval not in INTERVALS:
+        raise ValueError(f"database.partitioning.interval must be one of {INTERVALS}, got {interval!r}")
+    return interval
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 分区边界（纯计算）
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def period_start(d: date, interval: str) -> date:
+    return date(d.year, 1, 1) if interval == "year" else date(d.year, d.month, 1)
+
+
+def next_period(d: date, interval: str) -> date:
+    if interval == "year":
+        return date(d.year + 1, 1, 1)
+    return date(d.year + (d.month == 12), d.month % 12 + 1, 1)
+
+
+def partition_name(table: str, lower: date, interval: str) -> str:
+    if interval == "year":
+        return f"{table}_y{lower.year}"
+    return f"{table}_m{lower.year}_{lower.month:02d}"
+
+
+def partition_bounds(start: date, end: date, interval: str) -> List[Tuple[date, date]]:
+    """覆盖 [start, end] 的所有分区区间 [lower, upper)"""
+    if interval not in INTERVALS:
+        raise ValueError(f"interval must be one of {INTERVALS}, got {interval!r}")
+    if start > end:
+        return []
+
+    bounds = []
+    lower = period_start(start, interval)
+    while lower <= end:
+        upper = next_period(lower, interval)
+        bounds.append((lower, upper))
+        lower = upper
+    return bounds
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 目录查询
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def is_partitioned(conn, table: str) -> bool:
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT 1
+        FROM pg_partitioned_table pt
+        JOIN pg_class c ON c.oid = pt.partrelid
+        WHERE c.relname = %s
+        """,
+        (table,),
+    )
+    return cursor.fetchone() is not None
+
+
+def list_partitions(conn, table: str) -> List[str]:
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT child.relname
+        FROM pg_inherits i
+        JOIN pg_class parent ON parent.oid = i.inhparent
+        JOIN pg_class child  ON child.oid  = i.inhrelid
+        WHERE parent.relname = %s
+        ORDER BY child.relname
+        """,
+        (table,),
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 建分区
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def _check_table(table: str):
+    if table not in PARTITIONED_TABLES:
+        raise ValueError(f"table {table!r} is not partitionable (expected one of {PARTITIONED_TABLES})")
+
+
+def ensure_partitions(
+    conn,
+    table: str,
+    start: date,
+    end: date,
+    interval: Optional[str] = None,
+) -> List[str]:
+    """
+    为 [start, end] 建缺失的分区（以及 default 分区），返回新建的分区名
+
+    default 分区里已有落在新区间的行时，PostgreSQL 会拒绝创建该分区，
+    这里先把这些行移出 default 再建（同一事务内完成）。
+    """
+    _check_table(table)
+    interval = interval or partition_interval()
+    existing = set(list_partitions(conn, table))
+    cursor = conn.cursor()
+    created = []
+
+    default_name = f"{table}_default"
+    if default_name not in existing:
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {default_name} PARTITION OF {table} DEFAULT;")
+        created.append(default_name)
+
+    for lower, upper in partition_bounds(start, end, interval):
+        name = partition_name(table, lower, interval)
+        if name in existing:
+            continue
+
+        # default 中落在本区间的行先暂存，建好分区后再写回
+        stash = f"_stash_{name}"
+        in_range = f"date >= '{lower.isoformat()}' AND date < '{upper.isoformat()}'"
+        cursor.execute(f"CREATE TEMP TABLE {stash} ON COMMIT DROP AS SELECT * FROM {default_name} WHERE {in_range};")
+        cursor.execute(f"DELETE FROM {default_name} WHERE {in_range};")
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}');"
+        )
+        cursor.execute(f"INSERT INTO {table} SELECT * FROM {stash};")
+        cursor.execute(f"DROP TABLE {stash};")
+        created.append(name)
+
+    if created:
+        log.info(f"[partitions] {table}: created {created}")
+    return created
+
+
+def ensure_default_partitions(conn, start: date, end: Optional[date] = None) -> Dict[str, List[str]]:
+    """create_tables 调用：从 start 建到「今天 + future_periods 个周期」"""
+    interval = partition_interval()
+    if end is None:
+        end = date.today()
+        for _ in range(int(get_config_value("database.partitioning.future_periods", 2))):
+            end = next_period(period_start(end, interval), interval)
+
+    return {table: ensure_partitions(conn, table, start, end, interval) for table in PARTITIONED_TABLES}
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 写入前按需补建（批量写入器调用）
+# ----------------------------------------------------------------------------------------------------------------------------------------
+_COVERED: Dict[str, Set[date]] = {}
+_COVERED_LOCK = threading.Lock()
+
+
+def _as_date(d) -> date:
+    if isinstance(d, datetime):
+        return d.date()
+    if isinstance(d, date):
+        return d
+    return date.fromisoformat(str(d)[:10])
+
+
+def partitions_covered(table: str, dates: Iterable) -> bool:
+    """不查库：分区未开启，或 dates 涉及的周期都已在本进程确认过时返回 True"""
+    if not partitioning_enabled():
+        return True
+
+    interval = partition_interval()
+    periods = {period_start(_as_date(d), interval) for d in dates if d is not None}
+    with _COVERED_LOCK:
+        return periods <= _COVERED.get(table, set())
+
+
+def ensure_partitions_for_dates(conn, table: str, dates: Iterable) -> List[str]:
+    """
+    分区开启时，保证 dates 涉及的每个周期都有独立分区（未开启时直接返回）
+
+    进程内缓存已确认的周期，日常增量写入只在跨年/跨月后第一次写入时查库。
+    """
+    if not partitioning_enabled():
+        return []
+
+    interval = partition_interval()
+    periods = {period_start(_as_date(d), interval) for d in dates if d is not None}
+    with _COVERED_LOCK:
+        missing = sorted(periods - _COVERED.setdefault(table, set()))
+    if not missing:
+        return []
+
+    if not is_partitioned(conn, table):
+        return []
+
+    created = ensure_partitions(conn, table, missing[0], missing[-1], interval)
+    with _COVERED_LOCK:
+        _COVERED[table].update(lower for lower, _ in partition_bounds(missing[0], missing[-1], interval))
+    return created
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 迁移：单表 -> 分区表
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def migrate_to_partitioned(conn, table: str, *, interval: Optional[str] = None, drop_legacy: bool = False) -> int:
+    """
+    把现有单表迁移为按 date 分区的表，返回迁移的行数
+
+    步骤（单个事务，调用方 commit）：
+    1) 旧表及其索引改名为 *_legacy（索引名全局唯一，不改名会与新表冲突）
+    2) 用同一份 DDL 建分区父表 + 覆盖旧数据日期范围的分区
+    3) INSERT ... SELECT 按列名搬数据，重建索引
+    4) drop_legacy=True 时删除旧表，否则保留供核对
+    """
+    # 延迟 import：表模块反过来会 import 本模块
+    from database.schema.tables.factor_values import create_factor_values_indexes, create_factor_values_table
+    from database.schema.tables.market_prices import create_market_prices_indexes, create_market_prices_table
+
+    _check_table(table)
+    interval = interval or partition_interval()
+    creators = {
+        "market_prices": (create_market_prices_table, create_market_prices_indexes),
+        "factor_values": (create_factor_values_table, create_factor_values_indexes),
+    }
+    create_table, create_indexes = creators[table]
+
+    if is_partitioned(conn, table):
+        log.info(f"[partitions] {table} is already partitioned, skip")
+        return 0
+
+    legacy = f"{table}_legacy"
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT indexname FROM pg_indexes WHERE schemaname = 'public' AND tablename = %s", (table,))
+    for (index_name,) in cursor.fetchall():
+        cursor.execute(f"ALTER INDEX {index_name} RENAME TO {index_name}_legacy;")
+    cursor.execute(f"ALTER TABLE {table} RENAME TO {legacy};")
+
+    create_table(conn, "skip", partitioned=True)
+
+    cursor.execute(f"SELECT MIN(date), MAX(date) FROM {legacy}")
+    lo, hi = cursor.fetchone()
+    ensure_partitions(conn, table, lo or date.today(), hi or date.today(), interval)
+
+    cursor.execute(
+        """
+        SELECT column_name
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = %s
+        ORDER BY ordinal_position
+        """,
+        (table,),
+    )
+    columns = ", ".join(row[0] for row in cursor.fetchall())
+    cursor.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {legacy};")
+    moved = cursor.rowcount
+
+    create_indexes(conn)
+    cursor.execute(f"ANALYZE {table};")
+
+    if drop_legacy:
+        cursor.execute(f"DROP TABLE {legacy};")
+
+    log.info(f"[partitions] migrated {moved} rows from {legacy} into partitioned {table}")
+    return moved
@@ -42,12 +42,17 @@ def create_data_update_logs_table(conn, if_exists='skip'):
             started_at TIMESTAMPTZ DEFAULT now(),
             completed_at TIMESTAMPTZ,
             duration_seconds INT,
+            processed_ids BIGINT[],
             
             CHECK (status IN ('running','completed','failed','partial')),
             CHECK (dataset IN ('market_prices','fundamental_data','universe','instruments'))
         );
         
+        -- 旧库补列（CREATE TABLE IF NOT EXISTS 不会修改已有表）
+        ALTER TABLE data_update_logs ADD COLUMN IF NOT EXISTS processed_ids BIGINT[];
+        
         COMMENT ON TABLE data_update_logs IS '数据更新日志（监控 Tiingo API 调用）';
+        COMMENT ON COLUMN data_update_logs.processed_ids IS '本轮已处理完的 instrument_id（含无数据可写的），断点续跑时跳过';
     """
     
     cursor = conn.cursor()
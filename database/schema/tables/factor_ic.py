@@ -0,0 +1,66 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+factor_ic：逐日截面 IC（engine/analytics/ic.py 的输出）
+
+一行 = (因子, 版本, 前瞻周期, 相关方法, 日期)；汇总指标（ICIR / t 值）由逐日序列现算，不落表。
+"""
+from utils.logger import get_logger
+
+log = get_logger("database")
+
+
+def create_factor_ic_table(conn, if_exists='skip'):
+    """创建因子 IC 表"""
+
+    if if_exists == 'drop':
+        cursor = conn.cursor()
+        cursor.execute("DROP TABLE IF EXISTS factor_ic CASCADE;")
+        log.info("[✔] 已删除旧表 factor_ic")
+
+    statement = """
+        CREATE TABLE IF NOT EXISTS factor_ic (
+            factor_name TEXT NOT NULL,
+            factor_version TEXT NOT NULL DEFAULT 'v1',
+            horizon INT NOT NULL,
+            method TEXT NOT NULL,
+            date DATE NOT NULL,
+
+            ic DOUBLE PRECISION,
+            n_obs INT NOT NULL,
+
+            computed_at TIMESTAMPTZ DEFAULT now(),
+
+            PRIMARY KEY (factor_name, factor_version, horizon, method, date),
+            CHECK (method IN ('spearman', 'pearson')),
+            CHECK (horizon >= 1)
+        );
+
+        COMMENT ON TABLE factor_ic IS '因子逐日截面 IC：factor(t) 与 t -> t+horizon 前瞻收益的相关系数';
+    """
+
+    cursor = conn.cursor()
+    cursor.execute(statement)
+    log.info("[✔] 表 'factor_ic' 创建成功")
+
+
+def create_factor_ic_indexes(conn):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_factor_ic_date
+        ON factor_ic (date);
+        """
+    )
+    log.info("[✔] factor_ic 索引创建成功")
@@ -0,0 +1,84 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+factor_monitor：因子衰减监控（engine/analytics/factor_monitor.py 每日增量追加）
+
+一行 = (因子, 版本, 前瞻周期, 日期)：当日截面 IC / 多空收益，以及截至当日的滚动 IC、ICIR、命中率、
+多空收益均值和状态。数值列用 REAL（float4）：监控只需要 3~4 位有效数字，行宽减半。
+"""
+from utils.logger import get_logger
+
+log = get_logger("database")
+
+
+def create_factor_monitor_table(conn, if_exists='skip'):
+    """创建因子监控表"""
+
+    if if_exists == 'drop':
+        cursor = conn.cursor()
+        cursor.execute("DROP TABLE IF EXISTS factor_monitor CASCADE;")
+        log.info("[✔] 已删除旧表 factor_monitor")
+
+    statement = """
+        CREATE TABLE IF NOT EXISTS factor_monitor (
+            factor_name TEXT NOT NULL,
+            factor_version TEXT NOT NULL DEFAULT 'v1',
+            horizon INT NOT NULL,
+            date DATE NOT NULL,
+
+            ic REAL,
+            ls_return REAL,
+            n_obs INT NOT NULL,
+
+            n_days INT NOT NULL,
+            ic_longrun REAL,
+
+            rolling_ic REAL,
+            rolling_icir REAL,
+            hit_rate REAL,
+            rolling_ls REAL,
+            val_spread REAL,
+            crowding_z REAL,
+            status TEXT NOT NULL,
+
+            PRIMARY KEY (factor_name, factor_version, horizon, date),
+            CHECK (status IN ('ok', 'weak', 'decayed', 'insufficient')),
+            CHECK (horizon >= 1)
+        );
+
+        -- 旧库补列（CREATE TABLE IF NOT EXISTS 不会修改已有表）
+        ALTER TABLE factor_monitor ADD COLUMN IF NOT EXISTS val_spread REAL;
+        ALTER TABLE factor_monitor ADD COLUMN IF NOT EXISTS crowding_z REAL;
+
+        COMMENT ON TABLE factor_monitor IS '因子衰减与拥挤监控：逐日 IC / 多空收益 + 滚动 ICIR / 命中率 / 估值价差 / 状态';
+        COMMENT ON COLUMN factor_monitor.n_days IS '截至当日有效 IC 的累计天数（长期均值 ic_longrun 的样本数）';
+        COMMENT ON COLUMN factor_monitor.hit_rate IS '滚动窗口内 IC > 0 的比例（未按因子方向翻转）';
+        COMMENT ON COLUMN factor_monitor.val_spread IS '多头组与空头组估值分位（val_bp 截面分位均值）之差，未按因子方向翻转';
+        COMMENT ON COLUMN factor_monitor.crowding_z IS '拥挤度：估值价差相对滚动窗口的 z 值（按长期方向翻转，越大表示多头腿越贵）';
+    """
+
+    cursor = conn.cursor()
+    cursor.execute(statement)
+    log.info("[✔] 表 'factor_monitor' 创建成功")
+
+
+def create_factor_monitor_indexes(conn):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_factor_monitor_date
+        ON factor_monitor (date);
+        """
+    )
+    log.info("[✔] factor_monitor 索引创建成功")
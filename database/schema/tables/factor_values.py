@@ -16,21 +16,23 @@ from utils.logger import get_logger
 log = get_logger("database")
 
 
-def create_factor_values_table(conn, if_exists: str = "skip"):
+def create_factor_values_table(conn, if_exists: str = "skip", partitioned: bool = False):
     """
     创建标量因子表（Scalar Factor Values）
 
     设计原则：
     - 一行 = instrument + date + factor_name + version → 一个数值
     - 所有参数、口径、预处理信息放 JSONB
+    - partitioned=True 时按 date 范围分区（PK 含 date，满足分区键约束）
     """
+    partition_by = "PARTITION BY RANGE (date)" if partitioned else ""
 
     if if_exists == "drop":
         cursor = conn.cursor()
         cursor.execute("DROP TABLE IF EXISTS factor_values CASCADE;")
         log.info("[✔] 已删除旧表 factor_values")
 
-    statement = """
+    statement = f"""
         CREATE TABLE IF NOT EXISTS factor_values (
             instrument_id BIGINT NOT NULL REFERENCES instruments(instrument_id) ON DELETE CASCADE,
             date DATE NOT NULL,
@@ -51,7 +53,7 @@ def create_factor_values_table(conn, if_exists: str = "skip"):
             ingested_at TIMESTAMPTZ DEFAULT now(),
 
             PRIMARY KEY (instrument_id, date, factor_name, factor_version)
-        );
+        ) {partition_by};
 
         COMMENT ON TABLE factor_values IS
             '标量因子值表（instrument × date × factor × version → scalar）';
@@ -78,23 +80,25 @@ def create_factor_values_indexes(conn):
     """创建 factor_values 相关索引"""
 
     index_statements = [
-        # 某因子某天的截面（选股 / IC / 分组）
+        # 某因子某天 / 某段日期的截面（选股 / 回测信号 / 简报 / IC / 分组）：
+        # 等值列在前、date 范围在后；INCLUDE 取值列 -> Index Only Scan，不回表
         """
-        CREATE INDEX IF NOT EXISTS idx_factor_values_name_date_ver
-        ON factor_values (factor_name, date, factor_version);
+        CREATE INDEX IF NOT EXISTS idx_factor_values_name_ver_date_cov
+        ON factor_values (factor_name, factor_version, date)
+        INCLUDE (instrument_id, factor_value);
         """,
 
-        # 单标的因子时间序列
+        # 最新因子日（MAX(date) WHERE factor_version = ...）
         """
-        CREATE INDEX IF NOT EXISTS idx_factor_values_instrument_date
-        ON factor_values (instrument_id, date);
+        CREATE INDEX IF NOT EXISTS idx_factor_values_ver_date
+        ON factor_values (factor_version, date);
         """,
 
-        # 某天取全部因子（构建训练集 / 回测）
-        """
-        CREATE INDEX IF NOT EXISTS idx_factor_values_date
-        ON factor_values (date);
-        """
+        # 旧索引：name_date_ver / date 被上面两个取代；
+        # instrument_date 是主键 (instrument_id, date, ...) 的前缀，单标的时间序列直接走主键
+        "DROP INDEX IF EXISTS idx_factor_values_name_date_ver;",
+        "DROP INDEX IF EXISTS idx_factor_values_date;",
+        "DROP INDEX IF EXISTS idx_factor_values_instrument_date;",
     ]
 
     cursor = conn.cursor()
@@ -0,0 +1,65 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+forward_returns：每个 (instrument_id, date) 的多周期前瞻收益（研究 / 打标签用的派生表）
+
+fwd_{h}d = adj_close[t + h 个交易日] / adj_close[t] - 1，交易日按 trading_calendar 计；
+中途停牌取 t+h 之前最后一个价格，退市标的取退市前最后一个价格（退出价），
+未来价格尚未出现时为 NULL。由 engine/analytics/forward_returns.py 计算并增量维护。
+"""
+from utils.logger import get_logger
+
+log = get_logger("database")
+
+
+def create_forward_returns_table(conn, if_exists='skip'):
+    """创建前瞻收益表"""
+
+    if if_exists == 'drop':
+        cursor = conn.cursor()
+        cursor.execute("DROP TABLE IF EXISTS forward_returns CASCADE;")
+        log.info("[✔] 已删除旧表 forward_returns")
+
+    statement = """
+        CREATE TABLE IF NOT EXISTS forward_returns (
+            instrument_id BIGINT NOT NULL REFERENCES instruments(instrument_id) ON DELETE CASCADE,
+            date DATE NOT NULL,
+
+            fwd_1d DOUBLE PRECISION,
+            fwd_5d DOUBLE PRECISION,
+            fwd_21d DOUBLE PRECISION,
+            fwd_63d DOUBLE PRECISION,
+
+            updated_at TIMESTAMPTZ DEFAULT now(),
+
+            PRIMARY KEY (instrument_id, date)
+        );
+
+        COMMENT ON TABLE forward_returns IS '前瞻收益（交易日历对齐，退市按最后价格退出）；派生表，可随时重算';
+    """
+
+    cursor = conn.cursor()
+    cursor.execute(statement)
+    log.info("[✔] 表 'forward_returns' 创建成功")
+
+
+def create_forward_returns_indexes(conn):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_forward_returns_date
+        ON forward_returns (date, instrument_id);
+        """
+    )
+    log.info("[✔] forward_returns 索引创建成功")
@@ -0,0 +1,60 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+from utils.logger import get_logger
+
+log = get_logger("database")
+
+
+def create_fundamental_daily_table(conn, if_exists='skip'):
+    """创建每日基本面/估值表（point-in-time：只使用当日已披露的财报）"""
+    
+    if if_exists == 'drop':
+        cursor = conn.cursor()
+        cursor.execute("DROP TABLE IF EXISTS fundamental_daily CASCADE;")
+        log.info("[✔] 已删除旧表 fundamental_daily")
+    
+    statement = """
+        CREATE TABLE IF NOT EXISTS fundamental_daily (
+            instrument_id BIGINT NOT NULL REFERENCES instruments(instrument_id) ON DELETE CASCADE,
+            date DATE NOT NULL,
+            metric_name TEXT NOT NULL,
+            
+            metric_value NUMERIC(38,10),
+            
+            currency TEXT DEFAULT 'USD',
+            data_source TEXT DEFAULT 'internal',
+            ingested_at TIMESTAMPTZ DEFAULT now(),
+            
+            PRIMARY KEY (instrument_id, date, metric_name)
+        );
+        
+        COMMENT ON TABLE fundamental_daily IS '每日估值（收盘价 × 已披露财报，as-of 对齐）';
+        COMMENT ON COLUMN fundamental_daily.metric_name IS 'market_cap, pe_ttm, pb, ps_ttm, ev_ebitda_ttm, fcf_yield_ttm, div_yield_ttm';
+    """
+    
+    cursor = conn.cursor()
+    cursor.execute(statement)
+    log.info("[✔] 表 'fundamental_daily' 创建成功")
+
+
+def create_fundamental_daily_indexes(conn):
+    """创建索引"""
+    
+    index_statements = [
+        "CREATE INDEX IF NOT EXISTS idx_fundamental_daily_metric_date ON fundamental_daily(metric_name, date);",
+    ]
+    
+    cursor = conn.cursor()
+    for statement in index_statements:
+        cursor.execute(statement)
@@ -34,6 +34,7 @@ def create_fundamental_data_table(conn, if_exists='skip'):
             period_type TEXT NOT NULL,
             period_start DATE,
             period_end DATE,
+            filed_date DATE,
             
             currency TEXT DEFAULT 'USD',
             data_source TEXT DEFAULT 'sec_edgar',
@@ -43,8 +44,12 @@ def create_fundamental_data_table(conn, if_exists='skip'):
             CHECK (period_type IN ('TTM','Quarterly','Annual'))
         );
         
-        COMMENT ON TABLE fundamental_data IS '基本面数据（SEC EDGAR - 预留但暂不使用）';
-        COMMENT ON COLUMN fundamental_data.metric_name IS 'EPS, Revenue, NetIncome, ROE, PE, PB...';
+        -- 旧库补列（CREATE TABLE IF NOT EXISTS 不会修改已有表）
+        ALTER TABLE fundamental_data ADD COLUMN IF NOT EXISTS filed_date DATE;
+        
+        COMMENT ON TABLE fundamental_data IS '基本面数据（SEC EDGAR）';
+        COMMENT ON COLUMN fundamental_data.filed_date IS '该报告期首次披露日期（point-in-time 可得日）';
+        COMMENT ON COLUMN fundamental_data.metric_name IS '标准指标名（revenue, net_income, total_assets...，见 sec_metric_map）';
     """
     
     cursor = conn.cursor()
@@ -58,6 +63,7 @@ def create_fundamental_data_indexes(conn):
     index_statements = [
         "CREATE INDEX IF NOT EXISTS idx_fundamental_instrument_date ON fundamental_data(instrument_id, report_date);",
         "CREATE INDEX IF NOT EXISTS idx_fundamental_metric ON fundamental_data(metric_name);",
+        "CREATE INDEX IF NOT EXISTS idx_fundamental_metric_filed ON fundamental_data(metric_name, filed_date);",
     ]
     
     cursor = conn.cursor()
@@ -0,0 +1,70 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+from utils.logger import get_logger
+
+log = get_logger("database")
+
+
+def create_instrument_tradable_history_table(conn, if_exists='skip'):
+    """创建 is_tradable 变更历史表"""
+
+    if if_exists == 'drop':
+        cursor = conn.cursor()
+        cursor.execute("DROP TABLE IF EXISTS instrument_tradable_history CASCADE;")
+        log.info("[✔] 已删除旧表 instrument_tradable_history")
+
+    statement = """
+        CREATE TABLE IF NOT EXISTS instrument_tradable_history (
+            history_id BIGSERIAL PRIMARY KEY,
+            instrument_id BIGINT NOT NULL REFERENCES instruments(instrument_id) ON DELETE CASCADE,
+            asof_date DATE NOT NULL,
+
+            is_tradable BOOLEAN NOT NULL,
+
+            last_price NUMERIC(20,6),
+            dv_log NUMERIC(38,10),
+
+            changed_at TIMESTAMPTZ DEFAULT now()
+        );
+
+        COMMENT ON TABLE instrument_tradable_history IS 'instruments.is_tradable 的变更记录（只记变化，不记每日全量）';
+        COMMENT ON COLUMN instrument_tradable_history.asof_date IS '触发变更的行情日期';
+        COMMENT ON COLUMN instrument_tradable_history.dv_log IS '判定时使用的 log(平均成交额)';
+    """
+
+    cursor = conn.cursor()
+    cursor.execute(statement)
+    log.info("[✔] 表 'instrument_tradable_history' 创建成功")
+
+
+def create_instrument_tradable_history_indexes(conn):
+    """创建索引"""
+
+    index_statements = [
+        # 某标的的变更时间线 / 按日期回放可交易池
+        """
+        CREATE INDEX IF NOT EXISTS idx_tradable_history_instrument_date
+        ON instrument_tradable_history (instrument_id, asof_date);
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_tradable_history_date
+        ON instrument_tradable_history (asof_date);
+        """,
+    ]
+
+    cursor = conn.cursor()
+    for statement in index_statements:
+        cursor.execute(statement)
+
+    log.info("[✔] instrument_tradable_history 索引创建成功")
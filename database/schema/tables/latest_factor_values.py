@@ -0,0 +1,62 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+latest_factor_values：每个 (instrument_id, factor_name, factor_version) 一行，为该组合最新日期的因子值
+
+由 rw_factor_values 的写入函数在同一事务内维护（database/readwrite/rw_latest_snapshots.py），不要直接写。
+"""
+from utils.logger import get_logger
+
+log = get_logger("database")
+
+
+def create_latest_factor_values_table(conn, if_exists='skip'):
+    """创建最新因子值快照表"""
+
+    if if_exists == 'drop':
+        cursor = conn.cursor()
+        cursor.execute("DROP TABLE IF EXISTS latest_factor_values CASCADE;")
+        log.info("[✔] 已删除旧表 latest_factor_values")
+
+    statement = """
+        CREATE TABLE IF NOT EXISTS latest_factor_values (
+            instrument_id BIGINT NOT NULL REFERENCES instruments(instrument_id) ON DELETE CASCADE,
+            factor_name TEXT NOT NULL,
+            factor_version TEXT NOT NULL DEFAULT 'v1',
+
+            date DATE NOT NULL,
+            factor_value NUMERIC(38,10) NOT NULL,
+
+            updated_at TIMESTAMPTZ DEFAULT now(),
+
+            PRIMARY KEY (instrument_id, factor_name, factor_version)
+        );
+
+        COMMENT ON TABLE latest_factor_values IS '每个 (标的, 因子, 版本) 最新一天的因子值（factor_values 的物化快照）';
+    """
+
+    cursor = conn.cursor()
+    cursor.execute(statement)
+    log.info("[✔] 表 'latest_factor_values' 创建成功")
+
+
+def create_latest_factor_values_indexes(conn):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_latest_factor_values_ver_date
+        ON latest_factor_values (factor_version, date);
+        """
+    )
+    log.info("[✔] latest_factor_values 索引创建成功")
@@ -0,0 +1,67 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+latest_prices：每个 instrument_id 一行，等于 market_prices 中该标的最新日期的整行
+
+由 rw_market_prices 的写入函数在同一事务内维护（database/readwrite/rw_latest_snapshots.py），不要直接写。
+"""
+from utils.logger import get_logger
+
+log = get_logger("database")
+
+
+def create_latest_prices_table(conn, if_exists='skip'):
+    """创建最新价格快照表"""
+
+    if if_exists == 'drop':
+        cursor = conn.cursor()
+        cursor.execute("DROP TABLE IF EXISTS latest_prices CASCADE;")
+        log.info("[✔] 已删除旧表 latest_prices")
+
+    statement = """
+        CREATE TABLE IF NOT EXISTS latest_prices (
+            instrument_id BIGINT PRIMARY KEY REFERENCES instruments(instrument_id) ON DELETE CASCADE,
+            date DATE NOT NULL,
+
+            open_price NUMERIC(20,6),
+            high_price NUMERIC(20,6),
+            low_price NUMERIC(20,6),
+            close_price NUMERIC(20,6) NOT NULL,
+            volume BIGINT,
+
+            adj_open NUMERIC(20,6),
+            adj_high NUMERIC(20,6),
+            adj_low NUMERIC(20,6),
+            adj_close NUMERIC(20,6) NOT NULL,
+            adj_volume BIGINT,
+
+            dividends NUMERIC(20,6) DEFAULT 0,
+            stock_splits NUMERIC(20,6) DEFAULT 1,
+
+            data_source TEXT NOT NULL DEFAULT 'tiingo',
+            updated_at TIMESTAMPTZ DEFAULT now()
+        );
+
+        COMMENT ON TABLE latest_prices IS '每个标的最新一天的行情（market_prices 的物化快照）';
+    """
+
+    cursor = conn.cursor()
+    cursor.execute(statement)
+    log.info("[✔] 表 'latest_prices' 创建成功")
+
+
+def create_latest_prices_indexes(conn):
+    cursor = conn.cursor()
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_latest_prices_date ON latest_prices (date);")
+    log.info("[✔] latest_prices 索引创建成功")
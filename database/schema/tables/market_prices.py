@@ -16,15 +16,20 @@ from utils.logger import get_logger
 log = get_logger("database")
 
 
-def create_market_prices_table(conn, if_exists='skip'):
-    """创建市场价格表"""
+def create_market_prices_table(conn, if_exists='skip', partitioned: bool = False):
+    """
+    创建市场价格表
+
+    partitioned=True 时建为按 date 范围分区的父表（分区由 database/schema/partitions.py 创建）
+    """
+    partition_by = "PARTITION BY RANGE (date)" if partitioned else ""
     
     if if_exists == 'drop':
         cursor = conn.cursor()
         cursor.execute("DROP TABLE IF EXISTS market_prices CASCADE;")
         log.info("[✔] 已删除旧表 market_prices")
     
-    statement = """
+    statement = f"""
         CREATE TABLE IF NOT EXISTS market_prices (
             instrument_id BIGINT NOT NULL REFERENCES instruments(instrument_id) ON DELETE CASCADE,
             date DATE NOT NULL,
@@ -48,7 +53,7 @@ def create_market_prices_table(conn, if_exists='skip'):
             ingested_at TIMESTAMPTZ DEFAULT now(),
             
             PRIMARY KEY (instrument_id, date)
-        );
+        ) {partition_by};
         
         COMMENT ON TABLE market_prices IS 'Tiingo EOD 价格（完整 OHLCV + 复权）';
         COMMENT ON COLUMN market_prices.dividends IS '当日分红（美元）';
@@ -64,8 +69,18 @@ def create_market_prices_indexes(conn):
     """创建索引"""
     
     index_statements = [
-        "CREATE INDEX IF NOT EXISTS idx_prices_date ON market_prices(date);",
-        "CREATE INDEX IF NOT EXISTS idx_prices_instrument_date ON market_prices(instrument_id, date);",
+        # 单日截面（get_prices_on_date / 回测逐日估值 / 简报价格快照）：
+        # (date, instrument_id) 定位 + INCLUDE 日常读取的价格列 -> Index Only Scan，不回表
+        """
+        CREATE INDEX IF NOT EXISTS idx_prices_date_cov
+        ON market_prices (date, instrument_id)
+        INCLUDE (adj_close, adj_volume, open_price, high_price, low_price, close_price);
+        """,
+
+        # 旧索引：idx_prices_date 被上面的覆盖索引取代；
+        # idx_prices_instrument_date 与主键 (instrument_id, date) 完全重复
+        "DROP INDEX IF EXISTS idx_prices_date;",
+        "DROP INDEX IF EXISTS idx_prices_instrument_date;",
     ]
     
     cursor = conn.cursor()
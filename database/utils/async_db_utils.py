@@ -0,0 +1,127 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+异步数据库连接（psycopg.AsyncConnection + AsyncConnectionPool）
+
+用于编排代码并发等待多个互不依赖的查询：
+
+    async with async_db_connection() as c1, async_db_connection() as c2:
+        prices, factors = await asyncio.gather(
+            aget_prices(c1, 123, start_date="2025-01-01"),
+            aget_factor_values(c2, factor_names=["mom_21d"], date="2025-06-30"),
+        )
+
+注意：一个连接同一时刻只能执行一条语句，并发的查询要各自借一个连接。
+
+连接池配置沿用 config.yaml 的 database.pool.*（与同步池各自独立计数）。
+异步池绑定创建它的事件循环：每次 asyncio.run() 是一个新循环，会新建池。
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+import psycopg
+
+from database.utils.db_utils import _conn_kwargs, _pool_enabled
+from utils.config_loader import get_config_value
+
+try:
+    from psycopg_pool import AsyncConnectionPool
+except ImportError:  # pragma: no cover - 未安装时退回直连
+    AsyncConnectionPool = None
+
+
+_APOOL = None
+_APOOL_KEY = None
+
+# 建池互斥锁：asyncio.Lock 绑定事件循环，按 (pid, loop) 各建一把
+_APOOL_LOCK = None
+_APOOL_LOCK_KEY = None
+
+
+def _loop_key():
+    return os.getpid(), id(asyncio.get_running_loop())
+
+
+def _pool_lock(key) -> asyncio.Lock:
+    # 同步函数内没有 await，检查与赋值之间不会被其他协程打断
+    global _APOOL_LOCK, _APOOL_LOCK_KEY
+
+    if _APOOL_LOCK is None or _APOOL_LOCK_KEY != key:
+        _APOOL_LOCK, _APOOL_LOCK_KEY = asyncio.Lock(), key
+    return _APOOL_LOCK
+
+
+async def get_async_pool():
+    """返回当前进程 + 当前事件循环的异步连接池；未启用连接池时返回 None"""
+    global _APOOL, _APOOL_KEY
+
+    if AsyncConnectionPool is None or not _pool_enabled():
+        return None
+
+    key = _loop_key()
+    if _APOOL is not None and _APOOL_KEY == key:
+        return _APOOL
+
+    # asyncio.gather 并发借连接时多个协程会同时走到这里：加锁后再检查一次，只建一个池
+    async with _pool_lock(key):
+        if _APOOL is not None and _APOOL_KEY == key:
+            return _APOOL
+
+        # 旧池属于已结束的事件循环（或 fork 前的父进程），无法在这里关闭，直接丢弃
+        pool = AsyncConnectionPool(
+            kwargs=_conn_kwargs(),
+            min_size=int(get_config_value("database.pool.min_size", 1)),
+            max_size=int(get_config_value("database.pool.max_size", 10)),
+            timeout=float(get_config_value("database.pool.timeout", 30)),
+            max_idle=float(get_config_value("database.pool.max_idle", 300)),
+            check=getattr(AsyncConnectionPool, "check_connection", None),
+            name=f"quant-async-{key[0]}",
+            open=False,
+        )
+        await pool.open()
+        _APOOL, _APOOL_KEY = pool, key
+        return pool
+
+
+async def close_async_pool():
+    """关闭当前事件循环的异步池（在 asyncio.run 的主协程结束前调用）"""
+    global _APOOL, _APOOL_KEY
+
+    pool, key = _APOOL, _APOOL_KEY
+    _APOOL, _APOOL_KEY = None, None
+    if pool is not None and key == _loop_key():
+        await pool.close()
+
+
+@asynccontextmanager
+async def async_db_connection():
+    """
+    借一个异步连接：正常退出提交，异常回滚，最后归还连接池（未启用连接池时关闭）
+    """
+    pool = await get_async_pool()
+    if pool is not None:
+        async with pool.connection() as conn:
+            yield conn
+        return
+
+    conn = await psycopg.AsyncConnection.connect(**_conn_kwargs())
+    try:
+        yield conn
+        await conn.commit()
+    except BaseException:
+        await conn.rollback()
+        raise
+    finally:
+        await conn.close()
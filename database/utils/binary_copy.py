@@ -0,0 +1,182 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+COPY ... TO STDOUT (FORMAT BINARY) -> NumPy 列
+=============================================
+
+普通 SELECT + fetchall 的主要成本在客户端：每个 NUMERIC 都要构造一个 Decimal，
+每行一个 tuple，再由 pandas 逐个转换。面板类读取（价格 / 因子）只需要定宽数值列，
+这里改用二进制 COPY：
+
+1) SQL 端把每列 cast 成定宽类型（int8 / int4 / float8 / date），
+   float8 列用 COALESCE(..., 'NaN') 消除 NULL —— 于是每一行都是等长的
+2) 客户端把整个 COPY 流拼成一个 buffer，用一个大端结构化 dtype 一次
+   np.frombuffer 解码，不产生任何 Python 级的行对象
+
+二进制 COPY 格式（PostgreSQL 文档 "Binary Format"）：
+  header : 11 字节签名 + int32 flags + int32 扩展区长度 + 扩展区
+  tuple  : int16 字段数，然后每个字段 int32 长度（-1 = NULL）+ 数据
+  trailer: int16 -1
+"""
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+PGCOPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+_HEADER_FIXED = len(PGCOPY_SIGNATURE) + 8
+_TRAILER = b"\xff\xff"
+
+# PostgreSQL date 的二进制表示：自 2000-01-01 起的天数（int32）
+_PG_EPOCH = np.datetime64("2000-01-01", "D")
+
+# kind -> (SQL cast, 大端 dtype)
+FIELD_KINDS: Dict[str, Tuple[str, str]] = {
+    "int8": ("int8", ">i8"),
+    "int4": ("int4", ">i4"),
+    "float8": ("float8", ">f8"),
+    "date": ("date", ">i4"),
+}
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# SQL 构造
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def select_expr(expr: str, kind: str, alias: str) -> str:
+    """把一列包装成定宽、非 NULL 的表达式（float8 的 NULL -> NaN）"""
+    cast = FIELD_KINDS[kind][0]
+    if kind == "float8":
+        return f"COALESCE(({expr})::float8, 'NaN'::float8) AS {alias}"
+    return f"({expr})::{cast} AS {alias}"
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 解码
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def _row_dtype(fields: Sequence[Tuple[str, str]]) -> np.dtype:
+    parts = [("_nfields", ">i2")]
+    for i, (name, kind) in enumerate(fields):
+        parts.append((f"_len{i}", ">i4"))
+        parts.append((name, FIELD_KINDS[kind][1]))
+    return np.dtype(parts)
+
+
+def decode_binary_copy(data, fields: Sequence[Tuple[str, str]]) -> Dict[str, np.ndarray]:
+    """
+    解码定宽二进制 COPY 数据
+
+    fields : [(列名, kind), ...]，顺序与 SELECT 一致；kind 见 FIELD_KINDS
+    返回   : {列名: 原生字节序的 ndarray}；date 列为 datetime64[ns]
+
+    出现 NULL / 变长字段时行宽不一致，直接 raise（SQL 端应保证定宽）。
+    """
+    buf = memoryview(data)
+    if bytes(buf[: len(PGCOPY_SIGNATURE)]) != PGCOPY_SIGNATURE:
+        raise ValueError("not a PGCOPY binary stream")
+
+    ext_len = int.from_bytes(buf[_HEADER_FIXED - 4 : _HEADER_FIXED], "big")
+    start = _HEADER_FIXED + ext_len
+    if bytes(buf[-2:]) != _TRAILER:
+        raise ValueError("PGCOPY stream is missing its trailer")
+    body = buf[start:-2]
+
+    dtype = _row_dtype(fields)
+    if len(body) % dtype.itemsize:
+        raise ValueError("PGCOPY rows are not fixed-width (NULL or variable-length field?)")
+
+    rows = np.frombuffer(body, dtype=dtype)
+    if len(rows):
+        if (rows["_nfields"] != len(fields)).any():
+            raise ValueError("unexpected field count in PGCOPY stream")
+        for i, (name, kind) in enumerate(fields):
+            if (rows[f"_len{i}"] != np.dtype(FIELD_KINDS[kind][1]).itemsize).any():
+                raise ValueError(f"unexpected field width for {name}")
+
+    out: Dict[str, np.ndarray] = {}
+    for name, kind in fields:
+        col = rows[name]
+        if kind == "date":
+            out[name] = (_PG_EPOCH + col.astype(np.int64)).astype("datetime64[ns]")
+        else:
+            out[name] = col.astype(col.dtype.newbyteorder("="))
+    return out
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 执行
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def copy_to_numpy(
+    conn,
+    query: str,
+    params: Optional[Sequence[Any]],
+    fields: Sequence[Tuple[str, str]],
+) -> Dict[str, np.ndarray]:
+    """
+    COPY (query) TO STDOUT (FORMAT BINARY)，返回按列的 ndarray
+
+    query 的 SELECT 列必须与 fields 一一对应（用 select_expr 生成）。
+    """
+    buf = bytearray()
+    cursor = conn.cursor()
+    with cursor.copy(f"COPY ({query}) TO STDOUT (FORMAT BINARY)", params) as copy:
+        for block in copy:
+            buf += block
+    return decode_binary_copy(buf, fields)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 编码 / 写入
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def encode_columns(cols: Dict[str, Any], fields: Sequence[Tuple[str, str]]) -> bytes:
+    """
+    按列的 ndarray -> 二进制 COPY 流（decode_binary_copy 的逆过程，整块向量化）
+
+    date 列接受任意 datetime64 / 日期序列；float8 的 NaN 原样写出（不是 NULL），
+    需要 NULL 时在目标 SQL 里用 NULLIF(col, 'NaN')。
+    """
+    n = len(cols[fields[0][0]]) if fields else 0
+    arr = np.zeros(n, dtype=_row_dtype(fields))
+    arr["_nfields"] = len(fields)
+    for i, (name, kind) in enumerate(fields):
+        arr[f"_len{i}"] = np.dtype(FIELD_KINDS[kind][1]).itemsize
+        if kind == "date":
+            days = np.asarray(cols[name], dtype="datetime64[D]")
+            arr[name] = (days - _PG_EPOCH).astype(np.int64)
+        else:
+            arr[name] = np.asarray(cols[name])
+    header = PGCOPY_SIGNATURE + (0).to_bytes(4, "big") + (0).to_bytes(4, "big")
+    return header + arr.tobytes() + _TRAILER
+
+
+def encode_binary_copy(rows: Sequence[Sequence[Any]], fields: Sequence[Tuple[str, str]]) -> bytes:
+    """
+    按行的版本（测试与基准脚本用；date 传 numpy/pandas 可识别的日期）
+    """
+    cols = {name: [r[i] for r in rows] for i, (name, _) in enumerate(fields)}
+    return encode_columns(cols, fields)
+
+
+def copy_from_numpy(conn, table: str, cols: Dict[str, Any], fields: Sequence[Tuple[str, str]]) -> int:
+    """
+    COPY table (...) FROM STDIN (FORMAT BINARY)，写入按列的 ndarray，返回行数
+
+    用于大批量派生数据（如前瞻收益）写入临时表：不经过逐行的 Python 对象。
+    """
+    n = len(cols[fields[0][0]]) if fields else 0
+    if n == 0:
+        return 0
+    names = ", ".join(name for name, _ in fields)
+    cursor = conn.cursor()
+    with cursor.copy(f"COPY {table} ({names}) FROM STDIN (FORMAT BINARY)") as copy:
+        copy.write(encode_columns(cols, fields))
+    return n
@@ -11,8 +11,149 @@
 # Unauthorized copying, modification, distribution, or use of this file,
 # via any medium, is strictly prohibited without prior written consent.
 # =============================================================================
+import atexit
+import os
+import threading
+from contextlib import contextmanager
+
 import psycopg
-from utils.config_loader import load_config
+from utils.config_loader import get_config_value, load_config
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError:  # pragma: no cover - 未安装时退回直连
+    ConnectionPool = None
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 进程级连接池
+# - config.yaml: database.pool.{enabled, min_size, max_size, timeout, max_idle}
+# - 按 pid 区分：fork 出的子进程（多进程任务）会在首次取连接时创建自己的池，
+#   不会复用父进程的 socket
+# - 取连接时做健康检查（失效连接自动丢弃重连）
+# ----------------------------------------------------------------------------------------------------------------------------------------
+_POOL = None
+_POOL_PID = None
+_POOL_LOCK = threading.Lock()
+
+
+def _conn_kwargs() -> dict:
+    db = load_config()["database"]
+    return dict(
+        dbname=db["dbname"],
+        user=db["user"],
+        password=db["password"],
+        host=db["host"],
+        port=db["port"],
+    )
+
+
+def _pool_enabled() -> bool:
+    return ConnectionPool is not None and bool(get_config_value("database.pool.enabled", True))
+
+
+def get_pool():
+    """返回当前进程的连接池；未安装 psycopg_pool 或 database.pool.enabled=false 时返回 None"""
+    global _POOL, _POOL_PID
+
+    if not _pool_enabled():
+        return None
+
+    pid = os.getpid()
+    if _POOL is not None and _POOL_PID == pid:
+        return _POOL
+
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_PID != pid:
+            # fork 后父进程的池不可用，也不能在子进程里 close（会影响父进程连接）
+            _POOL = ConnectionPool(
+                kwargs=_conn_kwargs(),
+                min_size=int(get_config_value("database.pool.min_size", 1)),
+                max_size=int(get_config_value("database.pool.max_size", 10)),
+                timeout=float(get_config_value("database.pool.timeout", 30)),
+                max_idle=float(get_config_value("database.pool.max_idle", 300)),
+                check=getattr(ConnectionPool, "check_connection", None),
+                name=f"quant-{pid}",
+                open=True,
+            )
+            _POOL_PID = pid
+    return _POOL
+
+
+def close_pool():
+    """关闭当前进程的连接池（进程退出时自动调用）"""
+    global _POOL, _POOL_PID
+
+    with _POOL_LOCK:
+        if _POOL is not None and _POOL_PID == os.getpid():
+            _POOL.close()
+        _POOL = None
+        _POOL_PID = None
+
+
+atexit.register(close_pool)
+
+
+def pool_stats() -> dict:
+    """连接池状态（pool_size / pool_available / requests_num 等），未启用时返回空 dict"""
+    pool = _POOL if _POOL_PID == os.getpid() else None
+    return pool.get_stats() if pool is not None else {}
+
+
+class PooledConnection:
+    """
+    从池中借出的连接（接口与 psycopg.Connection 相同）
+
+    close() 不会断开连接，而是把连接还回池中（未提交的事务先回滚）；
+    with 语法与 psycopg.Connection 一致：正常退出提交，异常退出回滚。
+    """
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        conn = self.__dict__.get("_conn")
+        if conn is None:
+            raise psycopg.InterfaceError("connection already returned to pool")
+        return getattr(conn, name)
+
+    def __setattr__(self, name, value):
+        # conn.autocommit = True 等属性设置透传给底层连接
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._conn, name, value)
+
+    @property
+    def closed(self) -> bool:
+        return self._conn is None or self._conn.closed
+
+    def close(self):
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        if not conn.closed and conn.info.transaction_status != psycopg.pq.TransactionStatus.IDLE:
+            conn.rollback()
+        self._pool.putconn(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._conn is not None and not self._conn.closed:
+            if exc_type is None:
+                self._conn.commit()
+            else:
+                self._conn.rollback()
+        self.close()
+
+    def __del__(self):
+        # 调用方忘记 close 时兜底归还，避免池被耗尽
+        try:
+            self.close()
+        except Exception:
+            pass
 
 
 # ----------------------------------------------------------------------------------------------------------------------------------------
@@ -21,16 +162,31 @@ from utils.config_loader import load_config
 # with get_db_connection() as conn:
 #   with conn.cursor() as cursor:
 #       cursor.execute("SELECT * FROM table_name")
-# 连接会在with块结束时自动关闭，也会自动提交事务
+# with 块结束时自动提交（异常则回滚），连接归还连接池（未启用连接池时关闭）
 # 如果之前需要手动提交或回滚事务，可以使用 conn.commit() 或 conn.rollback()
+# 非 with 用法中 conn.close() 同样是归还连接
 # ----------------------------------------------------------------------------------------------------------------------------------------
 def get_db_connection():
-    cfg = load_config()
-    db = cfg["database"]
-    return psycopg.connect(
-        dbname=db["dbname"],
-        user=db["user"],
-        password=db["password"],
-        host=db["host"],
-        port=db["port"],
-    )
+    pool = get_pool()
+    if pool is None:
+        return psycopg.connect(**_conn_kwargs())
+    return PooledConnection(pool, pool.getconn())
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 推荐用法：上下文管理的连接借用
+# with db_connection() as conn:
+#     ...
+# 正常退出提交，异常回滚，最后归还/关闭连接
+# ----------------------------------------------------------------------------------------------------------------------------------------
+@contextmanager
+def db_connection():
+    conn = get_db_connection()
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
@@ -0,0 +1,67 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+服务端游标流式读取
+==================
+
+普通 cursor.execute + fetchall 会把整张结果集先拉成 Python tuple，再复制成
+DataFrame（内存占用约两倍）。这里用 psycopg 的命名（服务端）游标：
+
+- 结果集留在 PostgreSQL 端，客户端每次 fetchmany(chunksize) 拉一块
+- 每块转成一个 DataFrame yield 给调用方，处理完即可释放
+- 客户端内存上限 ≈ 一个 chunk，与结果集总行数无关
+
+注意：服务端游标只在事务内有效（本项目连接默认非 autocommit）；
+autocommit 连接会自动改用 WITH HOLD 游标。生成器提前结束（break）时游标会被关闭。
+"""
+import uuid
+from typing import Any, Iterator, Optional, Sequence
+
+import pandas as pd
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def iter_query(
+    conn,
+    query: str,
+    params: Optional[Sequence[Any]] = None,
+    *,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    name: str = "stream",
+) -> Iterator[pd.DataFrame]:
+    """
+    执行查询并按 chunksize 行一块 yield DataFrame（列名取自 cursor.description）
+
+    结果为空时不 yield 任何块。
+    """
+    if chunksize <= 0:
+        raise ValueError(f"chunksize must be > 0, got {chunksize}")
+
+    withhold = getattr(conn, "autocommit", False) is True
+    cursor = conn.cursor(name=f"{name}_{uuid.uuid4().hex[:12]}", withhold=withhold)
+    try:
+        cursor.itersize = chunksize
+        cursor.execute(query, params)
+        columns = None
+
+        while True:
+            rows = cursor.fetchmany(chunksize)
+            if not rows:
+                break
+            if columns is None:
+                columns = [d[0] for d in cursor.description]
+            yield pd.DataFrame(rows, columns=columns)
+    finally:
+        cursor.close()
@@ -0,0 +1,480 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+策略收益的风格归因（Fama-French 式）
+
+风格因子收益全部由本库 factor_values 构造（不依赖外部 FF 数据）：
+- MKT    ：全市场等权日收益
+- MOM    ：mom_12m_skip1m 高 - 低
+- LOWVOL ：vol_60d_ann   低 - 高
+- SIZE   ：dv_60d_log    低 - 高（以成交额代替市值，小 - 大）
+- VALUE  ：val_bp        高 - 低（基本面数据未覆盖的区间为 NaN，整列缺失时自动剔除）
+
+构造方式：每 rebalance_every 个交易日按因子把截面分成 n_quantiles 组，组内等权持有到下一个调仓日，
+多空日收益 = 多头组 - 空头组（每日用 1 日前瞻收益，持有期内退市的标的当日不计入）。
+
+回归：策略日收益 = alpha + Σ beta_k * 因子收益_k + e
+- 滚动 OLS（rolling_ols）：X'X / X'y / y'y 用累计和一次得到所有窗口，再批量解正规方程，不逐窗口循环
+- 全区间（attribute）：beta、t 值、年化 alpha，以及各因子对年化收益的贡献 beta_k * mean(f_k) * 252
+
+y 可以是 [T, R]（参数扫描的 R 个回测），同一组风格收益对齐到同一日期轴，结果可直接横向比较；
+get_attribution / get_attribution_many 按 run_id 缓存，NAV 或风格收益变化时重算。
+
+NAV 不是日频时（如只有月度调仓日快照），风格日收益在每个 NAV 区间 (d[k-1], d[k]] 上复利累计后再回归，
+年化因子默认按 NAV 日期间隔推断（infer_periods_per_year）；exp_attribution 使用逐日盯市的日频 NAV。
+"""
+from __future__ import annotations
+
+import threading
+from typing import Dict, Hashable, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from database.readwrite.rw_latest_snapshots import get_latest_factor_date
+from database.utils.db_utils import get_db_connection
+from engine.analytics.metrics import (
+    TRADING_DAYS,
+    _as_2d,
+    _fingerprint,
+    _rolling_sum,
+    infer_periods_per_year,
+    load_nav_with_benchmark,
+    nav_to_returns,
+)
+from engine.analytics.panels import iter_factor_matrices, load_return_panel
+from engine.analytics.quantiles import assign_quantiles, bucket_returns
+from utils.logger import get_logger
+
+log = get_logger("attribution")
+
+# 风格名 -> (factor_name, ascending)；ascending 与 FactorSpec 同义：True 表示做多因子值高的一端
+STYLE_FACTORS: Dict[str, Tuple[str, bool]] = {
+    "MOM": ("mom_12m_skip1m", True),
+    "LOWVOL": ("vol_60d_ann", False),
+    "SIZE": ("dv_60d_log", False),
+    "VALUE": ("val_bp", True),
+}
+MARKET = "MKT"
+
+DEFAULT_WINDOW = 126
+DEFAULT_N_QUANTILES = 3
+DEFAULT_REBALANCE = 21
+
+# rolling_ols 按回测分块，限制 [T, R, K+1, K+1] 中间数组的内存
+_RUN_CHUNK = 64
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 风格因子收益
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def long_short_returns(
+    factor: np.ndarray,
+    daily_forward: np.ndarray,
+    *,
+    ascending: bool = True,
+    n_quantiles: int = DEFAULT_N_QUANTILES,
+    rebalance_every: int = DEFAULT_REBALANCE,
+) -> np.ndarray:
+    """
+    单个因子的多空日收益
+
+    factor / daily_forward : [T, N]，daily_forward[t] 为 t -> t+1 的收益
+    Returns: [T]，第 t 个值是 t -> t+1 的多空收益；任一端当日没有成员时为 NaN
+    """
+    if rebalance_every < 1:
+        raise ValueError(f"rebalance_every must be >= 1, got {rebalance_every}")
+
+    t = factor.shape[0]
+    idx = np.arange(0, t, rebalance_every)
+    buckets = assign_quantiles(factor[idx], n_quantiles)
+    held = buckets[np.arange(t) // rebalance_every]
+
+    ret, _ = bucket_returns(held, daily_forward, n_quantiles)
+    spread = ret[:, -1] - ret[:, 0]
+    return spread if ascending else -spread
+
+
+def style_returns_frame(
+    dates: np.ndarray,
+    daily_forward: np.ndarray,
+    factors: Mapping[str, Tuple[np.ndarray, bool]],
+    *,
+    n_quantiles: int = DEFAULT_N_QUANTILES,
+    rebalance_every: int = DEFAULT_REBALANCE,
+) -> pd.DataFrame:
+    """
+    风格收益表：DataFrame[date] -> MKT, <风格名> ...
+
+    factors : 风格名 -> (因子矩阵 [T, N], ascending)
+    收益按实现日标注（t -> t+1 的收益记在 dates[t+1]），与 nav_to_returns 的口径一致；
+    没有任何有效值的风格列被剔除。
+    """
+    cols: Dict[str, np.ndarray] = {}
+    with np.errstate(invalid="ignore"):
+        valid = np.isfinite(daily_forward)
+        n = valid.sum(axis=1)
+        cols[MARKET] = np.where(n > 0, np.where(valid, daily_forward, 0.0).sum(axis=1) / np.maximum(n, 1), np.nan)
+
+    for name, (mat, ascending) in factors.items():
+        ls = long_short_returns(
+            mat, daily_forward, ascending=ascending, n_quantiles=n_quantiles, rebalance_every=rebalance_every
+        )
+        if not np.isfinite(ls).any():
+            log.warning(f"[attribution] style {name} has no data in range, dropped")
+            continue
+        cols[name] = ls
+
+    index = pd.Index(pd.to_datetime(np.asarray(dates)[1:]), name="date")
+    return pd.DataFrame({k: v[:-1] for k, v in cols.items()}, index=index)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# OLS
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def _design(y, x) -> Tuple[np.ndarray, np.ndarray, np.ndarray, bool]:
+    """(y[T, R] 缺失置 0, X1[T, K+1] 含截距且缺失置 0, valid[T, R], squeeze)"""
+    y2, squeeze = _as_2d(y)
+    x2 = np.asarray(x, dtype=np.float64)
+    if x2.ndim == 1:
+        x2 = x2[:, None]
+    if x2.shape[0] != y2.shape[0]:
+        raise ValueError(f"x length {x2.shape[0]} != y length {y2.shape[0]}")
+
+    x1 = np.hstack([np.ones((x2.shape[0], 1)), x2])
+    valid = np.isfinite(x1).all(axis=1)[:, None] & np.isfinite(y2)
+    return np.where(valid, y2, 0.0), np.where(np.isfinite(x1), x1, 0.0), valid, squeeze
+
+
+def _solve(xtx: np.ndarray, xty: np.ndarray) -> np.ndarray:
+    """批量解 X'X b = X'y（[..., K, K] / [..., K]）；有奇异矩阵时整批退回伪逆"""
+    try:
+        return np.linalg.solve(xtx, xty[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        return (np.linalg.pinv(xtx) @ xty[..., None])[..., 0]
+
+
+def _fit_moments(
+    xtx: np.ndarray, xty: np.ndarray, yy: np.ndarray, sy: np.ndarray, n: np.ndarray, min_obs: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    由充分统计量解 OLS（前导维度任意）
+
+    Returns: (coef[..., K], sse[...], r2[...], ok[...])；样本不足 min_obs 的位置 coef 为 NaN
+    """
+    k = xtx.shape[-1]
+    ok = n >= max(min_obs, k + 1)
+    # 样本不足的位置用单位阵占位，避免整批求解因奇异失败
+    eye = np.broadcast_to(np.eye(k), xtx.shape)
+    coef = _solve(np.where(ok[..., None, None], xtx, eye), np.where(ok[..., None], xty, 0.0))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sse = np.maximum(yy - (coef * xty).sum(axis=-1), 0.0)
+        sst = yy - sy * sy / n
+        r2 = np.where(sst > 0, 1.0 - sse / sst, np.nan)
+
+    coef[~ok] = np.nan
+    sse = np.where(ok, sse, np.nan)
+    r2 = np.where(ok, r2, np.nan)
+    return coef, sse, r2, ok
+
+
+def rolling_ols(y, x, window: int = DEFAULT_WINDOW, *, min_obs: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    滚动 OLS：y = a + x @ b + e，窗口为截至 t（含）的 window 行
+
+    y : [T] 或 [T, R]；x : [T, K]（不含截距）。任一列缺失的行不参与该窗口；
+    窗口内有效样本 < min_obs（默认 window）时结果为 NaN。
+
+    Returns
+    -------
+    {"coef": [T, (R,) K+1]（第 0 列为截距）, "r2": [T, (R)], "resid_std": [T, (R)], "n_obs": [T, (R)]}
+    """
+    if window < 2:
+        raise ValueError(f"window must be >= 2, got {window}")
+    min_obs = window if min_obs is None else int(min_obs)
+
+    yz, x1, valid, squeeze = _design(y, x)
+    t, r = yz.shape
+    k = x1.shape[1]
+    outer = x1[:, :, None] * x1[:, None, :]
+
+    coef = np.full((t, r, k), np.nan)
+    r2 = np.full((t, r), np.nan)
+    resid_std = np.full((t, r), np.nan)
+    n_obs = np.zeros((t, r))
+
+    for lo in range(0, r, _RUN_CHUNK):
+        hi = min(lo + _RUN_CHUNK, r)
+        w = valid[:, lo:hi].astype(np.float64)
+        yc = yz[:, lo:hi]
+
+        n = _rolling_sum(w, window)
+        xtx = _rolling_sum(w[:, :, None, None] * outer[:, None], window)
+        xty = _rolling_sum(yc[:, :, None] * x1[:, None, :], window)
+        yy = _rolling_sum(yc * yc, window)
+        sy = _rolling_sum(yc, window)
+
+        head = window - 1
+        c, sse, rr, ok = _fit_moments(xtx[head:], xty[head:], yy[head:], sy[head:], n[head:], min_obs)
+        coef[head:, lo:hi] = c
+        r2[head:, lo:hi] = rr
+        with np.errstate(divide="ignore", invalid="ignore"):
+            resid_std[head:, lo:hi] = np.where(ok, np.sqrt(sse / (n[head:] - k)), np.nan)
+        n_obs[head:, lo:hi] = n[head:]
+
+    out = {"coef": coef, "r2": r2, "resid_std": resid_std, "n_obs": n_obs}
+    if squeeze:
+        return {key: v[:, 0] for key, v in out.items()}
+    return out
+
+
+def attribute(
+    y,
+    x,
+    factor_names: Sequence[str],
+    *,
+    periods_per_year: int = TRADING_DAYS,
+    min_obs: int = 20,
+    run_ids: Optional[Sequence[Hashable]] = None,
+) -> pd.DataFrame:
+    """
+    全区间归因（一行一个回测）
+
+    列：alpha（年化）, alpha_t, r2, resid_vol（年化）, n_obs,
+        beta_<F>, t_<F>, contrib_<F>（= beta * 因子收益均值 * periods_per_year）
+    """
+    yz, x1, valid, _ = _design(y, x)
+    r = yz.shape[1]
+    k = x1.shape[1]
+    if len(factor_names) != k - 1:
+        raise ValueError(f"{len(factor_names)} factor names for {k - 1} columns")
+
+    w = valid.astype(np.float64)
+    n = w.sum(axis=0)
+    xtx = np.einsum("tr,tk,tl->rkl", w, x1, x1)
+    xty = np.einsum("tr,tk->rk", yz, x1)
+    coef, sse, r2, ok = _fit_moments(xtx, xty, (yz * yz).sum(axis=0), yz.sum(axis=0), n, min_obs)
+
+    ppy = float(periods_per_year)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s2 = sse / (n - k)
+        safe = np.where(ok[:, None, None], xtx, np.eye(k))
+        se = np.sqrt(np.diagonal(np.linalg.pinv(safe), axis1=1, axis2=2) * s2[:, None])
+        tstat = coef / se
+        # 每个回测在自己的有效样本上取因子均值
+        fmean = np.einsum("tr,tk->rk", w, x1) / n[:, None]
+
+    data = {
+        "alpha": coef[:, 0] * ppy,
+        "alpha_t": tstat[:, 0],
+        "r2": r2,
+        "resid_vol": np.sqrt(s2 * ppy),
+        "n_obs": n,
+    }
+    for j, name in enumerate(factor_names, start=1):
+        data[f"beta_{name}"] = coef[:, j]
+        data[f"t_{name}"] = tstat[:, j]
+        data[f"contrib_{name}"] = coef[:, j] * fmean[:, j] * ppy
+
+    index = pd.Index(list(run_ids) if run_ids is not None else range(r), name="run_id")
+    return pd.DataFrame(data, index=index)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 按回测缓存
+# ----------------------------------------------------------------------------------------------------------------------------------------
+_CACHE: Dict[Hashable, Tuple[str, pd.DataFrame]] = {}
+_LOCK = threading.Lock()
+
+
+def compound_styles(styles: pd.DataFrame, dates) -> np.ndarray:
+    """
+    风格日收益在每个区间 (dates[k-1], dates[k]] 上复利累计 -> [len(dates), F]
+
+    首行为 NaN；区间内没有风格数据或有缺失日时为 NaN。日期与风格表一致的日频 NAV 上等于原始日收益。
+    """
+    idx = pd.DatetimeIndex(pd.to_datetime(dates))
+    s = styles.sort_index()
+    with np.errstate(invalid="ignore"):
+        log_r = np.log1p(s.to_numpy(dtype=np.float64))
+    missing = np.isnan(log_r)
+
+    zero = np.zeros((1, log_r.shape[1]))
+    cum = np.vstack([zero, np.cumsum(np.where(missing, 0.0, log_r), axis=0)])
+    cnt = np.vstack([zero, np.cumsum(missing, axis=0)])
+
+    # pos[k] = 风格表中日期 <= dates[k] 的行数
+    pos = pd.DatetimeIndex(pd.to_datetime(s.index)).searchsorted(idx, side="right")
+    out = np.full((len(idx), log_r.shape[1]), np.nan)
+    lo, hi = pos[:-1], pos[1:]
+    seg = np.expm1(cum[hi] - cum[lo])
+    bad = ((cnt[hi] - cnt[lo]) > 0) | (hi == lo)[:, None]
+    out[1:] = np.where(bad, np.nan, seg)
+    return out
+
+
+def _aligned(navs: pd.DataFrame, styles: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """NAV -> 区间收益，风格收益在同一区间上复利累计（缺失为 NaN，不参与回归）"""
+    y = nav_to_returns(navs.to_numpy(dtype=np.float64))
+    x = compound_styles(styles, navs.index)
+    return y, x
+
+
+def get_attribution_many(
+    navs: pd.DataFrame,
+    styles: pd.DataFrame,
+    *,
+    periods_per_year: Optional[int] = None,
+    min_obs: int = 20,
+) -> pd.DataFrame:
+    """
+    多个回测（DataFrame：行 = 日期，列 = run_id）对同一组风格收益的全区间归因
+
+    缓存命中的列不重算，其余列一次性按 2-D 回归。periods_per_year=None 时按 NAV 日期间隔推断。
+    """
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(navs.index)
+    y, x = _aligned(navs, styles)
+    params = np.array([periods_per_year, min_obs])
+    names = list(styles.columns)
+    x_key = _fingerprint(x, params)
+    keys = {rid: f"{_fingerprint(y[:, j])}:{x_key}:{','.join(names)}" for j, rid in enumerate(navs.columns)}
+
+    with _LOCK:
+        cached = {rid: _CACHE[rid][1] for rid, k in keys.items() if rid in _CACHE and _CACHE[rid][0] == k}
+
+    missing = [j for j, rid in enumerate(navs.columns) if rid not in cached]
+    if missing:
+        ids = [navs.columns[j] for j in missing]
+        fresh = attribute(y[:, missing], x, names, periods_per_year=periods_per_year, min_obs=min_obs, run_ids=ids)
+        with _LOCK:
+            for rid in ids:
+                _CACHE[rid] = (keys[rid], fresh.loc[[rid]])
+        cached.update({rid: fresh.loc[[rid]] for rid in ids})
+
+    return pd.concat([cached[rid] for rid in navs.columns])
+
+
+def get_attribution(
+    run_id: Hashable,
+    nav: pd.Series,
+    styles: pd.DataFrame,
+    *,
+    periods_per_year: Optional[int] = None,
+    min_obs: int = 20,
+) -> pd.Series:
+    """单个回测（Series[date] -> nav）的全区间归因，按 run_id 缓存"""
+    frame = nav.to_frame(run_id)
+    return get_attribution_many(frame, styles, periods_per_year=periods_per_year, min_obs=min_obs).iloc[0]
+
+
+def clear_attribution_cache():
+    with _LOCK:
+        _CACHE.clear()
+
+
+def rolling_attribution(
+    nav: pd.Series,
+    styles: pd.DataFrame,
+    window: int = DEFAULT_WINDOW,
+    *,
+    periods_per_year: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    单个回测的滚动归因：DataFrame[date] -> alpha（年化）, beta_<F> ..., r2
+
+    window 按 NAV 期数计（日频 NAV 上 126 ≈ 半年）；periods_per_year=None 时按 NAV 日期间隔推断
+    """
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(nav.index)
+    y, x = _aligned(nav.to_frame(), styles)
+    res = rolling_ols(y[:, 0], x, window)
+    out = pd.DataFrame(index=pd.Index(pd.to_datetime(nav.index), name="date"))
+    out["alpha"] = res["coef"][:, 0] * periods_per_year
+    for j, name in enumerate(styles.columns, start=1):
+        out[f"beta_{name}"] = res["coef"][:, j]
+    out["r2"] = res["r2"]
+    return out
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 数据库入口
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def load_style_returns(
+    conn,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    *,
+    styles: Mapping[str, Tuple[str, bool]] = STYLE_FACTORS,
+    n_quantiles: int = DEFAULT_N_QUANTILES,
+    rebalance_every: int = DEFAULT_REBALANCE,
+    factor_version: str = "v1",
+) -> pd.DataFrame:
+    """
+    从 factor_values + 价格面板构造风格收益表（DataFrame[date] -> MKT, <风格名> ...）
+
+    同一区间只需构造一次，参数扫描的所有回测共用。
+    """
+    if end_date is None:
+        end_date = get_latest_factor_date(conn, factor_version)
+
+    panel = load_return_panel(conn, start_date, end_date, (1,))
+    log.info(
+        f"[attribution] panel {panel.shape[0]} dates x {panel.shape[1]} instruments, "
+        f"styles={list(styles)}, Q{n_quantiles}, rebalance every {rebalance_every}d"
+    )
+
+    by_factor = {factor_name: style for style, (factor_name, _) in styles.items()}
+    mats = {
+        by_factor[factor_name]: (mat, styles[by_factor[factor_name]][1])
+        for factor_name, mat in iter_factor_matrices(conn, by_factor, panel, factor_version)
+    }
+    return style_returns_frame(
+        panel.dates, panel.forward[1], mats, n_quantiles=n_quantiles, rebalance_every=rebalance_every
+    )
+
+
+def exp_attribution(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    *,
+    window: int = DEFAULT_WINDOW,
+    run_id: Hashable = "exp_positions",
+    conn=None,
+) -> Tuple[pd.Series, pd.DataFrame]:
+    """
+    当前 exp_positions 回测的风格归因（调仓日快照逐日盯市后的日频 NAV 对风格日收益回归）
+
+    Returns: (全区间归因 Series, 滚动归因 DataFrame)
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+        if not conn:
+            raise RuntimeError("failed to get db connection")
+
+    try:
+        nav = load_nav_with_benchmark(conn, None, start_date, end_date)
+        if nav.empty:
+            raise RuntimeError("exp_positions NAV is empty")
+
+        dates = nav.index
+        styles = load_style_returns(conn, str(dates[0].date()), str(dates[-1].date()))
+        summary = get_attribution(run_id, nav["nav"], styles)
+        return summary, rolling_attribution(nav["nav"], styles, window)
+
+    finally:
+        if own_conn:
+            conn.close()
@@ -0,0 +1,370 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+因子相关性与冗余分析
+
+逐日截面 rank 相关（所有因子两两之间）：
+- 每个因子加载一次、按行 rank（rank_rows），按 step 抽样调仓日后以 float32 保存 [K, T', N]
+- 按日期分块做批量矩阵乘：对每个日期同时得到 K×K 的联合样本数 / 和 / 平方和 / 积和，
+  一次算出该日所有因子对的相关系数（只用两个因子都有值的标的）
+
+rank 先在各因子自身的有效集合上计算；某日两个因子覆盖的标的不同时，该因子对在联合样本上重新 rank
+（_joint_rank_corr：按覆盖模式分组，每个因子排序一次后对联合成员计数；同一对分组间的因子对共用一次矩阵乘），
+结果与逐对 Spearman 完全一致。
+
+聚类：距离 = 1 - |平均相关|，平均链接层次聚类，|相关| >= threshold 的因子归为一簇；
+每簇保留一个代表因子（给定 scores 时取分数最高者，例如 |ICIR|，否则取簇内平均相关最高的中心因子）。
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import fcluster, linkage
+from scipy.spatial.distance import squareform
+
+from database.readwrite.rw_latest_snapshots import get_latest_factor_date, list_factor_names
+from database.utils.db_utils import get_db_connection
+from engine.analytics.ic import rank_rows
+from engine.analytics.panels import iter_factor_matrices, load_return_panel
+from utils.logger import get_logger
+
+log = get_logger("factor_correlation")
+
+DEFAULT_STEP = 5
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_MIN_OBS = 30
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 批量相关
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def pairwise_corr(values: np.ndarray, min_obs: int = DEFAULT_MIN_OBS) -> np.ndarray:
+    """
+    逐日所有变量两两之间的 Pearson 相关（只用两边都有值的列）
+
+    values : [K, T, N]（K 个变量，T 个日期，N 个标的；缺失为 NaN）；按 values 的 dtype 计算，
+             float32 输入应先去中心化（factor_correlations 存的是居中后的分位秩）
+    返回   : [T, K, K]；联合样本 < min_obs 或某一方方差为 0 时为 NaN，对角线为 1
+
+    每个日期只做一次 GEMM：[x; m; x²] (3K × N) @ [x; m]ᵀ (N × 2K)，
+    一次得到所有因子对在联合样本上的积和 / 和 / 样本数 / 平方和。
+    （小矩阵的批量 matmul 不走 BLAS，逐日 2-D GEMM 反而快数倍，也不需要 [T, K, N] 的临时数组）
+    """
+    k, t, n = values.shape
+    dtype = values.dtype if values.dtype in (np.float32, np.float64) else np.float64
+    out = np.full((t, k, k), np.nan)
+    lhs = np.empty((3 * k, n), dtype=dtype)
+    rhs = np.empty((2 * k, n), dtype=dtype)
+
+    for d in range(t):
+        v = values[:, d, :]
+        m = np.isfinite(v)
+        np.copyto(lhs[:k], np.where(m, v, 0))
+        lhs[k:2 * k] = m
+        np.multiply(lhs[:k], lhs[:k], out=lhs[2 * k:])
+        rhs[:] = lhs[:2 * k]
+
+        p = (lhs @ rhs.T).astype(np.float64)
+        sxy, sx, cnt, sxx = p[:k, :k], p[:k, k:], p[k:2 * k, k:], p[2 * k:, k:]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ma = sx / cnt
+            va = sxx / cnt - ma * ma
+            corr = (sxy / cnt - ma * ma.T) / np.sqrt(va * va.T)
+
+        tol = 1e-6 * np.maximum(sxx / np.maximum(cnt, 1), 1e-30)
+        bad = (cnt < max(min_obs, 2)) | (va <= tol) | (va.T <= tol.T)
+        corr[bad] = np.nan
+        out[d] = np.clip(corr, -1.0, 1.0)
+
+    diag = np.arange(k)
+    out[:, diag, diag] = np.where(np.isfinite(out[:, diag, diag]), 1.0, np.nan)
+    return out
+
+
+def _subset_ranks(x: np.ndarray, masks: np.ndarray) -> np.ndarray:
+    """
+    x 在每个子集 masks[b] & isfinite(x) 上的平均秩（1 起） -> [B, N]，子集外为 NaN
+
+    x 只排序一次：按 x 的顺序对子集成员做累计计数，并列值取组内平均秩。
+    """
+    valid = np.isfinite(x)
+    order = np.flatnonzero(valid)[np.argsort(x[valid], kind="stable")]
+    out = np.full(masks.shape, np.nan)
+    if len(order) == 0:
+        return out
+
+    s = x[order]
+    keep = masks[:, order]
+    c = np.concatenate([np.zeros((len(masks), 1)), np.cumsum(keep, axis=1)], axis=1)
+
+    new = np.r_[True, s[1:] != s[:-1]]
+    gid = np.cumsum(new) - 1
+    starts = np.flatnonzero(new)
+    ends = np.r_[starts[1:], len(s)]
+    before = c[:, starts]
+    avg = before + (c[:, ends] - before + 1.0) / 2.0
+
+    out[:, order] = np.where(keep, avg[:, gid], np.nan)
+    return out
+
+
+def _joint_rank_corr(ranks: np.ndarray, out: np.ndarray, min_obs: int) -> None:
+    """
+    对每个日期有效集合不同的因子对，在联合样本上重新 rank 后求相关，就地覆盖 out[d, i, j]
+
+    ranks : [K, T, N] 各因子在自身有效集合上的（居中）秩，顺序与原始因子值一致
+    有效集合相同的因子归为一组：因子 i 对另一组只需在「i 的集合 & 该组集合」上 rank 一次，
+    成本 ∝ K × 组数 × N（覆盖模式通常只有几种：全市场 / 历史长度不足 / 基本面缺失）。
+    """
+    k, t, _ = ranks.shape
+    for d in range(t):
+        v = ranks[:, d, :].astype(np.float64)
+        m = np.isfinite(v)
+        keys: Dict[bytes, int] = {}
+        group = np.array([keys.setdefault(row.tobytes(), len(keys)) for row in np.packbits(m, axis=1)])
+        if len(keys) == 1:
+            continue
+        masks = m[[int(np.flatnonzero(group == g)[0]) for g in range(len(keys))]]
+
+        # joint[i][g] = 因子 i 在 m[i] & masks[g] 上的秩（g != group[i]）
+        n_groups = len(masks)
+        joint = {}
+        for i in range(k):
+            others = np.flatnonzero(np.arange(n_groups) != group[i])
+            joint[i] = dict(zip(others.tolist(), _subset_ranks(v[i], masks[others])))
+
+        # 两组之间的所有因子对共享同一联合样本：居中后一次矩阵乘得到整块相关
+        for ga in range(n_groups):
+            for gb in range(ga + 1, n_groups):
+                both = masks[ga] & masks[gb]
+                ia, ib = np.flatnonzero(group == ga), np.flatnonzero(group == gb)
+                if both.sum() < max(min_obs, 2):
+                    out[d][np.ix_(ia, ib)] = np.nan
+                    out[d][np.ix_(ib, ia)] = np.nan
+                    continue
+                x = np.stack([joint[i][gb][both] for i in ia])
+                y = np.stack([joint[j][ga][both] for j in ib])
+                x -= x.mean(axis=1, keepdims=True)
+                y -= y.mean(axis=1, keepdims=True)
+                sx, sy = np.einsum("ij,ij->i", x, x), np.einsum("ij,ij->i", y, y)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    block = (x @ y.T) / np.sqrt(np.outer(sx, sy))
+                block[(sx <= 0)[:, None] | (sy <= 0)[None, :]] = np.nan
+                block = np.clip(block, -1.0, 1.0)
+                out[d][np.ix_(ia, ib)] = block
+                out[d][np.ix_(ib, ia)] = block.T
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 结果
+# ----------------------------------------------------------------------------------------------------------------------------------------
+@dataclass
+class CorrelationResult:
+    """
+    factor_names : K 个因子
+    dates        : T' 个抽样日期
+    corr         : [T', K, K] 逐日截面 rank 相关
+    """
+
+    factor_names: List[str]
+    dates: np.ndarray
+    corr: np.ndarray
+
+    def mean(self) -> pd.DataFrame:
+        """全历史平均相关矩阵"""
+        with np.errstate(invalid="ignore"):
+            m = np.nanmean(self.corr, axis=0) if len(self.dates) else np.full((len(self.factor_names),) * 2, np.nan)
+        return pd.DataFrame(m, index=self.factor_names, columns=self.factor_names)
+
+    def stability(self) -> pd.DataFrame:
+        """相关系数的时间标准差（越小越稳定）"""
+        with np.errstate(invalid="ignore"):
+            s = np.nanstd(self.corr, axis=0)
+        return pd.DataFrame(s, index=self.factor_names, columns=self.factor_names)
+
+    def pair_series(self, a: str, b: str) -> pd.Series:
+        i, j = self.factor_names.index(a), self.factor_names.index(b)
+        return pd.Series(self.corr[:, i, j], index=pd.to_datetime(self.dates), name=f"{a}~{b}")
+
+    def pairs(self) -> pd.DataFrame:
+        """因子对汇总（按 |mean_corr| 降序）：mean_corr, std_corr, min_corr, max_corr, n_dates"""
+        k = len(self.factor_names)
+        rows = []
+        with np.errstate(invalid="ignore"):
+            for i in range(k):
+                for j in range(i + 1, k):
+                    s = self.corr[:, i, j]
+                    s = s[np.isfinite(s)]
+                    rows.append(
+                        {
+                            "factor_a": self.factor_names[i],
+                            "factor_b": self.factor_names[j],
+                            "mean_corr": s.mean() if len(s) else np.nan,
+                            "std_corr": s.std(ddof=1) if len(s) > 1 else np.nan,
+                            "min_corr": s.min() if len(s) else np.nan,
+                            "max_corr": s.max() if len(s) else np.nan,
+                            "n_dates": len(s),
+                        }
+                    )
+        df = pd.DataFrame(rows, columns=["factor_a", "factor_b", "mean_corr", "std_corr", "min_corr", "max_corr", "n_dates"])
+        return df.reindex(df["mean_corr"].abs().sort_values(ascending=False).index).reset_index(drop=True)
+
+
+def factor_correlations(
+    factors: Mapping[str, np.ndarray] | Sequence,
+    dates: np.ndarray,
+    *,
+    step: int = DEFAULT_STEP,
+    min_obs: int = DEFAULT_MIN_OBS,
+) -> CorrelationResult:
+    """
+    factors : {name: [T, N]} 或 (name, [T, N]) 的可迭代对象（可以是生成器，逐个消费）
+    每个因子只保留第 0, step, 2*step, ... 行，rank 后以 float32 保存（K × T/step × N × 4 字节）。
+    """
+    if step < 1:
+        raise ValueError(f"step must be >= 1, got {step}")
+
+    items = factors.items() if isinstance(factors, Mapping) else factors
+    names: List[str] = []
+    ranks: List[np.ndarray] = []
+    for name, mat in items:
+        names.append(name)
+        r = rank_rows(np.asarray(mat, dtype=np.float64)[::step])
+        # 分位秩居中到 [-0.5, 0.5]：float32 存储与计算都不会损失精度
+        n_valid = np.isfinite(r).sum(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ranks.append(((r - (n_valid + 1) / 2.0) / np.maximum(n_valid, 1)).astype(np.float32))
+
+    sampled = np.asarray(dates)[::step]
+    if not ranks:
+        return CorrelationResult([], sampled, np.empty((len(sampled), 0, 0)))
+    stacked = np.stack(ranks)
+    corr = pairwise_corr(stacked, min_obs=min_obs)
+    _joint_rank_corr(stacked, corr, min_obs)
+    return CorrelationResult(names, sampled, corr)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 聚类 / 冗余
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def cluster_factors(
+    mean_corr: pd.DataFrame,
+    threshold: float = DEFAULT_THRESHOLD,
+    scores: Optional[Mapping[str, float]] = None,
+) -> pd.DataFrame:
+    """
+    平均链接层次聚类（距离 = 1 - |相关|，在 1 - threshold 处切开）
+
+    Returns
+    -------
+    DataFrame：factor_name, cluster, representative, nearest, nearest_corr, redundant
+    redundant = 所在簇有多个因子且自己不是代表因子（可以考虑剪掉）
+    """
+    names = list(mean_corr.index)
+    k = len(names)
+    cols = ["factor_name", "cluster", "representative", "nearest", "nearest_corr", "redundant"]
+    if k == 0:
+        return pd.DataFrame(columns=cols)
+
+    c = mean_corr.to_numpy(dtype=np.float64).copy()
+    c = np.where(np.isfinite(c), c, 0.0)
+    np.fill_diagonal(c, 1.0)
+    absc = np.abs((c + c.T) / 2.0)
+
+    if k == 1:
+        labels = np.array([1])
+    else:
+        dist = np.clip(1.0 - absc, 0.0, None)
+        np.fill_diagonal(dist, 0.0)
+        labels = fcluster(linkage(squareform(dist, checks=False), method="average"), t=1.0 - threshold, criterion="distance")
+
+    off = absc.copy()
+    np.fill_diagonal(off, -np.inf)
+    nearest = off.argmax(axis=1) if k > 1 else np.array([0])
+
+    rep: Dict[int, str] = {}
+    for lab in np.unique(labels):
+        members = np.flatnonzero(labels == lab)
+        if scores is not None and any(names[i] in scores for i in members):
+            best = max(members, key=lambda i: (np.nan_to_num(scores.get(names[i], -np.inf), nan=-np.inf), -i))
+        else:
+            best = members[np.argmax(absc[np.ix_(members, members)].mean(axis=1))]
+        rep[int(lab)] = names[best]
+
+    sizes = pd.Series(labels).value_counts()
+    rows = []
+    for i, name in enumerate(names):
+        lab = int(labels[i])
+        rows.append(
+            {
+                "factor_name": name,
+                "cluster": lab,
+                "representative": rep[lab],
+                "nearest": names[nearest[i]] if k > 1 else None,
+                "nearest_corr": float(c[i, nearest[i]]) if k > 1 else np.nan,
+                "redundant": bool(sizes[lab] > 1 and rep[lab] != name),
+            }
+        )
+    return pd.DataFrame(rows, columns=cols).sort_values(["cluster", "redundant", "factor_name"]).reset_index(drop=True)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 入口
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def run_correlation_analysis(
+    factor_names: Optional[Sequence[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    *,
+    step: int = DEFAULT_STEP,
+    threshold: float = DEFAULT_THRESHOLD,
+    scores: Optional[Mapping[str, float]] = None,
+    factor_version: str = "v1",
+    conn=None,
+):
+    """
+    加载所有因子 -> 逐日 rank 相关 -> 聚类
+
+    Returns: (CorrelationResult, clusters_df)
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+        if not conn:
+            raise RuntimeError("failed to get db connection")
+
+    try:
+        if factor_names is None:
+            factor_names = list_factor_names(conn, factor_version)
+        if end_date is None:
+            end_date = get_latest_factor_date(conn, factor_version)
+
+        # 只需要坐标轴：不取前瞻收益
+        panel = load_return_panel(conn, start_date, end_date, ())
+        log.info(
+            f"[corr] {len(factor_names)} factors, {panel.shape[0]} dates (step={step}) x {panel.shape[1]} instruments"
+        )
+
+        result = factor_correlations(
+            iter_factor_matrices(conn, factor_names, panel, factor_version), panel.dates, step=step
+        )
+        return result, cluster_factors(result.mean(), threshold=threshold, scores=scores)
+
+    finally:
+        if own_conn:
+            conn.close()
@@ -0,0 +1,421 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+因子衰减与拥挤监控（每日增量）
+
+每个因子每个交易日一行（factor_monitor 表）：
+- 当日截面：Spearman IC、Q5 - Q1 多空收益（持有 horizon 日），均只在前瞻收益已实现后计算
+- 滚动窗口（最近 window 个交易日）：平均 IC、ICIR、命中率（IC > 0 的比例）、多空收益均值
+- 长期均值 ic_longrun：逐行累计（n_days 个有效 IC 的均值），用来确定因子的「预期方向」
+- status：有效 ICIR = 滚动 ICIR × sign(ic_longrun)
+    < decay_icir -> decayed；< warn_icir -> weak；否则 ok；窗口样本不足 -> insufficient
+- 拥挤度（估值价差）：val_spread = 多头组与空头组的估值分位均值之差（估值因子默认 val_bp，越高越便宜）；
+  crowding_z = 当日价差相对滚动窗口的 z 值，按长期方向翻转后取负：越大说明有效多头腿相对空头腿越贵，
+  资金挤进同一侧。crowding_z >= factor_monitor.crowding_z 的因子也计入告警
+
+增量：前瞻收益在 t + horizon 日才可知，所以每天新增的是 horizon 个交易日之前那一天的截面。
+只加载新日期的 forward_returns 和 factor_values，滚动量用表中每个因子最近 window-1 行补齐窗口，
+不重算历史（每日只涉及几十个因子 × 一个截面）。水位按因子分别记录：新加入的因子（表中无记录）从
+start_date 起回填，已有因子只补各自水位之后的日期；首次运行时按 chunk_days 分块回填全部历史，走同一路径。
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from database.readwrite.rw_factor_monitor import (
+    copy_factor_monitor,
+    delete_factor_monitor,
+    get_last_monitor_dates,
+    get_latest_monitor,
+    get_monitor_tail,
+)
+from database.readwrite.rw_factor_values import load_factor_panel
+from database.readwrite.rw_forward_returns import load_forward_returns
+from database.readwrite.rw_latest_snapshots import get_latest_factor_date, list_factor_names
+from database.readwrite.rw_trading_calendar import get_trading_days
+from database.utils.db_utils import get_db_connection
+from engine.analytics.ic import rank_rows, rowwise_corr
+from engine.analytics.panels import build_stored_return_panel
+from engine.analytics.quantiles import assign_quantiles, bucket_returns
+from utils.config_loader import get_config_value
+from utils.config_values import DEFAULT_START_DATE
+from utils.logger import get_logger
+from utils.time import to_date
+
+log = get_logger("factor_monitor")
+
+DEFAULT_HORIZON = 21
+DEFAULT_WINDOW = 126
+DEFAULT_MIN_PERIODS = 63
+DEFAULT_WARN_ICIR = 0.1
+DEFAULT_DECAY_ICIR = 0.0
+DEFAULT_N_QUANTILES = 5
+DEFAULT_MIN_OBS = 30
+DEFAULT_CHUNK_DAYS = 250
+DEFAULT_CROWDING_FACTOR = "val_bp"
+DEFAULT_CROWDING_Z = 2.0
+
+ALERT_STATUSES = ("weak", "decayed")
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 纯计算
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def cross_section_stats(
+    factor: np.ndarray,
+    forward: np.ndarray,
+    *,
+    n_quantiles: int = DEFAULT_N_QUANTILES,
+    min_obs: int = DEFAULT_MIN_OBS,
+):
+    """
+    [D, N] 因子与前瞻收益 -> (ic[D], ls_return[D], n_obs[D])
+
+    只用两边都有值的标的；n_obs < min_obs 的截面 IC 为 NaN。
+    """
+    valid = np.isfinite(factor) & np.isfinite(forward)
+    f = np.where(valid, factor, np.nan)
+    ic, n = rowwise_corr(rank_rows(f), rank_rows(np.where(valid, forward, np.nan)), min_obs=min_obs)
+
+    ret, _ = bucket_returns(assign_quantiles(f, n_quantiles), forward, n_quantiles)
+    ls = ret[:, -1] - ret[:, 0]
+    ls[n < min_obs] = np.nan
+    return ic, ls, n
+
+
+def valuation_spread(
+    factor: np.ndarray,
+    valuation: np.ndarray,
+    *,
+    n_quantiles: int = DEFAULT_N_QUANTILES,
+    min_obs: int = DEFAULT_MIN_OBS,
+) -> np.ndarray:
+    """
+    [D, N] 因子与估值（越高越便宜）-> 多头组（最高分位）与空头组（最低分位）估值截面分位均值之差 [D]
+
+    估值分位在两边都有值的标的上计算，取值 0..1；有效样本 < min_obs 的截面为 NaN。
+    """
+    valid = np.isfinite(factor) & np.isfinite(valuation)
+    n = valid.sum(axis=1)
+    q = assign_quantiles(np.where(valid, factor, np.nan), n_quantiles)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct = (rank_rows(np.where(valid, valuation, np.nan)) - 1.0) / (n[:, None] - 1.0)
+        top, bottom = q == n_quantiles, q == 1
+        spread = (
+            np.where(top, pct, 0.0).sum(axis=1) / top.sum(axis=1)
+            - np.where(bottom, pct, 0.0).sum(axis=1) / bottom.sum(axis=1)
+        )
+    spread[n < max(min_obs, n_quantiles)] = np.nan
+    return spread
+
+
+def classify(rolling_icir, ic_longrun, *, warn_icir: float = DEFAULT_WARN_ICIR, decay_icir: float = DEFAULT_DECAY_ICIR) -> np.ndarray:
+    """有效 ICIR（按长期方向翻转）-> ok / weak / decayed / insufficient"""
+    icir = np.asarray(rolling_icir, dtype=np.float64)
+    eff = icir * np.sign(np.asarray(ic_longrun, dtype=np.float64))
+    out = np.full(icir.shape, "ok", dtype=object)
+    with np.errstate(invalid="ignore"):
+        out[eff < warn_icir] = "weak"
+        out[eff < decay_icir] = "decayed"
+    out[~np.isfinite(eff)] = "insufficient"
+    return out
+
+
+def _csum(a: np.ndarray) -> np.ndarray:
+    return np.concatenate([[0.0], np.cumsum(a)])
+
+
+def update_factor(
+    tail: pd.DataFrame,
+    new: pd.DataFrame,
+    *,
+    window: int = DEFAULT_WINDOW,
+    min_periods: int = DEFAULT_MIN_PERIODS,
+    warn_icir: float = DEFAULT_WARN_ICIR,
+    decay_icir: float = DEFAULT_DECAY_ICIR,
+) -> pd.DataFrame:
+    """
+    单个因子：在已有的最近若干行（tail，按日期升序）之后追加新截面，只计算新行的滚动量
+
+    tail : ic, ls_return, n_days, ic_longrun, val_spread（至少 window-1 行即可补齐窗口，可为空）
+    new  : date, ic, ls_return, n_obs, val_spread（可缺省，视为 NaN）
+    Returns: new 加上 n_days, ic_longrun, rolling_ic, rolling_icir, hit_rate, rolling_ls, crowding_z, status
+    """
+    def col(df, name):
+        if name not in df:
+            return np.full(len(df), np.nan)
+        return df[name].to_numpy(dtype=np.float64)
+
+    m = len(tail)
+    ic = col(new, "ic")
+    ls = col(new, "ls_return")
+    vs = col(new, "val_spread")
+    if m:
+        ic = np.concatenate([col(tail, "ic"), ic])
+        ls = np.concatenate([col(tail, "ls_return"), ls])
+        vs = np.concatenate([col(tail, "val_spread"), vs])
+
+    vi = np.isfinite(ic)
+    vl = np.isfinite(ls)
+    vv = np.isfinite(vs)
+    ic0 = np.where(vi, ic, 0.0)
+    ls0 = np.where(vl, ls, 0.0)
+    vs0 = np.where(vv, vs, 0.0)
+
+    hi = np.arange(m, len(ic)) + 1
+    lo = np.maximum(hi - window, 0)
+
+    def win(a):
+        c = _csum(a)
+        return c[hi] - c[lo]
+
+    cnt = win(vi.astype(np.float64))
+    s1 = win(ic0)
+    s2 = win(ic0 * ic0)
+    pos = win((ic0 > 0).astype(np.float64))
+    ls_cnt = win(vl.astype(np.float64))
+    ls_sum = win(ls0)
+    vs_cnt = win(vv.astype(np.float64))
+    vs_s1 = win(vs0)
+    vs_s2 = win(vs0 * vs0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = s1 / cnt
+        std = np.sqrt(np.maximum((s2 - cnt * mean * mean) / (cnt - 1.0), 0.0))
+        icir = np.where(std > 0, mean / std, np.nan)
+        hit = pos / cnt
+        roll_ls = ls_sum / ls_cnt
+        vs_mean = vs_s1 / vs_cnt
+        vs_std = np.sqrt(np.maximum((vs_s2 - vs_cnt * vs_mean * vs_mean) / (vs_cnt - 1.0), 0.0))
+        spread_z = np.where(vs_std > 0, (vs[m:] - vs_mean) / vs_std, np.nan)
+
+    enough = cnt >= min_periods
+    mean[~enough] = np.nan
+    icir[~enough] = np.nan
+    hit[~enough] = np.nan
+    roll_ls[ls_cnt < min_periods] = np.nan
+
+    # 长期均值：接着 tail 最后一行的累计量往下算
+    prev_n = int(tail["n_days"].iloc[-1]) if m else 0
+    prev_mean = float(tail["ic_longrun"].iloc[-1]) if m and prev_n > 0 else 0.0
+    new_valid = vi[m:]
+    n_days = prev_n + np.cumsum(new_valid)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        longrun = (prev_n * prev_mean + np.cumsum(ic0[m:])) / n_days
+    longrun[n_days == 0] = np.nan
+
+    # 有效多头腿越贵（按长期方向翻转后的价差越低于常态）越拥挤
+    crowding = -np.sign(longrun) * spread_z
+    crowding[vs_cnt < min_periods] = np.nan
+
+    out = new.copy()
+    out["n_days"] = n_days.astype(np.int64)
+    out["ic_longrun"] = longrun
+    out["rolling_ic"] = mean
+    out["rolling_icir"] = icir
+    out["hit_rate"] = hit
+    out["rolling_ls"] = roll_ls
+    out["val_spread"] = vs[m:]
+    out["crowding_z"] = crowding
+    out["status"] = classify(icir, longrun, warn_icir=warn_icir, decay_icir=decay_icir)
+    return out
+
+
+def compute_chunk(
+    forward_long: pd.DataFrame,
+    factor_long: pd.DataFrame,
+    tail: pd.DataFrame,
+    horizon: int,
+    *,
+    window: int = DEFAULT_WINDOW,
+    min_periods: int = DEFAULT_MIN_PERIODS,
+    warn_icir: float = DEFAULT_WARN_ICIR,
+    decay_icir: float = DEFAULT_DECAY_ICIR,
+    n_quantiles: int = DEFAULT_N_QUANTILES,
+    min_obs: int = DEFAULT_MIN_OBS,
+    valuation_long: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    一段日期的监控行（所有因子）
+
+    forward_long   : forward_returns 长表（instrument_id, date, fwd_{horizon}d）
+    factor_long    : load_factor_panel 长表（instrument_id, date, factor_name, factor_value）
+    tail           : 各因子已有的最近行（get_monitor_tail 的格式）
+    valuation_long : 估值因子长表（instrument_id, date, factor_value），None 时 val_spread / crowding_z 为 NaN
+    只输出前瞻收益已实现（该日至少一个有效值）且因子有数据的 (因子, 日期)。
+    """
+    if forward_long.empty or factor_long.empty:
+        return pd.DataFrame()
+
+    panel = build_stored_return_panel(forward_long, (horizon,))
+    fwd = panel.forward[horizon]
+    realized = np.isfinite(fwd).any(axis=1)
+    if not realized.any():
+        return pd.DataFrame()
+    fwd = fwd[realized]
+    dates = pd.to_datetime(panel.dates[realized]).date
+    val = panel.align(valuation_long, "factor_value")[realized] if valuation_long is not None else None
+
+    frames = []
+    for name, g in factor_long.groupby("factor_name", sort=True):
+        mat = panel.align(g, "factor_value")[realized]
+        ic, ls, n = cross_section_stats(mat, fwd, n_quantiles=n_quantiles, min_obs=min_obs)
+        keep = n > 0
+        if not keep.any():
+            continue
+
+        new = pd.DataFrame({"date": dates[keep], "ic": ic[keep], "ls_return": ls[keep], "n_obs": n[keep]})
+        if val is not None:
+            new["val_spread"] = valuation_spread(mat, val, n_quantiles=n_quantiles, min_obs=min_obs)[keep]
+        prev = tail[tail["factor_name"] == name] if not tail.empty else tail
+        out = update_factor(
+            prev, new, window=window, min_periods=min_periods, warn_icir=warn_icir, decay_icir=decay_icir
+        )
+        out.insert(0, "factor_name", name)
+        frames.append(out)
+
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def _after_marks(factor_long: pd.DataFrame, starts: dict) -> pd.DataFrame:
+    """去掉各因子水位之前（已监控过）的行"""
+    if factor_long.empty:
+        return factor_long
+    first = pd.to_datetime(factor_long["factor_name"].map(starts))
+    return factor_long[pd.to_datetime(factor_long["date"]) >= first]
+
+
+def _alerts(conn, factor_version: str, horizon: int, crowding_z: float) -> pd.DataFrame:
+    """各因子最新一行中 status 为 weak / decayed，或 crowding_z >= 阈值的"""
+    latest = get_latest_monitor(conn, factor_version, horizon)
+    if latest.empty:
+        return latest
+    crowded = latest["crowding_z"].to_numpy(dtype=np.float64) >= crowding_z
+    return latest[latest["status"].isin(ALERT_STATUSES) | crowded].reset_index(drop=True)
+
+
+def run(
+    factor_names: Optional[Sequence[str]] = None,
+    *,
+    factor_version: str = "v1",
+    horizon: int = DEFAULT_HORIZON,
+    window: int = DEFAULT_WINDOW,
+    min_periods: int = DEFAULT_MIN_PERIODS,
+    start_date: Optional[str] = None,
+    force: bool = False,
+    chunk_days: int = DEFAULT_CHUNK_DAYS,
+    conn=None,
+) -> pd.DataFrame:
+    """
+    增量更新 factor_monitor，返回各因子最新状态中的告警行（weak / decayed，或 crowding_z 超阈值）
+
+    每个因子按自己的水位增量：表中没有记录的因子从 start_date（默认 data.default_start_date）回填。
+    force=True 时清空该版本 / 周期后全量回填。阈值读 config.yaml 的 factor_monitor.warn_icir / decay_icir /
+    crowding_z，估值因子读 factor_monitor.crowding_factor。
+    """
+    warn_icir = float(get_config_value("factor_monitor.warn_icir", DEFAULT_WARN_ICIR))
+    decay_icir = float(get_config_value("factor_monitor.decay_icir", DEFAULT_DECAY_ICIR))
+    crowding_z = float(get_config_value("factor_monitor.crowding_z", DEFAULT_CROWDING_Z))
+    crowding_factor = get_config_value("factor_monitor.crowding_factor", DEFAULT_CROWDING_FACTOR)
+
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+        if not conn:
+            raise RuntimeError("failed to get db connection")
+
+    try:
+        if force:
+            delete_factor_monitor(conn, factor_version, horizon)
+            marks = {}
+        else:
+            marks = get_last_monitor_dates(conn, factor_version, horizon)
+
+        names = list(factor_names) if factor_names is not None else list_factor_names(conn, factor_version)
+        # 每个因子从自己的水位之后开始；没有记录的（新因子）从 start_date 回填
+        first = to_date(start_date or DEFAULT_START_DATE())
+        starts = {n: to_date(marks[n]) + timedelta(days=1) if n in marks else first for n in names}
+        start = min(starts.values()) if starts else first
+
+        data_end = get_latest_factor_date(conn, factor_version)
+        if data_end is None or start > to_date(data_end):
+            log.info("[factor_monitor] already up to date, skip")
+            return _alerts(conn, factor_version, horizon, crowding_z)
+
+        tail = get_monitor_tail(conn, window - 1, factor_version, horizon) if marks else pd.DataFrame()
+
+        calendar = get_trading_days(conn, start.isoformat(), to_date(data_end).isoformat())
+        days = calendar["date"].tolist() if not calendar.empty else []
+        # 最后 horizon 个交易日的前瞻收益尚未实现（退市标的虽有退出价，但截面不完整），留到之后再算
+        days = days[:max(len(days) - horizon, 0)]
+        if not days:
+            log.info("[factor_monitor] no newly realized cross-section, skip")
+            return _alerts(conn, factor_version, horizon, crowding_z)
+        backfill = [n for n in names if n not in marks]
+        log.info(
+            f"[factor_monitor] {days[0]} -> {days[-1]}: {len(days)} trading days, {len(names)} factors "
+            f"({len(backfill)} without history), h={horizon}"
+        )
+
+        written = 0
+        for k in range(0, len(days), chunk_days):
+            chunk = days[k:k + chunk_days]
+            c0, c1 = str(chunk[0]), str(chunk[-1])
+            # 只加载这一段里还需要补的因子
+            todo = [n for n in names if starts[n] <= to_date(c1)]
+            if not todo:
+                continue
+            fwd_long = load_forward_returns(conn, (horizon,), start_date=c0, end_date=c1)
+            load_names = todo if crowding_factor in todo else todo + [crowding_factor]
+            loaded = load_factor_panel(conn, load_names, start_date=c0, end_date=c1, factor_version=factor_version)
+
+            is_val = loaded["factor_name"] == crowding_factor
+            valuation_long = loaded[is_val]
+            factor_long = _after_marks(loaded[loaded["factor_name"].isin(todo)], starts)
+
+            rows = compute_chunk(
+                fwd_long, factor_long, tail, horizon,
+                window=window, min_periods=min_periods, warn_icir=warn_icir, decay_icir=decay_icir,
+                valuation_long=valuation_long,
+            )
+            if rows.empty:
+                continue
+
+            written += copy_factor_monitor(conn, rows, factor_version, horizon)
+            conn.commit()
+            tail = pd.concat([tail, rows], ignore_index=True).groupby("factor_name").tail(window - 1)
+
+        alerts = _alerts(conn, factor_version, horizon, crowding_z)
+        for r in alerts.itertuples(index=False):
+            log.warning(
+                f"[factor_monitor] {r.factor_name} {r.status}: rolling ICIR={r.rolling_icir:.3f}, "
+                f"rolling IC={r.rolling_ic:.4f}, long-run IC={r.ic_longrun:.4f}, "
+                f"crowding z={r.crowding_z:.2f} (as of {r.date})"
+            )
+        log.info(f"[factor_monitor] finished: wrote={written}, alerts={len(alerts)}")
+        return alerts
+
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if own_conn:
+            conn.close()
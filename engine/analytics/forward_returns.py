@@ -0,0 +1,195 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+前瞻收益物化（forward_returns 表）
+
+一次向量化计算：价格面板按 trading_calendar 的交易日轴展开成 [T, N] 矩阵，
+对每个周期 h 做一次整块的「t+h 行 / t 行」：
+- 停牌缺价：取 t+h 及之前最后一个有效价格（前向填充）
+- 退市标的：t+h 超过最后一个价格时按最后价格退出（避免幸存者偏差）
+- 未退市但 t+h 超过其最后一个价格、或超过全库最新价格日：结果未知，NULL
+
+增量维护：system_state 记录已处理到的价格日期；每天只重算最近 max(h) 个交易日
+（这些行的长周期收益刚变得可知），按标的分批加载价格面板，二进制 COPY 写回。
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Dict, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from database.readwrite.rw_forward_returns import (
+    FORWARD_HORIZONS,
+    copy_forward_returns,
+    delete_forward_returns,
+)
+from database.readwrite.rw_instruments import get_delisted_instrument_ids
+from database.readwrite.rw_latest_snapshots import get_latest_prices
+from database.readwrite.rw_market_prices import get_price_max_date, load_price_panel
+from database.readwrite.rw_system_state import get_state, set_state
+from database.readwrite.rw_trading_calendar import get_trading_days
+from database.utils.db_utils import get_db_connection
+from engine.analytics.panels import pivot_panel
+from utils.config_values import DEFAULT_START_DATE
+from utils.logger import get_logger
+from utils.time import to_date
+
+log = get_logger("forward_returns")
+
+STATE_KEY = "forward_returns:v1"
+DEFAULT_CHUNK_SIZE = 500
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 纯计算
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def trading_axis(calendar_dates: Iterable, price_dates: np.ndarray, data_end) -> np.ndarray:
+    """
+    交易日轴：交易日历 ∪ 实际有价格的日期，截止到 data_end（datetime64[D]，已排序）
+
+    日历缺年份（未下载）时退化为价格日期，不会因此丢价格。
+    """
+    cal = np.asarray(pd.to_datetime(pd.Series(list(calendar_dates), dtype=object)).values, dtype="datetime64[D]")
+    axis = np.union1d(cal, np.asarray(price_dates, dtype="datetime64[D]"))
+    if len(price_dates):
+        axis = axis[axis >= np.min(price_dates)]
+    return axis[axis <= np.datetime64(str(data_end)[:10], "D")]
+
+
+def compute_forward_returns(
+    prices_long: pd.DataFrame,
+    axis: np.ndarray,
+    horizons: Sequence[int] = FORWARD_HORIZONS,
+    delisted_ids: Iterable[int] = (),
+    start_date=None,
+) -> Dict[str, np.ndarray]:
+    """
+    价格长表（instrument_id, date, adj_close）-> 前瞻收益列
+
+    axis : 交易日轴（trading_axis 的结果）；最后一天视为全库最新价格日
+    start_date : 只输出 date >= start_date 的行（之前的价格仅作为上下文）
+
+    Returns
+    -------
+    {"instrument_id", "date", "fwd_{h}d", ...}：只包含当天实际有价格的 (标的, 日期)
+    """
+    empty = {"instrument_id": np.array([], dtype=np.int64), "date": np.array([], dtype="datetime64[D]")}
+    empty.update({f"fwd_{int(h)}d": np.array([], dtype=np.float64) for h in horizons})
+    if prices_long.empty or len(axis) == 0:
+        return empty
+
+    day = np.asarray(pd.to_datetime(prices_long["date"]).values, dtype="datetime64[D]")
+    iid = prices_long["instrument_id"].to_numpy(dtype=np.int64)
+    ids = np.unique(iid)
+    px = pivot_panel(day, iid, prices_long["adj_close"].to_numpy(dtype=np.float64), axis, ids)
+    px[~(px > 0)] = np.nan
+
+    t, n = px.shape
+    rows = np.arange(t)[:, None]
+    has = np.isfinite(px)
+
+    # 前向填充：每个位置取该位置及之前最后一个有效价格的行号
+    last_row = np.maximum.accumulate(np.where(has, rows, -1), axis=0)
+    filled = np.where(last_row >= 0, px[np.maximum(last_row, 0), np.arange(n)], np.nan)
+
+    # 每个标的最后一个有价格的行；未退市标的不允许越过它
+    final_row = np.where(has.any(axis=0), t - 1 - has[::-1].argmax(axis=0), -1)
+    delisted = np.isin(ids, np.fromiter(delisted_ids, dtype=np.int64))
+    limit = np.where(delisted, t - 1, final_row)
+
+    keep = has.copy()
+    if start_date is not None:
+        keep &= (axis >= np.datetime64(str(start_date)[:10], "D"))[:, None]
+    ti, ni = np.nonzero(keep)
+
+    out = {"instrument_id": ids[ni], "date": axis[ti]}
+    base = px[ti, ni]
+    for h in horizons:
+        end_row = ti + int(h)
+        ok = end_row <= limit[ni]
+        end_px = np.full(len(ti), np.nan)
+        end_px[ok] = filled[end_row[ok], ni[ok]]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[f"fwd_{int(h)}d"] = end_px / base - 1.0
+    return out
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def _recompute_start(last_done, max_h: int):
+    """增量起点：last_done 往前 max_h 个交易日（自然日约 1.45 倍，再留余量）"""
+    return last_done - timedelta(days=int(max_h * 1.5) + 10)
+
+
+def run(*, force: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    增量更新 forward_returns（force=True 时清空后从 data.default_start_date 全量重算）
+    """
+    conn = get_db_connection()
+    if not conn:
+        raise RuntimeError("failed to get db connection")
+
+    try:
+        max_db_date = get_price_max_date(conn)
+        if not max_db_date:
+            log.warning("market_prices is empty, nothing to do")
+            return
+        data_end = to_date(max_db_date)
+
+        st = get_state(conn, STATE_KEY, default=None)
+        last_done = to_date(st["last_done_date"]) if (st and not force and "last_done_date" in st) else None
+        if last_done is not None and last_done >= data_end:
+            log.info("[forward_returns] already up to date, skip")
+            return
+
+        out_start = _recompute_start(last_done, max(FORWARD_HORIZONS)) if last_done else to_date(DEFAULT_START_DATE())
+        if force:
+            delete_forward_returns(conn)
+
+        calendar = get_trading_days(conn, out_start.isoformat(), data_end.isoformat())
+        cal_dates = calendar["date"].tolist() if not calendar.empty else []
+        delisted = set(get_delisted_instrument_ids(conn))
+        ids = sorted(int(i) for i in get_latest_prices(conn)["instrument_id"])
+
+        log.info(
+            f"[forward_returns] {out_start} -> {data_end}, {len(ids)} instruments, "
+            f"horizons={list(FORWARD_HORIZONS)}, chunk={chunk_size}"
+        )
+
+        written = 0
+        for k in range(0, len(ids), chunk_size):
+            chunk = ids[k:k + chunk_size]
+            prices = load_price_panel(
+                conn, ["adj_close"], start_date=out_start.isoformat(), end_date=data_end.isoformat(),
+                instrument_ids=chunk,
+            )
+            if prices.empty:
+                continue
+            axis = trading_axis(cal_dates, prices["date"].to_numpy(), data_end)
+            cols = compute_forward_returns(prices, axis, FORWARD_HORIZONS, delisted, start_date=out_start)
+            written += copy_forward_returns(conn, cols)
+            conn.commit()
+
+        set_state(conn, STATE_KEY, {"last_done_date": data_end.isoformat(), "horizons": list(FORWARD_HORIZONS)})
+        conn.commit()
+        log.info(f"[forward_returns] finished: wrote={written}")
+
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
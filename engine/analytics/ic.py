@@ -0,0 +1,333 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+因子 IC / ICIR 分析（向量化）
+
+IC(t) = corr( factor[t, :], fwd_ret_h[t, :] )，逐日截面相关：
+- spearman：截面 rank 后的 Pearson（平均秩处理并列）
+- pearson ：原始值
+
+一次加载价格面板算出所有 horizon 的前瞻收益矩阵（并预先 rank），
+然后逐个因子加载 [T, N] 矩阵，整块做按行相关；不逐日查询、不逐日循环。
+
+前瞻收益的 rank 只做一次、跨因子复用；若某行因子与收益的有效集合不一致，
+只对这些行按联合有效集合重新 rank，保证 spearman 结果精确。
+
+汇总（summarize_ic）：
+- icir     = mean(IC) / std(IC)
+- t_stat   = icir * sqrt(n)
+- t_stat_nw: Newey-West t 值（lag = horizon - 1），h > 1 时相邻日的前瞻收益重叠，普通 t 值会高估
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from database.readwrite.rw_factor_ic import copy_factor_ic
+from database.readwrite.rw_latest_snapshots import get_latest_factor_date, list_factor_names
+from database.utils.db_utils import get_db_connection
+from engine.analytics.panels import DEFAULT_HORIZONS, ReturnPanel, iter_factor_matrices, load_return_panel
+from utils.logger import get_logger
+
+log = get_logger("factor_ic")
+
+METHODS = ("spearman", "pearson")
+DEFAULT_MIN_OBS = 30
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 按行 rank / 相关
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def rank_rows(x: np.ndarray) -> np.ndarray:
+    """
+    按行平均秩（1..n_valid），非有限值（NaN / ±inf）视为缺失，输出 NaN
+
+    有限值部分与 scipy.stats.rankdata(x, axis=1, nan_policy="omit") 一致，但快数倍。
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim != 2:
+        raise ValueError(f"rank_rows expects a 2-D array, got shape {x.shape}")
+    t, n = x.shape
+    out = np.full((t, n), np.nan)
+    if t == 0 or n == 0:
+        return out
+
+    # 缺失值换成 +inf 再排序（numpy 对含 NaN 的行排序慢数倍），排在最后
+    missing = ~np.isfinite(x)
+    order = np.argsort(np.where(missing, np.inf, x), axis=1)
+    s = np.take_along_axis(x, order, axis=1)
+    s_missing = np.take_along_axis(missing, order, axis=1)
+    pos = np.broadcast_to(np.arange(n), (t, n))
+
+    # 并列组的首尾位置（缺失值各自成组，后面会被覆盖成 NaN）
+    first = np.ones((t, n), dtype=bool)
+    first[:, 1:] = s[:, 1:] != s[:, :-1]
+    last = np.ones((t, n), dtype=bool)
+    last[:, :-1] = first[:, 1:]
+
+    start = np.maximum.accumulate(np.where(first, pos, 0), axis=1)
+    end = n - 1 - np.maximum.accumulate(np.where(last[:, ::-1], pos, 0), axis=1)[:, ::-1]
+
+    ranks = (start + end) / 2.0 + 1.0
+    ranks[s_missing] = np.nan
+    np.put_along_axis(out, order, ranks, axis=1)
+    return out
+
+
+def rowwise_corr(x: np.ndarray, y: np.ndarray, min_obs: int = 2) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    按行 Pearson 相关（只用两边都有效的列）
+
+    Returns
+    -------
+    (corr[T], n_obs[T])；n_obs < min_obs 或某一边截面方差为 0 时 corr 为 NaN
+    """
+    if x.shape != y.shape:
+        raise ValueError(f"shape mismatch: {x.shape} vs {y.shape}")
+
+    mask = np.isfinite(x) & np.isfinite(y)
+    n = mask.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+
+    # 去均值后再求积和（就地运算，避免多余的 [T, N] 临时数组）
+    dx = np.where(mask, x, 0.0)
+    dx -= (dx.sum(axis=1) / safe_n)[:, None]
+    dx[~mask] = 0.0
+    dy = np.where(mask, y, 0.0)
+    dy -= (dy.sum(axis=1) / safe_n)[:, None]
+    dy[~mask] = 0.0
+
+    sxy = np.einsum("ij,ij->i", dx, dy)
+    sxx = np.einsum("ij,ij->i", dx, dx)
+    syy = np.einsum("ij,ij->i", dy, dy)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = sxy / np.sqrt(sxx * syy)
+    corr[(n < max(min_obs, 2)) | (sxx <= 0) | (syy <= 0)] = np.nan
+    return np.clip(corr, -1.0, 1.0), n
+
+
+def _joint_ranks(x: np.ndarray, rx: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """rx 是 x 按自身有效集合的 rank；对有效集合超出 valid 的行按联合集合重新 rank"""
+    extra = (np.isfinite(x) & ~valid).any(axis=1)
+    if not extra.any():
+        return rx
+    out = rx.copy()
+    out[extra] = rank_rows(np.where(valid[extra], x[extra], np.nan))
+    return out
+
+
+def factor_ic(
+    factor: np.ndarray,
+    forward: Mapping[int, np.ndarray],
+    *,
+    methods: Sequence[str] = METHODS,
+    min_obs: int = DEFAULT_MIN_OBS,
+    forward_ranks: Optional[Mapping[int, np.ndarray]] = None,
+) -> Dict[Tuple[int, str], Tuple[np.ndarray, np.ndarray]]:
+    """
+    单个因子矩阵 [T, N] 对各 horizon 的逐日 IC
+
+    forward_ranks 可传入预先算好的 rank_rows(forward[h])，跨因子复用。
+    返回 {(horizon, method): (ic[T], n_obs[T])}
+    """
+    for m in methods:
+        if m not in METHODS:
+            raise ValueError(f"unknown IC method: {m!r} (expected one of {METHODS})")
+
+    out: Dict[Tuple[int, str], Tuple[np.ndarray, np.ndarray]] = {}
+    factor_valid = np.isfinite(factor)
+    factor_rank = rank_rows(factor) if "spearman" in methods else None
+
+    for h, fwd in forward.items():
+        if "pearson" in methods:
+            out[(h, "pearson")] = rowwise_corr(factor, fwd, min_obs)
+
+        if "spearman" in methods:
+            valid = factor_valid & np.isfinite(fwd)
+            fr = forward_ranks[h] if forward_ranks is not None and h in forward_ranks else rank_rows(fwd)
+            rx = _joint_ranks(factor, factor_rank, valid)
+            ry = _joint_ranks(fwd, fr, valid)
+            out[(h, "spearman")] = rowwise_corr(rx, ry, min_obs)
+
+    return out
+
+
+def compute_ic(
+    factors: Iterable[Tuple[str, np.ndarray]],
+    panel: ReturnPanel,
+    *,
+    methods: Sequence[str] = METHODS,
+    min_obs: int = DEFAULT_MIN_OBS,
+) -> pd.DataFrame:
+    """
+    多个因子的逐日 IC 长表 [date, factor_name, horizon, method, ic, n_obs]
+
+    factors 可以是生成器（iter_factor_matrices），逐个消费，峰值只持有一个因子矩阵。
+    只保留 n_obs >= min_obs 的日期。
+    """
+    forward_ranks = {h: rank_rows(f) for h, f in panel.forward.items()} if "spearman" in methods else None
+    dates = pd.to_datetime(panel.dates).date if len(panel.dates) else np.array([])
+
+    frames: List[pd.DataFrame] = []
+    for name, mat in factors:
+        res = factor_ic(mat, panel.forward, methods=methods, min_obs=min_obs, forward_ranks=forward_ranks)
+        for (h, method), (ic, n) in res.items():
+            keep = n >= min_obs
+            if not keep.any():
+                continue
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "date": dates[keep],
+                        "factor_name": name,
+                        "horizon": int(h),
+                        "method": method,
+                        "ic": ic[keep],
+                        "n_obs": n[keep].astype(np.int64),
+                    }
+                )
+            )
+
+    if not frames:
+        return pd.DataFrame(columns=["date", "factor_name", "horizon", "method", "ic", "n_obs"])
+    return pd.concat(frames, ignore_index=True)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 汇总
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def newey_west_tstat(x: np.ndarray, lags: int) -> float:
+    """均值的 Newey-West t 值（Bartlett 核）；lags = 0 时即普通 t 值"""
+    x = np.asarray(x, dtype=np.float64)
+    x = x[np.isfinite(x)]
+    n = len(x)
+    if n < 2:
+        return np.nan
+
+    e = x - x.mean()
+    var = e @ e / n
+    for k in range(1, min(lags, n - 1) + 1):
+        var += 2.0 * (1.0 - k / (lags + 1)) * (e[k:] @ e[:-k]) / n
+    if var <= 0:
+        return np.nan
+    return float(x.mean() / np.sqrt(var / n))
+
+
+def summarize_ic(ic_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    每个 (factor_name, horizon, method) 的汇总：
+    n_dates, mean_ic, std_ic, icir, t_stat, t_stat_nw, hit_rate（IC > 0 的占比）
+    """
+    cols = ["factor_name", "horizon", "method", "n_dates", "mean_ic", "std_ic", "icir", "t_stat", "t_stat_nw", "hit_rate"]
+    if ic_df is None or ic_df.empty:
+        return pd.DataFrame(columns=cols)
+
+    rows = []
+    for (name, h, method), g in ic_df.groupby(["factor_name", "horizon", "method"], sort=True):
+        ic = g.sort_values("date")["ic"].to_numpy(dtype=np.float64)
+        ic = ic[np.isfinite(ic)]
+        n = len(ic)
+        mean = ic.mean() if n else np.nan
+        std = ic.std(ddof=1) if n > 1 else np.nan
+        icir = mean / std if n > 1 and std > 0 else np.nan
+        rows.append(
+            {
+                "factor_name": name,
+                "horizon": int(h),
+                "method": method,
+                "n_dates": n,
+                "mean_ic": mean,
+                "std_ic": std,
+                "icir": icir,
+                "t_stat": icir * np.sqrt(n) if n > 1 else np.nan,
+                "t_stat_nw": newey_west_tstat(ic, int(h) - 1),
+                "hit_rate": float((ic > 0).mean()) if n else np.nan,
+            }
+        )
+    return pd.DataFrame(rows, columns=cols)
+
+
+def ic_decay(summary: pd.DataFrame, method: str = "spearman", value: str = "mean_ic") -> pd.DataFrame:
+    """IC 衰减表：行 = 因子，列 = horizon"""
+    sub = summary[summary["method"] == method]
+    return sub.pivot(index="factor_name", columns="horizon", values=value).sort_index()
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 入口
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def run_ic_analysis(
+    factor_names: Optional[Sequence[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    *,
+    horizons: Sequence[int] = DEFAULT_HORIZONS,
+    methods: Sequence[str] = METHODS,
+    factor_version: str = "v1",
+    min_obs: int = DEFAULT_MIN_OBS,
+    persist: bool = True,
+    source: str = "prices",
+    conn=None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    加载面板 -> 逐日 IC -> 汇总（persist=True 时逐日 IC 写入 factor_ic）
+
+    factor_names=None 时分析库中所有因子；end_date=None 时取最新因子日期。
+    source="store" 时前瞻收益读 forward_returns 表（见 panels.load_return_panel）。
+    Returns: (ic_df, summary_df)
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+        if not conn:
+            raise RuntimeError("failed to get db connection")
+
+    try:
+        if factor_names is None:
+            factor_names = list_factor_names(conn, factor_version)
+        if not factor_names:
+            log.warning("[ic] no factors to analyse")
+            return summarize_ic(None), summarize_ic(None)
+        if end_date is None:
+            end_date = get_latest_factor_date(conn, factor_version)
+
+        panel = load_return_panel(conn, start_date, end_date, horizons, source=source)
+        log.info(
+            f"[ic] panel {panel.shape[0]} dates x {panel.shape[1]} instruments, "
+            f"{len(factor_names)} factors, horizons={list(horizons)}"
+        )
+
+        ic_df = compute_ic(
+            iter_factor_matrices(conn, factor_names, panel, factor_version),
+            panel,
+            methods=methods,
+            min_obs=min_obs,
+        )
+
+        if persist and not ic_df.empty:
+            copy_factor_ic(conn, ic_df, factor_version)
+            conn.commit()
+
+        return ic_df, summarize_ic(ic_df)
+
+    except Exception:
+        if own_conn:
+            conn.rollback()
+        raise
+    finally:
+        if own_conn:
+            conn.close()
@@ -0,0 +1,568 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+回测绩效指标（向量化）
+
+输入 NAV 或收益率数组，时间在第 0 维：
+- 1-D [T]      ：单个回测
+- 2-D [T, R]   ：R 个回测（参数扫描的输出）一次算完；不同长度的回测用 NaN 补齐
+
+全区间指标（compute_metrics，一行一个回测）：
+total_return, cagr, ann_vol, sharpe, sortino, max_drawdown, calmar,
+max_dd_duration（最长水下期数）, recovery_periods（最大回撤谷底到收复前高的期数，未收复为 NaN），
+以及给定基准（如 SPY）时的 beta, alpha（年化）, tracking_error, information_ratio。
+
+滚动指标（rolling_metrics）用累计和做 O(T) 的窗口统计，不逐窗口循环。
+
+结果按 run_id 缓存（get_metrics），NAV 内容变化时自动重算。
+
+exp_positions 只在调仓日（每月一次）写快照；load_daily_nav 把每个快照的持仓按之后每个交易日的
+adj_close 逐日盯市，得到日频 NAV。非日频的 NAV 用 infer_periods_per_year 按日期间隔推断年化因子。
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import Dict, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from database.readwrite.rw_exp_positions import get_exp_nav, get_exp_positions_with_sector
+from database.readwrite.rw_instruments import get_instrument_id
+from database.readwrite.rw_market_prices import get_prices, load_price_panel
+from engine.constants import CASH_INSTRUMENT_ID
+
+TRADING_DAYS = 252
+DEFAULT_BENCHMARK = "SPY"
+
+METRIC_COLUMNS = [
+    "total_return",
+    "cagr",
+    "ann_vol",
+    "sharpe",
+    "sortino",
+    "max_drawdown",
+    "calmar",
+    "max_dd_duration",
+    "recovery_periods",
+    "beta",
+    "alpha",
+    "tracking_error",
+    "information_ratio",
+]
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 基础变换
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def _as_2d(x) -> Tuple[np.ndarray, bool]:
+    a = np.asarray(x, dtype=np.float64)
+    if a.ndim == 1:
+        return a[:, None], True
+    if a.ndim != 2:
+        raise ValueError(f"expected a 1-D or 2-D array, got shape {a.shape}")
+    return a, False
+
+
+def nav_to_returns(nav) -> np.ndarray:
+    """简单收益率 r[t] = nav[t] / nav[t-1] - 1，首行为 NaN（形状与 nav 相同）"""
+    nav = np.asarray(nav, dtype=np.float64)
+    out = np.full(nav.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[1:] = nav[1:] / nav[:-1] - 1.0
+    return out
+
+
+def returns_to_nav(returns, start: float = 1.0) -> np.ndarray:
+    """收益率 -> NAV（NaN 收益按 0 处理）"""
+    r = np.nan_to_num(np.asarray(returns, dtype=np.float64), nan=0.0)
+    return start * np.cumprod(1.0 + r, axis=0)
+
+
+def infer_periods_per_year(dates) -> int:
+    """
+    按日期间隔的中位数推断年化因子：交易日序列（中位间隔 <= 4 天）为 252，
+    否则 round(365.25 / 中位间隔天数)（周频 52、月频 12、季频 4）
+    """
+    d = pd.DatetimeIndex(pd.to_datetime(dates)).sort_values()
+    if len(d) < 2:
+        return TRADING_DAYS
+    seconds = d.to_numpy().astype("datetime64[s]").astype(np.int64)
+    gap = float(np.median(np.diff(seconds))) / 86_400
+    if gap <= 4:
+        return TRADING_DAYS
+    return max(1, int(round(365.25 / gap)))
+
+
+def drawdown(nav) -> np.ndarray:
+    """回撤序列 nav / 历史最高 - 1（<= 0）"""
+    nav = np.asarray(nav, dtype=np.float64)
+    peak = np.fmax.accumulate(nav, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return nav / peak - 1.0
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 全区间指标
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def _drawdown_stats(nav: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(max_drawdown, 最长水下期数, 最大回撤的收复期数)，按列"""
+    t, r = nav.shape
+    peak = np.fmax.accumulate(nav, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = nav / peak - 1.0
+
+    valid = np.isfinite(dd).any(axis=0)
+    mdd = np.full(r, np.nan)
+    mdd[valid] = np.nanmin(dd[:, valid], axis=0)
+
+    # 最长水下期：连续 dd < 0 的最长游程
+    under = (dd < 0).astype(np.int64)
+    c = np.cumsum(under, axis=0)
+    run = c - np.maximum.accumulate(np.where(under == 0, c, 0), axis=0)
+    duration = run.max(axis=0).astype(np.float64) if t else np.zeros(r)
+
+    # 收复：谷底之后第一次回到谷底时的前高
+    recovery = np.full(r, np.nan)
+    if t and valid.any():
+        trough = np.where(valid, np.nanargmin(np.where(np.isfinite(dd), dd, np.inf), axis=0), 0)
+        cols = np.arange(r)
+        level = peak[trough, cols]
+        after = (np.arange(t)[:, None] > trough[None, :]) & (nav >= level[None, :])
+        hit = after.any(axis=0) & valid & (mdd < 0)
+        recovery[hit] = (after.argmax(axis=0) - trough)[hit]
+        recovery[valid & (mdd == 0)] = 0.0
+    return mdd, duration, recovery
+
+
+def _masked_moments(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """按列联合有效样本的 (n, mean_x, mean_y, cov_xy, var_y)"""
+    mask = np.isfinite(x) & np.isfinite(y)
+    n = mask.sum(axis=0)
+    safe = np.maximum(n, 1)
+    mx = np.where(mask, x, 0.0).sum(axis=0) / safe
+    my = np.where(mask, y, 0.0).sum(axis=0) / safe
+    dx = np.where(mask, x - mx, 0.0)
+    dy = np.where(mask, y - my, 0.0)
+    ddof = np.maximum(n - 1, 1)
+    return n, mx, my, (dx * dy).sum(axis=0) / ddof, (dy * dy).sum(axis=0) / ddof
+
+
+def compute_metrics(
+    nav,
+    benchmark_nav=None,
+    *,
+    periods_per_year: int = TRADING_DAYS,
+    risk_free: float = 0.0,
+    run_ids: Optional[Sequence[Hashable]] = None,
+) -> pd.DataFrame:
+    """
+    全区间绩效指标
+
+    Parameters
+    ----------
+    nav : [T] 或 [T, R]，与 benchmark_nav 按行对齐（同一日期轴）
+    benchmark_nav : [T]（所有回测共用）或 [T, R]；None 时 beta / alpha / IR 为 NaN
+    risk_free : 年化无风险利率（Sharpe / Sortino / alpha 用超额收益）
+    run_ids : 结果的行索引（默认 0..R-1）
+
+    Returns
+    -------
+    DataFrame，行 = 回测，列 = METRIC_COLUMNS
+    """
+    nav2, _ = _as_2d(nav)
+    t, r = nav2.shape
+    ppy = float(periods_per_year)
+    rets = nav_to_returns(nav2)
+    rf = risk_free / ppy
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # 每列第一个 / 最后一个有效 NAV（支持前后 NaN 补齐）
+        finite = np.isfinite(nav2)
+        has = finite.any(axis=0)
+        first_i = finite.argmax(axis=0)
+        last_i = t - 1 - finite[::-1].argmax(axis=0)
+        cols = np.arange(r)
+        total = np.where(has, nav2[last_i, cols] / nav2[first_i, cols] - 1.0, np.nan)
+        years = (last_i - first_i) / ppy
+        cagr = np.where(years > 0, (1.0 + total) ** (1.0 / years) - 1.0, np.nan)
+
+        n = np.isfinite(rets).sum(axis=0)
+        excess = rets - rf
+        mean_ex = np.nanmean(excess, axis=0) if t > 1 else np.full(r, np.nan)
+        std = np.nanstd(rets, axis=0, ddof=1) if t > 2 else np.full(r, np.nan)
+        ann_vol = std * np.sqrt(ppy)
+        sharpe = mean_ex / std * np.sqrt(ppy)
+
+        downside = np.sqrt(np.nansum(np.minimum(excess, 0.0) ** 2, axis=0) / np.maximum(n, 1))
+        sortino = mean_ex / downside * np.sqrt(ppy)
+
+        mdd, duration, recovery = _drawdown_stats(nav2)
+        calmar = cagr / np.abs(mdd)
+
+    out = {
+        "total_return": total,
+        "cagr": cagr,
+        "ann_vol": ann_vol,
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "max_drawdown": mdd,
+        "calmar": calmar,
+        "max_dd_duration": duration,
+        "recovery_periods": recovery,
+        "beta": np.full(r, np.nan),
+        "alpha": np.full(r, np.nan),
+        "tracking_error": np.full(r, np.nan),
+        "information_ratio": np.full(r, np.nan),
+    }
+
+    if benchmark_nav is not None:
+        bench, _ = _as_2d(benchmark_nav)
+        if bench.shape[0] != t:
+            raise ValueError(f"benchmark length {bench.shape[0]} != nav length {t}")
+        b = np.broadcast_to(nav_to_returns(bench), (t, r))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            _, mr, mb, cov, var_b = _masked_moments(rets, b)
+            beta = cov / var_b
+            out["beta"] = beta
+            out["alpha"] = ((mr - rf) - beta * (mb - rf)) * ppy
+
+            active = np.where(np.isfinite(rets) & np.isfinite(b), rets - b, np.nan)
+            te = np.nanstd(active, axis=0, ddof=1) * np.sqrt(ppy) if t > 2 else np.full(r, np.nan)
+            out["tracking_error"] = te
+            out["information_ratio"] = np.nanmean(active, axis=0) * ppy / te
+
+    for k, v in out.items():
+        v = np.asarray(v, dtype=np.float64)
+        v[~np.isfinite(v)] = np.nan
+        out[k] = v
+
+    index = pd.Index(list(run_ids) if run_ids is not None else range(r), name="run_id")
+    if len(index) != r:
+        raise ValueError(f"got {len(index)} run_ids for {r} runs")
+    return pd.DataFrame(out, index=index, columns=METRIC_COLUMNS)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 滚动指标
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def _rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """按列窗口和（前 window-1 行为 NaN）；x 中不应含 NaN"""
+    c = np.cumsum(x, axis=0)
+    out = np.full(x.shape, np.nan)
+    if x.shape[0] >= window:
+        out[window - 1] = c[window - 1]
+        out[window:] = c[window:] - c[:-window]
+    return out
+
+
+def rolling_metrics(
+    nav,
+    window: int = 63,
+    benchmark_nav=None,
+    *,
+    periods_per_year: int = TRADING_DAYS,
+    risk_free: float = 0.0,
+) -> Dict[str, np.ndarray]:
+    """
+    滚动窗口指标（窗口 = window 个收益率），每项形状与 nav 相同（[T] 或 [T, R]）
+
+    返回 {return, ann_vol, sharpe, sortino, drawdown, beta, alpha, information_ratio}；
+    窗口内有缺失收益的位置为 NaN。drawdown 为相对历史最高（非窗口内）的当前回撤。
+    """
+    if window < 2:
+        raise ValueError(f"window must be >= 2, got {window}")
+
+    nav2, squeeze = _as_2d(nav)
+    t, r = nav2.shape
+    ppy = float(periods_per_year)
+    rf = risk_free / ppy
+
+    rets = nav_to_returns(nav2)
+    bad = ~np.isfinite(rets)
+    n_bad = _rolling_sum(bad.astype(np.float64), window)
+    ex = np.where(bad, 0.0, rets - rf)
+
+    s1 = _rolling_sum(ex, window)
+    s2 = _rolling_sum(ex * ex, window)
+    sd2 = _rolling_sum(np.minimum(ex, 0.0) ** 2, window)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = s1 / window
+        var = (s2 - window * mean * mean) / (window - 1)
+        std = np.sqrt(np.maximum(var, 0.0))
+        window_ret = np.full((t, r), np.nan)
+        if t > window:
+            window_ret[window:] = nav2[window:] / nav2[:-window] - 1.0
+
+        out = {
+            "return": window_ret,
+            "ann_vol": std * np.sqrt(ppy),
+            "sharpe": mean / std * np.sqrt(ppy),
+            "sortino": mean / np.sqrt(sd2 / window) * np.sqrt(ppy),
+            "drawdown": drawdown(nav2),
+            "beta": np.full((t, r), np.nan),
+            "alpha": np.full((t, r), np.nan),
+            "information_ratio": np.full((t, r), np.nan),
+        }
+
+        if benchmark_nav is not None:
+            bench, _ = _as_2d(benchmark_nav)
+            if bench.shape[0] != t:
+                raise ValueError(f"benchmark length {bench.shape[0]} != nav length {t}")
+            b = np.broadcast_to(nav_to_returns(bench), (t, r))
+            bad_b = ~np.isfinite(b)
+            n_bad = n_bad + _rolling_sum(bad_b.astype(np.float64), window)
+            bx = np.where(bad_b, 0.0, b - rf)
+
+            sb = _rolling_sum(bx, window)
+            sbb = _rolling_sum(bx * bx, window)
+            sxb = _rolling_sum(ex * bx, window)
+            cov = (sxb - s1 * sb / window) / (window - 1)
+            var_b = (sbb - sb * sb / window) / (window - 1)
+            beta = cov / var_b
+            out["beta"] = beta
+            out["alpha"] = (s1 - beta * sb) / window * ppy
+
+            act = ex - bx
+            sa = _rolling_sum(act, window)
+            saa = _rolling_sum(act * act, window)
+            te = np.sqrt(np.maximum((saa - sa * sa / window) / (window - 1), 0.0))
+            out["information_ratio"] = sa / window / te * np.sqrt(ppy)
+
+    incomplete = ~(n_bad == 0)
+    for k, v in out.items():
+        if k == "drawdown":
+            continue
+        v = np.array(v, dtype=np.float64)
+        v[incomplete | ~np.isfinite(v)] = np.nan
+        out[k] = v
+
+    if squeeze:
+        return {k: v[:, 0] for k, v in out.items()}
+    return out
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 排名 / 缓存
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def rank_runs(metrics: pd.DataFrame, by: str = "sharpe", ascending: bool = False, top: Optional[int] = None) -> pd.DataFrame:
+    """按某个指标给回测排序（NaN 排最后）"""
+    if by not in metrics.columns:
+        raise ValueError(f"unknown metric: {by!r}")
+    out = metrics.sort_values(by, ascending=ascending, na_position="last")
+    return out.head(top) if top is not None else out
+
+
+def _fingerprint(*arrays) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for a in arrays:
+        if a is None:
+            h.update(b"-")
+            continue
+        a = np.ascontiguousarray(a, dtype=np.float64)
+        h.update(str(a.shape).encode())
+        h.update(a.tobytes())
+    return h.hexdigest()
+
+
+_CACHE: Dict[Hashable, Tuple[str, pd.DataFrame]] = {}
+_LOCK = threading.Lock()
+
+
+def get_metrics(
+    run_id: Hashable,
+    nav,
+    benchmark_nav=None,
+    *,
+    periods_per_year: int = TRADING_DAYS,
+    risk_free: float = 0.0,
+) -> pd.Series:
+    """
+    单个回测的全区间指标，按 run_id 缓存
+
+    同一 run_id 的 NAV / 基准 / 参数不变时直接返回缓存；内容变化（如回测重跑）时重算并覆盖。
+    """
+    key = _fingerprint(nav, benchmark_nav, np.array([periods_per_year, risk_free]))
+    with _LOCK:
+        hit = _CACHE.get(run_id)
+    if hit is not None and hit[0] == key:
+        return hit[1].iloc[0]
+
+    df = compute_metrics(
+        np.asarray(nav, dtype=np.float64).ravel(),
+        benchmark_nav,
+        periods_per_year=periods_per_year,
+        risk_free=risk_free,
+        run_ids=[run_id],
+    )
+    with _LOCK:
+        _CACHE[run_id] = (key, df)
+    return df.iloc[0]
+
+
+def get_metrics_many(
+    navs: pd.DataFrame,
+    benchmark_nav=None,
+    *,
+    periods_per_year: int = TRADING_DAYS,
+    risk_free: float = 0.0,
+) -> pd.DataFrame:
+    """
+    多个回测（DataFrame：行 = 日期，列 = run_id）的指标，缓存命中的列不重算，
+    其余列一次性按 2-D 计算。
+    """
+    bench = None if benchmark_nav is None else np.asarray(benchmark_nav, dtype=np.float64)
+    params = np.array([periods_per_year, risk_free])
+
+    keys = {rid: _fingerprint(navs[rid].to_numpy(), bench, params) for rid in navs.columns}
+    with _LOCK:
+        cached = {rid: _CACHE[rid][1] for rid, k in keys.items() if rid in _CACHE and _CACHE[rid][0] == k}
+
+    missing = [rid for rid in navs.columns if rid not in cached]
+    if missing:
+        fresh = compute_metrics(
+            navs[missing].to_numpy(dtype=np.float64),
+            bench,
+            periods_per_year=periods_per_year,
+            risk_free=risk_free,
+            run_ids=missing,
+        )
+        with _LOCK:
+            for rid in missing:
+                _CACHE[rid] = (keys[rid], fresh.loc[[rid]])
+        cached.update({rid: fresh.loc[[rid]] for rid in missing})
+
+    return pd.concat([cached[rid] for rid in navs.columns])
+
+
+def clear_metrics_cache():
+    with _LOCK:
+        _CACHE.clear()
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 数据库入口
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def daily_nav_from_snapshots(holdings: pd.DataFrame, prices: pd.DataFrame, end_date: Optional[str] = None) -> pd.Series:
+    """
+    持仓快照 -> 日频盯市 NAV
+
+    holdings : 长表 date, instrument_id, quantity, market_value（现金为 CASH_INSTRUMENT_ID，quantity = 现金额）
+    prices   : DataFrame[date, instrument_id] -> adj_close（与快照 current_price 同口径）
+    快照日取快照市值合计（含调仓成本）；两个快照之间的交易日 = 上一快照的现金 + Σ 数量 × 当日价格
+    （缺价前向填充，从未有价格时用快照价）。最后一个快照之后盯市到 end_date（None 时到最后一个快照为止）。
+    """
+    h = holdings.assign(date=pd.to_datetime(holdings["date"]))
+    snap_nav = h.groupby("date")["market_value"].sum().astype(np.float64)
+    snap_dates = snap_nav.index
+    last = pd.Timestamp(end_date) if end_date is not None else snap_dates[-1]
+
+    px = prices.copy()
+    px.index = pd.to_datetime(px.index)
+    days = px.index[(px.index > snap_dates[0]) & (px.index <= last)].union(snap_dates)
+    px = px.reindex(px.index.union(days)).sort_index().ffill()
+
+    is_cash = h["instrument_id"] == CASH_INSTRUMENT_ID
+    cash = h[is_cash].groupby("date")["market_value"].sum().reindex(snap_dates, fill_value=0.0)
+    stocks = dict(tuple(h[~is_cash].groupby("date")))
+
+    nav = pd.Series(np.nan, index=days, name="nav")
+    bounds = list(snap_dates[1:]) + [last + pd.Timedelta(days=1)]
+    for s, nxt in zip(snap_dates, bounds):
+        seg = days[(days > s) & (days < nxt)]
+        if len(seg) == 0:
+            continue
+        pos = stocks.get(s)
+        value = np.full(len(seg), float(cash[s]))
+        if pos is not None and len(pos):
+            q = pos["quantity"].to_numpy(dtype=np.float64)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                snap_px = pos["market_value"].to_numpy(dtype=np.float64) / q
+            p = px.reindex(index=seg, columns=pos["instrument_id"].to_numpy()).to_numpy(dtype=np.float64)
+            p = np.where(np.isnan(p), snap_px[None, :], p)
+            value += np.nan_to_num(p * q[None, :], nan=0.0).sum(axis=1)
+        nav[seg] = value
+
+    nav[snap_dates] = snap_nav.to_numpy()
+    nav.index.name = "date"
+    return nav
+
+
+def load_daily_nav(conn, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.Series:
+    """exp_positions 快照 + 持仓标的 adj_close 面板 -> 日频盯市 NAV（Series[date]，两次查询）"""
+    holdings = get_exp_positions_with_sector(conn, start_date, end_date)
+    if holdings.empty:
+        return pd.Series(dtype=np.float64, name="nav")
+
+    dates = pd.to_datetime(holdings["date"])
+    ids = sorted(set(holdings.loc[holdings["instrument_id"] != CASH_INSTRUMENT_ID, "instrument_id"].astype(int)))
+    last = end_date or str(dates.max().date())
+    if ids:
+        long = load_price_panel(conn, ("adj_close",), str(dates.min().date()), last, instrument_ids=ids)
+        prices = long.pivot(index="date", columns="instrument_id", values="adj_close")
+    else:
+        prices = pd.DataFrame(index=pd.DatetimeIndex([], name="date"))
+    return daily_nav_from_snapshots(holdings, prices, end_date)
+
+
+def load_nav_with_benchmark(
+    conn,
+    benchmark: Optional[str] = DEFAULT_BENCHMARK,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    *,
+    daily: bool = True,
+) -> pd.DataFrame:
+    """
+    exp_positions 的组合 NAV 与基准 adj_close 对齐到组合日期轴
+
+    daily=True（默认）：快照间逐日盯市的日频 NAV（load_daily_nav）；False：只取调仓日快照 NAV
+    Returns: DataFrame[date] -> nav, benchmark（基准缺失日前向填充；benchmark=None 时无该列）
+    """
+    if daily:
+        nav = load_daily_nav(conn, start_date, end_date).reset_index()
+    else:
+        nav = get_exp_nav(conn, start_date, end_date)
+    if nav.empty:
+        return pd.DataFrame(columns=["nav", "benchmark"])
+
+    nav["date"] = pd.to_datetime(nav["date"])
+    out = nav.set_index("date")[["nav"]].astype(float)
+
+    if benchmark:
+        instrument_id = get_instrument_id(conn, benchmark)
+        if instrument_id is None:
+            raise RuntimeError(f"Benchmark not found: {benchmark}")
+        px = get_prices(conn, instrument_id, start_date, end_date)
+        px["date"] = pd.to_datetime(px["date"])
+        out["benchmark"] = px.set_index("date")["adj_close"].astype(float).reindex(out.index).ffill()
+    return out
+
+
+def exp_metrics(
+    conn,
+    benchmark: Optional[str] = DEFAULT_BENCHMARK,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    run_id: Hashable = "exp_positions",
+) -> pd.Series:
+    """当前 exp_positions 回测结果相对基准的全区间指标（日频盯市 NAV，年化因子按日期间隔推断；按 run_id 缓存）"""
+    df = load_nav_with_benchmark(conn, benchmark, start_date, end_date)
+    if df.empty:
+        raise RuntimeError("exp_positions NAV is empty")
+    bench = df["benchmark"].to_numpy() if "benchmark" in df.columns else None
+    return get_metrics(run_id, df["nav"].to_numpy(), bench, periods_per_year=infer_periods_per_year(df.index))
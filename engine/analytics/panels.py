@@ -0,0 +1,250 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+分析用的 2-D 面板（日期 × 标的）
+
+因子分析（IC / 分位组合 ...）都需要同一套对齐好的矩阵：
+- ReturnPanel：交易日轴 + 标的轴 + adj_close 矩阵 + 各 horizon 的前瞻收益矩阵
+  （source="prices" 从价格面板现算；source="store" 直接读 forward_returns 物化表）
+- load_factor_matrix：单个因子对齐到同一坐标轴
+
+长表 -> 矩阵用 searchsorted 下标一次散列写入，不做 pivot_table。
+因子按个加载：20 年 × 3000 标的的单因子长表约 1500 万行，
+30 个因子一起加载的长表会占用十几 GB，逐个加载则峰值只有一个因子。
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from database.readwrite.rw_factor_values import load_factor_panel
+from database.readwrite.rw_forward_returns import horizon_column, load_forward_returns
+from database.readwrite.rw_market_prices import load_price_panel
+
+DEFAULT_HORIZONS = (1, 5, 21, 63)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 矩阵工具
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def pivot_panel(
+    row_keys: np.ndarray,
+    col_keys: np.ndarray,
+    values: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray,
+) -> np.ndarray:
+    """
+    长表 (row_key, col_key, value) -> 矩阵 [len(rows), len(cols)]，缺失为 NaN
+
+    rows / cols 必须已排序且唯一；不在轴上的键被丢弃。
+    """
+    out = np.full((len(rows), len(cols)), np.nan, dtype=np.float64)
+    if len(values) == 0 or len(rows) == 0 or len(cols) == 0:
+        return out
+
+    ri = np.searchsorted(rows, row_keys)
+    ci = np.searchsorted(cols, col_keys)
+    ri_c = np.minimum(ri, len(rows) - 1)
+    ci_c = np.minimum(ci, len(cols) - 1)
+    ok = (rows[ri_c] == row_keys) & (cols[ci_c] == col_keys)
+
+    out[ri_c[ok], ci_c[ok]] = values[ok]
+    return out
+
+
+def forward_returns(prices: np.ndarray, horizon: int) -> np.ndarray:
+    """
+    前瞻收益 r[t] = P[t + h] / P[t] - 1（沿交易日轴），最后 h 行为 NaN
+
+    任一端价格缺失或非正时为 NaN。
+    """
+    if horizon < 1:
+        raise ValueError(f"horizon must be >= 1, got {horizon}")
+
+    out = np.full(prices.shape, np.nan, dtype=np.float64)
+    if prices.shape[0] <= horizon:
+        return out
+
+    start = prices[:-horizon]
+    end = prices[horizon:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = end / start - 1.0
+    r[~(start > 0) | ~(end > 0)] = np.nan
+    out[:-horizon] = r
+    return out
+
+
+def _as_day(values) -> np.ndarray:
+    return np.asarray(pd.to_datetime(values).values.astype("datetime64[D]"))
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 面板
+# ----------------------------------------------------------------------------------------------------------------------------------------
+@dataclass
+class ReturnPanel:
+    """
+    dates          : datetime64[D]，分析区间内的交易日（价格面板的日期轴）
+    instrument_ids : int64，已排序
+    prices         : [T, N] adj_close（从 forward_returns 表读取时为 None）
+    forward        : horizon -> [T, N] 前瞻收益（区间末尾的 horizon 用区间外的价格补齐）
+    """
+
+    dates: np.ndarray
+    instrument_ids: np.ndarray
+    prices: Optional[np.ndarray]
+    forward: Dict[int, np.ndarray] = field(default_factory=dict)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.dates), len(self.instrument_ids)
+
+    def align(self, long_df: pd.DataFrame, value_col: str) -> np.ndarray:
+        """长表（instrument_id, date, value_col）对齐到本面板坐标轴"""
+        if long_df.empty:
+            return np.full(self.shape, np.nan)
+        return pivot_panel(
+            _as_day(long_df["date"]),
+            long_df["instrument_id"].to_numpy(dtype=np.int64),
+            long_df[value_col].to_numpy(dtype=np.float64),
+            self.dates,
+            self.instrument_ids,
+        )
+
+
+def build_return_panel(
+    prices_long: pd.DataFrame,
+    horizons: Sequence[int] = DEFAULT_HORIZONS,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> ReturnPanel:
+    """
+    由价格长表（instrument_id, date, adj_close）构造 ReturnPanel
+
+    prices_long 可以比 [start_date, end_date] 多出尾部若干交易日，用于计算区间末尾的前瞻收益。
+    """
+    if prices_long.empty:
+        empty = np.empty((0, 0))
+        return ReturnPanel(np.array([], dtype="datetime64[D]"), np.array([], dtype=np.int64), empty,
+                           {h: empty for h in horizons})
+
+    day = _as_day(prices_long["date"])
+    iid = prices_long["instrument_id"].to_numpy(dtype=np.int64)
+    all_dates = np.unique(day)
+    ids = np.unique(iid)
+    prices = pivot_panel(day, iid, prices_long["adj_close"].to_numpy(dtype=np.float64), all_dates, ids)
+
+    keep = np.ones(len(all_dates), dtype=bool)
+    if start_date is not None:
+        keep &= all_dates >= np.datetime64(str(start_date)[:10], "D")
+    if end_date is not None:
+        keep &= all_dates <= np.datetime64(str(end_date)[:10], "D")
+
+    forward = {int(h): forward_returns(prices, int(h))[keep] for h in horizons}
+    return ReturnPanel(all_dates[keep], ids, prices[keep], forward)
+
+
+def build_stored_return_panel(stored_long: pd.DataFrame, horizons: Sequence[int] = DEFAULT_HORIZONS) -> ReturnPanel:
+    """由 forward_returns 长表（instrument_id, date, fwd_{h}d ...）构造 ReturnPanel（prices=None）"""
+    if stored_long.empty:
+        empty = np.empty((0, 0))
+        return ReturnPanel(np.array([], dtype="datetime64[D]"), np.array([], dtype=np.int64), None,
+                           {int(h): empty for h in horizons})
+
+    day = _as_day(stored_long["date"])
+    iid = stored_long["instrument_id"].to_numpy(dtype=np.int64)
+    dates = np.unique(day)
+    ids = np.unique(iid)
+    forward = {
+        int(h): pivot_panel(day, iid, stored_long[horizon_column(h)].to_numpy(dtype=np.float64), dates, ids)
+        for h in horizons
+    }
+    return ReturnPanel(dates, ids, None, forward)
+
+
+def load_return_panel(
+    conn,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    horizons: Sequence[int] = DEFAULT_HORIZONS,
+    instrument_ids: Optional[Sequence[int]] = None,
+    source: str = "prices",
+) -> ReturnPanel:
+    """
+    前瞻收益面板
+
+    source="prices"：价格面板（二进制 COPY）现算，end_date 之后多读约 max(horizons) 个交易日
+    source="store" ：读 forward_returns 物化表（交易日历对齐、退市按最后价格退出；只支持表中的周期）
+    """
+    if source == "store":
+        stored = load_forward_returns(
+            conn,
+            horizons,
+            start_date=start_date,
+            end_date=end_date,
+            instrument_ids=list(instrument_ids) if instrument_ids is not None else None,
+        )
+        return build_stored_return_panel(stored, horizons)
+    if source != "prices":
+        raise ValueError(f"unknown return panel source: {source!r}")
+
+    price_end = None
+    if end_date is not None and horizons:
+        # 交易日 -> 自然日约 1.45 倍，再留余量
+        pad = int(max(horizons) * 1.5) + 10
+        price_end = (pd.Timestamp(end_date) + pd.Timedelta(days=pad)).date().isoformat()
+
+    prices_long = load_price_panel(
+        conn,
+        ["adj_close"],
+        start_date=start_date,
+        end_date=price_end,
+        instrument_ids=list(instrument_ids) if instrument_ids is not None else None,
+    )
+    return build_return_panel(prices_long, horizons, start_date, end_date)
+
+
+def load_factor_matrix(
+    conn,
+    factor_name: str,
+    panel: ReturnPanel,
+    factor_version: str = "v1",
+) -> np.ndarray:
+    """单个因子对齐到 panel 的 [T, N] 矩阵"""
+    if len(panel.dates) == 0:
+        return np.full(panel.shape, np.nan)
+
+    long_df = load_factor_panel(
+        conn,
+        [factor_name],
+        start_date=str(panel.dates[0]),
+        end_date=str(panel.dates[-1]),
+        factor_version=factor_version,
+    )
+    return panel.align(long_df, "factor_value")
+
+
+def iter_factor_matrices(
+    conn,
+    factor_names: Iterable[str],
+    panel: ReturnPanel,
+    factor_version: str = "v1",
+) -> Iterator[Tuple[str, np.ndarray]]:
+    """逐个因子加载（峰值内存只有一个因子的长表）"""
+    for name in factor_names:
+        yield name, load_factor_matrix(conn, name, panel, factor_version)
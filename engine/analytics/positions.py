@@ -0,0 +1,164 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+持仓分析：换手率、集中度、行业暴露
+
+输入是持仓长表（run_id, date, instrument_id, market_value, sector），一行 = 某回测某快照日的一个持仓；
+exp_positions 只保存当前一次回测，读出时 run_id 取常量。参数扫描把多个回测的快照拼成一张长表，
+所有指标都是按 (run_id, date) 的 groupby / merge，一次算完几百个回测。
+
+- weight      ：市值 / 当日总市值（含现金），现金 instrument_id = CASH_INSTRUMENT_ID
+- turnover    ：单边换手 0.5 * Σ|w_t - w_{t-1}|（相邻快照，含现金；首个快照为 NaN）。
+                用快照权重计算，包含两次快照之间价格漂移带来的权重变化
+- 集中度      ：只看股票部分（权重按股票总市值重新归一）：hhi = Σw²、effective_n = 1 / hhi、top_weight
+- 行业暴露    ：各行业权重之和（占总市值，现金单列为 Cash，无行业为 Unknown）
+"""
+from __future__ import annotations
+
+from typing import Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from database.readwrite.rw_exp_positions import get_exp_positions_with_sector
+from engine.constants import CASH_INSTRUMENT_ID
+
+RUN = "run_id"
+KEYS = [RUN, "date"]
+
+TS_COLUMNS = ["n_holdings", "cash_weight", "turnover", "hhi", "effective_n", "top_weight"]
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 权重
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def with_weights(positions: pd.DataFrame, run_id: Hashable = "run") -> pd.DataFrame:
+    """补 run_id（缺失时取常量）、is_cash 与 weight 列；总市值 <= 0 的快照权重为 NaN"""
+    df = positions.copy()
+    if RUN not in df.columns:
+        df[RUN] = run_id
+    df["date"] = pd.to_datetime(df["date"])
+    df["market_value"] = df["market_value"].astype(np.float64)
+    df["is_cash"] = df["instrument_id"] == CASH_INSTRUMENT_ID
+
+    total = df.groupby(KEYS, sort=False)["market_value"].transform("sum")
+    df["weight"] = df["market_value"] / total.where(total > 0)
+    return df
+
+
+def _snapshots(df: pd.DataFrame) -> pd.DataFrame:
+    """每个回测的快照日序号 k（0, 1, ...）"""
+    snap = df[KEYS].drop_duplicates().sort_values(KEYS, ignore_index=True)
+    snap["k"] = snap.groupby(RUN, sort=False).cumcount()
+    return snap
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 指标
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def turnover(df: pd.DataFrame) -> pd.Series:
+    """单边换手（index = run_id, date）；df 为 with_weights 的输出"""
+    snap = _snapshots(df)
+    cur = df[KEYS + ["instrument_id", "weight"]].merge(snap, on=KEYS)[[RUN, "k", "instrument_id", "weight"]]
+    prev = cur.assign(k=cur["k"] + 1).rename(columns={"weight": "prev"})
+
+    # 外连接：新买入（prev 缺失）与清仓（cur 缺失）都按 0 处理；k 超出最后一个快照的行由 snap 内连接丢掉
+    both = cur.merge(prev, on=[RUN, "k", "instrument_id"], how="outer").merge(snap, on=[RUN, "k"])
+    both["delta"] = (both["weight"].fillna(0.0) - both["prev"].fillna(0.0)).abs()
+
+    out = both.groupby(KEYS)["delta"].sum() * 0.5
+    first = snap.loc[snap["k"] == 0].set_index(KEYS).index
+    out.loc[out.index.intersection(first)] = np.nan
+    return out.reindex(pd.MultiIndex.from_frame(snap[KEYS])).rename("turnover")
+
+
+def concentration(df: pd.DataFrame) -> pd.DataFrame:
+    """股票部分的 n_holdings / hhi / effective_n / top_weight 与 cash_weight（index = run_id, date）"""
+    stocks = df.loc[~df["is_cash"] & (df["market_value"] > 0), KEYS + ["market_value"]].copy()
+    stocks["w"] = stocks["market_value"] / stocks.groupby(KEYS, sort=False)["market_value"].transform("sum")
+    stocks["w2"] = stocks["w"] ** 2
+
+    g = stocks.groupby(KEYS)
+    out = pd.DataFrame({"n_holdings": g.size(), "hhi": g["w2"].sum(), "top_weight": g["w"].max()})
+    out["effective_n"] = 1.0 / out["hhi"]
+
+    cash = df.loc[df["is_cash"]].groupby(KEYS)["weight"].sum()
+    index = pd.MultiIndex.from_frame(_snapshots(df)[KEYS])
+    out = out.reindex(index)
+    out["n_holdings"] = out["n_holdings"].fillna(0).astype(np.int64)
+    out["cash_weight"] = cash.reindex(index).fillna(0.0)
+    return out
+
+
+def sector_exposure(df: pd.DataFrame) -> pd.DataFrame:
+    """行业权重宽表（index = run_id, date；列 = 行业，未持有为 0）"""
+    sector = df["sector"].fillna("Unknown") if "sector" in df.columns else pd.Series("Unknown", index=df.index)
+    grouped = df.assign(sector=sector).groupby(KEYS + ["sector"])["weight"].sum()
+    out = grouped.unstack("sector", fill_value=0.0)
+    out.columns.name = None
+    return out
+
+
+def position_analytics(positions: pd.DataFrame, run_id: Hashable = "run") -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Returns
+    -------
+    (ts, sectors)
+    ts      : DataFrame[(run_id, date)] -> n_holdings, cash_weight, turnover, hhi, effective_n, top_weight
+    sectors : DataFrame[(run_id, date)] -> 各行业权重
+    """
+    df = with_weights(positions, run_id)
+    ts = concentration(df)
+    ts["turnover"] = turnover(df)
+    return ts[TS_COLUMNS], sector_exposure(df)
+
+
+def summarize_runs(ts: pd.DataFrame) -> pd.DataFrame:
+    """
+    一行一个回测：快照数、平均 / 年化换手、平均集中度与现金比例
+
+    年化换手 = 换手总和 / 首末快照间隔年数（只有一个快照时为 NaN）
+    """
+    dates = ts.index.get_level_values("date")
+    g = ts.groupby(level=RUN, sort=False)
+    span = pd.Series(dates, index=ts.index).groupby(level=RUN, sort=False).agg(lambda d: (d.max() - d.min()).days / 365.25)
+
+    out = pd.DataFrame({
+        "n_snapshots": g.size(),
+        "avg_turnover": g["turnover"].mean(),
+        "annual_turnover": g["turnover"].sum() / span.where(span > 0),
+        "avg_hhi": g["hhi"].mean(),
+        "avg_effective_n": g["effective_n"].mean(),
+        "avg_top_weight": g["top_weight"].mean(),
+        "avg_cash_weight": g["cash_weight"].mean(),
+        "avg_holdings": g["n_holdings"].mean(),
+    })
+    out.index.name = RUN
+    return out
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 数据库入口
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def exp_position_analytics(
+    conn,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    run_id: Hashable = "exp_positions",
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """当前 exp_positions 回测的持仓分析（一次查询读出全部快照 + 行业）"""
+    positions = get_exp_positions_with_sector(conn, start_date, end_date)
+    if positions.empty:
+        raise RuntimeError("exp_positions is empty")
+    return position_analytics(positions, run_id)
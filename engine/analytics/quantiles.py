@@ -0,0 +1,254 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+因子分组（Q1..Qn）回测
+
+每个调仓日按因子值把截面等分成 n 组（Q1 = 因子最小，Qn = 最大），组内等权持有到下一个调仓日：
+- 分组收益：各组持有期收益（前瞻收益矩阵在调仓日那一行的组内均值）
+- 多空价差：Qn - Q1
+- 换手率  ：组内成员相对上一期被替换的比例（单边）
+- 单调性  ：每期「组号 vs 组收益」的 Spearman 相关，取平均
+
+与 TopKSelector 的一次回测只产出一个 top-K 组合不同，这里对所有因子、所有调仓日整块计算：
+前瞻收益面板只加载一次，因子矩阵逐个加载，分组用 rank_rows 一次完成整个 [调仓日 × 标的] 矩阵。
+
+持有期内退市（前瞻收益缺失）的标的不计入该期组收益。
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from database.readwrite.rw_latest_snapshots import get_latest_factor_date, list_factor_names
+from database.utils.db_utils import get_db_connection
+from engine.analytics.ic import rank_rows, rowwise_corr
+from engine.analytics.panels import ReturnPanel, iter_factor_matrices, load_return_panel
+from utils.logger import get_logger
+
+log = get_logger("factor_quantiles")
+
+TRADING_DAYS = 252
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 分组
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def assign_quantiles(factor: np.ndarray, n_quantiles: int = 5) -> np.ndarray:
+    """
+    按行分组：返回同形状的 int8 矩阵，取值 1..n_quantiles，因子缺失为 0
+
+    用平均秩分组，并列值落在同一组；每行有效样本 < n_quantiles 时整行为 0。
+    """
+    if n_quantiles < 2:
+        raise ValueError(f"n_quantiles must be >= 2, got {n_quantiles}")
+
+    ranks = rank_rows(factor)
+    n_valid = np.isfinite(ranks).sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        q = np.floor((ranks - 1.0) * n_quantiles / n_valid) + 1.0
+    q = np.where(np.isfinite(q), q, 0.0)
+    q[(n_valid < n_quantiles).ravel()] = 0
+    return np.clip(q, 0, n_quantiles).astype(np.int8)
+
+
+def bucket_returns(buckets: np.ndarray, returns: np.ndarray, n_quantiles: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    各组等权收益与成员数
+
+    Returns
+    -------
+    (ret[T, n_quantiles], count[T, n_quantiles])；某组当期没有有效收益时 ret 为 NaN
+    """
+    has_ret = np.isfinite(returns)
+    r = np.where(has_ret, returns, 0.0)
+    t = buckets.shape[0]
+    ret = np.full((t, n_quantiles), np.nan)
+    count = np.zeros((t, n_quantiles), dtype=np.int64)
+
+    for k in range(1, n_quantiles + 1):
+        m = (buckets == k) & has_ret
+        c = m.sum(axis=1)
+        count[:, k - 1] = c
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ret[:, k - 1] = np.where(c > 0, (r * m).sum(axis=1) / np.maximum(c, 1), np.nan)
+    return ret, count
+
+
+def bucket_turnover(buckets: np.ndarray, n_quantiles: int) -> np.ndarray:
+    """
+    各组单边换手率 [T, n_quantiles]：1 - |本期 ∩ 上期| / |本期|，第一期为 NaN
+    """
+    t = buckets.shape[0]
+    out = np.full((t, n_quantiles), np.nan)
+    if t < 2:
+        return out
+
+    cur, prev = buckets[1:], buckets[:-1]
+    for k in range(1, n_quantiles + 1):
+        now = cur == k
+        size = now.sum(axis=1)
+        kept = (now & (prev == k)).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[1:, k - 1] = np.where(size > 0, 1.0 - kept / np.maximum(size, 1), np.nan)
+    return out
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 单因子结果
+# ----------------------------------------------------------------------------------------------------------------------------------------
+@dataclass
+class QuantileResult:
+    """
+    returns  : DataFrame[date] -> Q1..Qn, spread（每个调仓期的持有期收益）
+    turnover : DataFrame[date] -> Q1..Qn
+    counts   : DataFrame[date] -> Q1..Qn（有收益的成员数）
+    monotonicity : Series[date]，每期组号与组收益的 Spearman 相关
+    """
+
+    factor_name: str
+    holding_days: int
+    returns: pd.DataFrame
+    turnover: pd.DataFrame
+    counts: pd.DataFrame
+    monotonicity: pd.Series
+
+    def summary(self) -> Dict[str, float]:
+        """年化组收益、多空价差均值 / t 值 / Sharpe、平均换手、平均单调性"""
+        periods = TRADING_DAYS / self.holding_days
+        out: Dict[str, float] = {"factor_name": self.factor_name, "n_periods": int(len(self.returns))}
+
+        for col in self.turnover.columns:
+            r = self.returns[col].dropna()
+            out[f"{col}_ann"] = float((1.0 + r).prod() ** (periods / len(r)) - 1.0) if len(r) else np.nan
+
+        spread = self.returns["spread"].dropna()
+        n = len(spread)
+        mean = spread.mean() if n else np.nan
+        std = spread.std(ddof=1) if n > 1 else np.nan
+        out["spread_mean"] = float(mean)
+        out["spread_t"] = float(mean / std * np.sqrt(n)) if n > 1 and std > 0 else np.nan
+        out["spread_sharpe"] = float(mean / std * np.sqrt(periods)) if n > 1 and std > 0 else np.nan
+        out["turnover"] = float(np.nanmean(self.turnover.to_numpy())) if self.turnover.notna().any().any() else np.nan
+        out["monotonicity"] = float(self.monotonicity.mean()) if self.monotonicity.notna().any() else np.nan
+        return out
+
+
+def quantile_backtest(
+    factor: np.ndarray,
+    panel: ReturnPanel,
+    *,
+    factor_name: str = "factor",
+    n_quantiles: int = 5,
+    rebalance_every: int = 21,
+) -> QuantileResult:
+    """
+    单个因子矩阵（对齐到 panel）的分组回测
+
+    调仓日 = panel 的第 0, k, 2k, ... 个交易日（k = rebalance_every），
+    持有期收益取 panel.forward[k]，相邻调仓期不重叠，可直接复利。
+    """
+    if rebalance_every not in panel.forward:
+        raise ValueError(f"panel has no {rebalance_every}d forward returns (horizons={sorted(panel.forward)})")
+
+    idx = np.arange(0, panel.shape[0], rebalance_every)
+    fwd = panel.forward[rebalance_every][idx]
+    buckets = assign_quantiles(factor[idx], n_quantiles)
+
+    ret, count = bucket_returns(buckets, fwd, n_quantiles)
+    turnover = bucket_turnover(buckets, n_quantiles)
+
+    # 组号 vs 组收益（n 个点的 Spearman）
+    grid = np.broadcast_to(np.arange(1, n_quantiles + 1, dtype=np.float64), ret.shape)
+    mono, _ = rowwise_corr(rank_rows(np.where(np.isfinite(ret), grid, np.nan)), rank_rows(ret), min_obs=3)
+
+    cols = [f"Q{k}" for k in range(1, n_quantiles + 1)]
+    dates = pd.Index(pd.to_datetime(panel.dates[idx]), name="date")
+
+    returns = pd.DataFrame(ret, index=dates, columns=cols)
+    returns["spread"] = returns[cols[-1]] - returns[cols[0]]
+
+    # 整期没有任何成员的调仓日（如因子尚未开始计算）不计入
+    active = count.sum(axis=1) > 0
+    return QuantileResult(
+        factor_name=factor_name,
+        holding_days=rebalance_every,
+        returns=returns[active],
+        turnover=pd.DataFrame(turnover, index=dates, columns=cols)[active],
+        counts=pd.DataFrame(count, index=dates, columns=cols)[active],
+        monotonicity=pd.Series(mono, index=dates, name="monotonicity")[active],
+    )
+
+
+def summarize_quantiles(results: Iterable[QuantileResult]) -> pd.DataFrame:
+    """多个因子的汇总表（一行一个因子），按 |spread_t| 降序"""
+    rows = [r.summary() for r in results]
+    if not rows:
+        return pd.DataFrame()
+    df = pd.DataFrame(rows)
+    return df.reindex(df["spread_t"].abs().sort_values(ascending=False, na_position="last").index).reset_index(drop=True)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 入口
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def run_quantile_analysis(
+    factor_names: Optional[Sequence[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    *,
+    n_quantiles: int = 5,
+    rebalance_every: int = 21,
+    factor_version: str = "v1",
+    source: str = "prices",
+    conn=None,
+) -> Tuple[Dict[str, QuantileResult], pd.DataFrame]:
+    """
+    所有因子的分组回测（价格面板加载一次，因子逐个加载）
+
+    factor_names=None 时分析库中所有因子；end_date=None 时取最新因子日期。
+    source="store" 时持有期收益读 forward_returns 表（rebalance_every 须是表中的周期）。
+    Returns: ({factor_name: QuantileResult}, summary_df)
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+        if not conn:
+            raise RuntimeError("failed to get db connection")
+
+    try:
+        if factor_names is None:
+            factor_names = list_factor_names(conn, factor_version)
+        if end_date is None:
+            end_date = get_latest_factor_date(conn, factor_version)
+
+        panel = load_return_panel(conn, start_date, end_date, (rebalance_every,), source=source)
+        log.info(
+            f"[quantiles] panel {panel.shape[0]} dates x {panel.shape[1]} instruments, "
+            f"{len(factor_names)} factors, Q{n_quantiles}, rebalance every {rebalance_every}d"
+        )
+
+        results: Dict[str, QuantileResult] = {}
+        for name, mat in iter_factor_matrices(conn, factor_names, panel, factor_version):
+            results[name] = quantile_backtest(
+                mat, panel, factor_name=name, n_quantiles=n_quantiles, rebalance_every=rebalance_every
+            )
+
+        return results, summarize_quantiles(results.values())
+
+    finally:
+        if own_conn:
+            conn.close()
@@ -0,0 +1,217 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+尾部风险模拟（stationary bootstrap）
+
+对一个回测的日收益做 Politis-Romano stationary bootstrap：
+每条路径从随机位置开始，每天以 1 / mean_block 的概率跳到新的随机位置，否则顺延到下一天（循环取样），
+块长服从几何分布，保留波动聚集与短期自相关。
+
+- 路径按 chunk_size 分块生成：每块是一个 [chunk, horizon] 数组（索引 -> 收益 -> 对数累计），
+  只保留每条路径的期末收益与最大回撤，内存与总路径数无关
+- 随机数由 np.random.default_rng(seed) 驱动，(seed, chunk_size) 相同则结果逐位相同
+
+输出：期末收益 / 最大回撤的分位数、VaR / CVaR、「一年内回撤超过 30%」等阈值概率。
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from engine.analytics.metrics import TRADING_DAYS, infer_periods_per_year, load_nav_with_benchmark, nav_to_returns
+from utils.logger import get_logger
+
+log = get_logger("tail_risk")
+
+DEFAULT_PATHS = 100_000
+DEFAULT_MEAN_BLOCK = 10
+DEFAULT_CHUNK = 10_000
+DEFAULT_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+DEFAULT_DD_LEVELS = (0.1, 0.2, 0.3, 0.4)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 收益输入
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def holdings_returns(weights: np.ndarray, daily_forward: np.ndarray) -> np.ndarray:
+    """
+    持仓 + 收益面板 -> 组合日收益
+
+    weights / daily_forward : [T, N]，weights[t] 为 t 日收盘后的持仓权重，daily_forward[t] 为 t -> t+1 的收益
+    Returns: [T]，第 t 个值是 t -> t+1 的组合收益（缺失收益按 0 处理，现金部分收益为 0）
+    """
+    if weights.shape != daily_forward.shape:
+        raise ValueError(f"weights shape {weights.shape} != returns shape {daily_forward.shape}")
+    w = np.nan_to_num(weights, nan=0.0)
+    r = np.nan_to_num(daily_forward, nan=0.0)
+    return (w * r).sum(axis=1)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# Bootstrap
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def stationary_bootstrap_indices(
+    n_obs: int,
+    n_paths: int,
+    horizon: int,
+    mean_block: float,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    stationary bootstrap 的取样下标 [n_paths, horizon]（int64，取值 0..n_obs-1）
+
+    每个位置以 1 / mean_block 概率开启新块（第 0 列必开）；块内下标逐日 +1 并对 n_obs 取模。
+    """
+    if n_obs < 1:
+        raise ValueError("need at least one observation")
+    if mean_block < 1:
+        raise ValueError(f"mean_block must be >= 1, got {mean_block}")
+
+    new_block = rng.random((n_paths, horizon)) < 1.0 / mean_block
+    new_block[:, 0] = True
+    starts = rng.integers(0, n_obs, size=(n_paths, horizon))
+
+    col = np.arange(horizon)
+    # 每个位置所在块的起始列
+    block_col = np.maximum.accumulate(np.where(new_block, col, 0), axis=1)
+    block_start = np.take_along_axis(starts, block_col, axis=1)
+    return (block_start + (col - block_col)) % n_obs
+
+
+def _path_stats(log_returns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """[P, H] 对数收益 -> (期末收益[P], 最大回撤[P]（<= 0）)，起点净值 1 计入历史最高"""
+    cum = np.cumsum(log_returns, axis=1)
+    peak = np.maximum(np.maximum.accumulate(cum, axis=1), 0.0)
+    worst = (cum - peak).min(axis=1)
+    return np.expm1(cum[:, -1]), np.expm1(worst)
+
+
+@dataclass
+class TailRiskResult:
+    """
+    total_return : [n_paths] 每条路径 horizon 天的累计收益
+    max_drawdown : [n_paths] 每条路径的最大回撤（负数）
+    """
+
+    horizon: int
+    mean_block: float
+    total_return: np.ndarray
+    max_drawdown: np.ndarray
+
+    @property
+    def n_paths(self) -> int:
+        return len(self.total_return)
+
+    def prob_drawdown(self, level: float) -> float:
+        """最大回撤达到 level（如 0.3 = 30%）的概率"""
+        return float(np.mean(self.max_drawdown <= -abs(level)))
+
+    def quantiles(self, qs: Sequence[float] = DEFAULT_QUANTILES) -> pd.DataFrame:
+        """DataFrame[q] -> total_return, max_drawdown"""
+        qs = np.asarray(qs, dtype=np.float64)
+        return pd.DataFrame(
+            {
+                "total_return": np.quantile(self.total_return, qs),
+                "max_drawdown": np.quantile(self.max_drawdown, qs),
+            },
+            index=pd.Index(qs, name="q"),
+        )
+
+    def summary(self, levels: Sequence[float] = DEFAULT_DD_LEVELS, alphas: Sequence[float] = (0.95, 0.99)) -> pd.Series:
+        """回撤阈值概率、亏损概率、期末收益的 VaR / CVaR（以正数表示损失）"""
+        out: Dict[str, float] = {
+            "n_paths": float(self.n_paths),
+            "horizon": float(self.horizon),
+            "mean_return": float(self.total_return.mean()),
+            "median_return": float(np.median(self.total_return)),
+            "prob_loss": float(np.mean(self.total_return < 0)),
+            "median_max_drawdown": float(np.median(self.max_drawdown)),
+        }
+        for level in levels:
+            out[f"prob_dd_{int(round(level * 100))}"] = self.prob_drawdown(level)
+
+        ordered = np.sort(self.total_return)
+        for a in alphas:
+            k = max(int(np.floor((1.0 - a) * self.n_paths)), 1)
+            tag = int(round(a * 100))
+            out[f"var_{tag}"] = float(-np.quantile(self.total_return, 1.0 - a))
+            out[f"cvar_{tag}"] = float(-ordered[:k].mean())
+        return pd.Series(out)
+
+
+def simulate_tail_risk(
+    returns,
+    *,
+    n_paths: int = DEFAULT_PATHS,
+    horizon: int = TRADING_DAYS,
+    mean_block: float = DEFAULT_MEAN_BLOCK,
+    seed: Optional[int] = 0,
+    chunk_size: int = DEFAULT_CHUNK,
+) -> TailRiskResult:
+    """
+    日收益序列的 stationary bootstrap 模拟
+
+    returns : 一维日收益（NaN 会被剔除，例如 nav_to_returns 的首行）
+    """
+    r = np.asarray(returns, dtype=np.float64).ravel()
+    r = r[np.isfinite(r)]
+    if len(r) < 2:
+        raise ValueError(f"need at least 2 finite returns, got {len(r)}")
+    if np.any(r <= -1.0):
+        raise ValueError("returns <= -100% cannot be compounded")
+    if horizon < 1 or n_paths < 1 or chunk_size < 1:
+        raise ValueError("horizon, n_paths and chunk_size must be >= 1")
+
+    log_r = np.log1p(r)
+    rng = np.random.default_rng(seed)
+
+    total = np.empty(n_paths)
+    mdd = np.empty(n_paths)
+    for lo in range(0, n_paths, chunk_size):
+        hi = min(lo + chunk_size, n_paths)
+        idx = stationary_bootstrap_indices(len(r), hi - lo, horizon, mean_block, rng)
+        total[lo:hi], mdd[lo:hi] = _path_stats(log_r[idx])
+
+    return TailRiskResult(horizon=horizon, mean_block=mean_block, total_return=total, max_drawdown=mdd)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 数据库入口
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def exp_tail_risk(
+    conn,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    **kwargs,
+) -> TailRiskResult:
+    """
+    当前 exp_positions 回测的尾部风险模拟（kwargs 透传给 simulate_tail_risk）
+
+    bootstrap 的单位是交易日：使用调仓日快照逐日盯市后的日频 NAV；NAV 不是日频时直接报错，
+    否则 horizon=252 的一条路径会被当成几十年。
+    """
+    nav = load_nav_with_benchmark(conn, None, start_date, end_date)
+    if nav.empty:
+        raise RuntimeError("exp_positions NAV is empty")
+
+    ppy = infer_periods_per_year(nav.index)
+    if ppy != TRADING_DAYS:
+        raise ValueError(f"tail risk needs daily returns, got a NAV with ~{ppy} periods per year")
+
+    rets = nav_to_returns(nav["nav"].to_numpy())
+    log.info(f"[tail_risk] {len(rets) - 1} daily returns, {kwargs.get('n_paths', DEFAULT_PATHS)} paths")
+    return simulate_tail_risk(rets, **kwargs)
@@ -0,0 +1,385 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+LinearScorer 权重的 walk-forward 优化
+
+信号与回测一致：每个 FactorSpec 生成 <factor_name>_rank（联合有效集合内 rank 到 (-1, 1)，
+ascending=False 的因子反向），LinearScorer 对这些列线性加权。
+
+流程（日期轴按 step 抽样，默认每周一个截面）：
+1) 逐截面统计量一次算完：各信号的 Spearman IC，以及 X'X / X'y（X = 信号，y = 去均值的 horizon 日前瞻收益，
+   按截面样本数归一，每个截面权重相同）
+2) 调仓日 = 每 horizon 个交易日；调仓日 s 的训练窗口为 s 之前已实现的最近 train_days 个交易日
+   （训练样本 d 需满足 d + horizon <= s，不使用未来收益）。所有窗口的统计量由累计和相减得到，批量求解：
+   - ic       ：w = 窗口平均 IC
+   - ridge    ：w = (mean X'X + ridge * I)^-1 mean X'y
+   - max_icir ：w = Σ_IC^-1 mean IC（Σ_IC 向对角收缩 shrink）
+   权重按 Σ|w| = 1 归一（与手工权重 0.5 / 0.3 / 0.2 同尺度）
+3) 每个调仓日用该窗口的权重构造 LinearScorer 给截面打分（样本外），统计打分的 IC、Top 组与多空收益
+
+baseline 传入固定权重（如 tasks/backtest_tasks.py 的 WEIGHTS）时作为对照一并评估。
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from database.readwrite.rw_latest_snapshots import get_latest_factor_date
+from database.utils.db_utils import get_db_connection
+from engine.analytics.ic import rank_rows, rowwise_corr
+from engine.analytics.panels import iter_factor_matrices, load_return_panel
+from engine.analytics.quantiles import TRADING_DAYS, assign_quantiles, bucket_returns
+from engine.scorers.linear import LinearScorer, LinearTerm
+from engine.signals import FactorSpec
+from utils.logger import get_logger
+
+log = get_logger("walk_forward")
+
+METHODS = ("ic", "ridge", "max_icir")
+BASELINE = "baseline"
+
+DEFAULT_HORIZON = 21
+DEFAULT_TRAIN_DAYS = 756
+DEFAULT_STEP = 5
+# 信号在 (-1, 1) 近似均匀分布，截面方差约 1/3；ridge 以此为尺度
+DEFAULT_RIDGE = 0.1
+DEFAULT_SHRINK = 0.5
+DEFAULT_MIN_OBS = 30
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 信号
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def rank_signals(factors: Sequence[np.ndarray], ascending: Sequence[bool]) -> np.ndarray:
+    """
+    因子矩阵 -> rank 信号 [K, T, N]
+
+    与 normalize_cross_section 的 rank 方法一致：只保留所有因子都有值的标的，
+    在这个集合内取平均秩百分位并映射到 (-1, 1]；其余位置为 NaN。
+    """
+    if len(factors) != len(ascending):
+        raise ValueError(f"{len(factors)} factors but {len(ascending)} directions")
+
+    joint = np.logical_and.reduce([np.isfinite(f) for f in factors])
+    n = joint.sum(axis=1, keepdims=True).astype(np.float64)
+
+    out = np.empty((len(factors),) + joint.shape)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for k, (f, asc) in enumerate(zip(factors, ascending)):
+            r = rank_rows(np.where(joint, f, np.nan))
+            pct = r / n if asc else (n - r + 1.0) / n
+            out[k] = 2.0 * pct - 1.0
+    return out
+
+
+def _cross_section_stats(signals: np.ndarray, forward: np.ndarray, min_obs: int) -> Dict[str, np.ndarray]:
+    """逐截面 IC[T, K]、X'X/n [T, K, K]、X'y/n [T, K] 与有效标记 ok[T]"""
+    k, t, _ = signals.shape
+    valid = np.isfinite(signals).all(axis=0) & np.isfinite(forward)
+    n = valid.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+
+    fwd_rank = rank_rows(np.where(valid, forward, np.nan))
+    ic = np.empty((t, k))
+    for j in range(k):
+        ic[:, j], _ = rowwise_corr(np.where(valid, signals[j], np.nan), fwd_rank, min_obs=min_obs)
+
+    y = np.where(valid, forward, 0.0)
+    y -= (y.sum(axis=1) / safe_n)[:, None]
+    y[~valid] = 0.0
+    x = np.where(valid[None], signals, 0.0)
+
+    xtx = np.einsum("ktn,ltn->tkl", x, x) / safe_n[:, None, None]
+    xty = np.einsum("ktn,tn->tk", x, y) / safe_n[:, None]
+
+    ok = (n >= min_obs) & np.isfinite(ic).all(axis=1)
+    ic[~ok] = 0.0
+    xtx[~ok] = 0.0
+    xty[~ok] = 0.0
+    return {"ic": ic, "xtx": xtx, "xty": xty, "ok": ok.astype(np.float64)}
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 批量拟合
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def _window_sums(a: np.ndarray, ends: np.ndarray, length: int) -> np.ndarray:
+    """a 沿第 0 维在 (end - length, end] 上的和（end < 0 时为 0），对所有 end 一次取出"""
+    c = np.concatenate([np.zeros((1,) + a.shape[1:]), np.cumsum(a, axis=0)])
+    hi = np.clip(ends + 1, 0, len(a))
+    lo = np.clip(ends + 1 - length, 0, len(a))
+    return c[hi] - c[lo]
+
+
+def _normalize(w: np.ndarray) -> np.ndarray:
+    """按 Σ|w| = 1 归一；全 0 或非有限的行置 NaN"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scale = np.abs(w).sum(axis=1, keepdims=True)
+        out = w / scale
+    out[~(np.isfinite(out).all(axis=1) & (scale[:, 0] > 0))] = np.nan
+    return out
+
+
+def fit_weights(
+    stats: Mapping[str, np.ndarray],
+    ends: np.ndarray,
+    train_len: int,
+    method: str,
+    *,
+    ridge: float = DEFAULT_RIDGE,
+    shrink: float = DEFAULT_SHRINK,
+    min_train: Optional[int] = None,
+) -> np.ndarray:
+    """
+    所有训练窗口的权重 [len(ends), K]
+
+    ends : 每个窗口最后一个训练截面的下标（窗口 = (end - train_len, end]）
+    有效截面数 < min_train（默认 train_len // 2）的窗口为 NaN
+    """
+    min_train = max(train_len // 2, 2) if min_train is None else int(min_train)
+    ends = np.asarray(ends, dtype=np.int64)
+    k = stats["ic"].shape[1]
+
+    cnt = _window_sums(stats["ok"], ends, train_len)
+    enough = cnt >= min_train
+    safe = np.maximum(cnt, 1.0)
+    mu = _window_sums(stats["ic"], ends, train_len) / safe[:, None]
+    eye = np.eye(k)
+
+    if method == "ic":
+        w = mu
+    elif method == "ridge":
+        a = _window_sums(stats["xtx"], ends, train_len) / safe[:, None, None] + ridge * eye
+        b = _window_sums(stats["xty"], ends, train_len) / safe[:, None]
+        w = np.linalg.solve(np.where(enough[:, None, None], a, eye), b[..., None])[..., 0]
+    elif method == "max_icir":
+        ic = stats["ic"]
+        s2 = _window_sums(ic[:, :, None] * ic[:, None, :], ends, train_len)
+        cov = (s2 - cnt[:, None, None] * mu[:, :, None] * mu[:, None, :]) / np.maximum(cnt - 1.0, 1.0)[:, None, None]
+        diag = cov * eye
+        cov = (1.0 - shrink) * cov + shrink * diag
+        # 方差为 0（如窗口内只有一个截面）时退化为单位阵
+        usable = enough & (np.diagonal(cov, axis1=1, axis2=2) > 0).all(axis=1)
+        w = np.linalg.solve(np.where(usable[:, None, None], cov, eye), mu[..., None])[..., 0]
+    else:
+        raise ValueError(f"unknown method: {method!r} (expected one of {METHODS})")
+
+    w = _normalize(w)
+    w[~enough] = np.nan
+    return w
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 样本外打分
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def make_scorer(terms: Sequence[str], weights: Sequence[float], **kwargs) -> LinearScorer:
+    """列名 + 权重 -> LinearScorer（kwargs 透传，如 out_col / post_transform）"""
+    return LinearScorer(terms=tuple(LinearTerm(c, float(w)) for c, w in zip(terms, weights)), **kwargs)
+
+
+def score_cross_section(scorer: LinearScorer, signals: np.ndarray, instrument_ids: np.ndarray, terms: Sequence[str]) -> np.ndarray:
+    """单个截面的信号 [K, N] 用 scorer 打分，返回 [N]（信号不全的标的为 NaN）"""
+    valid = np.isfinite(signals).all(axis=0)
+    out = np.full(signals.shape[1], np.nan)
+    if not valid.any():
+        return out
+
+    df = pd.DataFrame({"instrument_id": instrument_ids[valid]})
+    for j, col in enumerate(terms):
+        df[col] = signals[j, valid]
+    res = scorer.score(df)
+    out[valid] = res.signals[res.score_col].to_numpy(dtype=np.float64)
+    return out
+
+
+@dataclass
+class WalkForwardResult:
+    """
+    terms   : 信号列名（<factor_name>_rank）
+    weights : DataFrame[(method, date)] -> 各 term 权重（date = 调仓日，只用该日之前已实现的收益拟合）
+    oos     : DataFrame[(method, date)] -> ic, top, spread, n_obs（调仓日打分的样本外表现，持有 horizon 日）
+    """
+
+    terms: List[str]
+    horizon: int
+    weights: pd.DataFrame
+    oos: pd.DataFrame
+
+    def summary(self) -> pd.DataFrame:
+        """一行一个方法：平均 IC、ICIR、Top 组 / 多空年化收益、多空 Sharpe"""
+        periods = TRADING_DAYS / self.horizon
+        rows = []
+        for method, g in self.oos.groupby(level="method", sort=False):
+            ic = g["ic"].dropna()
+            top = g["top"].dropna()
+            spread = g["spread"].dropna()
+            sd = spread.std(ddof=1) if len(spread) > 1 else np.nan
+            rows.append({
+                "method": method,
+                "n_periods": len(g),
+                "mean_ic": ic.mean() if len(ic) else np.nan,
+                "icir": ic.mean() / ic.std(ddof=1) if len(ic) > 1 and ic.std(ddof=1) > 0 else np.nan,
+                "top_ann": (1.0 + top).prod() ** (periods / len(top)) - 1.0 if len(top) else np.nan,
+                "spread_ann": (1.0 + spread).prod() ** (periods / len(spread)) - 1.0 if len(spread) else np.nan,
+                "spread_sharpe": spread.mean() / sd * np.sqrt(periods) if sd and sd > 0 else np.nan,
+            })
+        return pd.DataFrame(rows).set_index("method")
+
+    def latest_weights(self, method: str) -> pd.Series:
+        if method not in self.weights.index.get_level_values("method"):
+            raise ValueError(f"no fitted weights for method {method!r}")
+        w = self.weights.xs(method, level="method").dropna()
+        if w.empty:
+            raise ValueError(f"no fitted weights for method {method!r}")
+        return w.iloc[-1]
+
+    def scorer(self, method: str, **kwargs) -> LinearScorer:
+        """最近一次拟合的权重对应的 LinearScorer（用于下一期实盘 / 回测）"""
+        w = self.latest_weights(method)
+        return make_scorer(list(w.index), w.to_numpy(), **kwargs)
+
+
+def walk_forward(
+    signals: np.ndarray,
+    forward: np.ndarray,
+    dates: np.ndarray,
+    instrument_ids: np.ndarray,
+    terms: Sequence[str],
+    *,
+    hold: int,
+    train_len: int,
+    gap: int,
+    horizon: int,
+    methods: Sequence[str] = METHODS,
+    baseline: Optional[Mapping[str, float]] = None,
+    ridge: float = DEFAULT_RIDGE,
+    shrink: float = DEFAULT_SHRINK,
+    min_obs: int = DEFAULT_MIN_OBS,
+    n_quantiles: int = 5,
+) -> WalkForwardResult:
+    """
+    抽样后的信号 [K, T, N] / 前瞻收益 [T, N] 上的 walk-forward
+
+    hold      : 相邻调仓日间隔的截面数
+    train_len : 训练窗口的截面数
+    gap       : 训练截面与调仓日的最小间隔（截面数），保证训练收益在调仓日前已实现
+    """
+    terms = list(terms)
+    stats = _cross_section_stats(signals, forward, min_obs)
+    rebal = np.arange(0, signals.shape[1], hold)
+    ends = rebal - gap
+
+    fitted: Dict[str, np.ndarray] = {m: fit_weights(stats, ends, train_len, m, ridge=ridge, shrink=shrink) for m in methods}
+    if baseline is not None:
+        fitted[BASELINE] = np.tile(np.array([baseline[c] for c in terms], dtype=np.float64), (len(rebal), 1))
+
+    fwd = forward[rebal]
+    day = pd.to_datetime(np.asarray(dates)[rebal])
+    weight_frames, oos_frames = [], []
+    for method, w in fitted.items():
+        scores = np.full(fwd.shape, np.nan)
+        for i, s in enumerate(rebal):
+            if np.isfinite(w[i]).all():
+                scores[i] = score_cross_section(make_scorer(terms, w[i]), signals[:, s], instrument_ids, terms)
+
+        scores[~np.isfinite(fwd)] = np.nan
+        ic, n = rowwise_corr(rank_rows(scores), rank_rows(np.where(np.isfinite(scores), fwd, np.nan)), min_obs=min_obs)
+        ret, _ = bucket_returns(assign_quantiles(scores, n_quantiles), fwd, n_quantiles)
+
+        active = np.isfinite(w).all(axis=1)
+        idx = pd.MultiIndex.from_arrays([[method] * active.sum(), day[active]], names=["method", "date"])
+        weight_frames.append(pd.DataFrame(w[active], index=idx, columns=terms))
+        oos_frames.append(pd.DataFrame(
+            {"ic": ic[active], "top": ret[active, -1], "spread": (ret[:, -1] - ret[:, 0])[active], "n_obs": n[active]},
+            index=idx,
+        ))
+
+    return WalkForwardResult(terms=terms, horizon=horizon, weights=pd.concat(weight_frames), oos=pd.concat(oos_frames))
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 入口
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def run_walk_forward(
+    specs: Sequence[FactorSpec],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    *,
+    horizon: int = DEFAULT_HORIZON,
+    train_days: int = DEFAULT_TRAIN_DAYS,
+    step: int = DEFAULT_STEP,
+    methods: Sequence[str] = METHODS,
+    baseline: Optional[Mapping[str, float]] = None,
+    ridge: float = DEFAULT_RIDGE,
+    shrink: float = DEFAULT_SHRINK,
+    factor_version: str = "v1",
+    source: str = "prices",
+    conn=None,
+) -> WalkForwardResult:
+    """
+    加载前瞻收益面板与 specs 中的因子，按 step 抽样后做 walk-forward
+
+    horizon 须是 step 的整数倍（调仓日落在抽样网格上）；source="store" 时读 forward_returns 表。
+    """
+    if horizon % step != 0:
+        raise ValueError(f"horizon ({horizon}) must be a multiple of step ({step})")
+
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+        if not conn:
+            raise RuntimeError("failed to get db connection")
+
+    try:
+        if end_date is None:
+            end_date = get_latest_factor_date(conn, factor_version)
+
+        panel = load_return_panel(conn, start_date, end_date, (horizon,), source=source)
+        grid = np.arange(0, panel.shape[0], step)
+        log.info(
+            f"[walk_forward] {len(specs)} factors, {panel.shape[0]} dates ({len(grid)} sampled) x "
+            f"{panel.shape[1]} instruments, horizon={horizon}d, train={train_days}d, methods={list(methods)}"
+        )
+
+        names = [s.factor_name for s in specs]
+        mats = []
+        for name, mat in iter_factor_matrices(conn, names, panel, factor_version):
+            # 任一因子整块缺失时 rank_signals 的共同样本为空，所有窗口都拟合不出权重
+            if not np.isfinite(mat).any():
+                raise ValueError(f"factor {name!r} (version {factor_version}) has no values in {start_date} -> {end_date}")
+            mats.append(mat[grid])
+        signals = rank_signals(mats, [s.ascending for s in specs])
+        del mats
+
+        return walk_forward(
+            signals,
+            panel.forward[horizon][grid],
+            panel.dates[grid],
+            panel.instrument_ids,
+            [f"{n}_rank" for n in names],
+            hold=horizon // step,
+            train_len=max(train_days // step, 1),
+            gap=horizon // step,
+            horizon=horizon,
+            methods=methods,
+            baseline=baseline,
+            ridge=ridge,
+            shrink=shrink,
+        )
+
+    finally:
+        if own_conn:
+            conn.close()
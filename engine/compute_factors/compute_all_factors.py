@@ -20,6 +20,7 @@ from engine.compute_factors import (
     compute_volatility_of_volatility,
     compute_volume_ratio,
     compute_decline_streak,
+    compute_valuation,
 )
 
 
@@ -32,3 +33,4 @@ def compute_all_factors():
     compute_max_drawdown.run()
     compute_volume_ratio.run()
     compute_decline_streak.run()
+    compute_valuation.run()
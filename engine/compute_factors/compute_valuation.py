@@ -0,0 +1,169 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+估值因子 runner（point-in-time）
+
+- fundamental_daily：market_cap / pe_ttm / pb / ps_ttm / ev_ebitda_ttm / fcf_yield_ttm / div_yield_ttm
+- factor_values    ：val_ep_ttm / val_bp / val_sp_ttm / val_ebitda_ev_ttm / val_fcf_yield_ttm / val_div_yield_ttm
+
+增量：system_state 记录 last_done_date，日常只补新交易日。
+由于每天只使用当日已披露的财报，新财报不会改变历史日期的值；
+首次下载/重下 SEC 数据后用 force=True 全量重算。
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pandas as pd
+
+from database.utils.db_utils import get_db_connection
+from database.readwrite.rw_instruments import get_tradable_instrument_ids
+from database.readwrite.rw_system_state import get_state, set_state
+from database.readwrite.rw_market_prices import get_price_max_date, load_price_panel
+from database.readwrite.rw_fundamental_data import get_fundamental_panel
+from database.readwrite.rw_fundamental_daily import copy_fundamental_daily
+from database.readwrite.rw_factor_values import batch_insert_factor_values
+from factors.valuation import (
+    DAILY_METRICS,
+    FUNDAMENTAL_METRICS,
+    VALUATION_FACTORS,
+    compute_valuation_panel,
+    to_long,
+)
+from utils.config_values import DEFAULT_START_DATE
+from utils.time import to_date
+from utils.logger import get_logger
+
+log = get_logger("compute_valuation")
+
+STATE_KEY = "factor:valuation:v1"
+FACTOR_VERSION = "v1"
+
+# 拆股调整需要回看到股本的 period_end；TTM 需要约 5 个季度财报
+PRICE_LOOKBACK_DAYS = 600
+FUNDAMENTAL_LOOKBACK_DAYS = 3 * 365
+
+# 全量回填时按年分块，控制内存
+CHUNK_DAYS = 366
+
+
+def _factor_rows(panel: pd.DataFrame):
+    names = {v: k for k, v in VALUATION_FACTORS.items()}
+    long = to_long(panel, VALUATION_FACTORS.values(), names)
+    return [
+        {
+            "instrument_id": int(r.instrument_id),
+            "date": r.date.isoformat(),
+            "factor_name": r.metric_name,
+            "factor_value": float(r.metric_value),
+            "factor_version": FACTOR_VERSION,
+            "factor_args": {"ttm": True, "lag_days": 1, "price_field": "close_price"},
+            "config": {},
+            "data_source": "internal",
+        }
+        for r in long.itertuples(index=False)
+    ]
+
+
+def run(*, force: bool = False):
+    conn = get_db_connection()
+    if not conn:
+        raise RuntimeError("failed to get db connection")
+
+    try:
+        instrument_ids = get_tradable_instrument_ids(conn)
+        if not instrument_ids:
+            log.warning("no tradable instruments found")
+            return
+
+        req_start = to_date(DEFAULT_START_DATE())
+
+        max_db_date = get_price_max_date(conn)
+        if not max_db_date:
+            log.warning("market_prices is empty, nothing to do")
+            return
+        req_end = to_date(max_db_date)
+
+        st = get_state(conn, STATE_KEY, default=None)
+        old_last_done = to_date(st["last_done_date"]) if st and "last_done_date" in st else None
+
+        actual_start = req_start
+        if (not force) and old_last_done and old_last_done > actual_start:
+            actual_start = old_last_done
+
+        if actual_start > req_end:
+            log.info("[valuation] already up to date, skip")
+            return
+
+        log.info(f"[range] {actual_start} -> {req_end}, instruments={len(instrument_ids)}")
+
+        fund = get_fundamental_panel(
+            conn,
+            FUNDAMENTAL_METRICS,
+            instrument_ids=instrument_ids,
+            min_period_end=(actual_start - timedelta(days=FUNDAMENTAL_LOOKBACK_DAYS)).isoformat(),
+        )
+        if fund.empty:
+            log.warning("[valuation] fundamental_data is empty, nothing to do")
+            return
+
+        total_daily = total_factor = 0
+        chunk_start = actual_start
+        while chunk_start <= req_end:
+            chunk_end = min(chunk_start + timedelta(days=CHUNK_DAYS - 1), req_end)
+
+            prices = load_price_panel(
+                conn,
+                ("close_price", "stock_splits"),
+                (chunk_start - timedelta(days=PRICE_LOOKBACK_DAYS)).isoformat(),
+                chunk_end.isoformat(),
+                instrument_ids=instrument_ids,
+            )
+            if not prices.empty:
+                panel = compute_valuation_panel(prices, fund)
+                dates = panel["date"].dt.date
+                panel = panel[(dates >= chunk_start) & (dates <= chunk_end)]
+
+                total_daily += copy_fundamental_daily(conn, to_long(panel, DAILY_METRICS))
+                rows = _factor_rows(panel)
+                batch_insert_factor_values(conn, rows)
+                total_factor += len(rows)
+                conn.commit()
+
+            log.info(
+                f"[valuation] {chunk_start} -> {chunk_end}: "
+                f"daily={total_daily}, factor_values={total_factor}"
+            )
+            chunk_start = chunk_end + timedelta(days=1)
+
+        if total_daily > 0:
+            new_last_done = req_end
+            if old_last_done and old_last_done > new_last_done:
+                new_last_done = old_last_done
+
+            set_state(
+                conn,
+                STATE_KEY,
+                {
+                    "last_done_date": new_last_done.isoformat(),
+                    "factor": "valuation",
+                    "version": FACTOR_VERSION,
+                },
+            )
+            conn.commit()
+        else:
+            log.warning("[state] valuation: wrote 0 rows, state not advanced")
+
+    finally:
+        conn.close()
@@ -132,20 +132,22 @@ def fetch_factors_long_for_date(
 
     返回: DataFrame with columns [instrument_id, date, factor_name, factor_value]
     """
-    from database.readwrite.rw_factor_values import get_factor_values
-    
+    from database.readwrite.rw_factor_values import load_factor_panel
+
     if len(factor_names) == 0:
         raise ValueError("factor_names cannot be empty")
 
     if universe_ids is not None and len(universe_ids) == 0:
         raise ValueError("universe_ids provided but empty")
 
-    df = get_factor_values(
+    # 二进制 COPY 快速路径：factor_value 直接是 float64，无需逐行 Decimal 转换
+    df = load_factor_panel(
         conn,
-        factor_names=list(factor_names),
-        factor_version=factor_version,
+        list(factor_names),
+        start_date=asof_date,
+        end_date=asof_date,
         instrument_ids=list(universe_ids) if universe_ids else None,
-        date=asof_date,
+        factor_version=factor_version,
     )
 
     # RW 返回的列名是 factor_value，需要重命名为 value 以保持兼容
@@ -0,0 +1,355 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+"""
+Point-in-time 估值因子（纯 pandas，全市场向量化）
+================================================
+
+输入：
+- fund  : fundamental_data 长表（instrument_id, metric_name, period_type,
+          period_start, period_end, filed_date, metric_value），metric_name 为标准名
+- prices: market_prices 长表（instrument_id, date, close_price, stock_splits）
+
+防前视：
+- 每条财报在 filed_date + lag_days 才可用（默认次日，披露常在盘后）
+- 每个交易日只用「当日已可用」财报中 period_end 最新的一期
+- 流量指标取 TTM：最近 4 个单季之和（Q4 = FY − Q1 − Q2 − Q3），
+  可用日取 4 个分量中最晚的那个
+- 股本按 period_end 之后的拆股调整（避免拆股后、下一份财报前市值失真）
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+
+# 流量指标（需要 TTM）
+FLOW_METRICS = (
+    "revenue",
+    "net_income",
+    "operating_income",
+    "depreciation_amortization",
+    "operating_cash_flow",
+    "capex",
+    "dividends_paid",
+)
+
+# 存量指标（取最新一期）
+STOCK_METRICS = (
+    "stockholders_equity",
+    "cash",
+    "long_term_debt",
+    "shares_outstanding",
+)
+
+FUNDAMENTAL_METRICS = FLOW_METRICS + STOCK_METRICS
+
+# 写入 fundamental_daily 的估值指标
+DAILY_METRICS = (
+    "market_cap",
+    "pe_ttm",
+    "pb",
+    "ps_ttm",
+    "ev_ebitda_ttm",
+    "fcf_yield_ttm",
+    "div_yield_ttm",
+)
+
+# 写入 factor_values 的收益率型因子（越大越便宜，亏损公司为负值仍可排序）
+VALUATION_FACTORS: Dict[str, str] = {
+    "val_ep_ttm": "ep_ttm",
+    "val_bp": "bp",
+    "val_sp_ttm": "sp_ttm",
+    "val_ebitda_ev_ttm": "ebitda_ev_ttm",
+    "val_fcf_yield_ttm": "fcf_yield_ttm",
+    "val_div_yield_ttm": "div_yield_ttm",
+}
+
+_KEYS = ["instrument_id", "metric_name"]
+
+
+def _to_ns(values) -> pd.Series:
+    """统一日期精度（merge_asof 要求两侧 dtype 完全一致）"""
+    return pd.to_datetime(values).astype("datetime64[ns]")
+
+
+def _prepare(fund: pd.DataFrame) -> pd.DataFrame:
+    df = fund.copy()
+    for c in ("period_start", "period_end", "filed_date"):
+        df[c] = _to_ns(df[c])
+    df["metric_value"] = pd.to_numeric(df["metric_value"], errors="coerce").astype(float)
+    return df.dropna(subset=["period_end", "filed_date", "metric_value"])
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# TTM
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def compute_ttm(fund: pd.DataFrame) -> pd.DataFrame:
+    """
+    流量指标 TTM
+
+    返回：instrument_id, metric_name, period_end, filed_date, value
+    """
+    out_cols = [*_KEYS, "period_end", "filed_date", "value"]
+    df = _prepare(fund)
+    df = df[df["metric_name"].isin(FLOW_METRICS) & df["period_start"].notna()]
+    if df.empty:
+        return pd.DataFrame(columns=out_cols)
+
+    duration = (df["period_end"] - df["period_start"]).dt.days
+    q = df[(df["period_type"] == "Quarterly") & duration.between(80, 110)]
+    a = df[(df["period_type"] == "Annual") & duration.between(350, 380)]
+
+    q = q[[*_KEYS, "period_end", "filed_date", "metric_value"]].rename(columns={"metric_value": "value"})
+    a = a[[*_KEYS, "period_start", "period_end", "filed_date", "metric_value"]].rename(
+        columns={"metric_value": "value"}
+    )
+
+    # ---- 推导 Q4 = FY − (Q1 + Q2 + Q3) ----
+    quarters = q
+    if not a.empty and not q.empty:
+        # 每个单季归属到 period_end >= 自身的最近一个财年
+        fy = a.rename(columns={"period_end": "fy_end", "period_start": "fy_start",
+                               "filed_date": "fy_filed", "value": "fy_value"})
+        tagged = pd.merge_asof(
+            q.sort_values("period_end"),
+            fy.sort_values("fy_end"),
+            left_on="period_end",
+            right_on="fy_end",
+            by=_KEYS,
+            direction="forward",
+        )
+        tagged = tagged[
+            tagged["fy_end"].notna()
+            & (tagged["period_end"] > tagged["fy_start"])
+            & (tagged["period_end"] < tagged["fy_end"])
+        ]
+        parts = tagged.groupby([*_KEYS, "fy_end"]).agg(
+            q_sum=("value", "sum"), q_count=("value", "size"), q_filed=("filed_date", "max")
+        ).reset_index()
+
+        q4 = fy.merge(parts, on=[*_KEYS, "fy_end"], how="inner")
+        q4 = q4[q4["q_count"] == 3]
+        q4 = pd.DataFrame(
+            {
+                "instrument_id": q4["instrument_id"],
+                "metric_name": q4["metric_name"],
+                "period_end": q4["fy_end"],
+                "filed_date": q4[["fy_filed", "q_filed"]].max(axis=1),
+                "value": q4["fy_value"] - q4["q_sum"],
+            }
+        )
+        # 公司直接披露的单季 Q4 优先
+        quarters = pd.concat([q, q4], ignore_index=True).drop_duplicates(
+            subset=[*_KEYS, "period_end"], keep="first"
+        )
+
+    # ---- 连续 4 个单季求和 ----
+    ttm_q = pd.DataFrame(columns=out_cols)
+    if not quarters.empty:
+        quarters = quarters.sort_values([*_KEYS, "period_end"]).reset_index(drop=True)
+        g = quarters.groupby(_KEYS, sort=False)
+
+        filed_days = quarters["filed_date"].values.astype("datetime64[D]").astype("int64").astype(float)
+        quarters["_filed_days"] = filed_days
+
+        sum4 = g["value"].rolling(4).sum().reset_index(level=[0, 1], drop=True)
+        filed4 = g["_filed_days"].rolling(4).max().reset_index(level=[0, 1], drop=True)
+        span = (quarters["period_end"] - g["period_end"].shift(3)).dt.days
+
+        ok = sum4.notna() & span.between(250, 300)
+        ttm_q = pd.DataFrame(
+            {
+                "instrument_id": quarters.loc[ok, "instrument_id"],
+                "metric_name": quarters.loc[ok, "metric_name"],
+                "period_end": quarters.loc[ok, "period_end"],
+                "filed_date": _to_ns(pd.to_datetime(filed4[ok].astype("int64"), unit="D")),
+                "value": sum4[ok],
+            }
+        )
+
+    # ---- 财年值本身就是 TTM（优先于单季加总，避免舍入差异）----
+    ttm_a = a[[*_KEYS, "period_end", "filed_date", "value"]]
+
+    out = pd.concat([ttm_a, ttm_q], ignore_index=True)
+    out = out.drop_duplicates(subset=[*_KEYS, "period_end"], keep="first")
+    return out[out_cols].sort_values([*_KEYS, "period_end"]).reset_index(drop=True)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 财报「可得事件」宽表
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def build_fundamental_events(fund: pd.DataFrame, *, lag_days: int = 1) -> pd.DataFrame:
+    """
+    每个 (instrument, available_date) 一行，列为截至该日已知的最新一期指标值
+
+    额外列 shares_period_end：股本对应的 period_end（用于拆股调整）
+    """
+    ttm = compute_ttm(fund)
+
+    stock = _prepare(fund)
+    stock = stock[stock["metric_name"].isin(STOCK_METRICS)]
+    # 同一 period_end 可能同时有 Quarterly / Annual 两行：取最早披露
+    stock = (
+        stock.sort_values("filed_date")
+        .drop_duplicates(subset=[*_KEYS, "period_end"], keep="first")
+        [[*_KEYS, "period_end", "filed_date", "metric_value"]]
+        .rename(columns={"metric_value": "value"})
+    )
+
+    events = pd.concat([f for f in (ttm, stock) if not f.empty], ignore_index=True) \
+        if not (ttm.empty and stock.empty) else pd.DataFrame()
+    if events.empty:
+        empty = {"instrument_id": pd.Series(dtype="int64"),
+                 "available_date": pd.Series(dtype="datetime64[ns]")}
+        empty.update({m: pd.Series(dtype="float64") for m in FUNDAMENTAL_METRICS})
+        empty["shares_period_end"] = pd.Series(dtype="datetime64[ns]")
+        return pd.DataFrame(empty)
+
+    events["period_end"] = _to_ns(events["period_end"])
+    events["available_date"] = _to_ns(events["filed_date"]) + pd.Timedelta(days=lag_days)
+
+    # 晚披露的旧报告期（如对比期数据）不能覆盖已知的新报告期
+    events = events.sort_values([*_KEYS, "available_date", "period_end"])
+    newest = events.groupby(_KEYS)["period_end"].cummax()
+    events = events[events["period_end"] >= newest]
+
+    wide = events.pivot_table(
+        index=["instrument_id", "available_date"],
+        columns="metric_name",
+        values="value",
+        aggfunc="last",
+    )
+    shares_end = (
+        events[events["metric_name"] == "shares_outstanding"]
+        .groupby(["instrument_id", "available_date"])["period_end"]
+        .last()
+        .rename("shares_period_end")
+    )
+    wide = wide.join(shares_end, how="left")
+
+    for m in FUNDAMENTAL_METRICS:
+        if m not in wide.columns:
+            wide[m] = np.nan
+
+    wide = wide.reset_index().sort_values(["instrument_id", "available_date"])
+    cols = [*FUNDAMENTAL_METRICS, "shares_period_end"]
+    wide[cols] = wide.groupby("instrument_id")[cols].ffill()
+    return wide.reset_index(drop=True)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 每日估值面板
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def _safe_div(num: pd.Series, den: pd.Series) -> pd.Series:
+    """分母 <= 0 时无意义（亏损公司的 PE、负 EBITDA 的 EV/EBITDA）"""
+    return num.where(den > 0) / den.where(den > 0)
+
+
+def compute_valuation_panel(
+    prices: pd.DataFrame,
+    fund: pd.DataFrame,
+    *,
+    lag_days: int = 1,
+    max_staleness_days: int = 540,
+) -> pd.DataFrame:
+    """
+    返回每个 (instrument_id, date) 一行：
+      market_cap, pe_ttm, pb, ps_ttm, ev_ebitda_ttm, fcf_yield_ttm, div_yield_ttm,
+      ep_ttm, bp, sp_ttm, ebitda_ev_ttm
+    """
+    px = prices[["instrument_id", "date", "close_price", "stock_splits"]].copy()
+    px["date"] = _to_ns(px["date"])
+    px["close_price"] = pd.to_numeric(px["close_price"], errors="coerce").astype(float)
+    splits = pd.to_numeric(px["stock_splits"], errors="coerce").astype(float)
+    px["_split"] = splits.where(splits > 0, 1.0).fillna(1.0)
+    px = px.sort_values(["instrument_id", "date"])
+    px["_cum_split"] = px.groupby("instrument_id")["_split"].cumprod()
+
+    events = build_fundamental_events(fund, lag_days=lag_days)
+
+    panel = pd.merge_asof(
+        px.sort_values("date"),
+        events.sort_values("available_date"),
+        left_on="date",
+        right_on="available_date",
+        by="instrument_id",
+        direction="backward",
+        tolerance=pd.Timedelta(days=max_staleness_days),
+    )
+
+    # ---- 股本拆股调整：shares × cum_split(t) / cum_split(period_end) ----
+    has_end = panel["shares_period_end"].notna()
+    ref = pd.Series(np.nan, index=panel.index)
+    if has_end.any():
+        left = panel.loc[has_end, ["instrument_id", "shares_period_end"]].copy()
+        left["shares_period_end"] = _to_ns(left["shares_period_end"])
+        matched = pd.merge_asof(
+            left.reset_index().sort_values("shares_period_end"),
+            px[["instrument_id", "date", "_cum_split"]]
+            .rename(columns={"date": "_ref_date", "_cum_split": "_cum_split_ref"})
+            .sort_values("_ref_date"),
+            left_on="shares_period_end",
+            right_on="_ref_date",
+            by="instrument_id",
+            direction="backward",
+        )
+        ref.loc[matched["index"].to_numpy()] = matched["_cum_split_ref"].to_numpy()
+    # period_end 早于价格窗口时，假设窗口开始前没有拆股
+    first_cum = panel.groupby("instrument_id")["_cum_split"].transform("first")
+    split_adj = panel["_cum_split"] / ref.fillna(first_cum)
+
+    shares = panel["shares_outstanding"] * split_adj
+    mcap = panel["close_price"] * shares
+    mcap = mcap.where(mcap > 0)
+
+    ebitda = panel["operating_income"] + panel["depreciation_amortization"]
+    ev = mcap + panel["long_term_debt"].fillna(0.0) - panel["cash"].fillna(0.0)
+    fcf = panel["operating_cash_flow"] - panel["capex"]
+
+    out = pd.DataFrame(
+        {
+            "instrument_id": panel["instrument_id"],
+            "date": panel["date"],
+            "market_cap": mcap,
+            "pe_ttm": _safe_div(mcap, panel["net_income"]),
+            "pb": _safe_div(mcap, panel["stockholders_equity"]),
+            "ps_ttm": _safe_div(mcap, panel["revenue"]),
+            "ev_ebitda_ttm": _safe_div(ev, ebitda),
+            "fcf_yield_ttm": fcf / mcap,
+            "div_yield_ttm": panel["dividends_paid"] / mcap,
+            "ep_ttm": panel["net_income"] / mcap,
+            "bp": panel["stockholders_equity"] / mcap,
+            "sp_ttm": panel["revenue"] / mcap,
+            "ebitda_ev_ttm": ebitda / ev.where(ev > 0),
+        }
+    )
+    return out.sort_values(["instrument_id", "date"]).reset_index(drop=True)
+
+
+def to_long(panel: pd.DataFrame, columns: Iterable[str], names: Dict[str, str] = None) -> pd.DataFrame:
+    """宽表 -> 长表（instrument_id, date, metric_name, metric_value），去掉 NaN / inf"""
+    columns = list(columns)
+    long = panel.melt(
+        id_vars=["instrument_id", "date"],
+        value_vars=columns,
+        var_name="metric_name",
+        value_name="metric_value",
+    )
+    long = long[np.isfinite(long["metric_value"].astype(float))]
+    if names:
+        long["metric_name"] = long["metric_name"].map(names)
+    long["date"] = pd.to_datetime(long["date"]).dt.date
+    return long.reset_index(drop=True)
@@ -11,30 +11,350 @@
 # Unauthorized copying, modification, distribution, or use of this file,
 # via any medium, is strictly prohibited without prior written consent.
 # =============================================================================
+"""
+命令行入口
+==========
+
+各子系统在对应子命令里才 import（懒加载）：只跑简报不会加载 matplotlib、
+requests 或回测引擎，cron 任务和临时命令的启动时间只取决于实际用到的模块。
+
+用法（在项目根目录下）：
+    python main.py                                  # 默认：生成每日简报
+    python main.py daily                            # 价格 -> 公司行为 -> 因子 -> 可交易池
+    python main.py factors                          # 只重算因子
+    python main.py backtest
+    python main.py briefing --date 2026-06-12 --top-n 30
+    python main.py plot MSFT AAPL SPY --start 2019-01-01
+    python main.py ic --factors mom_3m mdd_252d --start 2010-01-01 --horizons 1 5 21 63
+    python main.py quantiles --start 2010-01-01 --quantiles 5 --rebalance 21
+    python main.py corr --threshold 0.7 --step 5
+    python main.py attribution --window 126
+    python main.py tailrisk --paths 100000 --horizon 252 --block 10
+    python main.py walkforward --start 2005-01-01 --horizon 21 --train-days 756
+    python main.py monitor --all
+    python main.py positions --start 2020-01-01
+    python main.py metrics --benchmark SPY
+    python main.py download prices
+    python main.py download fundamentals --all --workers 8
+    python main.py download calendar
+    python main.py download ticker SPCX --start 2026-06-01 --end 2026-06-14
+
+也可以用 python -m main <子命令>。
+"""
+import argparse
+import sys
 from datetime import date
+from typing import List, Optional
 
-from data_download.input.price_downloader import download_single_instrument_prices
-from tasks.backtest_tasks import run_backtest
-from tasks.daily_tasks import daily_update
-from ui.api import compare_portfolio_with_tickers
-from reports.daily_briefing import run_briefing
 
-if __name__ == "__main__":
-    #annual_update()
-    #seasonal_update()
-    #daily_update()
-    
-    # 生成每日市场情报简报（打印到日志）
-    run_briefing()
-
-    # run_backtest()
-
-    #compare_portfolio_with_tickers(
-    #    tickers=["MSFT", "AAPL", "SPY", "LITE", "AMZN", "NVDA", "AMD", "TSLA"],
-    #    start_date="2019-01-01",
-    #)
-    
-    #download_single_instrument_prices("SPCX", date(2026, 6, 1), date(2026, 6, 14))
-    
-    pass
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 子命令（import 都放在函数内部）
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def _cmd_daily(args):
+    from tasks.daily_tasks import daily_update
+
+    daily_update()
+
+
+def _cmd_factors(args):
+    from engine.compute_factors.compute_all_factors import compute_all_factors
+
+    compute_all_factors()
+
+
+def _cmd_backtest(args):
+    from tasks.backtest_tasks import run_backtest
+
+    run_backtest()
+
+
+def _cmd_briefing(args):
+    from reports.daily_briefing import run_briefing
+
+    text = run_briefing(date=args.date, top_n=args.top_n)
+    if args.print and text:
+        print(text)
+
+
+def _cmd_plot(args):
+    from ui.api import compare_portfolio_with_tickers
+
+    compare_portfolio_with_tickers(
+        tickers=args.tickers,
+        start_date=args.start,
+        end_date=args.end,
+    )
+
+
+def _cmd_ic(args):
+    from engine.analytics.ic import run_ic_analysis
+
+    _, summary = run_ic_analysis(
+        factor_names=args.factors,
+        start_date=args.start,
+        end_date=args.end,
+        horizons=tuple(args.horizons),
+        persist=not args.no_save,
+    )
+    print(summary.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+
+
+def _cmd_quantiles(args):
+    from engine.analytics.quantiles import run_quantile_analysis
+
+    _, summary = run_quantile_analysis(
+        factor_names=args.factors,
+        start_date=args.start,
+        end_date=args.end,
+        n_quantiles=args.quantiles,
+        rebalance_every=args.rebalance,
+    )
+    print(summary.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+
+
+def _cmd_corr(args):
+    from engine.analytics.correlation import run_correlation_analysis
+
+    result, clusters = run_correlation_analysis(
+        factor_names=args.factors,
+        start_date=args.start,
+        end_date=args.end,
+        step=args.step,
+        threshold=args.threshold,
+    )
+    print(result.pairs().head(args.top).to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    print()
+    print(clusters.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+
+def _cmd_metrics(args):
+    from database.utils.db_utils import get_db_connection
+    from engine.analytics.metrics import exp_metrics
+
+    with get_db_connection() as conn:
+        metrics = exp_metrics(conn, benchmark=args.benchmark, start_date=args.start, end_date=args.end)
+    print(metrics.to_string(float_format=lambda v: f"{v:.4f}"))
+
+
+def _cmd_attribution(args):
+    from engine.analytics.attribution import exp_attribution
+
+    summary, rolling = exp_attribution(start_date=args.start, end_date=args.end, window=args.window)
+    print(summary.to_string(float_format=lambda v: f"{v:.4f}"))
+    print()
+    print(rolling.dropna().tail(args.tail).to_string(float_format=lambda v: f"{v:.3f}"))
+
+
+def _cmd_tailrisk(args):
+    from database.utils.db_utils import get_db_connection
+    from engine.analytics.tail_risk import exp_tail_risk
+
+    with get_db_connection() as conn:
+        result = exp_tail_risk(
+            conn,
+            start_date=args.start,
+            end_date=args.end,
+            n_paths=args.paths,
+            horizon=args.horizon,
+            mean_block=args.block,
+            seed=args.seed,
+        )
+    print(result.summary().to_string(float_format=lambda v: f"{v:.4f}"))
+    print()
+    print(result.quantiles().to_string(float_format=lambda v: f"{v:.4f}"))
+
+
+def _cmd_walkforward(args):
+    from engine.analytics.walk_forward import run_walk_forward
+    from tasks.backtest_tasks import SPECS, WEIGHTS
+
+    result = run_walk_forward(
+        SPECS,
+        start_date=args.start,
+        end_date=args.end,
+        horizon=args.horizon,
+        train_days=args.train_days,
+        methods=args.methods,
+        baseline=WEIGHTS,
+    )
+    print(result.summary().to_string(float_format=lambda v: f"{v:.4f}"))
+    print()
+    for method in args.methods:
+        print(f"[{method}] latest weights:")
+        print(result.latest_weights(method).to_string(float_format=lambda v: f"{v:.3f}"))
+
 
+def _cmd_monitor(args):
+    from engine.analytics.factor_monitor import run
+
+    alerts = run(force=args.force, start_date=args.start)
+    if args.all:
+        from database.readwrite.rw_factor_monitor import get_latest_monitor
+        from database.utils.db_utils import get_db_connection
+
+        with get_db_connection() as conn:
+            alerts = get_latest_monitor(conn)
+    if alerts.empty:
+        print("no factor alerts")
+        return
+    print(alerts.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+
+
+def _cmd_positions(args):
+    from database.utils.db_utils import get_db_connection
+    from engine.analytics.positions import exp_position_analytics, summarize_runs
+
+    with get_db_connection() as conn:
+        ts, sectors = exp_position_analytics(conn, start_date=args.start, end_date=args.end)
+    print(summarize_runs(ts).T.to_string(float_format=lambda v: f"{v:.4f}"))
+    print()
+    print(ts.tail(args.tail).to_string(float_format=lambda v: f"{v:.3f}"))
+    print()
+    print("latest sector exposure:")
+    print(sectors.iloc[-1].sort_values(ascending=False).to_string(float_format=lambda v: f"{v:.3f}"))
+
+
+def _cmd_download(args):
+    if args.what == "prices":
+        from data_download.input.price_downloader import download_prices
+
+        download_prices(start_date=args.start, end_date=args.end)
+
+    elif args.what == "fundamentals":
+        from data_download.input.fundamentals_downloader import download_fundamentals
+
+        download_fundamentals(tradable_only=not args.all, max_workers=args.workers)
+
+    elif args.what == "calendar":
+        from tasks.annual_tasks import annual_update
+
+        annual_update()
+
+    elif args.what == "ticker":
+        if not args.ticker or args.start is None:
+            raise SystemExit("download ticker 需要 TICKER 和 --start")
+        from data_download.input.price_downloader import download_single_instrument_prices
+
+        download_single_instrument_prices(args.ticker, args.start, args.end or date.today())
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 参数解析
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py", description="Yezhou Quant 命令行入口")
+    sub = parser.add_subparsers(dest="command")
+
+    p = sub.add_parser("daily", help="每日更新：价格、公司行为、因子、可交易池")
+    p.set_defaults(func=_cmd_daily)
+
+    p = sub.add_parser("factors", help="计算全部因子")
+    p.set_defaults(func=_cmd_factors)
+
+    p = sub.add_parser("backtest", help="运行默认回测")
+    p.set_defaults(func=_cmd_backtest)
+
+    p = sub.add_parser("briefing", help="生成每日市场情报简报")
+    p.add_argument("--date", default=None, help="简报日期 YYYY-MM-DD（默认最新因子日）")
+    p.add_argument("--top-n", type=int, default=20)
+    p.add_argument("--print", action="store_true", help="同时输出到 stdout")
+    p.set_defaults(func=_cmd_briefing)
+
+    p = sub.add_parser("plot", help="组合 NAV 与 tickers 对比图")
+    p.add_argument("tickers", nargs="+")
+    p.add_argument("--start", default=None)
+    p.add_argument("--end", default=None)
+    p.set_defaults(func=_cmd_plot)
+
+    p = sub.add_parser("ic", help="因子 IC / ICIR 分析（逐日 IC 写入 factor_ic）")
+    p.add_argument("--factors", nargs="+", default=None, help="因子名（默认库中全部因子）")
+    p.add_argument("--start", default=None)
+    p.add_argument("--end", default=None, help="默认最新因子日")
+    p.add_argument("--horizons", nargs="+", type=int, default=[1, 5, 21, 63], help="前瞻收益周期（交易日）")
+    p.add_argument("--no-save", action="store_true", help="只打印汇总，不写入 factor_ic")
+    p.set_defaults(func=_cmd_ic)
+
+    p = sub.add_parser("quantiles", help="因子分组（Q1..Qn）回测：组收益、多空价差、换手、单调性")
+    p.add_argument("--factors", nargs="+", default=None, help="因子名（默认库中全部因子）")
+    p.add_argument("--start", default=None)
+    p.add_argument("--end", default=None, help="默认最新因子日")
+    p.add_argument("--quantiles", type=int, default=5)
+    p.add_argument("--rebalance", type=int, default=21, help="调仓间隔（交易日）= 持有期")
+    p.set_defaults(func=_cmd_quantiles)
+
+    p = sub.add_parser("corr", help="因子两两 rank 相关与冗余聚类")
+    p.add_argument("--factors", nargs="+", default=None, help="因子名（默认库中全部因子）")
+    p.add_argument("--start", default=None)
+    p.add_argument("--end", default=None, help="默认最新因子日")
+    p.add_argument("--step", type=int, default=5, help="每隔 step 个交易日取一个截面")
+    p.add_argument("--threshold", type=float, default=0.7, help="|平均相关| >= threshold 视为同一簇")
+    p.add_argument("--top", type=int, default=20, help="打印相关最高的因子对数")
+    p.set_defaults(func=_cmd_corr)
+
+    p = sub.add_parser("metrics", help="回测绩效指标（exp_positions NAV 对比基准）")
+    p.add_argument("--benchmark", default="SPY")
+    p.add_argument("--start", default=None)
+    p.add_argument("--end", default=None)
+    p.set_defaults(func=_cmd_metrics)
+
+    p = sub.add_parser("attribution", help="exp_positions 回测的风格归因（MKT/MOM/LOWVOL/SIZE/VALUE）")
+    p.add_argument("--start", default=None)
+    p.add_argument("--end", default=None)
+    p.add_argument("--window", type=int, default=126, help="滚动 OLS 窗口（交易日）")
+    p.add_argument("--tail", type=int, default=10, help="打印最近几期滚动结果")
+    p.set_defaults(func=_cmd_attribution)
+
+    p = sub.add_parser("tailrisk", help="exp_positions NAV 的 stationary bootstrap 尾部风险模拟")
+    p.add_argument("--start", default=None)
+    p.add_argument("--end", default=None)
+    p.add_argument("--paths", type=int, default=100_000, help="模拟路径数")
+    p.add_argument("--horizon", type=int, default=252, help="每条路径的交易日数")
+    p.add_argument("--block", type=float, default=10, help="平均块长（交易日）")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=_cmd_tailrisk)
+
+    p = sub.add_parser("walkforward", help="LinearScorer 权重的 walk-forward 拟合与样本外评估")
+    p.add_argument("--start", default=None)
+    p.add_argument("--end", default=None, help="默认最新因子日")
+    p.add_argument("--horizon", type=int, default=21, help="调仓间隔 / 前瞻收益周期（交易日，5 的倍数）")
+    p.add_argument("--train-days", type=int, default=756, help="训练窗口（交易日）")
+    p.add_argument("--methods", nargs="+", default=["ic", "ridge", "max_icir"], choices=("ic", "ridge", "max_icir"))
+    p.set_defaults(func=_cmd_walkforward)
+
+    p = sub.add_parser("monitor", help="因子衰减监控（增量更新 factor_monitor 并列出告警）")
+    p.add_argument("--force", action="store_true", help="清空后全量回填")
+    p.add_argument("--start", default=None, help="回填起点（默认 data.default_start_date）")
+    p.add_argument("--all", action="store_true", help="列出所有因子的最新状态，而不只是告警")
+    p.set_defaults(func=_cmd_monitor)
+
+    p = sub.add_parser("positions", help="exp_positions 回测的换手率、集中度与行业暴露")
+    p.add_argument("--start", default=None)
+    p.add_argument("--end", default=None)
+    p.add_argument("--tail", type=int, default=10, help="打印最近几个快照")
+    p.set_defaults(func=_cmd_positions)
+
+    p = sub.add_parser("download", help="数据下载")
+    p.add_argument("what", choices=("prices", "fundamentals", "calendar", "ticker"))
+    p.add_argument("ticker", nargs="?", default=None, help="what=ticker 时的代码")
+    p.add_argument("--start", type=date.fromisoformat, default=None)
+    p.add_argument("--end", type=date.fromisoformat, default=None)
+    p.add_argument("--all", action="store_true", help="fundamentals：包含不可交易标的")
+    p.add_argument("--workers", type=int, default=8, help="fundamentals：并发线程数")
+    p.set_defaults(func=_cmd_download)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    # 不带子命令时保持原来的默认行为：生成每日简报
+    if args.command is None:
+        args = build_parser().parse_args(["briefing"])
+
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -30,7 +30,14 @@ import pandas as pd
 import os
 
 from database.utils.db_utils import get_db_connection
-from database.readwrite.rw_factor_values import get_factor_values
+from database.readwrite.rw_factor_values import load_factor_panel
+from database.readwrite.rw_latest_snapshots import (
+    get_latest_factor_date,
+    get_latest_factor_values,
+    get_latest_price_date,
+    get_latest_prices,
+)
+from database.readwrite.rw_market_prices import load_price_panel
 from utils.config_loader import get_config_value
 from utils.logger import get_logger
 
@@ -72,39 +79,42 @@ _AI_TECH_WATCHLIST = {
 # Internal helpers
 # ---------------------------------------------------------------------------
 
-def _load_factor_snapshot(conn, date: str) -> pd.DataFrame:
-    """
-    Returns a wide DataFrame with one row per tradable instrument on `date`.
-    Columns: instrument_id, ticker, company_name, sector, <factor_name>...
-    """
+def _load_tradable_meta(conn) -> pd.DataFrame:
+    """instrument_id, ticker, company_name, sector for all tradable instruments."""
     cursor = conn.cursor()
-
-    # Single SQL join: factor_values × instruments for this date
     cursor.execute(
         """
-        SELECT
-            i.instrument_id,
-            i.ticker,
-            i.company_name,
-            i.sector,
-            fv.factor_name,
-            fv.factor_value
-        FROM factor_values fv
-        JOIN instruments i ON i.instrument_id = fv.instrument_id
-        WHERE fv.date = %s
-          AND fv.factor_version = 'v1'
-          AND i.is_tradable = TRUE
-          AND fv.factor_name = ANY(%s)
-        ORDER BY i.ticker, fv.factor_name
-        """,
-        (date, _FACTOR_NAMES),
+        SELECT instrument_id, ticker, company_name, sector
+        FROM instruments
+        WHERE is_tradable = TRUE
+        """
     )
-    rows = cursor.fetchall()
+    return pd.DataFrame(
+        cursor.fetchall(), columns=["instrument_id", "ticker", "company_name", "sector"]
+    ).astype({"instrument_id": "int64"})
 
-    if not rows:
+
+def _load_factor_snapshot(conn, date: str) -> pd.DataFrame:
+    """
+    Returns a wide DataFrame with one row per tradable instrument on `date`.
+    Columns: instrument_id, ticker, company_name, sector, <factor_name>...
+
+    For the latest date (the usual case) factor values come straight from the
+    latest_factor_values snapshot; older dates go through the binary COPY
+    panel over factor_values. Instrument metadata is a separate small query.
+    """
+    if _is_latest(date, get_latest_factor_date(conn)):
+        raw = get_latest_factor_values(conn, _FACTOR_NAMES, date=date)
+        raw["factor_value"] = raw["factor_value"].astype("float64")
+    else:
+        raw = load_factor_panel(conn, _FACTOR_NAMES, start_date=date, end_date=date)
+    if raw.empty:
         return pd.DataFrame()
 
-    raw = pd.DataFrame(rows, columns=["instrument_id", "ticker", "company_name", "sector", "factor_name", "factor_value"])
+    meta = _load_tradable_meta(conn)
+    raw = raw.merge(meta, on="instrument_id", how="inner")
+    if raw.empty:
+        return pd.DataFrame()
 
     # Pivot: one row per instrument, one column per factor
     wide = raw.pivot_table(
@@ -127,33 +137,20 @@ def _load_factor_snapshot(conn, date: str) -> pd.DataFrame:
 
 def _load_price_snapshot(conn, date: str) -> pd.DataFrame:
     """Returns today's raw OHLCV for all tradable instruments."""
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT
-            mp.instrument_id,
-            mp.adj_close,
-            mp.adj_volume,
-            mp.high_price,
-            mp.low_price,
-            mp.open_price
-        FROM market_prices mp
-        JOIN instruments i ON i.instrument_id = mp.instrument_id
-        WHERE mp.date = %s
-          AND i.is_tradable = TRUE
-        """,
-        (date,),
-    )
-    rows = cursor.fetchall()
-    if not rows:
+    fields = ["adj_close", "adj_volume", "high_price", "low_price", "open_price"]
+    if _is_latest(date, get_latest_price_date(conn)):
+        df = get_latest_prices(conn)
+        df = df[df["date"].astype(str) == str(date)][["instrument_id", "date", *fields]]
+        df = df.astype({"instrument_id": "int64", **{f: "float64" for f in fields}})
+    else:
+        df = load_price_panel(conn, fields, start_date=date, end_date=date)
+    if df.empty:
         return pd.DataFrame()
 
-    df = pd.DataFrame(
-        rows,
-        columns=["instrument_id", "adj_close", "adj_volume", "high_price", "low_price", "open_price"],
-    )
-    for col in ["adj_close", "adj_volume", "high_price", "low_price", "open_price"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+    tradable = _load_tradable_meta(conn)["instrument_id"]
+    df = df[df["instrument_id"].isin(tradable)].drop(columns="date").reset_index(drop=True)
+    if df.empty:
+        return pd.DataFrame()
 
     # Intraday range % = (high - low) / open
     df["intraday_range_pct"] = (df["high_price"] - df["low_price"]) / df["open_price"].replace(0, float("nan"))
@@ -161,15 +158,15 @@ def _load_price_snapshot(conn, date: str) -> pd.DataFrame:
 
 
 def _get_latest_factor_date(conn) -> Optional[str]:
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT MAX(date) FROM factor_values WHERE factor_version = 'v1'"
-    )
-    row = cursor.fetchone()
-    if not row or row[0] is None:
-        return None
-    d = row[0]
-    return d.isoformat() if hasattr(d, "isoformat") else str(d)
+    return get_latest_factor_date(conn, "v1")
+
+
+def _is_latest(date: str, latest: Optional[str]) -> bool:
+    """
+    True when `date` is at or after the newest snapshot date. Only then do the
+    snapshot rows dated `date` equal the full cross-section for that date.
+    """
+    return latest is not None and str(date) >= latest
 
 
 def _fmt_pct(v, decimals: int = 1) -> str:
@@ -39,12 +39,48 @@ def universe_all_tradable(conn, date: str):
     return None
 
 
+# ============================================================
+# 因子规格与线性权重
+# ============================================================
+
+SPECS = (
+    # 动量因子（越大越好）
+    FactorSpec(
+        factor_name="mom_3m",
+        ascending=True,
+        methods=("rank",),
+    ),
+    # 波动率因子（越小越好 - 低波动）
+    FactorSpec(
+        factor_name="vol_60d_ann",
+        ascending=False,
+        methods=("rank",),
+    ),
+    # 最大回撤因子（越小越好 - 风险控制）
+    FactorSpec(
+        factor_name="mdd_252d",
+        ascending=False,
+        methods=("rank",),
+    ),
+)
+
+# 手工权重；可用 `python main.py walkforward` 的拟合结果替换
+WEIGHTS = {
+    "mom_3m_rank": 0.5,          # 50% 权重：动量
+    "vol_60d_ann_rank": 0.3,     # 30% 权重：低波动
+    "mdd_252d_rank": 0.2,        # 20% 权重：低回撤
+}
+
+
 # ============================================================
 # Main Backtest
 # ============================================================
 
 
-def run_backtest():
+def run_backtest(weights=None):
+    """
+    weights: {signal 列名: 权重}，默认使用 WEIGHTS
+    """
 
     conn = get_db_connection()
 
@@ -52,37 +88,15 @@ def run_backtest():
     # 1️⃣ 定义因子规格
     # ===============================
 
-    specs = (
-        # 动量因子（越大越好）
-        FactorSpec(
-            factor_name="mom_63d",
-            ascending=True,
-            methods=("rank",),
-        ),
-        # 波动率因子（越小越好 - 低波动）
-        FactorSpec(
-            factor_name="vol_60d_ann252",
-            ascending=False,
-            methods=("rank",),
-        ),
-        # 最大回撤因子（越小越好 - 风险控制）
-        FactorSpec(
-            factor_name="mdd_252d",
-            ascending=False,
-            methods=("rank",),
-        ),
-    )
+    specs = SPECS
 
     # ===============================
     # 2️⃣ 定义线性打分
     # ===============================
 
+    weights = WEIGHTS if weights is None else weights
     scorer = LinearScorer(
-        terms=(
-            LinearTerm("mom_63d_rank", 0.5),        # 50% 权重：动量
-            LinearTerm("vol_60d_ann252_rank", 0.3), # 30% 权重：低波动
-            LinearTerm("mdd_252d_rank", 0.2),       # 20% 权重：低回撤
-        ),
+        terms=tuple(LinearTerm(col, w) for col, w in weights.items()),
         out_col="_score",
         post_transform=None,
     )
@@ -12,16 +12,27 @@
 # via any medium, is strictly prohibited without prior written consent.
 # =============================================================================
 from data_download.input.price_downloader import download_prices
+from data_download.input.corporate_actions_extractor import extract_corporate_actions
 from data_download.update.update_tradable_universe import update_tradable_universe
 from engine.compute_factors.compute_all_factors import compute_all_factors
+from engine.analytics import factor_monitor, forward_returns
 
 
 def daily_update():
     # 最近股价下载
     download_prices()
 
+    # 从新落库的价格中抽取分红/拆股
+    extract_corporate_actions()
+
     compute_all_factors()
 
+    # 研究用前瞻收益（增量：最近 63 个交易日）
+    forward_returns.run()
+
+    # 因子衰减监控（增量：只追加新实现的截面）
+    factor_monitor.run()
+
     # 每日更新可交易标的
     update_tradable_universe()
     
\ No newline at end of file
@@ -0,0 +1,60 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from datetime import date
+from unittest.mock import MagicMock
+
+import data_download.input.corporate_actions_extractor as cae
+
+
+def _normalize_sql(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def test_upsert_is_single_statement():
+    conn = MagicMock()
+    cursor = MagicMock()
+    cursor.rowcount = 7
+    conn.cursor.return_value = cursor
+
+    n = cae._upsert_actions_from_market_prices(conn, date(2024, 1, 1), date(2024, 1, 31))
+
+    assert n == 7
+    assert cursor.execute.call_count == 1
+    sql = _normalize_sql(cursor.execute.call_args[0][0])
+    assert "INSERT INTO corporate_actions" in sql
+    assert "UNION ALL" in sql
+    assert "ON CONFLICT (instrument_id, action_date, action_type)" in sql
+    assert cursor.execute.call_args[0][1] == {"start": "2024-01-01", "end": "2024-01-31"}
+
+
+def test_extract_advances_state_to_max_price_date(monkeypatch):
+    conn = MagicMock()
+    monkeypatch.setattr(cae, "get_db_connection", lambda: conn)
+    monkeypatch.setattr(cae, "get_state", lambda c, k: "2024-01-10")
+    monkeypatch.setattr(cae, "get_price_max_date", lambda c: date(2024, 1, 31))
+    monkeypatch.setattr(cae, "_upsert_actions_from_market_prices", lambda c, s, e: 3)
+
+    saved = {}
+    monkeypatch.setattr(cae, "set_state", lambda c, k, v: saved.update({k: v}))
+
+    result = cae.extract_corporate_actions()
+
+    assert result == {"inserted": 3, "events": 3}
+    assert saved == {"last_corporate_actions_extract": "2024-01-31"}
+    conn.close.assert_called_once()
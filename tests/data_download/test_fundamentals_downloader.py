@@ -0,0 +1,255 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import threading
+
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+
+import data_download.input.fundamentals_downloader as fd
+from data_download.rate_limiter import RateLimiter
+
+
+def _instruments():
+    return pd.DataFrame(
+        [
+            {"instrument_id": 1, "ticker": "AAA", "exchange": "NYSE", "asset_type": "Stock", "is_tradable": True},
+            {"instrument_id": 2, "ticker": "BBB", "exchange": "NYSE", "asset_type": "Stock", "is_tradable": True},
+            {"instrument_id": 3, "ticker": "SPY", "exchange": "NYSE", "asset_type": "ETF", "is_tradable": True},
+            {"instrument_id": 4, "ticker": "CCC", "exchange": "NYSE", "asset_type": "Stock", "is_tradable": True},
+            {"instrument_id": 5, "ticker": "DDD", "exchange": "NYSE", "asset_type": "Stock", "is_tradable": False},
+        ]
+    )
+
+
+@pytest.fixture
+def env(monkeypatch):
+    conn = MagicMock()
+    calls = {"copied": [], "log": [], "processed": []}
+
+    monkeypatch.setattr(fd, "get_db_connection", lambda: conn)
+    monkeypatch.setattr(fd, "get_all_instruments", lambda c, asset_type=None: _instruments())
+    monkeypatch.setattr(fd, "get_http_cache", lambda: None)
+    monkeypatch.setattr(fd, "_ticker_cik_map", lambda: {})
+    monkeypatch.setattr(fd, "get_resumable_log", lambda c, d, s, max_age_hours=None: None)
+    monkeypatch.setattr(fd, "create_log", lambda c, d, s, instruments_count=None: 42)
+    def _progress(c, log_id, rows, processed_ids=None):
+        calls["log"].append(("progress", rows))
+        calls["processed"].extend(processed_ids or ())
+
+    monkeypatch.setattr(fd, "update_log_progress", _progress)
+    monkeypatch.setattr(fd, "update_log_success", lambda c, log_id, rows_inserted=0: calls["log"].append(("success", rows_inserted)))
+    monkeypatch.setattr(fd, "update_log_partial", lambda c, log_id, rows, msg: calls["log"].append(("partial", rows)))
+    monkeypatch.setattr(fd, "copy_fundamental_data", lambda c, rows: calls["copied"].append(list(rows)) or len(rows))
+
+    return conn, calls
+
+
+def _fake_fetch(fail=()):
+    def _fetch(instrument_id, ticker, limiter, metric_map):
+        if ticker in fail:
+            raise ValueError(f"Ticker not found in SEC mapping: {ticker}")
+        return [{"instrument_id": instrument_id, "metric_name": "m"}] * instrument_id
+    return _fetch
+
+
+def test_downloads_tradable_stocks_and_skips_etf(env, monkeypatch):
+    conn, calls = env
+    monkeypatch.setattr(fd, "_fetch_rows", _fake_fetch())
+
+    stats = fd.download_fundamentals(tradable_only=True, max_workers=3, requests_per_second=1000)
+
+    assert stats["total"] == 4
+    assert stats["skipped"] == 1
+    assert stats["success"] == 3
+    assert stats["failed"] == 0
+
+    copied = [r for batch in calls["copied"] for r in batch]
+    assert sorted({r["instrument_id"] for r in copied}) == [1, 2, 4]
+    assert len(copied) == 1 + 2 + 4
+    assert calls["log"][-1] == ("success", 7)
+    conn.close.assert_called_once()
+
+
+def test_failed_ticker_marks_log_partial(env, monkeypatch):
+    conn, calls = env
+    monkeypatch.setattr(fd, "_fetch_rows", _fake_fetch(fail={"BBB"}))
+
+    stats = fd.download_fundamentals(max_workers=2, requests_per_second=1000)
+
+    assert stats["success"] == 2
+    assert stats["failed"] == 1
+    assert calls["log"][-1] == ("partial", 5)
+
+
+def test_small_batches_flush_incrementally(env, monkeypatch):
+    conn, calls = env
+    monkeypatch.setattr(fd, "_fetch_rows", _fake_fetch())
+
+    fd.download_fundamentals(max_workers=1, requests_per_second=1000, batch_rows=1)
+
+    assert len(calls["copied"]) == 3
+    assert [e for e in calls["log"] if e[0] == "progress"][-1] == ("progress", 7)
+
+
+def test_resume_skips_instruments_processed_by_previous_run(env, monkeypatch):
+    conn, calls = env
+    fetched = []
+
+    def _fetch(instrument_id, ticker, limiter, metric_map):
+        fetched.append(ticker)
+        return []
+
+    monkeypatch.setattr(fd, "_fetch_rows", _fetch)
+    monkeypatch.setattr(
+        fd, "get_resumable_log",
+        lambda c, d, s, max_age_hours=None: {
+            "log_id": 7, "status": "running", "started_at": "2026-01-01", "rows_inserted": 100, "processed_ids": {1, 4},
+        },
+    )
+    reopened = []
+    monkeypatch.setattr(fd, "reopen_log", lambda c, log_id: reopened.append(log_id))
+
+    stats = fd.download_fundamentals(max_workers=2, requests_per_second=1000)
+
+    assert reopened == [7]
+    assert fetched == ["BBB"]
+    assert stats["resumed"] == 2
+    assert calls["log"][-1] == ("success", 100)
+
+
+def test_stale_partial_log_does_not_skip_instruments(env, monkeypatch):
+    conn, calls = env
+    fetched = []
+
+    def _fetch(instrument_id, ticker, limiter, metric_map):
+        fetched.append(ticker)
+        return []
+
+    # 走真实的 get_resumable_log：最近一次是几个月前的 partial
+    from database.readwrite.rw_data_update_logs import get_resumable_log
+    monkeypatch.setattr(fd, "get_resumable_log", get_resumable_log)
+    conn.cursor.return_value.fetchone.return_value = (7, "partial", "2026-01-01", 100, 24.0 * 90, [1, 4])
+    monkeypatch.setattr(fd, "reopen_log", lambda c, log_id: pytest.fail("partial log must not be reopened"))
+    monkeypatch.setattr(fd, "_fetch_rows", _fetch)
+
+    stats = fd.download_fundamentals(max_workers=2, requests_per_second=1000)
+
+    assert sorted(fetched) == ["AAA", "BBB", "CCC"]
+    assert stats["resumed"] == 0
+
+
+def test_zero_row_tickers_are_recorded_as_processed(env, monkeypatch):
+    conn, calls = env
+
+    # BBB 下载成功但没有任何标准指标：不写库，但必须记入 processed_ids，续跑时不再重下
+    def _fetch(instrument_id, ticker, limiter, metric_map):
+        return [] if ticker == "BBB" else [{"instrument_id": instrument_id, "metric_name": "m"}]
+
+    monkeypatch.setattr(fd, "_fetch_rows", _fetch)
+
+    stats = fd.download_fundamentals(max_workers=1, requests_per_second=1000, batch_rows=1)
+
+    assert stats["success"] == 3
+    assert sorted(calls["processed"]) == [1, 2, 4]
+    assert {r["instrument_id"] for batch in calls["copied"] for r in batch} == {1, 4}
+
+
+def test_failed_ticker_is_not_recorded_as_processed(env, monkeypatch):
+    conn, calls = env
+    monkeypatch.setattr(fd, "_fetch_rows", _fake_fetch(fail={"BBB"}))
+
+    fd.download_fundamentals(max_workers=2, requests_per_second=1000)
+
+    assert sorted(calls["processed"]) == [1, 4]
+
+
+def test_in_flight_tasks_are_bounded(env, monkeypatch):
+    conn, calls = env
+    lock = threading.Lock()
+    state = {"live": 0, "peak": 0}
+    submit = fd.ThreadPoolExecutor.submit
+
+    def _submit(self, fn, *args):
+        with lock:
+            state["live"] += 1
+            state["peak"] = max(state["peak"], state["live"])
+        return submit(self, fn, *args)
+
+    def _fetch(instrument_id, ticker, limiter, metric_map):
+        with lock:
+            state["live"] -= 1
+        return []
+
+    many = pd.DataFrame(
+        [{"instrument_id": i, "ticker": f"T{i}", "exchange": "NYSE", "asset_type": "Stock", "is_tradable": True}
+         for i in range(1, 41)]
+    )
+    monkeypatch.setattr(fd, "get_all_instruments", lambda c, asset_type=None: many)
+    monkeypatch.setattr(fd.ThreadPoolExecutor, "submit", _submit)
+    monkeypatch.setattr(fd, "_fetch_rows", _fetch)
+
+    stats = fd.download_fundamentals(max_workers=2, requests_per_second=1000, max_in_flight=3)
+
+    assert stats["success"] == 40
+    assert state["peak"] <= 3
+
+
+# -----------------------------------------------------------------------------
+# RateLimiter
+# -----------------------------------------------------------------------------
+class _FakeClock:
+    def __init__(self):
+        self.t = 0.0
+        self.lock = threading.Lock()
+
+    def now(self):
+        return self.t
+
+    def sleep(self, s):
+        with self.lock:
+            self.t += s
+
+
+def test_rate_limiter_spaces_requests():
+    clock = _FakeClock()
+    limiter = RateLimiter(10, burst=1, clock=clock.now, sleep=clock.sleep)
+
+    for _ in range(21):
+        limiter.acquire()
+
+    # 第一个令牌立即可用，之后每 0.1s 一个
+    assert clock.t == pytest.approx(2.0)
+
+
+def test_rate_limiter_burst_then_steady():
+    clock = _FakeClock()
+    limiter = RateLimiter(5, burst=5, clock=clock.now, sleep=clock.sleep)
+
+    for _ in range(5):
+        limiter.acquire()
+    assert clock.t == 0.0
+
+    limiter.acquire()
+    assert clock.t == pytest.approx(0.2)
+
+
+def test_rate_limiter_rejects_bad_rate():
+    with pytest.raises(ValueError):
+        RateLimiter(0)
@@ -0,0 +1,115 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import json
+
+import pytest
+from unittest.mock import MagicMock
+
+from data_download.http_cache import HttpCache
+
+
+def _mk_resp(body: bytes, status=200, headers=None):
+    r = MagicMock()
+    r.status_code = status
+    r.content = body
+    r.headers = headers or {}
+    if status >= 400:
+        r.raise_for_status.side_effect = RuntimeError(f"HTTP {status}")
+    else:
+        r.raise_for_status.return_value = None
+    return r
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HttpCache(tmp_path / "http", default_ttl=3600, max_age=86400)
+
+
+class TestHttpCache:
+    def test_first_fetch_then_ttl_hit(self, cache):
+        session = MagicMock()
+        session.get.return_value = _mk_resp(b'{"a": 1}', headers={"ETag": '"v1"'})
+
+        assert cache.get_json("https://x/a.json", session=session) == {"a": 1}
+        assert cache.get_json("https://x/a.json", session=session) == {"a": 1}
+
+        # TTL 内第二次不发请求
+        assert session.get.call_count == 1
+        assert cache.stats["fetched"] == 1
+        assert cache.stats["hit"] == 1
+        assert cache.network_requests == 1
+
+    def test_expired_entry_sends_conditional_request_and_reuses_on_304(self, cache):
+        session = MagicMock()
+        session.get.return_value = _mk_resp(
+            b"payload", headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        )
+        cache.get("https://x/b", session=session)
+
+        session.get.return_value = _mk_resp(b"", status=304)
+        body = cache.get("https://x/b", session=session, ttl=0)
+
+        assert body == b"payload"
+        headers = session.get.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert cache.stats["revalidated"] == 1
+
+    def test_params_are_part_of_cache_key(self, cache):
+        session = MagicMock()
+        session.get.side_effect = [_mk_resp(b"one"), _mk_resp(b"two")]
+
+        assert cache.get("https://x/c", params={"q": 1}, session=session) == b"one"
+        assert cache.get("https://x/c", params={"q": 2}, session=session) == b"two"
+        assert session.get.call_args.args[0] == "https://x/c?q=2"
+
+    def test_identical_bodies_share_one_blob(self, cache):
+        session = MagicMock()
+        session.get.return_value = _mk_resp(b"same")
+
+        cache.get("https://x/d1", session=session)
+        cache.get("https://x/d2", session=session)
+
+        assert len(list(cache.meta_dir.glob("*.json"))) == 2
+        assert len(list(cache.blob_dir.iterdir())) == 1
+
+    def test_error_status_raises_and_is_not_cached(self, cache):
+        session = MagicMock()
+        session.get.return_value = _mk_resp(b"", status=503)
+
+        with pytest.raises(RuntimeError):
+            cache.get("https://x/e", session=session)
+        assert list(cache.meta_dir.glob("*.json")) == []
+
+    def test_evict_removes_old_meta_and_orphan_blobs(self, cache):
+        session = MagicMock()
+        session.get.side_effect = [_mk_resp(b"old"), _mk_resp(b"new")]
+        cache.get("https://x/old", session=session)
+        cache.get("https://x/new", session=session)
+
+        # 把 old 的 fetched_at 改到很久以前
+        meta_path = cache._meta_path("https://x/old")
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        meta["fetched_at"] = 0
+        meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+        assert cache.evict() == 1
+        assert not meta_path.exists()
+        assert len(list(cache.blob_dir.iterdir())) == 1
+        assert cache.get("https://x/new", session=session) == b"new"
@@ -0,0 +1,116 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_download.update.price_adjustments import (
+    apply_adjustments,
+    compare_adjusted,
+    compute_adjustment_factors,
+)
+
+
+def _prices(instrument_id, closes, volumes=None, start="2020-01-01"):
+    dates = pd.bdate_range(start, periods=len(closes))
+    volumes = volumes or [100] * len(closes)
+    return pd.DataFrame(
+        {
+            "instrument_id": instrument_id,
+            "date": dates,
+            "open_price": closes,
+            "high_price": closes,
+            "low_price": closes,
+            "close_price": closes,
+            "volume": volumes,
+        }
+    )
+
+
+def _actions(rows):
+    return pd.DataFrame(rows, columns=["instrument_id", "action_date", "action_type", "action_value"])
+
+
+def test_no_actions_factor_is_one():
+    px = compute_adjustment_factors(_prices(1, [10.0, 11.0, 12.0]), _actions([]))
+    assert px["price_factor"].tolist() == [1.0, 1.0, 1.0]
+    assert px["volume_factor"].tolist() == [1.0, 1.0, 1.0]
+
+
+def test_split_scales_history_before_ex_date():
+    px = _prices(1, [100.0, 100.0, 50.0, 51.0], volumes=[10, 10, 20, 20])
+    act = _actions([(1, "2020-01-03", "SPLIT", 2.0)])
+
+    out = apply_adjustments(px, act)
+
+    assert out["adj_close_calc"].tolist() == pytest.approx([50.0, 50.0, 50.0, 51.0])
+    assert out["adj_volume_calc"].tolist() == [20, 20, 20, 20]
+
+
+def test_dividend_uses_previous_close():
+    px = _prices(1, [50.0, 50.0, 49.0])
+    act = _actions([(1, "2020-01-03", "DIVIDEND_CASH", 1.0)])
+
+    out = apply_adjustments(px, act)
+
+    # 1 − 1/50 = 0.98
+    assert out["price_factor"].tolist() == pytest.approx([0.98, 0.98, 1.0])
+    # 分红不影响成交量
+    assert out["volume_factor"].tolist() == [1.0, 1.0, 1.0]
+
+
+def test_events_compound_and_instruments_are_independent():
+    px = pd.concat([_prices(1, [100.0, 100.0, 50.0, 50.0, 49.0]), _prices(2, [10.0, 10.0])])
+    act = _actions(
+        [
+            (1, "2020-01-03", "SPLIT", 2.0),
+            (1, "2020-01-07", "DIVIDEND_CASH", 1.0),
+        ]
+    )
+
+    out = compute_adjustment_factors(px, act)
+    f1 = out[out["instrument_id"] == 1]["price_factor"].tolist()
+    f2 = out[out["instrument_id"] == 2]["price_factor"].tolist()
+
+    assert f1 == pytest.approx([0.49, 0.49, 0.98, 0.98, 1.0])
+    assert f2 == [1.0, 1.0]
+
+
+def test_reverse_split_and_unsorted_input():
+    px = _prices(1, [1.0, 1.0, 10.0]).iloc[::-1]
+    act = _actions([(1, "2020-01-03", "REVERSE_SPLIT", 0.1)])
+
+    out = apply_adjustments(px, act)
+
+    assert out["date"].is_monotonic_increasing
+    assert out["adj_close_calc"].tolist() == pytest.approx([10.0, 10.0, 10.0])
+
+
+def test_compare_adjusted_flags_mismatches():
+    px = _prices(1, [100.0, 100.0, 50.0])
+    act = _actions([(1, "2020-01-03", "SPLIT", 2.0)])
+    out = apply_adjustments(px, act)
+    out["adj_close"] = [50.0, 55.0, 50.0]
+
+    report = compare_adjusted(out, tolerance=1e-3)
+    row = report.iloc[0]
+
+    assert row["mismatches"] == 1
+    assert row["max_rel_diff"] == pytest.approx(5.0 / 55.0)
+    assert row["first_mismatch_date"] == pd.Timestamp("2020-01-02")
@@ -16,10 +16,27 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+import json
+
 import pytest
 from unittest.mock import MagicMock, patch
 
-from data_download.input.sec_edgar_fundamental_single import download_one_ticker_fundamental_data
+import data_download.http_cache as http_cache
+from data_download.http_cache import HttpCache
+from data_download.input.sec_edgar_fundamental_single import (
+    _ticker_cik_map,
+    copy_fundamental_data,
+    download_one_ticker_fundamental_data,
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_http_cache(tmp_path, monkeypatch):
+    """每个测试使用独立的临时缓存目录，避免读到真实磁盘缓存"""
+    monkeypatch.setattr(http_cache, "_CACHE", HttpCache(tmp_path / "http"))
+    _ticker_cik_map.cache_clear()
+    yield
+    _ticker_cik_map.cache_clear()
 
 
 @pytest.fixture
@@ -34,6 +51,8 @@ def _mk_resp(json_data, status=200):
     r = MagicMock()
     r.raise_for_status.return_value = None
     r.json.return_value = json_data
+    r.content = json.dumps(json_data).encode("utf-8")
+    r.headers = {}
     r.status_code = status
     return r
 
@@ -55,7 +74,7 @@ class TestSecEdgarFundamentalSingle:
         # - FY 2016: keep
         # - Q3 cumulative 9m: drop (duration ~ 270)
         # - Q1 single quarter: keep
-        # - Q1 amended later filed: should win
+        # - Q1 amended later filed: ignored (point-in-time keeps the first-reported value)
         companyfacts_json = {
             "entityName": "Apple Inc.",
             "facts": {
@@ -75,7 +94,7 @@ class TestSecEdgarFundamentalSingle:
                                 {"fy": 2016, "fp": "Q1", "form": "10-Q", "filed": "2016-01-27",
                                  "start": "2015-09-28", "end": "2015-12-26", "val": 75000000000},
 
-                                # Q1 amended later filed, same end/fp should override
+                                # Q1 amended later filed, same end/fp: not visible at the original filing date
                                 {"fy": 2016, "fp": "Q1", "form": "10-Q/A", "filed": "2016-02-15",
                                  "start": "2015-09-28", "end": "2015-12-26", "val": 76000000000},
                             ]
@@ -93,11 +112,11 @@ class TestSecEdgarFundamentalSingle:
                 return _mk_resp(companyfacts_json)
             raise AssertionError(f"unexpected url: {url}")
 
-        with patch("data_download.input.sec_edgar_fundamental_single.requests.get", side_effect=requests_get_side_effect):
+        with patch("data_download.http_cache.requests.get", side_effect=requests_get_side_effect):
             n = download_one_ticker_fundamental_data(conn, ticker="AAPL", exchange="NASDAQ",
                                                      tags=[("us-gaap", "Revenues", "USD")])
 
-        # 应该写入两条：FY + Q1（Q3累计被过滤；Q1被修订覆盖后只剩一条）
+        # 应该写入两条：FY + Q1（Q3累计被过滤；Q1 只保留首次披露的一条）
         assert n == 2
 
         assert cursor.executemany.called
@@ -111,7 +130,8 @@ class TestSecEdgarFundamentalSingle:
         q_rows = [r for r in rows if r["period_type"] == "Quarterly"]
         assert len(q_rows) == 1
         assert q_rows[0]["report_date"] == "2015-12-26"
-        assert q_rows[0]["metric_value"] == 76000000000.0  # amended wins
+        assert q_rows[0]["metric_value"] == 75000000000.0  # first-reported wins
+        assert q_rows[0]["filed_date"] == "2016-01-27"
         assert q_rows[0]["metric_name"] == "us-gaap.Revenues"
         assert q_rows[0]["currency"] == "USD"
         assert q_rows[0]["data_source"] == "sec_edgar"
@@ -121,3 +141,34 @@ class TestSecEdgarFundamentalSingle:
         assert len(a_rows) == 1
         assert a_rows[0]["report_date"] == "2016-09-24"
         assert a_rows[0]["metric_value"] == 215639000000.0
+
+
+class TestCopyFundamentalData:
+    def test_copy_then_single_upsert(self, mock_conn):
+        conn, cursor = mock_conn
+        copy = MagicMock()
+        cursor.copy.return_value.__enter__.return_value = copy
+
+        rows = [
+            {"instrument_id": 1, "report_date": "2016-09-24", "metric_name": "us-gaap.Revenues",
+             "metric_value": 1.0, "period_type": "Annual", "period_start": "2015-09-28",
+             "period_end": "2016-09-24", "filed_date": "2016-10-26", "currency": "USD",
+             "data_source": "sec_edgar"},
+        ] * 3
+
+        assert copy_fundamental_data(conn, rows) == 3
+
+        assert copy.write_row.call_count == 3
+        assert "COPY _stage_fundamental_data" in cursor.copy.call_args[0][0]
+
+        sqls = [c[0][0] for c in cursor.execute.call_args_list]
+        upserts = [q for q in sqls if "INSERT INTO fundamental_data" in q]
+        assert len(upserts) == 1
+        assert "DISTINCT ON" in upserts[0]
+        assert "ON CONFLICT" in upserts[0]
+        cursor.executemany.assert_not_called()
+
+    def test_empty_rows_noop(self, mock_conn):
+        conn, cursor = mock_conn
+        assert copy_fundamental_data(conn, []) == 0
+        cursor.execute.assert_not_called()
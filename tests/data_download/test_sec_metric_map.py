@@ -0,0 +1,139 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+import data_download.input.sec_metric_map as smm
+from data_download.input.sec_metric_map import DEFAULT_METRIC_MAP, load_metric_map
+from data_download.input.sec_edgar_fundamental_single import build_fundamental_rows
+
+
+def _rec(end, val, fp="FY", form="10-K", filed=None, start=None):
+    r = {"fy": int(end[:4]), "fp": fp, "form": form, "filed": filed or end, "end": end, "val": val}
+    if start:
+        r["start"] = start
+    return r
+
+
+def _facts():
+    return {
+        "facts": {
+            "us-gaap": {
+                # 2017 之前用 SalesRevenueNet，之后换成 RevenueFromContract...
+                "SalesRevenueNet": {"units": {"USD": [
+                    _rec("2016-12-31", 100.0, start="2016-01-01"),
+                    _rec("2017-12-31", 999.0, start="2017-01-01"),
+                ]}},
+                "RevenueFromContractWithCustomerExcludingAssessedTax": {"units": {"USD": [
+                    _rec("2017-12-31", 120.0, start="2017-01-01"),
+                    _rec("2018-12-31", 130.0, start="2018-01-01"),
+                ]}},
+                "NetIncomeLoss": {"units": {"USD": [_rec("2018-12-31", 13.0, start="2018-01-01")]}},
+                "EarningsPerShareDiluted": {"units": {"USD/shares": [_rec("2018-12-31", 1.3, start="2018-01-01")]}},
+                # 未映射的 tag 不应入库
+                "SomeObscureTag": {"units": {"USD": [_rec("2018-12-31", 1.0)]}},
+            },
+            "dei": {
+                "EntityCommonStockSharesOutstanding": {"units": {"shares": [_rec("2019-02-01", 10.0)]}},
+            },
+        }
+    }
+
+
+@pytest.fixture
+def no_overrides(monkeypatch):
+    monkeypatch.setattr(smm, "get_config_value", lambda key, default=None: default)
+
+
+def test_synonyms_merge_with_priority_and_gap_fill(no_overrides):
+    rows = build_fundamental_rows(1, _facts())
+    revenue = {r["report_date"]: r["metric_value"] for r in rows if r["metric_name"] == "revenue"}
+
+    # 2017 两个 tag 都有：取优先级高的 RevenueFromContract...；2016 只有 SalesRevenueNet，用来补齐
+    assert revenue == {"2016-12-31": 100.0, "2017-12-31": 120.0, "2018-12-31": 130.0}
+
+
+def test_only_mapped_metrics_written_with_canonical_names(no_overrides):
+    rows = build_fundamental_rows(1, _facts())
+    names = {r["metric_name"] for r in rows}
+
+    assert names == {"revenue", "net_income", "eps_diluted", "shares_outstanding"}
+    assert all(n in DEFAULT_METRIC_MAP for n in names)
+
+    eps = [r for r in rows if r["metric_name"] == "eps_diluted"][0]
+    assert eps["currency"] == "USD/SHARES"
+    shares = [r for r in rows if r["metric_name"] == "shares_outstanding"][0]
+    assert shares["currency"] == "SHARES"
+
+
+def test_explicit_tags_keep_raw_names():
+    rows = build_fundamental_rows(1, _facts(), tags=[("us-gaap", "SomeObscureTag", "USD")])
+    assert [r["metric_name"] for r in rows] == ["us-gaap.SomeObscureTag"]
+
+
+def test_config_overrides_and_extends_defaults(monkeypatch):
+    overrides = {
+        "revenue": {"tags": ["us-gaap.SalesRevenueNet"]},
+        "obscure": {"unit": "USD", "tags": ["us-gaap.SomeObscureTag"]},
+    }
+    monkeypatch.setattr(
+        smm, "get_config_value",
+        lambda key, default=None: overrides if key == "fundamentals.metric_map" else default,
+    )
+
+    metric_map = load_metric_map()
+    assert metric_map["revenue"].unit == "USD"
+    assert metric_map["revenue"].tags == (("us-gaap", "SalesRevenueNet"),)
+    assert "obscure" in metric_map
+    assert metric_map["net_income"] == DEFAULT_METRIC_MAP["net_income"]
+
+    rows = build_fundamental_rows(1, _facts(), metric_map=metric_map)
+    revenue = {r["report_date"]: r["metric_value"] for r in rows if r["metric_name"] == "revenue"}
+    assert revenue == {"2016-12-31": 100.0, "2017-12-31": 999.0}
+
+
+def test_bad_config_entry_raises(monkeypatch):
+    monkeypatch.setattr(
+        smm, "get_config_value",
+        lambda key, default=None: {"x": {"tags": ["NoTaxonomy"], "unit": "USD"}},
+    )
+    with pytest.raises(ValueError):
+        load_metric_map()
+
+
+def test_value_and_filed_date_come_from_first_disclosure(no_overrides):
+    facts = {"facts": {"us-gaap": {"Assets": {"units": {"USD": [
+        # 次年年报的对比期（同一 end/fp）重述为 101，不能回写到 2019-02-20
+        _rec("2018-12-31", 101.0, form="10-K", filed="2020-02-20"),
+        _rec("2018-12-31", 100.0, form="10-K", filed="2019-02-20"),
+    ]}}}}}
+
+    rows = build_fundamental_rows(1, facts)
+    assert len(rows) == 1
+    assert rows[0]["metric_value"] == 100.0
+    assert rows[0]["filed_date"] == "2019-02-20"
+
+
+def test_amended_10k_is_not_visible_before_its_own_filing(no_overrides):
+    facts = {"facts": {"us-gaap": {"Revenues": {"units": {"USD": [
+        _rec("2019-12-31", 500.0, form="10-K", filed="2020-02-15", start="2019-01-01"),
+        _rec("2019-12-31", 450.0, form="10-K/A", filed="2020-06-30", start="2019-01-01"),
+    ]}}}}}
+
+    rows = build_fundamental_rows(1, facts)
+    assert [(r["metric_value"], r["filed_date"]) for r in rows] == [(500.0, "2020-02-15")]
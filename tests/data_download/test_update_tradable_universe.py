@@ -11,6 +11,8 @@
 # Unauthorized copying, modification, distribution, or use of this file,
 # via any medium, is strictly prohibited without prior written consent.
 # =============================================================================
+import math
+
 import pytest
 from unittest.mock import MagicMock, patch
 
@@ -22,6 +24,9 @@ sys.path.insert(0, str(project_root))
 # 待测函数
 from data_download.update.update_tradable_universe import update_tradable_universe
 
+MODULE = "data_download.update.update_tradable_universe"
+
+
 @pytest.fixture
 def mock_conn_cursor():
     """
@@ -33,104 +38,116 @@ def mock_conn_cursor():
     return conn, cursor
 
 
-@patch("tools.update_tradable_universe.get_db_connection")
-def test_update_tradable_universe_filters_stocks(mock_get_conn, mock_conn_cursor):
+def _calendar(n):
+    return [(f"2026-01-{31 - i:02d}",) for i in range(n)]
+
+
+@patch(f"{MODULE}.get_latest_price_date", return_value="2026-01-30")
+@patch(f"{MODULE}.get_db_connection")
+def test_update_tradable_universe_diff_update(mock_get_conn, _mock_date, mock_conn_cursor):
     """
     核心测试：
-    - 使用 market_prices
-    - 会执行多次 UPDATE
-    - 会实际过滤 Stock
+    - 一条语句：只 UPDATE 状态变化的行 + 写变更历史
+    - 复用 dv 因子，缺失时才回退 market_prices
+    - 返回新增 / 移除的标的
     """
-
     conn, cursor = mock_conn_cursor
     mock_get_conn.return_value = conn
 
-    # -----------------------------
-    # mock 返回值顺序非常关键
-    # -----------------------------
-    # 1) SELECT MAX(date) FROM market_prices
-    cursor.fetchone.side_effect = [
-        ("2026-01-24",),  # last_px_date
+    cursor.fetchall.side_effect = [
+        _calendar(20),                       # trading_calendar 窗口
+        [(7, True), (3, False), (5, True)],  # changed rows
     ]
 
-    # 2) summary SELECT asset_type, COUNT(*)
-    cursor.fetchall.return_value = [
-        ("ETF", 120),
-        ("Stock", 850),
-    ]
+    result = update_tradable_universe(min_price=3.0, min_avg_dollar_volume=1e6, lookback_days=20)
 
-    # 模拟 UPDATE 影响行数（这是“是否真的在滤”的关键）
-    cursor.rowcount = 123
-
-    # -----------------------------
-    # 执行
-    # -----------------------------
-    update_tradable_universe(
-        tradable_only=False,
-        min_price=3.0,
-        min_avg_volume=300_000,
-        volume_lookback_days=20,
-        commit=True,
-    )
-
-    # -----------------------------
-    # 断言：是否真的跑了核心 SQL
-    # -----------------------------
-    executed_sql = " ".join(
-        call.args[0] for call in cursor.execute.call_args_list
-    )
-
-    # ✅ 核心表名必须出现
-    assert "market_prices" in executed_sql
-    assert "instruments" in executed_sql
-
-    # ❌ 不允许再出现旧表
-    assert "price_history" not in executed_sql
-
-    # ✅ 必须有 is_tradable = FALSE（说明真的在“剔除”）
-    assert "SET is_tradable = FALSE" in executed_sql
+    assert result == {"asof_date": "2026-01-30", "added": [5, 7], "removed": [3]}
 
+    sql, params = cursor.execute.call_args_list[-1][0]
+
+    # ✅ 差量：不允许全表重置
+    assert "SET is_tradable = false" not in sql.lower().replace("  ", " ")
+    assert "IS DISTINCT FROM" in sql
+    # ✅ 变更写历史
+    assert "INSERT INTO instrument_tradable_history" in sql
+    # ✅ 复用因子 + 快照表
+    assert "latest_factor_values" in sql and "latest_prices" in sql
+    assert params["dv_factor"] == "dv_20d_log"
+    assert params["min_dv_log"] == pytest.approx(math.log(1e6))
+    assert params["window_start"] == "2026-01-12"
     # ✅ ETF 放行
-    assert "asset_type = 'ETF'" in executed_sql
+    assert "asset_type = 'ETF' THEN TRUE" in sql
 
-    # -----------------------------
-    # commit 被调用
-    # -----------------------------
     conn.commit.assert_called_once()
     conn.close.assert_called_once()
 
 
-@patch("tools.update_tradable_universe.get_db_connection")
-def test_update_tradable_universe_dry_run(mock_get_conn, mock_conn_cursor):
+@patch(f"{MODULE}.get_latest_price_date", return_value="2026-01-30")
+@patch(f"{MODULE}.get_db_connection")
+def test_fallback_averages_available_rows(mock_get_conn, _mock_date, mock_conn_cursor):
+    """
+    回退路径与旧规则同口径：新上市（窗口内不足 60 行）或个别日成交量为 0 的股票
+    仍按已有行求均值，不因行数不足被排除
+    """
+    conn, cursor = mock_conn_cursor
+    mock_get_conn.return_value = conn
+    cursor.fetchall.side_effect = [_calendar(60), [(9, True)]]
+
+    result = update_tradable_universe(min_price=1.0, lookback_days=60)
+    assert result["added"] == [9]
+
+    sql, params = cursor.execute.call_args_list[-1][0]
+    fallback = sql[sql.index("dv_fallback AS"):sql.index("target AS")]
+    assert "HAVING" not in fallback
+    assert "adj_volume > 0" not in fallback
+    assert "LN(NULLIF(AVG(m.adj_close * m.adj_volume), 0))" in fallback
+    assert "window" not in params
+
+
+@patch(f"{MODULE}.get_latest_price_date", return_value="2026-01-30")
+@patch(f"{MODULE}.get_db_connection")
+def test_update_tradable_universe_dry_run(mock_get_conn, _mock_date, mock_conn_cursor):
     """
     commit=False 时应 rollback
     """
     conn, cursor = mock_conn_cursor
     mock_get_conn.return_value = conn
 
-    cursor.fetchone.side_effect = [
-        ("2026-01-24",),
-    ]
-    cursor.fetchall.return_value = []
+    cursor.fetchall.side_effect = [_calendar(60), []]
 
-    update_tradable_universe(commit=False)
+    result = update_tradable_universe(commit=False, min_price=1.0)
 
+    assert result["added"] == [] and result["removed"] == []
     conn.rollback.assert_called_once()
     conn.commit.assert_not_called()
     conn.close.assert_called_once()
 
 
-@patch("tools.update_tradable_universe.get_db_connection")
-def test_fail_when_market_prices_empty(mock_get_conn, mock_conn_cursor):
+@patch(f"{MODULE}.get_latest_price_date", return_value=None)
+@patch(f"{MODULE}.get_db_connection")
+def test_fail_when_market_prices_empty(mock_get_conn, _mock_date, mock_conn_cursor):
     """
     market_prices 为空时应直接失败
     """
     conn, cursor = mock_conn_cursor
     mock_get_conn.return_value = conn
 
-    cursor.fetchone.return_value = (None,)  # MAX(date) is None
-
     with pytest.raises(ValueError):
-        update_tradable_universe()
+        update_tradable_universe(min_price=1.0)
 
+    conn.commit.assert_not_called()
     conn.close.assert_called_once()
+
+
+@patch(f"{MODULE}.get_latest_price_date", return_value="2026-01-30")
+@patch(f"{MODULE}.get_db_connection")
+def test_fail_when_calendar_too_short(mock_get_conn, _mock_date, mock_conn_cursor):
+    conn, cursor = mock_conn_cursor
+    mock_get_conn.return_value = conn
+    cursor.fetchall.return_value = _calendar(5)
+
+    with pytest.raises(ValueError):
+        update_tradable_universe(min_price=1.0, lookback_days=20)
+
+    # 没有执行差量更新
+    assert len(cursor.execute.call_args_list) == 1
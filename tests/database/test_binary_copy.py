@@ -0,0 +1,153 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+
+from database.utils.binary_copy import (
+    PGCOPY_SIGNATURE,
+    copy_from_numpy,
+    decode_binary_copy,
+    encode_binary_copy,
+    select_expr,
+)
+from database.readwrite.rw_market_prices import load_price_panel
+from database.readwrite.rw_factor_values import load_factor_panel
+
+PRICE_SPEC = [("instrument_id", "int8"), ("date", "date"), ("adj_close", "float8")]
+
+
+def _copy_conn(blob: bytes, block: int = 7):
+    """cursor.copy(...) 的上下文对象按 block 字节分块迭代"""
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value = cursor
+    copy = MagicMock()
+    copy.__iter__.return_value = iter([blob[i:i + block] for i in range(0, len(blob), block)])
+    cursor.copy.return_value.__enter__.return_value = copy
+    return conn, cursor
+
+
+def test_decode_roundtrip_types():
+    blob = encode_binary_copy(
+        [(1, "2026-01-02", 10.5), (2, "1999-12-31", float("nan"))], PRICE_SPEC
+    )
+    cols = decode_binary_copy(blob, PRICE_SPEC)
+
+    assert cols["instrument_id"].dtype == np.int64
+    assert cols["instrument_id"].tolist() == [1, 2]
+    assert cols["date"].dtype == np.dtype("datetime64[ns]")
+    assert list(pd.to_datetime(cols["date"]).date.astype(str)) == ["2026-01-02", "1999-12-31"]
+    assert cols["adj_close"][0] == 10.5 and np.isnan(cols["adj_close"][1])
+
+
+def test_decode_empty_stream():
+    cols = decode_binary_copy(encode_binary_copy([], PRICE_SPEC), PRICE_SPEC)
+    assert all(len(v) == 0 for v in cols.values())
+
+
+def test_decode_skips_header_extension():
+    body = encode_binary_copy([(5, "2020-01-01", 1.0)], PRICE_SPEC)[len(PGCOPY_SIGNATURE) + 8:]
+    blob = PGCOPY_SIGNATURE + (0).to_bytes(4, "big") + (3).to_bytes(4, "big") + b"xyz" + body
+    assert decode_binary_copy(blob, PRICE_SPEC)["instrument_id"].tolist() == [5]
+
+
+def test_decode_rejects_null_field():
+    blob = bytearray(encode_binary_copy([(1, "2020-01-01", 1.0)], PRICE_SPEC))
+    # 把最后一个字段改成 NULL（长度 -1，无数据）
+    row_end = len(blob) - 2
+    blob[row_end - 12:row_end] = (-1).to_bytes(4, "big", signed=True)
+    with pytest.raises(ValueError):
+        decode_binary_copy(bytes(blob), PRICE_SPEC)
+
+
+def test_decode_rejects_garbage():
+    with pytest.raises(ValueError, match="PGCOPY"):
+        decode_binary_copy(b"not a copy stream", PRICE_SPEC)
+
+
+def test_select_expr_coalesces_floats():
+    assert select_expr("adj_close", "float8", "adj_close") == \
+        "COALESCE((adj_close)::float8, 'NaN'::float8) AS adj_close"
+    assert select_expr("date", "date", "d") == "(date)::date AS d"
+
+
+def test_load_price_panel_decodes_copy_stream():
+    spec = [("instrument_id", "int8"), ("date", "date"), ("adj_close", "float8"), ("volume", "float8")]
+    blob = encode_binary_copy([(1, "2026-01-02", 100.0, 1e6), (1, "2026-01-05", 101.0, 2e6)], spec)
+    conn, cursor = _copy_conn(blob)
+
+    df = load_price_panel(conn, ["adj_close", "volume"], start_date="2026-01-01", instrument_ids=[1])
+
+    assert list(df.columns) == ["instrument_id", "date", "adj_close", "volume"]
+    assert df["adj_close"].tolist() == [100.0, 101.0]
+    sql, params = cursor.copy.call_args[0]
+    assert sql.startswith("COPY (SELECT") and sql.endswith("TO STDOUT (FORMAT BINARY)")
+    assert params == ["2026-01-01", [1]]
+
+
+def test_load_price_panel_rejects_unknown_field():
+    with pytest.raises(ValueError, match="unknown price fields"):
+        load_price_panel(MagicMock(), ["adj_close; DROP TABLE x"])
+
+
+def test_load_factor_panel_maps_factor_index_to_name():
+    spec = [("instrument_id", "int8"), ("date", "date"), ("factor_idx", "int4"), ("factor_value", "float8")]
+    blob = encode_binary_copy(
+        [(1, "2026-01-02", 1, 0.5), (2, "2026-01-02", 0, -0.25)], spec
+    )
+    conn, cursor = _copy_conn(blob)
+
+    df = load_factor_panel(conn, ["mom_21d", "vol_20d_ann252"], start_date="2026-01-02", end_date="2026-01-02")
+
+    assert df["factor_name"].tolist() == ["vol_20d_ann252", "mom_21d"]
+    assert df["factor_value"].tolist() == [0.5, -0.25]
+    sql, params = cursor.copy.call_args[0]
+    assert "array_position(%s::text[], factor_name)" in sql
+    assert params[:3] == [["mom_21d", "vol_20d_ann252"], ["mom_21d", "vol_20d_ann252"], "v1"]
+
+
+def test_load_factor_panel_validates_inputs():
+    with pytest.raises(ValueError, match="cannot be empty"):
+        load_factor_panel(MagicMock(), [])
+    with pytest.raises(ValueError, match="cannot be empty"):
+        load_factor_panel(MagicMock(), ["a"], instrument_ids=[])
+
+
+def test_copy_from_numpy_writes_one_binary_block():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value = cursor
+    copy = MagicMock()
+    cursor.copy.return_value.__enter__.return_value = copy
+
+    cols = {
+        "instrument_id": np.array([3, 4], dtype=np.int64),
+        "date": np.array(["2024-01-02", "2024-01-03"], dtype="datetime64[ns]"),
+        "adj_close": np.array([1.5, np.nan]),
+    }
+    assert copy_from_numpy(conn, "_stage", cols, PRICE_SPEC) == 2
+
+    assert cursor.copy.call_args.args[0] == "COPY _stage (instrument_id, date, adj_close) FROM STDIN (FORMAT BINARY)"
+    blob = copy.write.call_args.args[0]
+    back = decode_binary_copy(blob, PRICE_SPEC)
+    assert back["instrument_id"].tolist() == [3, 4]
+    assert back["adj_close"][0] == 1.5 and np.isnan(back["adj_close"][1])
+    assert copy_from_numpy(conn, "_stage", {k: v[:0] for k, v in cols.items()}, PRICE_SPEC) == 0
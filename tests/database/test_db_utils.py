@@ -0,0 +1,145 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import pytest
+from unittest.mock import MagicMock
+
+import psycopg
+
+import database.utils.db_utils as db_utils
+from database.utils.db_utils import PooledConnection, db_connection
+
+
+def _raw_conn(status=psycopg.pq.TransactionStatus.IDLE):
+    conn = MagicMock()
+    conn.closed = False
+    conn.info.transaction_status = status
+    return conn
+
+
+@pytest.fixture(autouse=True)
+def reset_pool(monkeypatch):
+    monkeypatch.setattr(db_utils, "_POOL", None)
+    monkeypatch.setattr(db_utils, "_POOL_PID", None)
+    monkeypatch.setattr(db_utils, "_conn_kwargs", lambda: {"dbname": "x"})
+    yield
+
+
+def _config(values):
+    return lambda key, default=None: values.get(key, default)
+
+
+class TestPooledConnection:
+    def test_close_returns_to_pool(self):
+        pool = MagicMock()
+        raw = _raw_conn()
+        conn = PooledConnection(pool, raw)
+
+        conn.close()
+        conn.close()  # 幂等
+
+        pool.putconn.assert_called_once_with(raw)
+        raw.rollback.assert_not_called()
+        assert conn.closed
+
+    def test_close_rolls_back_open_transaction(self):
+        pool = MagicMock()
+        raw = _raw_conn(psycopg.pq.TransactionStatus.INTRANS)
+
+        PooledConnection(pool, raw).close()
+
+        raw.rollback.assert_called_once()
+        pool.putconn.assert_called_once_with(raw)
+
+    def test_with_commits_or_rolls_back(self):
+        pool = MagicMock()
+        raw = _raw_conn()
+        with PooledConnection(pool, raw) as conn:
+            conn.cursor().execute("SELECT 1")
+        raw.commit.assert_called_once()
+        pool.putconn.assert_called_once_with(raw)
+
+        raw2 = _raw_conn()
+        with pytest.raises(ValueError):
+            with PooledConnection(pool, raw2):
+                raise ValueError("boom")
+        raw2.rollback.assert_called()
+        raw2.commit.assert_not_called()
+
+    def test_delegates_and_rejects_after_close(self):
+        pool = MagicMock()
+        raw = _raw_conn()
+        conn = PooledConnection(pool, raw)
+
+        conn.autocommit = True
+        assert raw.autocommit is True
+        assert conn.cursor() is raw.cursor.return_value
+
+        conn.close()
+        with pytest.raises(psycopg.InterfaceError):
+            conn.cursor()
+
+
+class TestGetDbConnection:
+    def test_pool_disabled_connects_directly(self, monkeypatch):
+        monkeypatch.setattr(db_utils, "get_config_value", _config({"database.pool.enabled": False}))
+        connect = MagicMock()
+        monkeypatch.setattr(db_utils.psycopg, "connect", connect)
+
+        conn = db_utils.get_db_connection()
+
+        assert conn is connect.return_value
+        connect.assert_called_once_with(dbname="x")
+
+    def test_pool_created_once_per_process(self, monkeypatch):
+        monkeypatch.setattr(db_utils, "get_config_value", _config({"database.pool.max_size": 4}))
+        pool_cls = MagicMock()
+        monkeypatch.setattr(db_utils, "ConnectionPool", pool_cls)
+
+        c1 = db_utils.get_db_connection()
+        c2 = db_utils.get_db_connection()
+
+        assert pool_cls.call_count == 1
+        assert pool_cls.call_args.kwargs["max_size"] == 4
+        assert isinstance(c1, PooledConnection) and isinstance(c2, PooledConnection)
+        assert pool_cls.return_value.getconn.call_count == 2
+
+    def test_new_pool_after_fork(self, monkeypatch):
+        monkeypatch.setattr(db_utils, "get_config_value", _config({}))
+        pool_cls = MagicMock(side_effect=[MagicMock(name="parent"), MagicMock(name="child")])
+        monkeypatch.setattr(db_utils, "ConnectionPool", pool_cls)
+
+        monkeypatch.setattr(db_utils.os, "getpid", lambda: 100)
+        parent = db_utils.get_pool()
+        monkeypatch.setattr(db_utils.os, "getpid", lambda: 200)
+        child = db_utils.get_pool()
+
+        assert parent is not child
+        parent.close.assert_not_called()
+
+
+def test_db_connection_context(monkeypatch):
+    raw = MagicMock()
+    monkeypatch.setattr(db_utils, "get_db_connection", lambda: raw)
+
+    with db_connection() as conn:
+        assert conn is raw
+    raw.commit.assert_called_once()
+    raw.close.assert_called_once()
+
+    raw.reset_mock()
+    with pytest.raises(RuntimeError):
+        with db_connection():
+            raise RuntimeError("x")
+    raw.rollback.assert_called_once()
+    raw.close.assert_called_once()
@@ -0,0 +1,121 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import json
+
+import pytest
+from unittest.mock import MagicMock
+
+import database.schema.explain_audit as ea
+
+
+def _plan(node):
+    return {"Plan": node, "Execution Time": 1.5, "Planning Time": 0.2}
+
+
+def test_summarize_plan_index_only_with_partitions():
+    plan = _plan(
+        {
+            "Node Type": "Append",
+            "Shared Hit Blocks": 12,
+            "Shared Read Blocks": 3,
+            "Plans": [
+                {
+                    "Node Type": "Index Only Scan",
+                    "Relation Name": "factor_values_2026",
+                    "Index Name": "factor_values_2026_cov_idx",
+                    "Actual Rows": 500,
+                    "Heap Fetches": 0,
+                },
+                {"Node Type": "Seq Scan", "Relation Name": "instruments", "Actual Rows": 10},
+            ],
+        }
+    )
+    s = ea.summarize_plan(plan)
+
+    assert s["index_only"] is True
+    assert [x["relation"] for x in s["scans"]] == ["factor_values_2026"]
+    assert s["shared_hit"] == 12 and s["shared_read"] == 3
+    assert s["execution_ms"] == 1.5
+
+
+def test_summarize_plan_flags_heap_scans_and_fetches():
+    plan = _plan(
+        {
+            "Node Type": "Nested Loop",
+            "Plans": [
+                {"Node Type": "Index Only Scan", "Relation Name": "market_prices", "Heap Fetches": 40},
+                {"Node Type": "Bitmap Heap Scan", "Relation Name": "factor_values"},
+            ],
+        }
+    )
+    s = ea.summarize_plan(plan)
+
+    assert s["index_only"] is False
+    assert s["heap_fetches"] == 40
+
+
+def test_recording_connection_explains_select_and_copy():
+    real_cursor = MagicMock()
+    real_cursor.fetchone.return_value = [json.dumps([_plan({"Node Type": "Result"})])]
+    conn = MagicMock()
+    conn.cursor.return_value = real_cursor
+
+    rec = ea.RecordingConnection(conn)
+    cur = rec.cursor()
+    cur.execute("SELECT * FROM factor_values WHERE date = %s", ("2026-01-02",))
+    cur.execute("INSERT INTO x VALUES (1)")
+    cur.copy("COPY (SELECT 1 FROM market_prices WHERE date = %s) TO STDOUT (FORMAT BINARY)", ["2026-01-02"])
+
+    explains = [c[0] for c in real_cursor.execute.call_args_list if c[0][0].startswith("EXPLAIN")]
+    assert len(explains) == 2
+    assert explains[0][1] == ("2026-01-02",)
+    assert explains[1][0].endswith("SELECT 1 FROM market_prices WHERE date = %s")
+    assert len(rec.plans) == 2
+    # 原语句仍然转发给真实 cursor
+    real_cursor.copy.assert_called_once()
+
+
+def test_audit_marks_expected_index_only_failures(monkeypatch):
+    def _run(plan_node):
+        def run(conn, d, names):
+            conn.plans.append({"query": "q", "plan": _plan(plan_node)})
+
+        return run
+
+    paths = [
+        ea.ReadPath("good", _run({"Node Type": "Index Only Scan", "Relation Name": "factor_values"})),
+        ea.ReadPath("bad", _run({"Node Type": "Seq Scan", "Relation Name": "market_prices"})),
+        ea.ReadPath("lenient", _run({"Node Type": "Index Scan", "Relation Name": "market_prices"}), expect_index_only=False),
+    ]
+    monkeypatch.setattr(ea, "_read_paths", lambda: paths)
+
+    results = ea.audit(MagicMock(), "2026-01-02", factor_names=["mom_1d"])
+
+    assert [r["ok"] for r in results] == [True, False, True]
+    assert "❌ bad" in ea.format_results(results)
+
+
+def test_seed_refuses_non_empty_tables():
+    conn = MagicMock()
+    cursor = conn.cursor.return_value
+    cursor.fetchone.return_value = (True,)
+
+    with pytest.raises(RuntimeError):
+        ea.seed_synthetic(conn, end_date="2026-01-02")
+    conn.commit.assert_not_called()
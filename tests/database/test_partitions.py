@@ -0,0 +1,98 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import database.schema.partitions as parts
+
+
+def _executed(cursor):
+    return [c[0][0] for c in cursor.execute.call_args_list]
+
+
+def test_partition_bounds_year_and_month():
+    assert parts.partition_bounds(date(2023, 6, 1), date(2024, 2, 1), "year") == [
+        (date(2023, 1, 1), date(2024, 1, 1)),
+        (date(2024, 1, 1), date(2025, 1, 1)),
+    ]
+    months = parts.partition_bounds(date(2023, 11, 15), date(2024, 1, 3), "month")
+    assert [lo for lo, _ in months] == [date(2023, 11, 1), date(2023, 12, 1), date(2024, 1, 1)]
+    assert months[1][1] == date(2024, 1, 1)
+    assert parts.partition_bounds(date(2024, 1, 2), date(2024, 1, 1), "year") == []
+
+
+def test_partition_names():
+    assert parts.partition_name("factor_values", date(2024, 1, 1), "year") == "factor_values_y2024"
+    assert parts.partition_name("market_prices", date(2024, 6, 1), "month") == "market_prices_m2024_06"
+
+
+def test_ensure_partitions_creates_only_missing(mock_db_connection, monkeypatch):
+    conn, cursor = mock_db_connection
+    monkeypatch.setattr(parts, "list_partitions", lambda c, t: ["market_prices_default", "market_prices_y2023"])
+
+    created = parts.ensure_partitions(conn, "market_prices", date(2023, 3, 1), date(2024, 3, 1), "year")
+
+    assert created == ["market_prices_y2024"]
+    sqls = _executed(cursor)
+    assert any("PARTITION OF market_prices FOR VALUES FROM ('2024-01-01') TO ('2025-01-01')" in s for s in sqls)
+    # default 中落在新区间的行先搬出再写回
+    assert any(s.startswith("DELETE FROM market_prices_default") for s in sqls)
+    assert not any("market_prices_y2023" in s for s in sqls)
+
+
+def test_ensure_partitions_rejects_unknown_table(mock_db_connection):
+    conn, _ = mock_db_connection
+    with pytest.raises(ValueError):
+        parts.ensure_partitions(conn, "instruments", date(2024, 1, 1), date(2024, 1, 2), "year")
+
+
+def test_ensure_partitions_for_dates_noop_when_disabled(mock_db_connection, monkeypatch):
+    conn, cursor = mock_db_connection
+    monkeypatch.setattr(parts, "partitioning_enabled", lambda: False)
+
+    assert parts.ensure_partitions_for_dates(conn, "factor_values", ["2024-01-02"]) == []
+    cursor.execute.assert_not_called()
+
+
+def test_ensure_partitions_for_dates_caches_covered_periods(mock_db_connection, monkeypatch):
+    conn, _ = mock_db_connection
+    monkeypatch.setattr(parts, "partitioning_enabled", lambda: True)
+    monkeypatch.setattr(parts, "partition_interval", lambda: "year")
+    monkeypatch.setattr(parts, "_COVERED", {})
+    monkeypatch.setattr(parts, "is_partitioned", lambda c, t: True)
+    calls = []
+    monkeypatch.setattr(parts, "ensure_partitions", lambda c, t, s, e, i: calls.append((s, e)) or [])
+
+    parts.ensure_partitions_for_dates(conn, "factor_values", ["2023-12-29", pd.Timestamp("2024-01-02"), date(2024, 5, 1)])
+    parts.ensure_partitions_for_dates(conn, "factor_values", [date(2024, 6, 3)])
+
+    assert calls == [(date(2023, 1, 1), date(2024, 1, 1))]
+
+
+def test_delete_factor_values_with_date_range(mock_db_connection):
+    from database.readwrite.rw_factor_values import delete_factor_values
+
+    conn, cursor = mock_db_connection
+    delete_factor_values(conn, factor_name="mom_21d", start_date="2024-01-01", end_date="2024-12-31")
+
+    sql, params = cursor.execute.call_args_list[0][0]
+    assert "date >= %s" in sql and "date <= %s" in sql
+    assert params == ["mom_21d", "2024-01-01", "2024-12-31"]
@@ -0,0 +1,193 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+import database.readwrite.rw_async as rw_async
+import database.utils.async_db_utils as async_db_utils
+
+
+def _async_conn():
+    conn = MagicMock()
+    cursor = MagicMock()
+    cursor.execute = AsyncMock()
+    cursor.executemany = AsyncMock()
+    cursor.fetchall = AsyncMock(return_value=[])
+    conn.cursor.return_value = cursor
+    return conn, cursor
+
+
+@pytest.fixture(autouse=True)
+def no_partitions(monkeypatch):
+    monkeypatch.setattr(rw_async, "partitions_covered", lambda table, dates: True)
+
+
+def test_aget_prices_shares_sync_query():
+    conn, cursor = _async_conn()
+    cursor.description = [("date",), ("adj_close",)]
+    cursor.fetchall.return_value = [("2026-01-02", 10.0)]
+
+    df = asyncio.run(rw_async.aget_prices(conn, 7, start_date="2026-01-01"))
+
+    sql, params = cursor.execute.call_args[0]
+    assert "FROM market_prices WHERE instrument_id = %s" in sql
+    assert params == [7, "2026-01-01"]
+    assert df["adj_close"].tolist() == [10.0]
+
+
+def test_aget_prices_on_date_strict_raises_on_missing():
+    conn, cursor = _async_conn()
+    cursor.fetchall.return_value = [(1, 10.0)]
+
+    assert asyncio.run(rw_async.aget_prices_on_date(conn, [1], "2026-01-02")) == {1: 10.0}
+    with pytest.raises(ValueError):
+        asyncio.run(rw_async.aget_prices_on_date(conn, [1, 2], "2026-01-02", strict=True))
+    assert asyncio.run(rw_async.aget_prices_on_date(conn, [], "2026-01-02")) == {}
+
+
+def test_aget_factor_values_validates_like_sync():
+    conn, _ = _async_conn()
+    with pytest.raises(ValueError):
+        asyncio.run(rw_async.aget_factor_values(conn, date="2026-01-02", start_date="2026-01-01"))
+
+
+def test_abatch_insert_factor_values_writes_rows_and_snapshot():
+    conn, cursor = _async_conn()
+    rows = [
+        {"instrument_id": 1, "date": "2026-01-01", "factor_name": "mom_5d", "factor_value": 0.1},
+        {"instrument_id": 1, "date": "2026-01-02", "factor_name": "mom_5d", "factor_value": 0.2},
+    ]
+
+    assert asyncio.run(rw_async.abatch_insert_factor_values(conn, rows)) == 2
+
+    passed = cursor.executemany.call_args[0][1]
+    assert [r["factor_version"] for r in passed] == ["v1", "v1"]
+    snapshot_sql, snapshot_params = cursor.execute.call_args[0]
+    assert "latest_factor_values" in snapshot_sql
+    assert snapshot_params[3] == ["2026-01-02"]
+
+
+def test_abatch_insert_prices_uses_executemany_and_ensures_partitions(monkeypatch):
+    conn, cursor = _async_conn()
+    ensured = []
+    monkeypatch.setattr(rw_async, "partitions_covered", lambda table, dates: False)
+    monkeypatch.setattr(rw_async, "_ensure_partitions_blocking", lambda table, dates: ensured.append((table, dates)))
+
+    prices = [{"instrument_id": 1, "date": "2026-01-02", "close_price": 5.0, "adj_close": 5.0}]
+    assert asyncio.run(rw_async.abatch_insert_prices(conn, prices)) == 1
+
+    sql, params = cursor.executemany.call_args[0]
+    assert "INSERT INTO market_prices" in sql and "latest_prices" in sql
+    assert params[0][:2] == (1, "2026-01-02")
+    assert ensured == [("market_prices", ["2026-01-02"])]
+    assert asyncio.run(rw_async.abatch_insert_prices(conn, [])) == 0
+
+
+def test_async_pool_is_per_event_loop(monkeypatch):
+    created = []
+
+    class FakePool:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+            self.open = AsyncMock()
+            self.close = AsyncMock()
+            created.append(self)
+
+    monkeypatch.setattr(async_db_utils, "AsyncConnectionPool", FakePool)
+    monkeypatch.setattr(async_db_utils, "_pool_enabled", lambda: True)
+    monkeypatch.setattr(async_db_utils, "_conn_kwargs", lambda: {"dbname": "x"})
+    monkeypatch.setattr(async_db_utils, "_APOOL", None)
+    monkeypatch.setattr(async_db_utils, "_APOOL_KEY", None)
+
+    async def run():
+        p1 = await async_db_utils.get_async_pool()
+        p2 = await async_db_utils.get_async_pool()
+        assert p1 is p2
+        await async_db_utils.close_async_pool()
+        p1.close.assert_awaited_once()
+
+    asyncio.run(run())
+    asyncio.run(run())
+    # 每个 asyncio.run 一个新事件循环 -> 新池
+    assert len(created) == 2
+    assert created[0].kwargs["open"] is False
+
+
+def test_concurrent_borrows_create_one_pool(monkeypatch):
+    created = []
+
+    class FakePool:
+        def __init__(self, **kwargs):
+            self.close = AsyncMock()
+            created.append(self)
+
+        async def open(self):
+            # 让出事件循环：没有锁时另一个协程会在这里也开始建池
+            await asyncio.sleep(0.01)
+
+        @asynccontextmanager
+        async def connection(self):
+            yield object()
+
+    monkeypatch.setattr(async_db_utils, "AsyncConnectionPool", FakePool)
+    monkeypatch.setattr(async_db_utils, "_pool_enabled", lambda: True)
+    monkeypatch.setattr(async_db_utils, "_conn_kwargs", lambda: {"dbname": "x"})
+    monkeypatch.setattr(async_db_utils, "_APOOL", None)
+    monkeypatch.setattr(async_db_utils, "_APOOL_KEY", None)
+
+    async def borrow():
+        async with async_db_utils.async_db_connection() as conn:
+            await asyncio.sleep(0)
+            return conn
+
+    async def run():
+        c1, c2 = await asyncio.gather(borrow(), borrow())
+        assert c1 is not c2
+        await async_db_utils.close_async_pool()
+
+    asyncio.run(run())
+    assert len(created) == 1
+
+
+def test_async_db_connection_without_pool_commits_and_closes(monkeypatch):
+    raw = MagicMock()
+    raw.commit = AsyncMock()
+    raw.rollback = AsyncMock()
+    raw.close = AsyncMock()
+    monkeypatch.setattr(async_db_utils, "_pool_enabled", lambda: False)
+    monkeypatch.setattr(async_db_utils, "_conn_kwargs", lambda: {"dbname": "x"})
+    monkeypatch.setattr(async_db_utils.psycopg.AsyncConnection, "connect", AsyncMock(return_value=raw))
+
+    async def ok():
+        async with async_db_utils.async_db_connection() as conn:
+            assert conn is raw
+
+    async def boom():
+        async with async_db_utils.async_db_connection():
+            raise RuntimeError("x")
+
+    asyncio.run(ok())
+    raw.commit.assert_awaited_once()
+    with pytest.raises(RuntimeError):
+        asyncio.run(boom())
+    raw.rollback.assert_awaited_once()
+    assert raw.close.await_count == 2
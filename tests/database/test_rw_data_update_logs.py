@@ -22,7 +22,9 @@ from database.readwrite.rw_data_update_logs import (
     create_log,
     update_log_success,
     update_log_failure,
-    get_recent_logs
+    get_recent_logs,
+    get_resumable_log,
+    update_log_progress,
 )
 
 
@@ -248,3 +250,60 @@ class TestGetRecentLogs:
         params = cursor.execute.call_args[0][1]
         assert 'market_prices' in params
         assert 5 in params
+
+
+class TestGetResumableLog:
+    """测试 get_resumable_log"""
+
+    def test_running_log_is_resumed(self, mock_conn):
+        conn, cursor = mock_conn
+        cursor.fetchone.return_value = (7, 'running', '2026-01-01', 100, 2.0, [1, 4])
+
+        result = get_resumable_log(conn, 'fundamental_data', 'sec_edgar', max_age_hours=48)
+
+        assert result == {
+            "log_id": 7, "status": 'running', "started_at": '2026-01-01', "rows_inserted": 100, "processed_ids": {1, 4},
+        }
+
+    def test_log_without_processed_ids(self, mock_conn):
+        conn, cursor = mock_conn
+        cursor.fetchone.return_value = (7, 'failed', '2026-01-01', None, 2.0, None)
+
+        result = get_resumable_log(conn, 'fundamental_data', 'sec_edgar')
+
+        assert result["processed_ids"] == set()
+        assert result["rows_inserted"] == 0
+
+    @pytest.mark.parametrize("status", ['completed', 'partial'])
+    def test_finished_log_starts_new_run(self, mock_conn, status):
+        conn, cursor = mock_conn
+        cursor.fetchone.return_value = (7, status, '2026-01-01', 100, 2.0, None)
+
+        assert get_resumable_log(conn, 'fundamental_data', 'sec_edgar') is None
+
+    def test_stale_failed_log_is_not_resumed(self, mock_conn):
+        conn, cursor = mock_conn
+        cursor.fetchone.return_value = (7, 'failed', '2026-01-01', 100, 24.0 * 90, None)
+
+        assert get_resumable_log(conn, 'fundamental_data', 'sec_edgar', max_age_hours=48) is None
+        assert get_resumable_log(conn, 'fundamental_data', 'sec_edgar') is not None
+
+
+class TestUpdateLogProgress:
+    """测试 update_log_progress"""
+
+    def test_appends_processed_ids(self, mock_conn):
+        conn, cursor = mock_conn
+
+        update_log_progress(conn, 7, 120, processed_ids=[3, 5])
+
+        sql, params = cursor.execute.call_args[0]
+        assert "processed_ids = COALESCE(processed_ids, '{}'::BIGINT[]) || %s::BIGINT[]" in sql
+        assert params == (120, [3, 5], 7)
+
+    def test_without_processed_ids_appends_nothing(self, mock_conn):
+        conn, cursor = mock_conn
+
+        update_log_progress(conn, 7, 120)
+
+        assert cursor.execute.call_args[0][1] == (120, [], 7)
@@ -23,6 +23,7 @@ from database.readwrite.rw_exp_positions import (
     batch_insert_exp_positions,
     get_exp_positions,
     get_exp_nav,
+    get_exp_positions_with_sector,
     delete_exp_positions_by_date,
 )
 
@@ -204,6 +205,27 @@ class TestGetExpNav:
         assert "2024-01-31" in params
 
 
+class TestGetExpPositionsWithSector:
+
+    def test_joins_sector_in_one_query(self, mock_conn):
+        """一次查询关联行业，现金 / 缺失行业有固定标签"""
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = [
+            ("2024-01-31", 0, 1000.0, 1000.0, "Cash"),
+            ("2024-01-31", 123, 10.0, 1500.0, "Technology"),
+        ]
+
+        result = get_exp_positions_with_sector(conn, start_date="2024-01-01")
+
+        assert cursor.execute.call_count == 1
+        sql, params = cursor.execute.call_args[0]
+        assert "LEFT JOIN instruments" in sql
+        assert "'Cash'" in sql and "'Unknown'" in sql
+        assert params == ["2024-01-01"]
+        assert list(result.columns) == ["date", "instrument_id", "quantity", "market_value", "sector"]
+        assert len(result) == 2
+
+
 # ============================================================
 # Delete Tests
 # ============================================================
@@ -0,0 +1,79 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock
+
+from database.readwrite.rw_factor_ic import copy_factor_ic, get_factor_ic
+
+
+def _conn():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value = cursor
+    copy = MagicMock()
+    cursor.copy.return_value.__enter__.return_value = copy
+    return conn, cursor, copy
+
+
+def test_copy_factor_ic_stages_and_upserts():
+    conn, cursor, copy = _conn()
+    df = pd.DataFrame(
+        {
+            "date": [date(2024, 1, 2), date(2024, 1, 3)],
+            "factor_name": ["mom_63d", "mom_63d"],
+            "horizon": [21, 21],
+            "method": ["spearman", "spearman"],
+            "ic": [0.05, np.nan],
+            "n_obs": [120, 118],
+        }
+    )
+
+    assert copy_factor_ic(conn, df, factor_version="v2") == 2
+
+    rows = [c.args[0] for c in copy.write_row.call_args_list]
+    assert rows[0] == ("mom_63d", 21, "spearman", date(2024, 1, 2), 0.05, 120)
+    assert rows[1][4] is None
+
+    sqls = [c.args[0] for c in cursor.execute.call_args_list]
+    assert "ON CONFLICT (factor_name, factor_version, horizon, method, date)" in sqls[1]
+    assert cursor.execute.call_args_list[1].args[1] == ("v2",)
+    assert "TRUNCATE _stage_factor_ic" in sqls[2]
+
+
+def test_copy_factor_ic_empty_is_noop():
+    conn, cursor, _ = _conn()
+    assert copy_factor_ic(conn, pd.DataFrame()) == 0
+    cursor.execute.assert_not_called()
+
+
+def test_get_factor_ic_filters():
+    conn, cursor, _ = _conn()
+    cursor.fetchall.return_value = [(date(2024, 1, 2), "mom_63d", 5, "pearson", 0.1, 100)]
+
+    df = get_factor_ic(conn, ["mom_63d"], horizon=5, method="pearson", start_date="2024-01-01")
+
+    sql, params = cursor.execute.call_args.args
+    assert "factor_name = ANY(%s)" in sql
+    assert "horizon = %s" in sql and "method = %s" in sql and "date >= %s" in sql
+    assert params == ["v1", ["mom_63d"], 5, "pearson", "2024-01-01"]
+    assert list(df.columns) == ["date", "factor_name", "horizon", "method", "ic", "n_obs"]
+    assert df["ic"].dtype == float
@@ -0,0 +1,101 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock
+
+from database.readwrite.rw_factor_monitor import (
+    MONITOR_COLUMNS,
+    copy_factor_monitor,
+    get_last_monitor_dates,
+    get_latest_monitor,
+    get_monitor_tail,
+)
+
+
+def _conn():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value = cursor
+    copy = MagicMock()
+    cursor.copy.return_value.__enter__.return_value = copy
+    return conn, cursor, copy
+
+
+def _row(**kw):
+    base = dict(
+        factor_name="mom_63d", date=date(2024, 1, 2), ic=0.05, ls_return=0.01, n_obs=120, n_days=300,
+        ic_longrun=0.03, rolling_ic=0.04, rolling_icir=0.3, hit_rate=0.6, rolling_ls=0.004, val_spread=-0.2,
+        crowding_z=0.5, status="ok",
+    )
+    base.update(kw)
+    return base
+
+
+def test_copy_factor_monitor_stages_and_upserts():
+    conn, cursor, copy = _conn()
+    df = pd.DataFrame([_row(), _row(date=date(2024, 1, 3), ic=np.nan, rolling_icir=np.nan, status="insufficient")])
+
+    assert copy_factor_monitor(conn, df, factor_version="v2", horizon=5) == 2
+
+    rows = [c.args[0] for c in copy.write_row.call_args_list]
+    assert rows[0] == ("mom_63d", date(2024, 1, 2), 0.05, 0.01, 120, 300, 0.03, 0.04, 0.3, 0.6, 0.004, -0.2, 0.5, "ok")
+    assert rows[1][2] is None and rows[1][8] is None
+
+    sqls = [c.args[0] for c in cursor.execute.call_args_list]
+    assert "ON CONFLICT (factor_name, factor_version, horizon, date)" in sqls[1]
+    assert "status = EXCLUDED.status" in sqls[1]
+    assert cursor.execute.call_args_list[1].args[1] == ("v2", 5)
+    assert "TRUNCATE _stage_factor_monitor" in sqls[2]
+
+
+def test_copy_factor_monitor_empty_is_noop():
+    conn, cursor, _ = _conn()
+    assert copy_factor_monitor(conn, pd.DataFrame()) == 0
+    cursor.execute.assert_not_called()
+
+
+def test_tail_and_latest_queries():
+    conn, cursor, _ = _conn()
+    values = tuple(_row().values())
+    cursor.fetchall.return_value = [values]
+
+    tail = get_monitor_tail(conn, 125, "v1", 21)
+    sql, params = cursor.execute.call_args.args
+    assert "ROW_NUMBER() OVER (PARTITION BY factor_name ORDER BY date DESC)" in sql
+    assert params == ("v1", 21, 125)
+    assert list(tail.columns) == MONITOR_COLUMNS
+    assert tail["ic"].dtype == float
+
+    get_latest_monitor(conn, statuses=("weak", "decayed"))
+    sql, params = cursor.execute.call_args.args
+    assert "DISTINCT ON (factor_name)" in sql and "status = ANY(%s)" in sql
+    assert params == ["v1", 21, ["weak", "decayed"]]
+
+
+def test_last_monitor_dates_per_factor():
+    conn, cursor, _ = _conn()
+    cursor.fetchall.return_value = [("mom_63d", date(2024, 1, 3)), ("val_bp", date(2023, 12, 29))]
+
+    assert get_last_monitor_dates(conn, "v1", 5) == {"mom_63d": date(2024, 1, 3), "val_bp": date(2023, 12, 29)}
+    sql, params = cursor.execute.call_args.args
+    assert "GROUP BY factor_name" in sql
+    assert params == ("v1", 5)
@@ -20,6 +20,7 @@ from database.readwrite.rw_factor_values import (
     insert_factor_value,
     batch_insert_factor_values,
     get_factor_values,
+    iter_factor_values,
     get_latest_factor_value,
     get_factor_snapshot,
     delete_factor_values,
@@ -191,13 +192,17 @@ def test_delete_factor_values_builds_query(mock_conn):
 
     delete_factor_values(conn, factor_name="mom_21d", factor_version="v1")
 
-    sql = cursor.execute.call_args[0][0]
-    params = cursor.execute.call_args[0][1]
+    sql, params = cursor.execute.call_args_list[0][0]
     assert "DELETE FROM factor_values" in sql
     assert "factor_name = %s" in sql
     assert "factor_version = %s" in sql
     assert params == ["mom_21d", "v1"]
 
+    # 删除后重建该因子的快照
+    rebuild_sql, rebuild_params = cursor.execute.call_args_list[-1][0]
+    assert "INSERT INTO latest_factor_values" in rebuild_sql
+    assert rebuild_params == ["mom_21d", "v1"]
+
 
 def test_get_factor_values_with_factor_names_list(mock_conn):
     """测试多因子名查询"""
@@ -301,3 +306,57 @@ def test_get_factor_values_empty_lists_raise(mock_conn):
     with pytest.raises(ValueError, match="cannot be empty"):
         get_factor_values(conn, instrument_ids=[])
 
+
+
+def test_iter_factor_values_uses_named_cursor_and_chunks(mock_conn):
+    """流式读取：命名游标 + fetchmany 分块"""
+    conn, cursor = mock_conn
+    conn.autocommit = False
+    cursor.description = [("instrument_id",), ("date",), ("factor_value",)]
+    cursor.fetchmany.side_effect = [
+        [(1, "2026-01-01", 0.1), (2, "2026-01-01", 0.2)],
+        [(1, "2026-01-02", 0.3)],
+        [],
+    ]
+
+    chunks = list(iter_factor_values(conn, factor_names=["mom_21d"], chunksize=2))
+
+    assert [len(c) for c in chunks] == [2, 1]
+    assert list(chunks[0].columns) == ["instrument_id", "date", "factor_value"]
+
+    kwargs = conn.cursor.call_args.kwargs
+    assert kwargs["name"].startswith("factor_values_")
+    assert kwargs["withhold"] is False
+    cursor.fetchmany.assert_called_with(2)
+    cursor.close.assert_called_once()
+
+    sql, params = cursor.execute.call_args[0]
+    assert "factor_name = ANY(%s)" in sql
+    assert params == [["mom_21d"]]
+
+
+def test_iter_factor_values_validates_filters(mock_conn):
+    conn, cursor = mock_conn
+
+    with pytest.raises(ValueError, match="mutually exclusive"):
+        next(iter_factor_values(conn, factor_name="a", factor_names=["b"]))
+
+
+def test_get_factor_values_columns_projection(mock_conn):
+    conn, cursor = mock_conn
+    cursor.description = [("instrument_id",), ("factor_value",)]
+    cursor.fetchall.return_value = [(1, 0.1)]
+
+    df = get_factor_values(conn, factor_name="mom_21d", date="2026-01-02", columns=("instrument_id", "factor_value"))
+
+    sql = cursor.execute.call_args[0][0]
+    assert sql.startswith("SELECT instrument_id, factor_value FROM factor_values")
+    assert list(df.columns) == ["instrument_id", "factor_value"]
+
+
+def test_get_factor_values_rejects_unknown_columns(mock_conn):
+    conn, _ = mock_conn
+    with pytest.raises(ValueError):
+        get_factor_values(conn, columns=("instrument_id; DROP TABLE x",))
+    with pytest.raises(ValueError):
+        get_factor_values(conn, columns=())
@@ -0,0 +1,89 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+
+from database.readwrite import rw_forward_returns as rw
+from database.utils.binary_copy import decode_binary_copy, encode_binary_copy
+
+
+def _conn():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value = cursor
+    copy = MagicMock()
+    cursor.copy.return_value.__enter__.return_value = copy
+    return conn, cursor, copy
+
+
+def _cols(n=2):
+    return {
+        "instrument_id": np.arange(1, n + 1, dtype=np.int64),
+        "date": np.array(["2024-01-02"] * n, dtype="datetime64[D]"),
+        "fwd_1d": np.full(n, 0.01),
+        "fwd_5d": np.full(n, 0.02),
+        "fwd_21d": np.full(n, np.nan),
+        "fwd_63d": np.full(n, np.nan),
+    }
+
+
+def test_horizon_column():
+    assert rw.horizon_column(21) == "fwd_21d"
+    with pytest.raises(ValueError):
+        rw.horizon_column(10)
+
+
+def test_copy_forward_returns_binary_stage_then_upsert():
+    conn, cursor, copy = _conn()
+
+    assert rw.copy_forward_returns(conn, _cols()) == 2
+
+    stage = decode_binary_copy(copy.write.call_args.args[0], rw._STAGE_FIELDS)
+    assert stage["instrument_id"].tolist() == [1, 2]
+    assert np.isnan(stage["fwd_63d"]).all()
+
+    sqls = [c.args[0] for c in cursor.execute.call_args_list]
+    assert "NULLIF(fwd_21d, 'NaN')" in sqls[1]
+    assert "ON CONFLICT (instrument_id, date)" in sqls[1]
+    assert "TRUNCATE _stage_forward_returns" in sqls[2]
+
+
+def test_copy_forward_returns_empty():
+    conn, cursor, _ = _conn()
+    assert rw.copy_forward_returns(conn, {k: v[:0] for k, v in _cols().items()}) == 0
+    assert len(cursor.execute.call_args_list) == 1          # 只建了临时表
+
+
+def test_load_forward_returns_selects_requested_horizons():
+    conn, cursor, copy = _conn()
+    spec = [("instrument_id", "int8"), ("date", "date"), ("fwd_5d", "float8")]
+    blob = encode_binary_copy([(7, "2024-01-02", 0.03)], spec)
+    copy.__iter__.return_value = iter([blob])
+
+    df = rw.load_forward_returns(conn, (5,), start_date="2024-01-01", instrument_ids=[7])
+
+    sql, params = cursor.copy.call_args.args
+    assert "fwd_5d" in sql and "fwd_1d" not in sql
+    assert params == [[7], "2024-01-01"]
+    assert list(df.columns) == ["instrument_id", "date", "fwd_5d"]
+    assert df["fwd_5d"].tolist() == [0.03]
+
+    with pytest.raises(ValueError):
+        rw.load_forward_returns(conn, (5,), instrument_ids=[])
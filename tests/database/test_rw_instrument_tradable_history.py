@@ -0,0 +1,54 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+from unittest.mock import MagicMock
+
+from database.readwrite.rw_instrument_tradable_history import get_tradable_changes, get_tradable_ids_asof
+
+
+@pytest.fixture
+def mock_conn():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value = cursor
+    return conn, cursor
+
+
+def test_get_tradable_changes_filters(mock_conn):
+    conn, cursor = mock_conn
+    cursor.description = [("instrument_id",), ("asof_date",), ("is_tradable",)]
+    cursor.fetchall.return_value = [(1, "2026-01-30", True)]
+
+    df = get_tradable_changes(conn, instrument_id=1, start_date="2026-01-01")
+
+    sql, params = cursor.execute.call_args[0]
+    assert "instrument_id = %s" in sql and "asof_date >= %s" in sql
+    assert "asof_date <= %s" not in sql
+    assert params == [1, "2026-01-01"]
+    assert df.iloc[0]["is_tradable"]
+
+
+def test_get_tradable_ids_asof(mock_conn):
+    conn, cursor = mock_conn
+    cursor.fetchall.return_value = [(1,), (4,)]
+
+    assert get_tradable_ids_asof(conn, "2026-01-30") == [1, 4]
+    sql, params = cursor.execute.call_args[0]
+    assert "DISTINCT ON (instrument_id)" in sql
+    assert params == ("2026-01-30",)
@@ -0,0 +1,150 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import datetime as dt
+from decimal import Decimal
+
+import pytest
+from unittest.mock import MagicMock
+
+from database.readwrite.rw_latest_snapshots import (
+    backfill_latest_snapshots,
+    get_latest_factor_date,
+    get_latest_factor_values,
+    rebuild_latest_factor_values,
+    refresh_latest_prices,
+    upsert_latest_factor_values,
+)
+from database.readwrite.rw_market_prices import batch_insert_prices, insert_price
+from database.readwrite.rw_factor_values import insert_factor_value
+
+
+@pytest.fixture
+def mock_conn():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value = cursor
+    return conn, cursor
+
+
+def test_price_writers_update_snapshot_in_same_statement(mock_conn):
+    conn, cursor = mock_conn
+
+    insert_price(conn, instrument_id=1, date="2026-01-02", close_price=10.0, adj_close=10.0)
+    batch_insert_prices(conn, [{"instrument_id": 2, "date": "2026-01-02", "close_price": 5.0, "adj_close": 5.0}])
+
+    for call in cursor.execute.call_args_list:
+        sql = call[0][0]
+        assert sql.lstrip().startswith("WITH ins AS (")
+        assert "RETURNING" in sql
+        assert "INSERT INTO latest_prices" in sql
+        # 回填历史不会覆盖更新的快照
+        assert "WHERE latest_prices.date <= EXCLUDED.date" in sql
+
+
+def test_insert_factor_value_updates_snapshot_in_same_statement(mock_conn):
+    conn, cursor = mock_conn
+
+    insert_factor_value(conn, instrument_id=1, date="2026-01-02", factor_name="mom_5d", factor_value=0.1)
+
+    sql = cursor.execute.call_args[0][0]
+    assert "INSERT INTO factor_values" in sql
+    assert "INSERT INTO latest_factor_values" in sql
+
+
+def test_upsert_latest_factor_values_keeps_newest_date_per_key(mock_conn):
+    conn, cursor = mock_conn
+    rows = [
+        {"instrument_id": 1, "date": "2026-01-01", "factor_name": "mom_5d", "factor_value": 0.1},
+        {"instrument_id": 1, "date": "2026-01-03", "factor_name": "mom_5d", "factor_value": 0.3},
+        {"instrument_id": 1, "date": "2026-01-02", "factor_name": "mom_5d", "factor_value": 0.2},
+        {"instrument_id": 2, "date": dt.date(2026, 1, 2), "factor_name": "mom_5d", "factor_value": 0.5,
+         "factor_version": "v2"},
+    ]
+
+    assert upsert_latest_factor_values(conn, rows) == 2
+
+    # 整批只执行一条语句
+    assert cursor.execute.call_count == 1
+    sql, params = cursor.execute.call_args[0]
+    assert "unnest" in sql
+    ids, names, versions, dates, values = params
+    got = dict(zip(zip(ids, names, versions), zip(dates, values)))
+    assert got[(1, "mom_5d", "v1")] == ("2026-01-03", 0.3)
+    assert got[(2, "mom_5d", "v2")] == ("2026-01-02", 0.5)
+
+
+def test_upsert_latest_factor_values_empty_noop(mock_conn):
+    conn, cursor = mock_conn
+    assert upsert_latest_factor_values(conn, []) == 0
+    assert not cursor.execute.called
+
+
+def test_refresh_latest_prices_recomputes_and_drops_empty(mock_conn):
+    conn, cursor = mock_conn
+
+    assert refresh_latest_prices(conn, [3, 1, 3]) == 2
+
+    upsert_sql, upsert_params = cursor.execute.call_args_list[0][0]
+    delete_sql, delete_params = cursor.execute.call_args_list[1][0]
+    assert "CROSS JOIN LATERAL" in upsert_sql and "LIMIT 1" in upsert_sql
+    assert upsert_params == ([1, 3],)
+    assert "DELETE FROM latest_prices" in delete_sql
+    assert delete_params == ([1, 3],)
+
+
+def test_rebuild_latest_factor_values_scoped_to_factor(mock_conn):
+    conn, cursor = mock_conn
+    cursor.rowcount = 7
+
+    assert rebuild_latest_factor_values(conn, factor_name="mom_5d") == 7
+
+    delete_sql, delete_params = cursor.execute.call_args_list[0][0]
+    insert_sql, insert_params = cursor.execute.call_args_list[1][0]
+    assert delete_sql.startswith("DELETE FROM latest_factor_values") and delete_params == ["mom_5d"]
+    assert "DISTINCT ON" in insert_sql and insert_params == ["mom_5d"]
+
+
+def test_backfill_only_rebuilds_empty_snapshots(mock_conn, monkeypatch):
+    conn, cursor = mock_conn
+    # latest_prices 需要回填；latest_factor_values 已有数据
+    cursor.fetchone.side_effect = [(True,), (False,)]
+    cursor.rowcount = 3
+
+    assert backfill_latest_snapshots(conn) == {"latest_prices": 3}
+
+
+def test_get_latest_factor_values_filters(mock_conn):
+    conn, cursor = mock_conn
+    cursor.fetchall.return_value = [(1, dt.date(2026, 1, 2), "mom_5d", Decimal("0.1"))]
+
+    df = get_latest_factor_values(conn, ["mom_5d"], date="2026-01-02")
+
+    sql, params = cursor.execute.call_args[0]
+    assert "FROM latest_factor_values" in sql
+    assert params == ["v1", ["mom_5d"], "2026-01-02"]
+    assert list(df.columns) == ["instrument_id", "date", "factor_name", "factor_value"]
+
+
+def test_get_latest_factor_date(mock_conn):
+    conn, cursor = mock_conn
+    cursor.fetchone.return_value = (dt.date(2026, 1, 2),)
+    assert get_latest_factor_date(conn) == "2026-01-02"
+
+    cursor.fetchone.return_value = (None,)
+    assert get_latest_factor_date(conn) is None
@@ -233,8 +233,7 @@ class TestGetLatestPrice:
         assert result is not None
         assert result['close_price'] == 183.5
         sql = cursor.execute.call_args[0][0]
-        assert 'ORDER BY date DESC' in sql
-        assert 'LIMIT 1' in sql
+        assert 'FROM latest_prices' in sql
     
     def test_get_latest_price_no_data(self, mock_conn):
         """没有价格数据返回 None"""
@@ -291,8 +290,10 @@ class TestDeletePrices:
         delete_prices(conn, instrument_id=123)
         
         assert cursor.execute.called
-        sql = cursor.execute.call_args[0][0]
+        sql = cursor.execute.call_args_list[0][0][0]
         assert 'DELETE FROM market_prices' in sql
+        # 随后重算该标的的 latest_prices
+        assert any('INSERT INTO latest_prices' in c[0][0] for c in cursor.execute.call_args_list[1:])
     
     def test_delete_prices_date_range(self, mock_conn):
         """删除指定日期范围的价格"""
@@ -303,7 +304,7 @@ class TestDeletePrices:
             start_date='2024-01-01', end_date='2024-01-31'
         )
         
-        params = cursor.execute.call_args[0][1]
+        params = cursor.execute.call_args_list[0][0][1]
         assert '2024-01-01' in params
         assert '2024-01-31' in params
     
@@ -313,5 +314,5 @@ class TestDeletePrices:
         
         delete_prices(conn, instrument_id=123, start_date='2024-01-01')
         
-        sql = cursor.execute.call_args[0][0]
+        sql = cursor.execute.call_args_list[0][0][0]
         assert 'date >=' in sql
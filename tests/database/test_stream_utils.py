@@ -0,0 +1,104 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import gc
+
+import pytest
+from unittest.mock import MagicMock
+
+from database.utils.stream_utils import iter_query
+from database.readwrite.rw_market_prices import iter_prices
+from database.readwrite.rw_exp_positions import iter_exp_positions
+from database.readwrite.rw_instruments import iter_all_instruments
+
+
+@pytest.fixture
+def mock_conn():
+    conn = MagicMock()
+    conn.autocommit = False
+    cursor = MagicMock()
+    conn.cursor.return_value = cursor
+    cursor.description = [("instrument_id",), ("date",)]
+    cursor.fetchmany.side_effect = [[(1, "2026-01-01")], []]
+    return conn, cursor
+
+
+def test_iter_query_empty_result_yields_nothing(mock_conn):
+    conn, cursor = mock_conn
+    cursor.fetchmany.side_effect = [[]]
+
+    assert list(iter_query(conn, "SELECT 1", chunksize=10)) == []
+    cursor.close.assert_called_once()
+
+
+def test_iter_query_closes_cursor_on_early_break(mock_conn):
+    conn, cursor = mock_conn
+    cursor.fetchmany.side_effect = [[(1, "a")], [(2, "b")], []]
+
+    for _ in iter_query(conn, "SELECT 1", chunksize=1):
+        break
+
+    # 生成器被回收时 finally 关闭游标
+    gc.collect()
+    cursor.close.assert_called_once()
+
+
+def test_iter_query_uses_withhold_in_autocommit(mock_conn):
+    conn, cursor = mock_conn
+    conn.autocommit = True
+
+    list(iter_query(conn, "SELECT 1"))
+    assert conn.cursor.call_args.kwargs["withhold"] is True
+
+
+def test_iter_query_rejects_bad_chunksize(mock_conn):
+    conn, _ = mock_conn
+    with pytest.raises(ValueError):
+        next(iter_query(conn, "SELECT 1", chunksize=0))
+
+
+def test_iter_prices_selects_columns_in_pk_order(mock_conn):
+    conn, cursor = mock_conn
+
+    list(iter_prices(conn, instrument_ids=[1, 2], start_date="2026-01-01", columns=["adj_close"]))
+
+    sql, params = cursor.execute.call_args[0]
+    assert sql.startswith("SELECT instrument_id, date, adj_close FROM market_prices")
+    assert sql.endswith("ORDER BY instrument_id, date")
+    assert params == [[1, 2], "2026-01-01"]
+
+
+def test_iter_prices_rejects_unknown_columns(mock_conn):
+    conn, cursor = mock_conn
+
+    with pytest.raises(ValueError, match="adj_close; DROP TABLE"):
+        next(iter_prices(conn, columns=["adj_close; DROP TABLE market_prices"]))
+    cursor.execute.assert_not_called()
+
+
+def test_iter_exp_positions_and_instruments(mock_conn):
+    conn, cursor = mock_conn
+
+    chunks = list(iter_exp_positions(conn, start_date="2026-01-01"))
+    assert len(chunks) == 1
+    assert "ORDER BY date, instrument_id" in cursor.execute.call_args[0][0]
+
+    cursor.fetchmany.side_effect = [[]]
+    list(iter_all_instruments(conn, is_tradable=True))
+    sql, params = cursor.execute.call_args[0]
+    assert "is_tradable = %s" in sql and params == [True]
@@ -0,0 +1,188 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine.analytics import attribution as a_mod
+from engine.analytics.attribution import (
+    MARKET,
+    attribute,
+    clear_attribution_cache,
+    compound_styles,
+    get_attribution,
+    get_attribution_many,
+    long_short_returns,
+    rolling_attribution,
+    rolling_ols,
+    style_returns_frame,
+)
+from engine.analytics.metrics import returns_to_nav
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    clear_attribution_cache()
+    yield
+    clear_attribution_cache()
+
+
+def _regression(t=600, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(0.0, 0.01, size=(t, 3))
+    beta = np.array([0.8, -0.3, 0.5])
+    y = 0.0004 + x @ beta + rng.normal(0.0, 0.002, size=t)
+    return y, x, beta
+
+
+def test_long_short_returns_holds_buckets_between_rebalances():
+    # 6 个标的，因子值 = 列号；只在第 0 行调仓，之后因子反转不影响持仓
+    factor = np.tile(np.arange(6, dtype=np.float64), (4, 1))
+    factor[1:] = factor[1:, ::-1]
+    fwd = np.tile(np.array([0.0, 0.0, 0.01, 0.01, 0.03, 0.05]), (4, 1))
+
+    ls = long_short_returns(factor, fwd, n_quantiles=3, rebalance_every=10)
+    np.testing.assert_allclose(ls, 0.04)
+
+    short_low = long_short_returns(factor, fwd, ascending=False, n_quantiles=3, rebalance_every=10)
+    np.testing.assert_allclose(short_low, -0.04)
+
+
+def test_style_returns_frame_labels_by_realization_date():
+    dates = np.array(["2024-01-02", "2024-01-03", "2024-01-04"], dtype="datetime64[D]")
+    fwd = np.array([[0.01, 0.03], [0.02, np.nan], [np.nan, np.nan]])
+    factor = np.array([[1.0, 2.0]] * 3)
+    empty = np.full((3, 2), np.nan)
+
+    df = style_returns_frame(dates, fwd, {"F": (factor, True), "EMPTY": (empty, True)}, n_quantiles=2)
+    assert list(df.columns) == [MARKET, "F"]
+    assert list(df.index) == list(pd.to_datetime(dates[1:]))
+    np.testing.assert_allclose(df[MARKET], [0.02, 0.02])
+    np.testing.assert_allclose(df["F"].iloc[0], 0.02)
+    assert np.isnan(df["F"].iloc[1])
+
+
+def test_attribute_recovers_betas_and_contributions():
+    y, x, beta = _regression()
+    df = attribute(y, x, ["A", "B", "C"], periods_per_year=252)
+
+    row = df.iloc[0]
+    np.testing.assert_allclose([row["beta_A"], row["beta_B"], row["beta_C"]], beta, atol=0.03)
+    assert row["alpha"] == pytest.approx(0.0004 * 252, abs=0.05)
+    assert row["r2"] > 0.9
+    assert abs(row["t_A"]) > 50
+
+    ref, *_ = np.linalg.lstsq(np.column_stack([np.ones(len(y)), x]), y, rcond=None)
+    assert row["contrib_B"] == pytest.approx(ref[2] * x[:, 1].mean() * 252)
+
+
+def test_rolling_ols_matches_lstsq_per_window_with_missing_rows():
+    y, x, _ = _regression(t=200, seed=1)
+    y[50] = np.nan
+    x[120, 1] = np.nan
+    y2 = np.column_stack([y, 2.0 * y])
+
+    res = rolling_ols(y2, x, window=60, min_obs=40)
+    assert res["coef"].shape == (200, 2, 4)
+    assert np.isnan(res["coef"][58]).all()
+
+    for t in (59, 100, 150, 199):
+        lo = t - 59
+        yw, xw = y[lo:t + 1], x[lo:t + 1]
+        ok = np.isfinite(yw) & np.isfinite(xw).all(axis=1)
+        ref, *_ = np.linalg.lstsq(np.column_stack([np.ones(ok.sum()), xw[ok]]), yw[ok], rcond=None)
+        np.testing.assert_allclose(res["coef"][t, 0], ref, rtol=1e-6, atol=1e-10)
+        np.testing.assert_allclose(res["coef"][t, 1], 2.0 * ref, rtol=1e-6, atol=1e-10)
+        assert res["n_obs"][t, 0] == ok.sum()
+
+
+def test_rolling_ols_requires_min_obs():
+    y, x, _ = _regression(t=100)
+    y[30:60] = np.nan
+    res = rolling_ols(y, x, window=40)
+    assert np.isnan(res["coef"][70]).all()
+    assert np.isfinite(res["coef"][99]).all()
+
+
+def test_get_attribution_many_caches_per_run(monkeypatch):
+    y, x, _ = _regression(t=300)
+    dates = pd.bdate_range("2023-01-02", periods=300)
+    styles = pd.DataFrame(x, index=dates, columns=[MARKET, "MOM", "SIZE"])
+    navs = pd.DataFrame({"a": returns_to_nav(y), "b": returns_to_nav(0.5 * y)}, index=dates)
+
+    calls = []
+    real = a_mod.attribute
+    monkeypatch.setattr(a_mod, "attribute", lambda yy, *args, **kw: calls.append(yy.shape[1]) or real(yy, *args, **kw))
+
+    first = get_attribution_many(navs, styles)
+    navs["c"] = returns_to_nav(-y)
+    second = get_attribution_many(navs, styles)
+
+    assert calls == [2, 1]
+    pd.testing.assert_frame_equal(first, second.loc[["a", "b"]])
+    assert second.loc["c", "beta_MOM"] == pytest.approx(-second.loc["a", "beta_MOM"], rel=1e-3)
+
+    # 风格收益变化时重算
+    get_attribution("a", navs["a"], styles * 2.0)
+    assert calls == [2, 1, 1]
+
+
+def test_rolling_attribution_columns():
+    y, x, _ = _regression(t=150)
+    dates = pd.bdate_range("2023-01-02", periods=150)
+    styles = pd.DataFrame(x, index=dates, columns=[MARKET, "MOM", "SIZE"])
+    out = rolling_attribution(pd.Series(returns_to_nav(y), index=dates), styles, window=60)
+
+    assert list(out.columns) == ["alpha", f"beta_{MARKET}", "beta_MOM", "beta_SIZE", "r2"]
+    assert out["r2"].iloc[:60].isna().all()
+    assert out["beta_MOM"].iloc[-1] == pytest.approx(-0.3, abs=0.05)
+
+
+def test_compound_styles_over_nav_intervals():
+    dates = pd.bdate_range("2024-01-01", periods=6)
+    styles = pd.DataFrame({MARKET: [0.01, 0.02, -0.01, 0.03, np.nan, 0.01]}, index=dates)
+
+    # 与风格表同一日期轴：原样返回（首行 NaN）
+    same = compound_styles(styles, dates)
+    np.testing.assert_allclose(same[1:4, 0], [0.02, -0.01, 0.03])
+    assert np.isnan(same[0, 0])
+
+    # 稀疏 NAV 日期：区间 (d0, d2] 复利，区间内有缺失日为 NaN
+    sparse = compound_styles(styles, dates[[0, 2, 5]])
+    assert sparse[1, 0] == pytest.approx(1.02 * 0.99 - 1)
+    assert np.isnan(sparse[2, 0])
+
+
+def test_monthly_nav_regresses_on_compounded_styles():
+    rng = np.random.default_rng(3)
+    days = pd.bdate_range("2015-01-01", "2023-12-31")
+    styles = pd.DataFrame(rng.normal(0.0004, 0.01, size=(len(days), 2)), index=days, columns=[MARKET, "MOM"])
+
+    # 只在月末观测 NAV：区间收益 = 0.002 + 1.2 * MKT 区间收益 - 0.4 * MOM 区间收益
+    month_ends = days.to_series().groupby(days.to_period("M")).max().to_numpy()
+    x = compound_styles(styles, month_ends)
+    y = 0.002 + x @ np.array([1.2, -0.4]) + rng.normal(0.0, 0.001, size=len(month_ends))
+    y[0] = 0.0
+    nav = pd.Series(returns_to_nav(y), index=pd.DatetimeIndex(month_ends))
+
+    row = get_attribution("monthly", nav, styles)
+    assert row["beta_MKT"] == pytest.approx(1.2, abs=0.02)
+    assert row["beta_MOM"] == pytest.approx(-0.4, abs=0.02)
+    # 年化因子按月频推断
+    assert row["alpha"] == pytest.approx(0.002 * 12, abs=0.003)
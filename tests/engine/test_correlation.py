@@ -0,0 +1,145 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import spearmanr
+from unittest.mock import MagicMock
+
+from engine.analytics import correlation as corr_mod
+from engine.analytics.correlation import cluster_factors, factor_correlations, pairwise_corr
+from engine.analytics.panels import ReturnPanel
+
+
+def _factors(t=20, n=80, seed=0):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(t, n))
+    out = {
+        "mom_21d": base + 0.1 * rng.normal(size=(t, n)),
+        "mom_63d": base + 0.1 * rng.normal(size=(t, n)),
+        "vol_20d": rng.normal(size=(t, n)),
+    }
+    for v in out.values():
+        v[rng.random((t, n)) < 0.1] = np.nan
+    return out
+
+
+def test_pairwise_corr_matches_pandas_pairwise_complete():
+    rng = np.random.default_rng(1)
+    v = rng.normal(size=(3, 4, 50))
+    v[0, :, :10] = np.nan
+    v[2, :, 40:] = np.nan
+    out = pairwise_corr(v, min_obs=5)
+
+    assert out.shape == (4, 3, 3)
+    df = pd.DataFrame(v[:, 2, :].T)
+    np.testing.assert_allclose(out[2], df.corr().to_numpy(), rtol=1e-10)
+    np.testing.assert_allclose(np.diagonal(out, axis1=1, axis2=2), 1.0)
+
+
+def test_pairwise_corr_min_obs_and_constant_series():
+    v = np.array([[[1.0, 2.0, 3.0, 4.0]], [[1.0, 1.0, 1.0, 1.0]], [[4.0, np.nan, np.nan, 1.0]]])
+    out = pairwise_corr(v, min_obs=3)[0]
+
+    assert np.isnan(out[0, 1])           # 常数序列
+    assert np.isnan(out[0, 2])           # 联合样本只有 2 个
+    assert np.isnan(out[1, 1])           # 自身方差为 0，对角线也是 NaN
+
+
+def test_factor_correlations_rank_based_and_sampled():
+    facs = _factors()
+    res = factor_correlations(facs, np.arange(20), step=2, min_obs=10)
+
+    assert res.factor_names == ["mom_21d", "mom_63d", "vol_20d"]
+    assert res.corr.shape == (10, 3, 3)
+    assert list(res.dates) == list(range(0, 20, 2))
+
+    # 单调变换不改变 rank 相关
+    res2 = factor_correlations({**facs, "mom_63d": np.exp(facs["mom_63d"])}, np.arange(20), step=2, min_obs=10)
+    np.testing.assert_allclose(res.corr, res2.corr, atol=1e-6)
+
+    pair = pd.DataFrame({"a": facs["mom_21d"][4], "b": facs["mom_63d"][4]}).dropna()
+    assert res.corr[2, 0, 1] == pytest.approx(pair.a.corr(pair.b, method="spearman"), abs=1e-6)
+
+    mean = res.mean()
+    assert mean.loc["mom_21d", "mom_63d"] > 0.9
+    assert abs(mean.loc["mom_21d", "vol_20d"]) < 0.3
+    assert res.pairs().iloc[0][["factor_a", "factor_b"]].tolist() == ["mom_21d", "mom_63d"]
+    assert len(res.pair_series("mom_21d", "vol_20d")) == 10
+
+
+def test_factor_correlations_rerank_on_joint_sample_when_coverage_differs():
+    rng = np.random.default_rng(5)
+    t, n = 6, 200
+    a = rng.normal(size=(t, n))
+    # b 只覆盖 a 最大的一半，且有大量并列值；c 覆盖随机 70%
+    b = np.where(a > np.median(a, axis=1, keepdims=True), np.round(a + rng.normal(0, 0.5, (t, n)), 1), np.nan)
+    c = np.where(rng.random((t, n)) < 0.7, -a + rng.normal(0, 1.0, (t, n)), np.nan)
+
+    mats = {"a": a, "b": b, "c": c}
+    res = factor_correlations(mats, np.arange(t), step=1, min_obs=10)
+    names = list(mats)
+    for d in range(t):
+        for i, x in enumerate(names):
+            for j, y in enumerate(names):
+                # 参照：scipy 在两个因子都有值的标的上逐对 rank
+                ok = np.isfinite(mats[x][d]) & np.isfinite(mats[y][d])
+                ref = spearmanr(mats[x][d][ok], mats[y][d][ok])[0]
+                assert res.corr[d, i, j] == pytest.approx(ref, abs=1e-6)
+
+
+def test_cluster_factors_marks_redundant_and_uses_scores():
+    names = ["a", "b", "c", "d"]
+    m = pd.DataFrame(
+        [[1.0, 0.9, 0.1, -0.85], [0.9, 1.0, 0.0, -0.8], [0.1, 0.0, 1.0, 0.1], [-0.85, -0.8, 0.1, 1.0]],
+        index=names, columns=names,
+    )
+
+    out = cluster_factors(m, threshold=0.7).set_index("factor_name")
+    assert out.loc["a", "cluster"] == out.loc["b", "cluster"] == out.loc["d", "cluster"]
+    assert out.loc["c", "cluster"] != out.loc["a", "cluster"]
+    assert out.loc["a", "representative"] == "a"                 # 簇内平均 |相关| 最高
+    assert out["redundant"].sum() == 2 and not out.loc["c", "redundant"]
+    assert out.loc["c", "nearest"] in ("a", "d")
+
+    scored = cluster_factors(m, threshold=0.7, scores={"a": 0.1, "b": 0.5, "d": 0.2}).set_index("factor_name")
+    assert scored.loc["a", "representative"] == "b"
+    assert scored.loc["a", "redundant"] and not scored.loc["b", "redundant"]
+
+
+def test_cluster_factors_edge_cases():
+    assert cluster_factors(pd.DataFrame()).empty
+    one = cluster_factors(pd.DataFrame([[1.0]], index=["x"], columns=["x"]))
+    assert one.iloc[0].representative == "x" and not one.iloc[0].redundant
+
+
+def test_run_correlation_analysis(monkeypatch):
+    facs = _factors()
+    dates = pd.bdate_range("2024-01-01", periods=20).values.astype("datetime64[D]")
+    panel = ReturnPanel(dates, np.arange(80, dtype=np.int64), np.ones((20, 80)), {})
+
+    monkeypatch.setattr(corr_mod, "list_factor_names", lambda c, v: list(facs))
+    monkeypatch.setattr(corr_mod, "get_latest_factor_date", lambda c, v: "2024-01-26")
+    monkeypatch.setattr(corr_mod, "load_return_panel", lambda c, s, e, h: panel)
+    monkeypatch.setattr(corr_mod, "iter_factor_matrices", lambda c, names, p, v: ((n, facs[n]) for n in names))
+
+    result, clusters = corr_mod.run_correlation_analysis(conn=MagicMock(), step=1)
+
+    assert result.corr.shape == (20, 3, 3)
+    assert clusters.set_index("factor_name")["redundant"].sum() == 1
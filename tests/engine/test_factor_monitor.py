@@ -0,0 +1,240 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+
+from engine.analytics import factor_monitor as fm
+from engine.analytics.factor_monitor import (
+    classify,
+    compute_chunk,
+    cross_section_stats,
+    update_factor,
+    valuation_spread,
+)
+
+
+def _daily(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    ic = rng.normal(0.03, 0.1, n)
+    ic[[5, 50]] = np.nan
+    return pd.DataFrame({
+        "date": pd.bdate_range("2024-01-01", periods=n).date,
+        "ic": ic,
+        "ls_return": rng.normal(0.002, 0.02, n),
+        "n_obs": 100,
+    })
+
+
+def test_incremental_update_matches_full_recompute():
+    new = _daily()
+    full = update_factor(pd.DataFrame(), new, window=40, min_periods=20)
+
+    first = update_factor(pd.DataFrame(), new.iloc[:120], window=40, min_periods=20)
+    second = update_factor(first.tail(39), new.iloc[120:].reset_index(drop=True), window=40, min_periods=20)
+    inc = pd.concat([first, second], ignore_index=True)
+
+    cols = ["n_days", "ic_longrun", "rolling_ic", "rolling_icir", "hit_rate", "rolling_ls"]
+    pd.testing.assert_frame_equal(inc[cols], full[cols], check_dtype=False, atol=1e-12)
+    assert (inc["status"] == full["status"]).all()
+
+    # 对照 pandas rolling
+    ref = new["ic"].rolling(40, min_periods=20).mean()
+    np.testing.assert_allclose(full["rolling_ic"], ref, equal_nan=True)
+    ref_ir = ref / new["ic"].rolling(40, min_periods=20).std()
+    np.testing.assert_allclose(full["rolling_icir"], ref_ir, equal_nan=True)
+    assert full["n_days"].iloc[-1] == 198
+    assert full["ic_longrun"].iloc[-1] == pytest.approx(np.nanmean(new["ic"]))
+
+
+def test_classify_uses_long_run_direction():
+    out = classify(
+        [0.5, 0.05, -0.2, -0.5, 0.2, np.nan],
+        [0.02, 0.02, 0.02, -0.03, -0.03, 0.02],
+        warn_icir=0.1,
+        decay_icir=0.0,
+    )
+    assert list(out) == ["ok", "weak", "decayed", "ok", "decayed", "insufficient"]
+
+
+def test_cross_section_stats():
+    rng = np.random.default_rng(1)
+    f = rng.normal(size=(3, 100))
+    fwd = f * 0.01
+    fwd[2] = np.nan
+    fwd[1, :80] = np.nan
+
+    ic, ls, n = cross_section_stats(f, fwd, n_quantiles=5, min_obs=30)
+    assert ic[0] == pytest.approx(1.0)
+    assert ls[0] > 0
+    assert np.isnan(ic[1]) and np.isnan(ls[1]) and n[1] == 20
+    assert n[2] == 0
+
+
+def test_valuation_spread_long_minus_short_leg():
+    rng = np.random.default_rng(3)
+    val = rng.normal(size=(3, 500))
+    f = np.vstack([val[0], -val[1], rng.normal(size=500)])
+    val[2, 20:] = np.nan
+
+    spread = valuation_spread(f, val, n_quantiles=5, min_obs=30)
+    # 多头组估值分位均值约 0.9，空头组约 0.1
+    assert spread[0] == pytest.approx(0.8, abs=0.01)
+    assert spread[1] == pytest.approx(-0.8, abs=0.01)
+    assert np.isnan(spread[2])
+
+
+def test_crowding_z_flags_expensive_long_leg():
+    new = _daily(n=120, seed=4)
+    rng = np.random.default_rng(5)
+    new["val_spread"] = rng.normal(0.1, 0.02, 120)
+    new.loc[119, "val_spread"] = -0.1
+
+    out = update_factor(pd.DataFrame(), new, window=40, min_periods=20)
+    s = new["val_spread"]
+    ref = -(s - s.rolling(40, min_periods=20).mean()) / s.rolling(40, min_periods=20).std()
+    np.testing.assert_allclose(out["crowding_z"], ref, equal_nan=True)
+    assert out["crowding_z"].iloc[-1] > 3
+    assert out["val_spread"].iloc[-1] == pytest.approx(-0.1)
+
+    # 长期 IC 为负时有效多头腿是空头组：方向翻转
+    flipped = update_factor(pd.DataFrame(), new.assign(ic=-new["ic"]), window=40, min_periods=20)
+    np.testing.assert_allclose(flipped["crowding_z"], -out["crowding_z"], equal_nan=True)
+
+    # 没有估值数据时拥挤度为 NaN，其余列不受影响
+    bare = update_factor(pd.DataFrame(), new.drop(columns="val_spread"), window=40, min_periods=20)
+    assert bare["crowding_z"].isna().all()
+    np.testing.assert_allclose(bare["rolling_icir"], out["rolling_icir"], equal_nan=True)
+
+
+def _long_frames(days, n=60, seed=2):
+    rng = np.random.default_rng(seed)
+    fwd_rows, fac_rows = [], []
+    for d in days:
+        f = rng.normal(size=n)
+        r = 0.01 * f + rng.normal(0.0, 0.01, n)
+        for i in range(n):
+            fwd_rows.append((i + 1, pd.Timestamp(d), r[i]))
+            fac_rows.append((i + 1, pd.Timestamp(d), "mom", f[i]))
+            fac_rows.append((i + 1, pd.Timestamp(d), "noise", rng.normal()))
+    fwd = pd.DataFrame(fwd_rows, columns=["instrument_id", "date", "fwd_21d"])
+    fac = pd.DataFrame(fac_rows, columns=["instrument_id", "date", "factor_name", "factor_value"])
+    return fwd, fac
+
+
+def test_compute_chunk_skips_unrealized_dates_and_continues_tail():
+    days = pd.bdate_range("2024-01-01", periods=30)
+    fwd, fac = _long_frames(days)
+    fwd.loc[fwd["date"] == days[-1], "fwd_21d"] = np.nan
+
+    rows = compute_chunk(fwd, fac, pd.DataFrame(), 21, window=10, min_periods=5)
+    assert set(rows["factor_name"]) == {"mom", "noise"}
+    assert len(rows) == 2 * 29
+    mom = rows[rows["factor_name"] == "mom"]
+    assert (mom["ic"] > 0.3).all()
+    assert mom["status"].iloc[-1] == "ok"
+
+    # 以前 20 天为 tail，后 9 天增量计算，结果一致
+    tail = rows[rows["date"] < days[20].date()].groupby("factor_name").tail(9)
+    later = fwd["date"] >= days[20]
+    inc = compute_chunk(fwd[later], fac[fac["date"] >= days[20]], tail, 21, window=10, min_periods=5)
+    ref = rows[rows["date"] >= days[20].date()].reset_index(drop=True)
+    np.testing.assert_allclose(inc["rolling_icir"], ref["rolling_icir"])
+    np.testing.assert_array_equal(inc["n_days"], ref["n_days"])
+
+
+def test_run_only_processes_realized_days(monkeypatch):
+    conn = MagicMock()
+    days = list(pd.bdate_range("2024-03-01", periods=25).date)
+    fwd, fac = _long_frames(days)
+    copied, loads = [], []
+
+    monkeypatch.setattr(fm, "get_last_monitor_dates", lambda *a: {"mom": date(2024, 2, 29), "noise": date(2024, 2, 29)})
+    monkeypatch.setattr(fm, "get_latest_factor_date", lambda *a: "2024-04-04")
+    monkeypatch.setattr(fm, "get_monitor_tail", lambda *a: pd.DataFrame())
+    monkeypatch.setattr(fm, "get_trading_days", lambda c, s, e: pd.DataFrame({"date": days}))
+
+    def _fwd(conn, horizons, start_date, end_date):
+        loads.append((start_date, end_date))
+        m = (fwd["date"].dt.date >= date.fromisoformat(start_date)) & (fwd["date"].dt.date <= date.fromisoformat(end_date))
+        return fwd[m]
+
+    monkeypatch.setattr(fm, "load_forward_returns", _fwd)
+    monkeypatch.setattr(fm, "load_factor_panel", lambda conn, names, start_date, end_date, factor_version: fac[
+        (fac["date"].dt.date >= date.fromisoformat(start_date)) & (fac["date"].dt.date <= date.fromisoformat(end_date))
+    ])
+    monkeypatch.setattr(fm, "copy_factor_monitor", lambda conn, df, v, h: copied.append(df) or len(df))
+    monkeypatch.setattr(fm, "get_latest_monitor", lambda *a, **kw: pd.DataFrame(columns=["factor_name"]))
+
+    alerts = fm.run(["mom", "noise"], horizon=21, chunk_days=3, conn=conn)
+
+    # 25 个交易日里只有前 4 天的 21 日收益已实现
+    assert loads == [(str(days[0]), str(days[2])), (str(days[3]), str(days[3]))]
+    assert sum(len(df) for df in copied) == 2 * 4
+    assert copied[1]["n_days"].tolist() == [4, 4]
+    assert alerts.empty
+    conn.close.assert_not_called()
+
+
+def test_run_backfills_factor_without_history(monkeypatch):
+    conn = MagicMock()
+    days = list(pd.bdate_range("2024-03-01", periods=25).date)
+    fwd, fac = _long_frames(days)
+    copied, names_loaded, calendars = [], [], []
+
+    # mom 已监控到 days[2]；noise 是新加入的因子，表中没有记录
+    monkeypatch.setattr(fm, "get_last_monitor_dates", lambda *a: {"mom": days[2]})
+    monkeypatch.setattr(fm, "get_latest_factor_date", lambda *a: "2024-04-04")
+    monkeypatch.setattr(fm, "get_monitor_tail", lambda *a: pd.DataFrame())
+
+    def _calendar(c, s, e):
+        calendars.append(s)
+        return pd.DataFrame({"date": [d for d in days if d >= date.fromisoformat(s)]})
+
+    def _factors(conn, names, start_date, end_date, factor_version):
+        names_loaded.append(list(names))
+        m = (fac["date"].dt.date >= date.fromisoformat(start_date)) & (fac["date"].dt.date <= date.fromisoformat(end_date))
+        return fac[m & fac["factor_name"].isin(names)]
+
+    monkeypatch.setattr(fm, "get_trading_days", _calendar)
+    monkeypatch.setattr(fm, "load_forward_returns", lambda conn, horizons, start_date, end_date: fwd[
+        (fwd["date"].dt.date >= date.fromisoformat(start_date)) & (fwd["date"].dt.date <= date.fromisoformat(end_date))
+    ])
+    monkeypatch.setattr(fm, "load_factor_panel", _factors)
+    monkeypatch.setattr(fm, "copy_factor_monitor", lambda conn, df, v, h: copied.append(df) or len(df))
+    latest = pd.DataFrame({
+        "factor_name": ["mom", "noise"], "status": ["ok", "ok"], "crowding_z": [2.5, np.nan],
+        "rolling_icir": [0.5, np.nan], "rolling_ic": [0.05, np.nan], "ic_longrun": [0.05, 0.0], "date": days[3],
+    })
+    monkeypatch.setattr(fm, "get_latest_monitor", lambda *a, **kw: latest)
+
+    alerts = fm.run(["mom", "noise"], horizon=21, start_date=str(days[0]), chunk_days=3, conn=conn)
+
+    assert calendars == [str(days[0])]
+    # 第一段只有 noise 需要补（外加估值因子），第二段两个都要
+    assert names_loaded == [["noise", "val_bp"], ["mom", "noise", "val_bp"]]
+    rows = pd.concat(copied, ignore_index=True)
+    assert rows[rows["factor_name"] == "noise"]["date"].tolist() == days[:4]
+    assert rows[rows["factor_name"] == "noise"]["n_days"].tolist() == [1, 2, 3, 4]
+    assert rows[rows["factor_name"] == "mom"]["date"].tolist() == [days[3]]
+    # 拥挤度超阈值的因子也列入告警
+    assert alerts["factor_name"].tolist() == ["mom"]
@@ -0,0 +1,149 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+
+from engine.analytics import forward_returns as fr
+from engine.analytics.forward_returns import compute_forward_returns, trading_axis
+from engine.analytics.panels import build_stored_return_panel
+
+
+AXIS = pd.bdate_range("2024-01-01", periods=6).values.astype("datetime64[D]")
+
+
+def _prices(rows):
+    return pd.DataFrame(rows, columns=["instrument_id", "date", "adj_close"]).assign(
+        date=lambda d: pd.to_datetime(d["date"])
+    )
+
+
+def _by_key(cols, h):
+    col = f"fwd_{h}d"
+    return {
+        (int(i), str(d)): v
+        for i, d, v in zip(cols["instrument_id"], cols["date"].astype("datetime64[D]"), cols[col])
+    }
+
+
+def test_trading_axis_unions_calendar_and_price_dates():
+    axis = trading_axis(
+        [date(2023, 12, 29), date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 4)],
+        np.array(["2024-01-02", "2024-01-05"], dtype="datetime64[D]"),
+        "2024-01-04",
+    )
+    assert [str(d) for d in axis] == ["2024-01-02", "2024-01-03", "2024-01-04"]
+
+
+def test_suspension_uses_last_price_before_exit_date():
+    # 标的 1 在 01-03、01-04 停牌
+    px = _prices([(1, "2024-01-01", 10.0), (1, "2024-01-02", 11.0), (1, "2024-01-05", 12.0), (1, "2024-01-08", 13.0)])
+    out = _by_key(compute_forward_returns(px, AXIS, (1, 2)), 1)
+
+    assert out[(1, "2024-01-02")] == pytest.approx(0.0)            # 01-03 停牌，取 01-02 价格
+    assert (1, "2024-01-03") not in out                            # 当天无价格不出行
+    assert out[(1, "2024-01-05")] == pytest.approx(13 / 12 - 1)
+    assert np.isnan(out[(1, "2024-01-08")])                        # 全库最后一天，未来未知
+
+
+def test_delisted_exit_at_last_price_but_active_stays_unknown():
+    px = _prices(
+        [(1, "2024-01-01", 10.0), (1, "2024-01-02", 8.0)]              # 退市
+        + [(2, "2024-01-01", 10.0), (2, "2024-01-02", 9.0)]            # 没有退市标记，只是缺数据
+        + [(3, d, 1.0) for d in ["2024-01-01", "2024-01-08"]]          # 让全库日期延伸到 01-08
+    )
+    cols = compute_forward_returns(px, AXIS, (5,), delisted_ids=[1])
+    out = _by_key(cols, 5)
+
+    assert out[(1, "2024-01-01")] == pytest.approx(-0.2)
+    assert np.isnan(out[(2, "2024-01-01")])
+    assert out[(3, "2024-01-01")] == pytest.approx(0.0)
+    assert set(cols) == {"instrument_id", "date", "fwd_5d"}
+
+
+def test_start_date_limits_output_rows():
+    px = _prices([(1, d, 10.0 + i) for i, d in enumerate(pd.bdate_range("2024-01-01", periods=6))])
+    cols = compute_forward_returns(px, AXIS, (1,), start_date="2024-01-04")
+
+    assert [str(d) for d in cols["date"]] == ["2024-01-04", "2024-01-05", "2024-01-08"]
+    assert cols["fwd_1d"][0] == pytest.approx(14 / 13 - 1)
+
+
+def test_compute_forward_returns_empty():
+    cols = compute_forward_returns(_prices([]), AXIS)
+    assert all(len(v) == 0 for v in cols.values())
+
+
+def test_stored_panel_pivots_wide():
+    long = pd.DataFrame(
+        {
+            "instrument_id": [1, 2, 1],
+            "date": pd.to_datetime(["2024-01-02", "2024-01-02", "2024-01-03"]),
+            "fwd_5d": [0.1, 0.2, 0.3],
+        }
+    )
+    panel = build_stored_return_panel(long, (5,))
+
+    assert panel.prices is None and panel.shape == (2, 2)
+    assert panel.forward[5][1, 0] == pytest.approx(0.3)
+    assert np.isnan(panel.forward[5][1, 1])
+
+
+def test_run_incremental_window_and_state(monkeypatch):
+    conn = MagicMock()
+    monkeypatch.setattr(fr, "get_db_connection", lambda: conn)
+    monkeypatch.setattr(fr, "get_price_max_date", lambda c: "2024-06-28")
+    monkeypatch.setattr(fr, "get_state", lambda c, k, default=None: {"last_done_date": "2024-06-27"})
+    monkeypatch.setattr(fr, "get_trading_days", lambda c, s, e: pd.DataFrame({"date": []}))
+    monkeypatch.setattr(fr, "get_delisted_instrument_ids", lambda c: [])
+    monkeypatch.setattr(fr, "get_latest_prices", lambda c: pd.DataFrame({"instrument_id": [1, 2, 3]}))
+
+    loads, written, states = [], [], []
+
+    def _load(c, fields, start_date=None, end_date=None, instrument_ids=None):
+        loads.append((start_date, end_date, instrument_ids))
+        return _prices([(i, "2024-06-27", 10.0) for i in instrument_ids] + [(i, "2024-06-28", 11.0) for i in instrument_ids])
+
+    monkeypatch.setattr(fr, "load_price_panel", _load)
+    monkeypatch.setattr(fr, "copy_forward_returns", lambda c, cols: written.append(cols) or len(cols["date"]))
+    monkeypatch.setattr(fr, "set_state", lambda c, k, v: states.append((k, v)))
+
+    fr.run(chunk_size=2)
+
+    # 回看 63 个交易日（约 104 个自然日）
+    assert loads[0][0] == "2024-03-15"
+    assert [l[2] for l in loads] == [[1, 2], [3]]
+    assert sum(len(w["date"]) for w in written) == 6
+    assert written[0]["fwd_1d"][0] == pytest.approx(0.1)
+    assert states == [(fr.STATE_KEY, {"last_done_date": "2024-06-28", "horizons": [1, 5, 21, 63]})]
+    conn.close.assert_called_once()
+
+
+def test_run_skips_when_up_to_date(monkeypatch):
+    conn = MagicMock()
+    monkeypatch.setattr(fr, "get_db_connection", lambda: conn)
+    monkeypatch.setattr(fr, "get_price_max_date", lambda c: "2024-06-28")
+    monkeypatch.setattr(fr, "get_state", lambda c, k, default=None: {"last_done_date": "2024-06-28"})
+    monkeypatch.setattr(fr, "load_price_panel", lambda *a, **k: pytest.fail("should not load"))
+
+    fr.run()
+    conn.close.assert_called_once()
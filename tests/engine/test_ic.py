@@ -0,0 +1,227 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+
+from engine.analytics import ic as ic_mod
+from engine.analytics.ic import (
+    compute_ic,
+    factor_ic,
+    ic_decay,
+    newey_west_tstat,
+    rank_rows,
+    rowwise_corr,
+    summarize_ic,
+)
+from engine.analytics.panels import build_return_panel, forward_returns, pivot_panel
+
+
+def _random_panel(t=40, n=60, seed=0, missing=0.15):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=(t, n))
+    y = 0.3 * x + rng.normal(size=(t, n))
+    x[rng.random((t, n)) < missing] = np.nan
+    y[rng.random((t, n)) < missing] = np.nan
+    return x, y
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# panels
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def test_pivot_panel_scatters_and_drops_unknown_keys():
+    rows = np.array([1, 2, 3])
+    cols = np.array([10, 20])
+    out = pivot_panel(np.array([1, 3, 4]), np.array([20, 10, 10]), np.array([1.0, 2.0, 3.0]), rows, cols)
+
+    assert out[0, 1] == 1.0
+    assert out[2, 0] == 2.0
+    assert np.isnan(out).sum() == 4
+
+
+def test_forward_returns_tail_is_nan():
+    p = np.array([[10.0, 5.0], [11.0, np.nan], [12.1, 6.0], [13.31, 0.0]])
+    fr = forward_returns(p, 1)
+
+    assert fr[0, 0] == pytest.approx(0.1)
+    assert np.isnan(fr[0, 1]) and np.isnan(fr[1, 1])
+    assert np.isnan(fr[2, 1])          # 非正价格
+    assert np.isnan(fr[-1]).all()
+
+    with pytest.raises(ValueError):
+        forward_returns(p, 0)
+
+
+def test_build_return_panel_uses_prices_after_end_date():
+    dates = pd.bdate_range("2024-01-01", periods=6)
+    long = pd.DataFrame(
+        {
+            "instrument_id": np.repeat([1, 2], 6),
+            "date": np.tile(dates, 2),
+            "adj_close": np.r_[np.arange(1, 7) * 10.0, np.arange(1, 7) * 20.0],
+        }
+    )
+
+    panel = build_return_panel(long, horizons=(2,), start_date="2024-01-02", end_date="2024-01-04")
+
+    assert panel.shape == (3, 2)
+    assert str(panel.dates[0]) == "2024-01-02"
+    # 2024-01-04 的 2 日前瞻收益用到了区间外的 2024-01-08 价格：60 / 40 - 1
+    assert panel.forward[2][-1, 0] == pytest.approx(0.5)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# rank / corr
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def test_rank_rows_matches_pandas_average_rank():
+    x, _ = _random_panel()
+    x[:, :10] = np.round(x[:, :10])        # 制造并列
+    expected = pd.DataFrame(x).rank(axis=1, method="average").to_numpy()
+
+    np.testing.assert_allclose(rank_rows(x), expected, equal_nan=True)
+
+
+def test_rowwise_corr_matches_pandas():
+    x, y = _random_panel()
+    ic, n = rowwise_corr(x, y)
+
+    for t in (0, 7, 39):
+        sx, sy = pd.Series(x[t]), pd.Series(y[t])
+        assert ic[t] == pytest.approx(sx.corr(sy))
+        assert n[t] == int((sx.notna() & sy.notna()).sum())
+
+
+def test_rowwise_corr_min_obs_and_constant_rows():
+    x = np.array([[1.0, 2.0, np.nan], [1.0, 1.0, 1.0]])
+    y = np.array([[2.0, 4.0, 6.0], [1.0, 2.0, 3.0]])
+    ic, n = rowwise_corr(x, y, min_obs=3)
+
+    assert list(n) == [2, 3]
+    assert np.isnan(ic).all()
+
+
+def test_factor_ic_spearman_is_exact_on_joint_support():
+    x, y = _random_panel(missing=0.3)
+    res = factor_ic(x, {5: y}, methods=("spearman", "pearson"), min_obs=5)
+
+    ic_s, _ = res[(5, "spearman")]
+    ic_p, _ = res[(5, "pearson")]
+    for t in range(x.shape[0]):
+        sx, sy = pd.Series(x[t]), pd.Series(y[t])
+        assert ic_s[t] == pytest.approx(sx.corr(sy, method="spearman"))
+        assert ic_p[t] == pytest.approx(sx.corr(sy))
+
+
+def test_factor_ic_rejects_unknown_method():
+    x, y = _random_panel()
+    with pytest.raises(ValueError):
+        factor_ic(x, {1: y}, methods=("kendall",))
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# compute / summarize
+# ----------------------------------------------------------------------------------------------------------------------------------------
+def _panel_from(x, y, h=1):
+    t, n = x.shape
+    panel = build_return_panel(
+        pd.DataFrame(
+            {
+                "instrument_id": np.repeat(np.arange(n), t),
+                "date": np.tile(pd.bdate_range("2024-01-01", periods=t), n),
+                "adj_close": 100.0,
+            }
+        ),
+        horizons=(h,),
+    )
+    panel.forward = {h: y}
+    return panel
+
+
+def test_compute_ic_long_output_and_min_obs():
+    x, y = _random_panel()
+    y[0] = np.nan                          # 第一天没有前瞻收益 -> 被 min_obs 过滤
+    panel = _panel_from(x, y)
+
+    df = compute_ic(iter([("f1", x), ("f2", -x)]), panel, min_obs=10)
+
+    assert list(df.columns) == ["date", "factor_name", "horizon", "method", "ic", "n_obs"]
+    assert set(df["factor_name"]) == {"f1", "f2"}
+    assert len(df) == 2 * 2 * (x.shape[0] - 1)
+    f1 = df[(df.factor_name == "f1") & (df.method == "pearson")]["ic"].to_numpy()
+    f2 = df[(df.factor_name == "f2") & (df.method == "pearson")]["ic"].to_numpy()
+    np.testing.assert_allclose(f1, -f2)
+
+
+def test_summarize_ic_and_decay():
+    ic = pd.DataFrame(
+        {
+            "date": pd.bdate_range("2024-01-01", periods=4).date.tolist() * 2,
+            "factor_name": "f1",
+            "horizon": [1] * 4 + [5] * 4,
+            "method": "spearman",
+            "ic": [0.1, 0.2, -0.1, 0.2, 0.05, 0.05, 0.0, 0.1],
+            "n_obs": 100,
+        }
+    )
+    summary = summarize_ic(ic)
+
+    row = summary[summary.horizon == 1].iloc[0]
+    vals = np.array([0.1, 0.2, -0.1, 0.2])
+    assert row.n_dates == 4
+    assert row.mean_ic == pytest.approx(vals.mean())
+    assert row.icir == pytest.approx(vals.mean() / vals.std(ddof=1))
+    assert row.t_stat == pytest.approx(row.icir * 2)
+    assert row.hit_rate == pytest.approx(0.75)
+
+    decay = ic_decay(summary)
+    assert list(decay.columns) == [1, 5]
+    assert decay.loc["f1", 5] == pytest.approx(0.05)
+
+
+def test_newey_west_penalizes_autocorrelation():
+    rng = np.random.default_rng(1)
+    # 重叠 5 日收益的 IC 近似 MA(4)
+    e = rng.normal(size=2004)
+    x = 0.02 + 0.1 * np.convolve(e, np.ones(5) / 5, mode="valid")
+
+    plain = newey_west_tstat(x, 0)
+    nw = newey_west_tstat(x, 4)
+    assert plain == pytest.approx(x.mean() / (x.std(ddof=0) / np.sqrt(len(x))))
+    assert abs(nw) < abs(plain)
+
+
+def test_run_ic_analysis_persists(monkeypatch):
+    x, y = _random_panel()
+    panel = _panel_from(x, y)
+    conn = MagicMock()
+    saved = []
+
+    monkeypatch.setattr(ic_mod, "list_factor_names", lambda c, v: ["f1"])
+    monkeypatch.setattr(ic_mod, "get_latest_factor_date", lambda c, v: "2024-03-01")
+    monkeypatch.setattr(ic_mod, "load_return_panel", lambda c, s, e, h, source="prices": panel)
+    monkeypatch.setattr(ic_mod, "iter_factor_matrices", lambda c, names, p, v: iter([("f1", x)]))
+    monkeypatch.setattr(ic_mod, "copy_factor_ic", lambda c, df, v: saved.append(len(df)))
+
+    ic_df, summary = ic_mod.run_ic_analysis(conn=conn, horizons=(1,), min_obs=10)
+
+    assert saved == [len(ic_df)] and len(ic_df) > 0
+    assert set(summary["method"]) == {"spearman", "pearson"}
+    conn.commit.assert_called_once()
+    conn.close.assert_not_called()
@@ -0,0 +1,251 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+
+from engine.analytics import metrics as m_mod
+from engine.analytics.metrics import (
+    METRIC_COLUMNS,
+    clear_metrics_cache,
+    compute_metrics,
+    drawdown,
+    get_metrics,
+    get_metrics_many,
+    nav_to_returns,
+    rank_runs,
+    returns_to_nav,
+    rolling_metrics,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    clear_metrics_cache()
+    yield
+    clear_metrics_cache()
+
+
+def _navs(t=500, r=4, seed=0):
+    rng = np.random.default_rng(seed)
+    rets = rng.normal(0.0005, 0.01, size=(t, r))
+    bench = returns_to_nav(rng.normal(0.0003, 0.01, size=t))
+    return returns_to_nav(rets), bench
+
+
+def test_nav_returns_roundtrip():
+    nav = np.array([1.0, 1.1, 0.99, 1.2])
+    r = nav_to_returns(nav)
+    assert np.isnan(r[0])
+    np.testing.assert_allclose(returns_to_nav(r), nav)
+
+
+def test_drawdown_stats_on_known_path():
+    nav = np.array([1.0, 1.2, 0.9, 1.0, 1.2, 1.3, 1.1])
+    m = compute_metrics(nav).iloc[0]
+
+    assert m.max_drawdown == pytest.approx(0.9 / 1.2 - 1)
+    assert m.recovery_periods == 2              # 谷底 t=2，t=4 收复 1.2
+    assert m.max_dd_duration == 2
+    assert m.total_return == pytest.approx(0.1)
+    np.testing.assert_allclose(drawdown(nav)[[0, 2, 6]], [0.0, 0.9 / 1.2 - 1, 1.1 / 1.3 - 1])
+
+
+def test_unrecovered_drawdown_is_nan():
+    m = compute_metrics(np.array([1.0, 1.5, 1.0, 1.2])).iloc[0]
+    assert np.isnan(m.recovery_periods)
+    assert m.max_dd_duration == 2
+
+
+def test_2d_matches_column_by_column_and_reference_formulas():
+    nav, bench = _navs()
+    many = compute_metrics(nav, bench, risk_free=0.02)
+
+    for j in range(nav.shape[1]):
+        one = compute_metrics(nav[:, j], bench, risk_free=0.02).iloc[0]
+        pd.testing.assert_series_equal(many.iloc[j], one, check_names=False)
+
+    r = pd.Series(nav_to_returns(nav[:, 0])).dropna()
+    b = pd.Series(nav_to_returns(bench)).dropna()
+    ex = r - 0.02 / 252
+    row = many.iloc[0]
+    assert row.sharpe == pytest.approx(ex.mean() / r.std() * np.sqrt(252))
+    assert row.beta == pytest.approx(r.cov(b) / b.var())
+    assert row.information_ratio == pytest.approx((r - b).mean() / (r - b).std() * np.sqrt(252))
+    assert row.calmar == pytest.approx(row.cagr / abs(row.max_drawdown))
+
+
+def test_nan_padded_runs_of_different_length():
+    nav, _ = _navs(t=300, r=2)
+    padded = nav.copy()
+    padded[:100, 1] = np.nan
+
+    m = compute_metrics(padded)
+    ref = compute_metrics(nav[100:, 1]).iloc[0]
+    assert m.iloc[1].total_return == pytest.approx(ref.total_return)
+    assert m.iloc[1].max_drawdown == pytest.approx(ref.max_drawdown)
+    assert m.iloc[1].sharpe == pytest.approx(ref.sharpe)
+
+
+def test_rolling_metrics_match_pandas():
+    nav, bench = _navs(t=200, r=2)
+    roll = rolling_metrics(nav, 20, bench)
+
+    r = pd.Series(nav_to_returns(nav[:, 1]))
+    b = pd.Series(nav_to_returns(bench))
+    exp_sharpe = r.rolling(20).mean() / r.rolling(20).std() * np.sqrt(252)
+    exp_beta = r.rolling(20).cov(b) / b.rolling(20).var()
+
+    np.testing.assert_allclose(roll["sharpe"][:, 1], exp_sharpe.to_numpy(), equal_nan=True, rtol=1e-8)
+    np.testing.assert_allclose(roll["beta"][:, 1], exp_beta.to_numpy(), equal_nan=True, rtol=1e-8)
+    assert np.isnan(roll["sharpe"][19, 1])      # 首个收益为 NaN，窗口 [1, 20] 才完整
+    assert np.isfinite(roll["sharpe"][20, 1])
+
+    one = rolling_metrics(nav[:, 0], 20)
+    assert one["sharpe"].shape == (200,)
+    with pytest.raises(ValueError):
+        rolling_metrics(nav, 1)
+
+
+def test_rank_runs():
+    df = pd.DataFrame({"sharpe": [0.5, np.nan, 1.2]}, index=["a", "b", "c"])
+    assert list(rank_runs(df, top=2).index) == ["c", "a"]
+    with pytest.raises(ValueError):
+        rank_runs(df, by="nope")
+
+
+def test_get_metrics_caches_by_run_id(monkeypatch):
+    nav, bench = _navs(r=1)
+    calls = []
+    real = m_mod.compute_metrics
+    monkeypatch.setattr(m_mod, "compute_metrics", lambda *a, **kw: calls.append(1) or real(*a, **kw))
+
+    first = get_metrics("run-1", nav[:, 0], bench)
+    again = get_metrics("run-1", nav[:, 0], bench)
+    assert len(calls) == 1
+    assert first.equals(again)
+
+    get_metrics("run-1", nav[:, 0] * 1.01 ** np.arange(len(nav)), bench)   # 重跑后 NAV 变化
+    assert len(calls) == 2
+
+
+def test_get_metrics_many_only_computes_missing(monkeypatch):
+    nav, bench = _navs(r=3)
+    navs = pd.DataFrame(nav, columns=["a", "b", "c"])
+    get_metrics("a", navs["a"].to_numpy(), bench)
+
+    seen = []
+    real = m_mod.compute_metrics
+    monkeypatch.setattr(
+        m_mod, "compute_metrics",
+        lambda nav, *a, run_ids=None, **kw: seen.append(list(run_ids)) or real(nav, *a, run_ids=run_ids, **kw),
+    )
+
+    out = get_metrics_many(navs, bench)
+    assert seen == [["b", "c"]]
+    assert list(out.index) == ["a", "b", "c"]
+    assert list(out.columns) == METRIC_COLUMNS
+
+
+def test_exp_metrics_aligns_benchmark(monkeypatch):
+    dates = pd.bdate_range("2024-01-01", periods=5)
+    monkeypatch.setattr(
+        m_mod, "load_daily_nav",
+        lambda conn, s, e: pd.Series([100.0, 101, 102, 101, 103], index=pd.Index(dates, name="date"), name="nav"),
+    )
+    monkeypatch.setattr(m_mod, "get_instrument_id", lambda conn, t: 7)
+    monkeypatch.setattr(
+        m_mod, "get_prices",
+        lambda conn, iid, s, e: pd.DataFrame({"date": dates[[0, 1, 3, 4]].date, "adj_close": [10.0, 10.1, 10.2, 10.3]}),
+    )
+
+    df = m_mod.load_nav_with_benchmark(MagicMock())
+    assert df["benchmark"].tolist() == [10.0, 10.1, 10.1, 10.2, 10.3]
+
+    res = m_mod.exp_metrics(MagicMock())
+    assert res.total_return == pytest.approx(0.03)
+    assert np.isfinite(res.beta)
+
+
+def test_infer_periods_per_year():
+    assert m_mod.infer_periods_per_year(pd.bdate_range("2024-01-01", periods=60)) == 252
+    assert m_mod.infer_periods_per_year(pd.date_range("2020-01-31", periods=36, freq="ME")) == 12
+    assert m_mod.infer_periods_per_year(pd.date_range("2020-01-03", periods=30, freq="W-FRI")) == 52
+    assert m_mod.infer_periods_per_year(pd.DatetimeIndex(["2024-01-02"])) == 252
+
+
+def test_exp_metrics_on_monthly_nav_uses_monthly_annualization(monkeypatch):
+    # 只有调仓日快照的 NAV：每月 +1%，两年
+    dates = pd.date_range("2022-01-31", periods=25, freq="ME")
+    monkeypatch.setattr(
+        m_mod, "get_exp_nav",
+        lambda conn, s, e: pd.DataFrame({"date": dates.date, "nav": 100.0 * 1.01 ** np.arange(25)}),
+    )
+    df = m_mod.load_nav_with_benchmark(MagicMock(), None, daily=False)
+    monkeypatch.setattr(m_mod, "load_nav_with_benchmark", lambda conn, b, s, e: df)
+
+    res = m_mod.exp_metrics(MagicMock(), benchmark=None)
+    assert res.cagr == pytest.approx(1.01 ** 12 - 1)
+    assert res.ann_vol == pytest.approx(0.0, abs=1e-12)
+
+
+def test_daily_nav_from_snapshots_marks_holdings_to_market():
+    holdings = pd.DataFrame([
+        {"date": "2024-01-31", "instrument_id": 1, "quantity": 10.0, "market_value": 100.0},
+        {"date": "2024-01-31", "instrument_id": 0, "quantity": 50.0, "market_value": 50.0},
+        # 第二次调仓：换成 2 号，扣掉成本后市值 155
+        {"date": "2024-02-05", "instrument_id": 2, "quantity": 5.0, "market_value": 150.0},
+        {"date": "2024-02-05", "instrument_id": 0, "quantity": 5.0, "market_value": 5.0},
+    ])
+    days = pd.bdate_range("2024-01-31", "2024-02-07")
+    prices = pd.DataFrame({1: [10.0, 11, np.nan, 13, 14, 15], 2: 30.0 + np.arange(6)}, index=days)
+
+    nav = m_mod.daily_nav_from_snapshots(holdings, prices, end_date="2024-02-07")
+
+    assert list(nav.index) == list(days)
+    # 1/31 快照；2/1 = 50 + 10 × 11；2/2 缺价前向填充；2/5 是快照日，取快照值
+    assert nav.tolist()[:4] == [150.0, 160.0, 160.0, 155.0]
+    # 之后用第二个快照的持仓：5 + 5 × 2 号价格
+    assert nav["2024-02-06"] == 5.0 + 5 * 34.0
+    assert nav["2024-02-07"] == 5.0 + 5 * 35.0
+
+    # end_date=None：到最后一个快照为止
+    assert m_mod.daily_nav_from_snapshots(holdings, prices).index[-1] == pd.Timestamp("2024-02-05")
+
+
+def test_load_daily_nav_reads_snapshots_and_held_prices(monkeypatch):
+    holdings = pd.DataFrame([
+        {"date": "2024-01-31", "instrument_id": 1, "quantity": 2.0, "market_value": 20.0, "sector": "Tech"},
+        {"date": "2024-01-31", "instrument_id": 0, "quantity": 1.0, "market_value": 1.0, "sector": "Cash"},
+    ])
+    seen = {}
+
+    def _panel(conn, fields, start, end, instrument_ids=None):
+        seen.update(start=start, end=end, ids=instrument_ids)
+        return pd.DataFrame({
+            "instrument_id": [1, 1], "date": pd.to_datetime(["2024-01-31", "2024-02-01"]), "adj_close": [10.0, 12.0],
+        })
+
+    monkeypatch.setattr(m_mod, "get_exp_positions_with_sector", lambda conn, s, e: holdings)
+    monkeypatch.setattr(m_mod, "load_price_panel", _panel)
+
+    nav = m_mod.load_daily_nav(MagicMock(), end_date="2024-02-01")
+    assert seen == {"start": "2024-01-31", "end": "2024-02-01", "ids": [1]}
+    assert nav.tolist() == [21.0, 25.0]
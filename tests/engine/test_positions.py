@@ -0,0 +1,109 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import engine.analytics.positions as pos
+from engine.analytics.positions import position_analytics, summarize_runs
+from engine.constants import CASH_INSTRUMENT_ID
+
+
+def _rows(date, holdings, cash, sectors=None):
+    sectors = sectors or {}
+    out = [{"date": date, "instrument_id": i, "market_value": v, "sector": sectors.get(i, "Tech")} for i, v in holdings.items()]
+    out.append({"date": date, "instrument_id": CASH_INSTRUMENT_ID, "market_value": cash, "sector": "Cash"})
+    return out
+
+
+def _single_run():
+    sectors = {1: "Tech", 2: "Tech", 3: "Energy"}
+    return pd.DataFrame(
+        _rows("2024-01-31", {1: 50.0, 2: 50.0}, 0.0, sectors)
+        + _rows("2024-02-29", {1: 50.0, 3: 30.0}, 20.0, sectors)
+        + _rows("2024-03-29", {3: 100.0}, 0.0, sectors)
+    )
+
+
+class TestPositionAnalytics:
+    def test_turnover_concentration_and_sectors(self):
+        ts, sectors = position_analytics(_single_run(), run_id="r")
+
+        first, second, third = (("r", pd.Timestamp(d)) for d in ["2024-01-31", "2024-02-29", "2024-03-29"])
+        assert np.isnan(ts.loc[first, "turnover"])
+        # 2: 0.5 -> 0，3: 0 -> 0.3，cash: 0 -> 0.2
+        assert ts.loc[second, "turnover"] == pytest.approx(0.5)
+        # 1: 0.5 -> 0，3: 0.3 -> 1，cash: 0.2 -> 0
+        assert ts.loc[third, "turnover"] == pytest.approx(0.7)
+
+        # 集中度只看股票部分：50/80、30/80
+        assert ts.loc[second, "n_holdings"] == 2
+        assert ts.loc[second, "hhi"] == pytest.approx((5 / 8) ** 2 + (3 / 8) ** 2)
+        assert ts.loc[second, "top_weight"] == pytest.approx(5 / 8)
+        assert ts.loc[second, "cash_weight"] == pytest.approx(0.2)
+        assert ts.loc[third, "effective_n"] == pytest.approx(1.0)
+
+        assert sectors.loc[second, "Tech"] == pytest.approx(0.5)
+        assert sectors.loc[second, "Energy"] == pytest.approx(0.3)
+        assert sectors.loc[second, "Cash"] == pytest.approx(0.2)
+        assert sectors.loc[third, "Tech"] == 0.0
+
+    def test_many_runs_match_single_run_results(self):
+        rng = np.random.default_rng(0)
+        dates = pd.bdate_range("2024-01-01", periods=12, freq="W-FRI")
+        frames = []
+        for run in range(50):
+            for d in dates:
+                ids = rng.choice(np.arange(1, 40), size=10, replace=False)
+                frames.append(pd.DataFrame({
+                    "run_id": run,
+                    "date": d,
+                    "instrument_id": np.append(ids, CASH_INSTRUMENT_ID),
+                    "market_value": rng.uniform(1, 10, size=11),
+                    "sector": np.append(rng.choice(["A", "B", "C"], size=10), "Cash"),
+                }))
+        panel = pd.concat(frames, ignore_index=True)
+
+        ts, sectors = position_analytics(panel)
+        assert len(ts) == 50 * len(dates)
+
+        one, one_sectors = position_analytics(panel[panel["run_id"] == 7].drop(columns="run_id"), run_id=7)
+        pd.testing.assert_frame_equal(ts.loc[[7]], one)
+        pd.testing.assert_frame_equal(sectors.loc[[7]], one_sectors.reindex(columns=sectors.columns, fill_value=0.0))
+        assert np.allclose(sectors.sum(axis=1), 1.0)
+
+    def test_summarize_runs(self):
+        ts, _ = position_analytics(_single_run(), run_id="r")
+        summary = summarize_runs(ts)
+
+        row = summary.loc["r"]
+        assert row["n_snapshots"] == 3
+        assert row["avg_turnover"] == pytest.approx(0.6)
+        years = (pd.Timestamp("2024-03-29") - pd.Timestamp("2024-01-31")).days / 365.25
+        assert row["annual_turnover"] == pytest.approx(1.2 / years)
+        assert row["avg_cash_weight"] == pytest.approx(0.2 / 3)
+
+    def test_exp_position_analytics_reads_db(self, monkeypatch):
+        monkeypatch.setattr(pos, "get_exp_positions_with_sector", lambda conn, s, e: _single_run())
+        ts, _ = pos.exp_position_analytics(object())
+        assert ts.index.get_level_values("run_id").unique().tolist() == ["exp_positions"]
+
+        monkeypatch.setattr(pos, "get_exp_positions_with_sector", lambda conn, s, e: pd.DataFrame())
+        with pytest.raises(RuntimeError):
+            pos.exp_position_analytics(object())
@@ -0,0 +1,123 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+
+from engine.analytics import quantiles as q_mod
+from engine.analytics.panels import ReturnPanel
+from engine.analytics.quantiles import (
+    assign_quantiles,
+    bucket_returns,
+    bucket_turnover,
+    quantile_backtest,
+    summarize_quantiles,
+)
+
+
+def _panel(fwd: np.ndarray, h: int) -> ReturnPanel:
+    t, n = fwd.shape
+    dates = pd.bdate_range("2024-01-01", periods=t).values.astype("datetime64[D]")
+    return ReturnPanel(dates, np.arange(n, dtype=np.int64), np.ones((t, n)), {h: fwd})
+
+
+def test_assign_quantiles_equal_buckets_and_missing():
+    x = np.array([[5.0, 1.0, 3.0, np.nan, 2.0, 4.0, 6.0, 0.0, 7.0, 8.0, 9.0]])
+    b = assign_quantiles(x, 5)
+
+    assert b[0, 3] == 0
+    assert b[0, 7] == 1 and b[0, 10] == 5
+    assert sorted(np.bincount(b[0], minlength=6)[1:]) == [2, 2, 2, 2, 2]
+
+
+def test_assign_quantiles_ties_share_bucket_and_sparse_rows_skipped():
+    x = np.array([[1.0, 1.0, 1.0, 1.0, 2.0, 3.0], [1.0, 2.0, np.nan, np.nan, np.nan, np.nan]])
+    b = assign_quantiles(x, 3)
+
+    assert len(set(b[0, :4])) == 1
+    assert (b[1] == 0).all()
+    with pytest.raises(ValueError):
+        assign_quantiles(x, 1)
+
+
+def test_bucket_returns_ignores_missing_returns():
+    b = np.array([[1, 1, 2, 2]], dtype=np.int8)
+    r = np.array([[0.1, np.nan, 0.2, 0.4]])
+    ret, count = bucket_returns(b, r, 2)
+
+    assert ret[0].tolist() == pytest.approx([0.1, 0.3])
+    assert count[0].tolist() == [1, 2]
+
+
+def test_bucket_turnover():
+    b = np.array([[1, 1, 2, 2], [1, 2, 1, 2]], dtype=np.int8)
+    to = bucket_turnover(b, 2)
+
+    assert np.isnan(to[0]).all()
+    assert to[1].tolist() == pytest.approx([0.5, 0.5])
+
+
+def test_quantile_backtest_on_predictive_factor():
+    rng = np.random.default_rng(0)
+    t, n, h = 60, 200, 5
+    x = rng.normal(size=(t, n))
+    fwd = 0.02 * x + 0.01 * rng.normal(size=(t, n))
+    x[:10] = np.nan                       # 因子开始计算前的调仓日被丢弃
+
+    res = quantile_backtest(x, _panel(fwd, h), factor_name="f", n_quantiles=5, rebalance_every=h)
+
+    assert len(res.returns) == (t - 10) // h
+    assert list(res.returns.columns) == ["Q1", "Q2", "Q3", "Q4", "Q5", "spread"]
+    assert (res.returns["spread"] > 0).all()
+    assert res.monotonicity.mean() > 0.9
+
+    s = res.summary()
+    assert s["Q5_ann"] > s["Q1_ann"]
+    assert s["spread_t"] > 2
+    assert 0.5 < s["turnover"] <= 1.0
+
+
+def test_quantile_backtest_requires_matching_horizon():
+    with pytest.raises(ValueError):
+        quantile_backtest(np.zeros((5, 5)), _panel(np.zeros((5, 5)), 1), rebalance_every=21)
+
+
+def test_run_quantile_analysis_one_panel_for_all_factors(monkeypatch):
+    rng = np.random.default_rng(1)
+    fwd = rng.normal(size=(40, 50))
+    panel = _panel(fwd, 5)
+    loads = []
+
+    monkeypatch.setattr(q_mod, "get_latest_factor_date", lambda c, v: "2024-03-01")
+    monkeypatch.setattr(q_mod, "load_return_panel", lambda c, s, e, h, source="prices": loads.append((h, source)) or panel)
+    monkeypatch.setattr(
+        q_mod, "iter_factor_matrices",
+        lambda c, names, p, v: ((n, rng.normal(size=(40, 50))) for n in names),
+    )
+
+    results, summary = q_mod.run_quantile_analysis(["a", "b", "c"], conn=MagicMock(), rebalance_every=5)
+
+    assert loads == [((5,), "prices")]
+    assert set(results) == {"a", "b", "c"}
+    assert len(summary) == 3 and "spread_t" in summary.columns
+
+
+def test_summarize_quantiles_empty():
+    assert summarize_quantiles([]).empty
@@ -106,22 +106,23 @@ def test_pivot_missing_columns_raises():
 
 
 def test_fetch_factors_long_for_date_uses_rw_method(monkeypatch):
-    """测试 fetch_factors_long_for_date 使用 RW 方法"""
-    
-    def fake_get_factor_values(conn, **kwargs):
+    """测试 fetch_factors_long_for_date 使用 RW 方法（二进制 COPY 快速路径）"""
+    calls = []
+
+    def fake_load_factor_panel(conn, factor_names, **kwargs):
+        calls.append((factor_names, kwargs))
         # 模拟返回 RW 方法的格式（含 factor_value 列）
         return pd.DataFrame({
             "instrument_id": [1, 2],
-            "date": ["2026-01-01", "2026-01-01"],
+            "date": pd.to_datetime(["2026-01-01", "2026-01-01"]),
             "factor_name": ["mom_21d", "mom_21d"],
             "factor_value": [0.1, 0.2],
-            "factor_version": ["v1", "v1"],
         })
     
     # patch RW 模块中的函数（因为 signals 里是 import 后调用）
     monkeypatch.setattr(
-        "database.readwrite.rw_factor_values.get_factor_values",
-        fake_get_factor_values,
+        "database.readwrite.rw_factor_values.load_factor_panel",
+        fake_load_factor_panel,
     )
     
     conn = MagicMock()
@@ -139,16 +140,22 @@ def test_fetch_factors_long_for_date_uses_rw_method(monkeypatch):
     assert list(df.columns) == ["instrument_id", "date", "factor_name", "value"]
     assert len(df) == 2
 
+    factor_names, kwargs = calls[0]
+    assert factor_names == ["mom_21d"]
+    assert kwargs["start_date"] == kwargs["end_date"] == "2026-01-01"
+    assert kwargs["instrument_ids"] == [1, 2]
+    assert kwargs["factor_version"] == "v1"
+
 
 def test_fetch_factors_long_for_date_empty_result(monkeypatch):
     """测试空结果返回正确的列结构"""
     
-    def fake_get_factor_values(conn, **kwargs):
+    def fake_load_factor_panel(conn, factor_names, **kwargs):
         return pd.DataFrame()
     
     monkeypatch.setattr(
-        "database.readwrite.rw_factor_values.get_factor_values",
-        fake_get_factor_values,
+        "database.readwrite.rw_factor_values.load_factor_panel",
+        fake_load_factor_panel,
     )
     
     conn = MagicMock()
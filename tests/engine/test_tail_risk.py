@@ -0,0 +1,116 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine.analytics import tail_risk as tr_mod
+from engine.analytics.tail_risk import (
+    holdings_returns,
+    simulate_tail_risk,
+    stationary_bootstrap_indices,
+)
+
+
+def test_bootstrap_indices_are_contiguous_blocks():
+    rng = np.random.default_rng(0)
+    idx = stationary_bootstrap_indices(50, 2000, 100, mean_block=8, rng=rng)
+
+    assert idx.shape == (2000, 100)
+    assert idx.min() >= 0 and idx.max() < 50
+
+    # 块内逐日 +1（循环）；块的平均长度约等于 mean_block
+    cont = (idx[:, 1:] - idx[:, :-1]) % 50 == 1
+    breaks = (~cont).sum()
+    # 新块恰好接在上一块后面时也算连续，所以只检查大致范围
+    assert 6.5 < idx.size / (breaks + len(idx)) < 9.5
+
+
+def test_mean_block_one_is_iid():
+    rng = np.random.default_rng(1)
+    idx = stationary_bootstrap_indices(1000, 500, 50, mean_block=1, rng=rng)
+    cont = (idx[:, 1:] - idx[:, :-1]) % 1000 == 1
+    assert cont.mean() < 0.01
+
+
+def test_constant_returns_give_deterministic_paths():
+    res = simulate_tail_risk(np.full(30, 0.001), n_paths=100, horizon=20, chunk_size=7)
+    np.testing.assert_allclose(res.total_return, 1.001 ** 20 - 1)
+    np.testing.assert_allclose(res.max_drawdown, 0.0, atol=1e-12)
+
+    down = simulate_tail_risk(np.full(30, -0.01), n_paths=10, horizon=20)
+    np.testing.assert_allclose(down.max_drawdown, 0.99 ** 20 - 1)
+    assert down.prob_drawdown(0.1) == 1.0
+
+
+def test_seeded_and_chunk_layout_is_reproducible():
+    r = np.random.default_rng(2).normal(0.0005, 0.02, 600)
+    r[0] = np.nan
+    a = simulate_tail_risk(r, n_paths=3000, horizon=60, seed=7, chunk_size=1000)
+    b = simulate_tail_risk(r, n_paths=3000, horizon=60, seed=7, chunk_size=1000)
+    c = simulate_tail_risk(r, n_paths=3000, horizon=60, seed=8, chunk_size=1000)
+
+    np.testing.assert_array_equal(a.total_return, b.total_return)
+    assert not np.array_equal(a.total_return, c.total_return)
+    assert a.total_return.shape == (3000,)
+
+
+def test_summary_and_quantiles_consistent():
+    r = np.random.default_rng(3).normal(0.0, 0.02, 1000)
+    res = simulate_tail_risk(r, n_paths=5000, horizon=252, seed=0)
+
+    s = res.summary(levels=(0.3,))
+    assert s["prob_dd_30"] == pytest.approx(np.mean(res.max_drawdown <= -0.3))
+    assert s["cvar_95"] >= s["var_95"]
+    assert s["cvar_99"] >= s["var_99"] >= s["var_95"]
+
+    q = res.quantiles((0.05, 0.5))
+    assert q.loc[0.5, "total_return"] == pytest.approx(s["median_return"])
+    assert (res.max_drawdown <= 0).all()
+
+
+def test_invalid_inputs():
+    with pytest.raises(ValueError):
+        simulate_tail_risk([0.01])
+    with pytest.raises(ValueError):
+        simulate_tail_risk([0.01, -1.0, 0.02])
+
+
+def test_holdings_returns():
+    w = np.array([[0.5, 0.5], [1.0, np.nan]])
+    fwd = np.array([[0.02, -0.02], [0.01, np.nan]])
+    np.testing.assert_allclose(holdings_returns(w, fwd), [0.0, 0.01])
+    with pytest.raises(ValueError):
+        holdings_returns(w, fwd[:, :1])
+
+
+def test_exp_tail_risk_requires_daily_nav(monkeypatch):
+    monthly = pd.DataFrame(
+        {"nav": 100.0 * 1.01 ** np.arange(24)}, index=pd.date_range("2022-01-31", periods=24, freq="ME")
+    )
+    monkeypatch.setattr(tr_mod, "load_nav_with_benchmark", lambda conn, b, s, e: monthly)
+    with pytest.raises(ValueError):
+        tr_mod.exp_tail_risk(object())
+
+    daily = pd.DataFrame(
+        {"nav": 100.0 * 1.001 ** np.arange(300)}, index=pd.bdate_range("2022-01-03", periods=300)
+    )
+    monkeypatch.setattr(tr_mod, "load_nav_with_benchmark", lambda conn, b, s, e: daily)
+    res = tr_mod.exp_tail_risk(object(), n_paths=100, horizon=252)
+    np.testing.assert_allclose(res.total_return, 1.001 ** 252 - 1)
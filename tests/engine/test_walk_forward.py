@@ -0,0 +1,164 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+
+from engine.analytics import walk_forward as wf
+from engine.analytics.panels import ReturnPanel
+from engine.analytics.walk_forward import (
+    BASELINE,
+    _cross_section_stats,
+    fit_weights,
+    make_scorer,
+    rank_signals,
+    score_cross_section,
+    walk_forward,
+)
+from engine.normalizer import rank_normalize
+from engine.signals import FactorSpec
+
+
+def _panel(t=120, n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    f = [rng.normal(size=(t, n)) for _ in range(3)]
+    # 真实关系：f0 正向，f1 反向，f2 无效
+    fwd = 0.02 * f[0] - 0.01 * f[1] + rng.normal(0.0, 0.02, size=(t, n))
+    return f, fwd
+
+
+def test_rank_signals_matches_rank_normalize_on_joint_set():
+    a = np.array([[3.0, 1.0, np.nan, 2.0, 5.0]])
+    b = np.array([[1.0, 2.0, 3.0, np.nan, 2.0]])
+    sig = rank_signals([a, b], [True, False])
+
+    joint = np.array([True, True, False, False, True])
+    assert np.isnan(sig[:, 0, ~joint]).all()
+    ref_a = rank_normalize(pd.Series(a[0, joint]), ascending=True)
+    ref_b = rank_normalize(pd.Series(b[0, joint]), ascending=False)
+    np.testing.assert_allclose(sig[0, 0, joint], ref_a)
+    np.testing.assert_allclose(sig[1, 0, joint], ref_b)
+
+
+def test_fit_weights_recover_signal_directions():
+    f, fwd = _panel()
+    sig = rank_signals(f, [True, True, True])
+    stats = _cross_section_stats(sig, fwd, min_obs=30)
+
+    ends = np.array([-1, 10, 119])
+    for method in ("ic", "ridge", "max_icir"):
+        w = fit_weights(stats, ends, train_len=60, method=method)
+        assert np.isnan(w[0]).all() and np.isnan(w[1]).all()
+        np.testing.assert_allclose(np.abs(w[2]).sum(), 1.0)
+        assert w[2, 0] > 0.4 and w[2, 1] < -0.15 and abs(w[2, 2]) < 0.15
+
+    with pytest.raises(ValueError):
+        fit_weights(stats, ends, 60, "lasso")
+
+
+def test_fit_weights_window_excludes_later_cross_sections():
+    f, fwd = _panel()
+    sig = rank_signals(f, [True, True, True])
+    stats = _cross_section_stats(sig, fwd, min_obs=30)
+    w = fit_weights(stats, np.array([59]), train_len=60, method="ic")
+
+    # 改动窗口之后的截面不影响权重
+    fwd2 = fwd.copy()
+    fwd2[60:] = -fwd2[60:]
+    stats2 = _cross_section_stats(sig, fwd2, min_obs=30)
+    np.testing.assert_allclose(fit_weights(stats2, np.array([59]), train_len=60, method="ic"), w)
+
+
+def test_score_cross_section_uses_linear_scorer():
+    sig = np.array([[0.5, -0.5, np.nan], [1.0, 0.0, 0.2]])
+    scorer = make_scorer(["a_rank", "b_rank"], [0.6, 0.4])
+    out = score_cross_section(scorer, sig, np.array([1, 2, 3]), ["a_rank", "b_rank"])
+    np.testing.assert_allclose(out[:2], [0.7, -0.3])
+    assert np.isnan(out[2])
+
+
+def test_walk_forward_end_to_end():
+    f, fwd = _panel(t=160)
+    sig = rank_signals(f, [True, False, True])
+    dates = np.arange(160).astype("datetime64[D]")
+    terms = ["a_rank", "b_rank", "c_rank"]
+
+    res = walk_forward(
+        sig, fwd, dates, np.arange(200), terms,
+        hold=4, train_len=40, gap=4, horizon=20,
+        baseline={"a_rank": 0.5, "b_rank": 0.3, "c_rank": 0.2},
+    )
+
+    # 第一个调仓日（下标 0）没有训练数据，不出权重
+    first = res.weights.xs("ridge", level="method").index[0]
+    assert first >= pd.Timestamp(dates[24])
+    assert res.weights.xs(BASELINE, level="method").index[0] == pd.Timestamp(dates[0])
+
+    summary = res.summary()
+    assert set(summary.index) == {"ic", "ridge", "max_icir", BASELINE}
+    assert (summary.loc[["ic", "ridge", "max_icir"], "mean_ic"] > summary.loc[BASELINE, "mean_ic"]).all()
+
+    w = res.latest_weights("ridge")
+    assert list(w.index) == terms
+    assert w["b_rank"] > 0  # b 以 ascending=False 生成信号，方向已翻正
+
+    scorer = res.scorer("max_icir", post_transform="rank")
+    assert [t.col for t in scorer.terms] == terms
+    assert scorer.post_transform == "rank"
+
+
+def test_latest_weights_unfitted_method_raises_value_error():
+    f, fwd = _panel(t=40)
+    sig = rank_signals(f, [True, False, True])
+    # 训练窗口比样本还长：拟合方法没有任何权重行
+    res = walk_forward(
+        sig, fwd, np.arange(40).astype("datetime64[D]"), np.arange(200), ["a_rank", "b_rank", "c_rank"],
+        hold=4, train_len=400, gap=40, horizon=20, methods=("ridge",),
+    )
+    with pytest.raises(ValueError, match="ridge"):
+        res.latest_weights("ridge")
+    with pytest.raises(ValueError, match="max_icir"):
+        res.latest_weights("max_icir")
+
+
+def test_run_walk_forward_rejects_factor_without_values(monkeypatch):
+    f, fwd = _panel(t=40, n=50)
+    panel = ReturnPanel(
+        dates=np.arange(40).astype("datetime64[D]"), instrument_ids=np.arange(50), prices=None, forward={20: fwd},
+    )
+    monkeypatch.setattr(wf, "load_return_panel", lambda *a, **kw: panel)
+    monkeypatch.setattr(wf, "iter_factor_matrices", lambda conn, names, p, v: iter([
+        ("mom_3m", f[0]), ("vol_60d_ann", np.full((40, 50), np.nan)),
+    ]))
+    specs = (FactorSpec("mom_3m", ascending=True), FactorSpec("vol_60d_ann", ascending=False))
+
+    with pytest.raises(ValueError, match="vol_60d_ann"):
+        wf.run_walk_forward(specs, "2024-01-01", "2024-03-01", horizon=20, step=5, conn=MagicMock())
+
+
+def test_backtest_specs_name_computed_factors():
+    from engine.compute_factors.compute_max_drawdown import MDD_SPECS
+    from engine.compute_factors.compute_momentum import MOMENTUM_SPECS
+    from engine.compute_factors.compute_volatility import VOL_SPECS
+    from tasks.backtest_tasks import SPECS, WEIGHTS
+
+    computed = {spec[0] for spec in (*MOMENTUM_SPECS, *VOL_SPECS, *MDD_SPECS)}
+    assert {s.factor_name for s in SPECS} <= computed
+    assert set(WEIGHTS) == {f"{s.factor_name}_rank" for s in SPECS}
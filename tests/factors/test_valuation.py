@@ -0,0 +1,153 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import numpy as np
+import pandas as pd
+import pytest
+
+from factors.valuation import (
+    DAILY_METRICS,
+    VALUATION_FACTORS,
+    build_fundamental_events,
+    compute_ttm,
+    compute_valuation_panel,
+    to_long,
+)
+
+
+def _row(metric, period_type, start, end, filed, value, instrument_id=1):
+    return {
+        "instrument_id": instrument_id,
+        "metric_name": metric,
+        "period_type": period_type,
+        "period_start": start,
+        "period_end": end,
+        "filed_date": filed,
+        "metric_value": value,
+    }
+
+
+def _net_income_rows():
+    return [
+        _row("net_income", "Quarterly", "2019-01-01", "2019-03-31", "2019-04-30", 90.0),
+        _row("net_income", "Quarterly", "2019-04-01", "2019-06-30", "2019-07-30", 100.0),
+        _row("net_income", "Quarterly", "2019-07-01", "2019-09-30", "2019-10-30", 110.0),
+        _row("net_income", "Annual", "2019-01-01", "2019-12-31", "2020-02-15", 400.0),
+        _row("net_income", "Quarterly", "2020-01-01", "2020-03-31", "2020-04-30", 120.0),
+    ]
+
+
+def _prices(start, end, close=50.0, instrument_id=1):
+    dates = pd.bdate_range(start, end)
+    return pd.DataFrame(
+        {"instrument_id": instrument_id, "date": dates, "close_price": close, "stock_splits": 1.0}
+    )
+
+
+def test_ttm_derives_q4_from_annual():
+    ttm = compute_ttm(pd.DataFrame(_net_income_rows()))
+    by_end = ttm.set_index("period_end")
+
+    # FY2019 直接使用年报
+    assert by_end.loc["2019-12-31", "value"] == 400.0
+    # Q1 2020 TTM = Q2(100) + Q3(110) + Q4(400-300=100) + Q1(120)
+    assert by_end.loc["2020-03-31", "value"] == 430.0
+    # 可用日 = 分量中最晚披露
+    assert by_end.loc["2020-03-31", "filed_date"] == pd.Timestamp("2020-04-30")
+
+
+def test_ttm_requires_four_consecutive_quarters():
+    rows = _net_income_rows()[:3]  # 只有 3 个单季，没有年报
+    assert compute_ttm(pd.DataFrame(rows)).empty
+
+
+def test_values_only_visible_after_filing_date():
+    fund = pd.DataFrame(
+        _net_income_rows()
+        + [_row("shares_outstanding", "Quarterly", None, "2020-04-20", "2020-01-20", 10.0)]
+    )
+    panel = compute_valuation_panel(_prices("2020-02-10", "2020-05-08"), fund)
+    by_date = panel.set_index("date")
+
+    # 2020-02-15 年报披露（周六），次一可用日起才有 FY 值
+    assert np.isnan(by_date.loc["2020-02-14", "ep_ttm"])
+    assert by_date.loc["2020-02-18", "ep_ttm"] == pytest.approx(400.0 / 500.0)
+    # 2020-04-30 盘后披露 Q1，5 月 1 日才切换到新 TTM
+    assert by_date.loc["2020-04-30", "ep_ttm"] == pytest.approx(400.0 / 500.0)
+    assert by_date.loc["2020-05-01", "ep_ttm"] == pytest.approx(430.0 / 500.0)
+
+
+def test_late_filed_older_period_does_not_override_newer():
+    fund = pd.DataFrame(
+        [
+            _row("stockholders_equity", "Quarterly", None, "2020-03-31", "2020-04-30", 1000.0),
+            # 对比期数据在后面的财报里才首次出现（更早的 period_end）
+            _row("stockholders_equity", "Quarterly", None, "2019-03-31", "2020-05-05", 1.0),
+        ]
+    )
+    events = build_fundamental_events(fund)
+    assert events["stockholders_equity"].tolist() == [1000.0]
+
+
+def test_shares_adjusted_for_split_after_period_end():
+    fund = pd.DataFrame(
+        [
+            _row("shares_outstanding", "Quarterly", None, "2020-04-20", "2020-04-30", 10.0),
+            _row("net_income", "Annual", "2019-01-01", "2019-12-31", "2020-02-15", 100.0),
+        ]
+    )
+    px = _prices("2020-04-01", "2020-05-08")
+    split_day = pd.Timestamp("2020-05-05")
+    px.loc[px["date"] == split_day, "stock_splits"] = 2.0
+    px.loc[px["date"] >= split_day, "close_price"] = 25.0
+
+    panel = compute_valuation_panel(px, fund).set_index("date")
+
+    # 拆股前后市值不变：50 × 10 == 25 × 20
+    assert panel.loc["2020-05-04", "market_cap"] == pytest.approx(500.0)
+    assert panel.loc["2020-05-05", "market_cap"] == pytest.approx(500.0)
+    assert panel.loc["2020-05-08", "pe_ttm"] == pytest.approx(5.0)
+
+
+def test_negative_earnings_pe_is_nan_but_yield_negative():
+    fund = pd.DataFrame(
+        [
+            _row("shares_outstanding", "Quarterly", None, "2020-03-31", "2020-04-01", 10.0),
+            _row("net_income", "Annual", "2019-01-01", "2019-12-31", "2020-02-15", -50.0),
+            _row("revenue", "Annual", "2019-01-01", "2019-12-31", "2020-02-15", 250.0),
+        ]
+    )
+    panel = compute_valuation_panel(_prices("2020-04-06", "2020-04-10"), fund)
+    last = panel.iloc[-1]
+
+    assert np.isnan(last["pe_ttm"])
+    assert last["ep_ttm"] == pytest.approx(-0.1)
+    assert last["ps_ttm"] == pytest.approx(2.0)
+
+
+def test_to_long_drops_missing_and_renames():
+    fund = pd.DataFrame(
+        [
+            _row("shares_outstanding", "Quarterly", None, "2020-03-31", "2020-04-01", 10.0),
+            _row("revenue", "Annual", "2019-01-01", "2019-12-31", "2020-02-15", 250.0),
+        ]
+    )
+    panel = compute_valuation_panel(_prices("2020-04-06", "2020-04-07"), fund)
+
+    daily = to_long(panel, DAILY_METRICS)
+    assert set(daily["metric_name"]) == {"market_cap", "ps_ttm"}
+
+    names = {v: k for k, v in VALUATION_FACTORS.items()}
+    factors = to_long(panel, VALUATION_FACTORS.values(), names)
+    assert set(factors["metric_name"]) == {"val_sp_ttm"}
+    assert factors["metric_value"].tolist() == pytest.approx([0.5, 0.5])
@@ -269,3 +269,31 @@ def test_sector_summary_present(monkeypatch, mock_conn):
 
     sector_names = {r["sector"] for r in sector_sec["rows"]}
     assert "Technology" in sector_names
+
+
+def test_factor_snapshot_uses_latest_table_for_latest_date(monkeypatch, mock_conn):
+    """The newest date reads latest_factor_values; older dates fall back to the factor panel."""
+    import reports.daily_briefing as db
+
+    long = pd.DataFrame(
+        {
+            "instrument_id": [1, 1],
+            "date": ["2025-01-15", "2025-01-15"],
+            "factor_name": ["mom_5d", "mom_1d"],
+            "factor_value": [0.1, 0.02],
+        }
+    )
+    meta = pd.DataFrame({"instrument_id": [1], "ticker": ["AAA"], "company_name": ["A"], "sector": ["Technology"]})
+    calls = []
+
+    monkeypatch.setattr(db, "get_latest_factor_date", lambda conn, *a: "2025-01-15")
+    monkeypatch.setattr(db, "get_latest_factor_values", lambda conn, names, date=None: calls.append("latest") or long)
+    monkeypatch.setattr(db, "load_factor_panel", lambda conn, names, **kw: calls.append("panel") or long)
+    monkeypatch.setattr(db, "_load_tradable_meta", lambda conn: meta)
+
+    wide = db._load_factor_snapshot(mock_conn, "2025-01-15")
+    assert calls == ["latest"]
+    assert wide.loc[0, "mom_5d"] == pytest.approx(0.1)
+
+    db._load_factor_snapshot(mock_conn, "2025-01-10")
+    assert calls == ["latest", "panel"]
@@ -0,0 +1,371 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import subprocess
+import types
+from datetime import date
+
+import pytest
+
+import main
+
+# 导入 main 只允许用到标准库；这些重量级模块必须在子命令里才加载
+HEAVY_MODULES = (
+    "pandas",
+    "numpy",
+    "requests",
+    "psycopg",
+    "matplotlib",
+    "yaml",
+    "engine.backtest_runner",
+    "reports.daily_briefing",
+    "ui.api",
+)
+
+# main 自身（含依赖）的 import 耗时预算（微秒）
+IMPORT_BUDGET_US = 200_000
+
+# 默认子命令 briefing 的 import 链（pandas / psycopg 不可避免）：整体预算 + 项目自身模块 self 时间之和的预算
+BRIEFING_IMPORT_BUDGET_US = 1_500_000
+BRIEFING_OWN_BUDGET_US = 100_000
+PROJECT_PACKAGES = ("database", "engine", "factors", "reports", "tasks", "utils", "data_download", "ui")
+BRIEFING_FORBIDDEN_MODULES = (
+    "matplotlib",
+    "scipy",
+    "requests",
+    "engine.backtest_runner",
+    "engine.analytics.panels",
+    "data_download.http_cache",
+    "ui.api",
+)
+
+
+def _fake_module(monkeypatch, name, **attrs):
+    module = types.ModuleType(name)
+    for k, v in attrs.items():
+        setattr(module, k, v)
+    monkeypatch.setitem(sys.modules, name, module)
+    return module
+
+
+def test_import_main_does_not_load_subsystems():
+    code = (
+        "import sys, main; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=project_root, capture_output=True, text=True, check=True,
+    )
+    assert out.stdout.strip() == ""
+
+
+def _import_times(statement):
+    """python -X importtime 的输出 -> {module: (self_us, cumulative_us)}"""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=project_root, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def test_import_time_budget():
+    times = _import_times("import main")
+    assert times["main"][1] < IMPORT_BUDGET_US
+
+
+def test_briefing_import_chain_budget():
+    """默认子命令 briefing 的 import 链：不拉入绘图 / 回测 / 下载模块，整体与项目自身模块各有预算"""
+    times = _import_times("import reports.daily_briefing")
+
+    assert not [m for m in BRIEFING_FORBIDDEN_MODULES if m in times]
+    assert times["reports.daily_briefing"][1] < BRIEFING_IMPORT_BUDGET_US
+
+    own_us = sum(t[0] for m, t in times.items() if m.split(".")[0] in PROJECT_PACKAGES)
+    assert own_us < BRIEFING_OWN_BUDGET_US
+
+
+def test_no_subcommand_runs_briefing(monkeypatch):
+    calls = []
+    _fake_module(
+        monkeypatch, "reports.daily_briefing",
+        run_briefing=lambda date=None, top_n=20: calls.append((date, top_n)) or "",
+    )
+
+    assert main.main([]) == 0
+    assert calls == [(None, 20)]
+
+
+def test_briefing_args(monkeypatch):
+    calls = []
+    _fake_module(
+        monkeypatch, "reports.daily_briefing",
+        run_briefing=lambda date=None, top_n=20: calls.append((date, top_n)) or "",
+    )
+
+    main.main(["briefing", "--date", "2026-06-12", "--top-n", "5"])
+    assert calls == [("2026-06-12", 5)]
+
+
+def test_download_ticker_parses_dates(monkeypatch):
+    calls = []
+    _fake_module(
+        monkeypatch, "data_download.input.price_downloader",
+        download_single_instrument_prices=lambda *a: calls.append(a),
+    )
+
+    main.main(["download", "ticker", "SPCX", "--start", "2026-06-01", "--end", "2026-06-14"])
+    assert calls == [("SPCX", date(2026, 6, 1), date(2026, 6, 14))]
+
+
+def test_download_ticker_requires_start():
+    with pytest.raises(SystemExit):
+        main.main(["download", "ticker", "SPCX"])
+
+
+def test_plot_passes_tickers(monkeypatch):
+    calls = []
+    _fake_module(
+        monkeypatch, "ui.api",
+        compare_portfolio_with_tickers=lambda **kw: calls.append(kw),
+    )
+
+    main.main(["plot", "MSFT", "SPY", "--start", "2019-01-01"])
+    assert calls == [{"tickers": ["MSFT", "SPY"], "start_date": "2019-01-01", "end_date": None}]
+
+
+def test_ic_args(monkeypatch):
+    calls = []
+
+    class _Summary:
+        def to_string(self, **kw):
+            return "summary"
+
+    _fake_module(
+        monkeypatch, "engine.analytics.ic",
+        run_ic_analysis=lambda **kw: calls.append(kw) or (None, _Summary()),
+    )
+
+    main.main(["ic", "--factors", "mom_63d", "--start", "2010-01-01", "--horizons", "5", "21", "--no-save"])
+    assert calls == [{
+        "factor_names": ["mom_63d"],
+        "start_date": "2010-01-01",
+        "end_date": None,
+        "horizons": (5, 21),
+        "persist": False,
+    }]
+
+
+def test_quantiles_args(monkeypatch):
+    calls = []
+
+    class _Summary:
+        def to_string(self, **kw):
+            return "summary"
+
+    _fake_module(
+        monkeypatch, "engine.analytics.quantiles",
+        run_quantile_analysis=lambda **kw: calls.append(kw) or ({}, _Summary()),
+    )
+
+    main.main(["quantiles", "--quantiles", "10", "--rebalance", "5"])
+    assert calls == [{
+        "factor_names": None,
+        "start_date": None,
+        "end_date": None,
+        "n_quantiles": 10,
+        "rebalance_every": 5,
+    }]
+
+
+def test_metrics_args(monkeypatch):
+    calls = []
+
+    class _Conn:
+        def __enter__(self):
+            return "conn"
+
+        def __exit__(self, *exc):
+            return False
+
+    class _Metrics:
+        def to_string(self, **kw):
+            return "metrics"
+
+    _fake_module(monkeypatch, "database.utils.db_utils", get_db_connection=lambda: _Conn())
+    _fake_module(
+        monkeypatch, "engine.analytics.metrics",
+        exp_metrics=lambda conn, **kw: calls.append((conn, kw)) or _Metrics(),
+    )
+
+    main.main(["metrics", "--benchmark", "QQQ", "--start", "2020-01-01"])
+    assert calls == [("conn", {"benchmark": "QQQ", "start_date": "2020-01-01", "end_date": None})]
+
+
+def test_corr_args(monkeypatch):
+    calls = []
+
+    class _Frame:
+        def head(self, n):
+            return self
+
+        def to_string(self, **kw):
+            return "frame"
+
+    class _Result:
+        def pairs(self):
+            return _Frame()
+
+    _fake_module(
+        monkeypatch, "engine.analytics.correlation",
+        run_correlation_analysis=lambda **kw: calls.append(kw) or (_Result(), _Frame()),
+    )
+
+    main.main(["corr", "--factors", "mom_21d", "mom_63d", "--step", "1", "--threshold", "0.8"])
+    assert calls == [{
+        "factor_names": ["mom_21d", "mom_63d"],
+        "start_date": None,
+        "end_date": None,
+        "step": 1,
+        "threshold": 0.8,
+    }]
+
+
+def test_attribution_args(monkeypatch):
+    import pandas as pd
+
+    calls = []
+    _fake_module(
+        monkeypatch, "engine.analytics.attribution",
+        exp_attribution=lambda **kw: calls.append(kw) or (pd.Series({"alpha": 0.01}), pd.DataFrame({"r2": [0.5]})),
+    )
+
+    main.main(["attribution", "--start", "2024-01-01", "--window", "63"])
+    assert calls == [{"start_date": "2024-01-01", "end_date": None, "window": 63}]
+
+
+def test_tailrisk_args(monkeypatch):
+    import pandas as pd
+
+    calls = []
+
+    class _Conn:
+        def __enter__(self):
+            return "conn"
+
+        def __exit__(self, *exc):
+            return False
+
+    class _Result:
+        def summary(self):
+            return pd.Series({"prob_dd_30": 0.1})
+
+        def quantiles(self):
+            return pd.DataFrame({"max_drawdown": [-0.3]})
+
+    _fake_module(monkeypatch, "database.utils.db_utils", get_db_connection=lambda: _Conn())
+    _fake_module(
+        monkeypatch, "engine.analytics.tail_risk",
+        exp_tail_risk=lambda conn, **kw: calls.append((conn, kw)) or _Result(),
+    )
+
+    main.main(["tailrisk", "--paths", "5000", "--block", "5", "--seed", "3"])
+    assert calls == [("conn", {
+        "start_date": None,
+        "end_date": None,
+        "n_paths": 5000,
+        "horizon": 252,
+        "mean_block": 5.0,
+        "seed": 3,
+    })]
+
+
+def test_walkforward_args(monkeypatch):
+    import pandas as pd
+
+    calls = []
+
+    class _Result:
+        def summary(self):
+            return pd.DataFrame({"mean_ic": [0.02]}, index=["ridge"])
+
+        def latest_weights(self, method):
+            return pd.Series({"mom_63d_rank": 1.0})
+
+    _fake_module(
+        monkeypatch, "engine.analytics.walk_forward",
+        run_walk_forward=lambda specs, **kw: calls.append((specs, kw)) or _Result(),
+    )
+    _fake_module(monkeypatch, "tasks.backtest_tasks", SPECS=("spec",), WEIGHTS={"mom_63d_rank": 1.0})
+
+    main.main(["walkforward", "--horizon", "10", "--methods", "ridge"])
+    assert calls == [(("spec",), {
+        "start_date": None,
+        "end_date": None,
+        "horizon": 10,
+        "train_days": 756,
+        "methods": ["ridge"],
+        "baseline": {"mom_63d_rank": 1.0},
+    })]
+
+
+def test_monitor_args(monkeypatch, capsys):
+    import pandas as pd
+
+    calls = []
+    _fake_module(
+        monkeypatch, "engine.analytics.factor_monitor",
+        run=lambda **kw: calls.append(kw) or pd.DataFrame(),
+    )
+
+    main.main(["monitor", "--force", "--start", "2015-01-01"])
+    assert calls == [{"force": True, "start_date": "2015-01-01"}]
+    assert "no factor alerts" in capsys.readouterr().out
+
+
+def test_positions_args(monkeypatch):
+    import pandas as pd
+
+    calls = []
+
+    class _Conn:
+        def __enter__(self):
+            return "conn"
+
+        def __exit__(self, *exc):
+            return False
+
+    index = pd.MultiIndex.from_tuples([("exp_positions", pd.Timestamp("2024-01-31"))], names=["run_id", "date"])
+    ts = pd.DataFrame({"turnover": [0.2]}, index=index)
+    sectors = pd.DataFrame({"Tech": [0.8], "Cash": [0.2]}, index=index)
+
+    _fake_module(monkeypatch, "database.utils.db_utils", get_db_connection=lambda: _Conn())
+    _fake_module(
+        monkeypatch, "engine.analytics.positions",
+        exp_position_analytics=lambda conn, **kw: calls.append((conn, kw)) or (ts, sectors),
+        summarize_runs=lambda frame: frame.groupby(level="run_id").mean(),
+    )
+
+    main.main(["positions", "--start", "2020-01-01"])
+    assert calls == [("conn", {"start_date": "2020-01-01", "end_date": None})]
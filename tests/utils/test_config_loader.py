@@ -0,0 +1,130 @@
+# =============================================================================
+# Yezhou Capital Limited  |  Proprietary & Confidential
+# =============================================================================
+# Copyright (c) 2026 Yezhou Capital Limited. All rights reserved.
+#
+# Project  : Yezhou Quantitative Trading System
+# Author   : Yezhou Liu
+# Contact  : yezhoucapital@gmail.com
+#
+# This source code is the exclusive property of Yezhou Capital Limited.
+# Unauthorized copying, modification, distribution, or use of this file,
+# via any medium, is strictly prohibited without prior written consent.
+# =============================================================================
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+from datetime import date
+
+import pytest
+
+import utils.config_loader as cl
+import utils.config_values as cv
+
+
+@pytest.fixture
+def cfg_file(tmp_path, monkeypatch):
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        "exchange:\n  slippage: 0.01\n  transaction_cost: 0.002\n  exchange_cost: 0.0\n"
+        "price:\n  price_floor: 3\n"
+        "backtest:\n  capital: 5000\n"
+        "  default_backtest_start_date: '2010-01-04'\n"
+        "  default_backtest_end_date: '2020-12-31'\n"
+        "universe:\n  tickers: [AAPL, MSFT]\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(cl, "DEFAULT_CONFIG_PATH", str(path))
+    monkeypatch.setattr(cl, "_CACHE", {})
+    monkeypatch.setattr(cl, "MTIME_CHECK_INTERVAL", 0.0)
+    return path
+
+
+def _count_reads(monkeypatch):
+    calls = []
+    real = cl._read_config
+
+    def counting(path):
+        calls.append(path)
+        return real(path)
+
+    monkeypatch.setattr(cl, "_read_config", counting)
+    return calls
+
+
+class TestConfigLoader:
+    def test_parsed_once_per_process(self, cfg_file, monkeypatch):
+        calls = _count_reads(monkeypatch)
+
+        for _ in range(100):
+            assert cl.get_config_value("exchange.slippage") == 0.01
+        assert cl.get_config_value("exchange.missing", 7) == 7
+        assert cl.load_config() is cl.load_config()
+        assert len(calls) == 1
+
+    def test_config_is_read_only(self, cfg_file):
+        config = cl.load_config()
+        with pytest.raises(TypeError):
+            config["exchange"]["slippage"] = 1.0
+        assert cl.get_config_value("universe.tickers") == ("AAPL", "MSFT")
+
+    def test_mtime_change_triggers_reload(self, cfg_file, monkeypatch):
+        calls = _count_reads(monkeypatch)
+        assert cl.get_config_value("price.price_floor") == 3
+
+        cfg_file.write_text("price:\n  price_floor: 4\n", encoding="utf-8")
+        st = os.stat(cfg_file)
+        os.utime(cfg_file, (st.st_atime, st.st_mtime + 10))
+
+        assert cl.get_config_value("price.price_floor") == 4
+        assert len(calls) == 2
+
+    def test_mtime_not_checked_within_interval(self, cfg_file, monkeypatch):
+        monkeypatch.setattr(cl, "MTIME_CHECK_INTERVAL", 3600.0)
+        cl.load_config()
+
+        monkeypatch.setattr(cl, "_mtime", lambda path: pytest.fail("unexpected stat"))
+        assert cl.get_config_value("exchange.exchange_cost") == 0.0
+
+    def test_reload_config_picks_up_env(self, cfg_file, monkeypatch):
+        monkeypatch.setenv("TIINGO_API_KEY", "first")
+        assert cl.get_config_value("tiingo.api_key") == "first"
+
+        monkeypatch.setenv("TIINGO_API_KEY", "second")
+        assert cl.get_config_value("tiingo.api_key") == "first"
+
+        version = cl.config_version()
+        cl.reload_config()
+        assert cl.get_config_value("tiingo.api_key") == "second"
+        assert cl.config_version() > version
+
+
+class TestTypedSections:
+    def test_sections_are_typed_and_cached(self, cfg_file, monkeypatch):
+        monkeypatch.setattr(cv, "_SECTIONS", {})
+
+        ex = cv.exchange_config()
+        assert ex.slippage == 0.01
+        assert ex.min_diff_buy_sell_ratio == 0.02
+        assert cv.exchange_config() is ex
+
+        price = cv.price_config()
+        assert price.price_floor == 3.0 and isinstance(price.price_floor, float)
+        assert price.price_ceiling == 10000.0
+
+        bt = cv.backtest_config()
+        assert bt.capital == 5000.0
+        assert bt.start_date == date(2010, 1, 4)
+        assert cv.DEFAULT_BACKTEST_END_DATE() == date(2020, 12, 31)
+        assert cv.DEFAULT_SLIPPAGE() == 0.01
+
+    def test_sections_rebuilt_after_reload(self, cfg_file, monkeypatch):
+        monkeypatch.setattr(cv, "_SECTIONS", {})
+        assert cv.DEFAULT_PRICE_FLOOR() == 3.0
+
+        cfg_file.write_text("price:\n  price_floor: 6\n", encoding="utf-8")
+        cl.reload_config()
+        assert cv.DEFAULT_PRICE_FLOOR() == 6.0
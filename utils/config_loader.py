@@ -12,7 +12,10 @@
 # via any medium, is strictly prohibited without prior written consent.
 # =============================================================================
 from datetime import date
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+import threading
+import time
 import yaml
 import os
 from pathlib import Path
@@ -20,30 +23,30 @@ from dotenv import load_dotenv
 
 # 项目根目录
 PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_CONFIG_PATH = str(PROJECT_ROOT / "config" / "config.yaml")
 
 # 加载环境变量文件
 load_dotenv(PROJECT_ROOT / "secrets.env")
 
+# 两次 mtime 检查之间的最小间隔（秒）；间隔内的查找完全不碰文件系统
+MTIME_CHECK_INTERVAL = 2.0
+
 
 # ----------------------------------------------------------------------------------------------------------------------------------------
-# 配置加载器（支持环境变量覆盖）
+# 配置读取（支持环境变量覆盖）
 # 优先级：环境变量 > config.yaml
 # ----------------------------------------------------------------------------------------------------------------------------------------
-def load_config(path: str = None):
-    if path is None:
-        path = str(PROJECT_ROOT / "config" / "config.yaml")
+def _read_config(path: str) -> Dict[str, Any]:
     """
-    加载配置文件，支持环境变量覆盖
-    
+    读取并解析 YAML，再用环境变量覆盖敏感配置（每个进程每次 reload 只执行一次）
+
     优先级：
     1. 环境变量（.env 文件或系统环境变量）
     2. config.yaml 文件
-    
-    这样即使 config.yaml 中有默认值，也会被环境变量覆盖
     """
     with open(path, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
-    
+        config = yaml.safe_load(f) or {}
+
     # 🔒 使用环境变量覆盖敏感配置
     # 数据库配置
     if "database" in config:
@@ -52,20 +55,108 @@ def load_config(path: str = None):
         config["database"]["dbname"] = os.getenv("DB_NAME", config["database"].get("dbname", "quant"))
         config["database"]["user"] = os.getenv("DB_USER", config["database"].get("user", ""))
         config["database"]["password"] = os.getenv("DB_PASSWORD", config["database"].get("password", ""))
-    
+
     # Tiingo API Key
     if "tiingo" not in config:
         config["tiingo"] = {}
     config["tiingo"]["api_key"] = os.getenv("TIINGO_API_KEY", config.get("tiingo", {}).get("api_key", ""))
-    
+
     # FMP API Key
     if "fmp" not in config:
         config["fmp"] = {}
     config["fmp"]["api_key"] = os.getenv("FMP_API_KEY", config.get("fmp", {}).get("api_key", ""))
-    
+
     return config
 
 
+def _freeze(value: Any) -> Any:
+    """dict -> 只读 MappingProxyType，list -> tuple（递归）"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 进程级缓存：每个配置文件解析一次，之后只在 mtime 变化或显式 reload 时重新读取
+# ----------------------------------------------------------------------------------------------------------------------------------------
+class _Entry:
+    __slots__ = ("config", "mtime", "checked_at", "values")
+
+    def __init__(self, config: Mapping[str, Any], mtime: Optional[float]):
+        self.config = config
+        self.mtime = mtime
+        self.checked_at = time.monotonic()
+        # 点号 key -> 解析结果（不存在时为 _MISSING）
+        self.values: Dict[str, Any] = {}
+
+
+_MISSING = object()
+_CACHE: Dict[str, _Entry] = {}
+_LOCK = threading.Lock()
+_VERSION = 0
+
+
+def _load_entry(path: str) -> _Entry:
+    global _VERSION
+    with _LOCK:
+        entry = _CACHE.get(path)
+        mtime = _mtime(path)
+        if entry is not None and entry.mtime == mtime:
+            entry.checked_at = time.monotonic()
+            return entry
+
+        entry = _Entry(_freeze(_read_config(path)), mtime)
+        _CACHE[path] = entry
+        _VERSION += 1
+        return entry
+
+
+def _get_entry(path: Optional[str]) -> _Entry:
+    path = DEFAULT_CONFIG_PATH if path is None else str(path)
+    entry = _CACHE.get(path)
+    if entry is None:
+        return _load_entry(path)
+
+    if time.monotonic() - entry.checked_at >= MTIME_CHECK_INTERVAL:
+        if _mtime(path) != entry.mtime:
+            return _load_entry(path)
+        entry.checked_at = time.monotonic()
+    return entry
+
+
+def load_config(path: str = None) -> Mapping[str, Any]:
+    """
+    返回只读的配置对象（嵌套 MappingProxyType / tuple）
+
+    首次调用时解析 YAML 并应用环境变量覆盖，之后直接返回缓存；
+    文件被修改（mtime 变化）后在下一次检查时自动重新加载。
+    需要可写副本时用 copy.deepcopy 或 dict(...) 自行转换。
+    """
+    return _get_entry(path).config
+
+
+def reload_config(path: str = None) -> Mapping[str, Any]:
+    """丢弃缓存并重新读取（例如修改了环境变量之后）"""
+    path = DEFAULT_CONFIG_PATH if path is None else str(path)
+    with _LOCK:
+        _CACHE.pop(path, None)
+    return load_config(path)
+
+
+def config_version() -> int:
+    """每次（重新）加载配置时递增；依赖配置的派生缓存可用它判断是否过期"""
+    return _VERSION
+
+
 # ----------------------------------------------------------------------------------------------------------------------------------------
 # 直接从环境变量获取敏感信息（推荐用于 API Key）
 # ----------------------------------------------------------------------------------------------------------------------------------------
@@ -92,17 +183,24 @@ def get_secret(key: str, default: str = "") -> str:
 # 如果需要嵌套访问，可以使用点号（.）分隔的字符串
 # 例如：get_config_value(config, "database.host") 或 get_config
 # ----------------------------------------------------------------------------------------------------------------------------------------
-def get_config_value(
-    key: str, default: Any = None, config_path: str = None
-) -> Any:
-    keys = key.split(".")
-    value = load_config(config_path)
+def _resolve(config: Mapping[str, Any], key: str) -> Any:
+    value = config
     try:
-        for k in keys:
+        for k in key.split("."):
             value = value[k]
         return value
     except (KeyError, TypeError):
-        return default
+        return _MISSING
+
+
+def get_config_value(
+    key: str, default: Any = None, config_path: str = None
+) -> Any:
+    entry = _get_entry(config_path)
+    value = entry.values.get(key, _MISSING)
+    if value is _MISSING and key not in entry.values:
+        value = entry.values[key] = _resolve(entry.config, key)
+    return default if value is _MISSING else value
 
 
 # ----------------------------------------------------------------------------------------------------------------------------------------
@@ -12,46 +12,132 @@
 # via any medium, is strictly prohibited without prior written consent.
 # =============================================================================
 import pandas as pd
+from dataclasses import dataclass
 from datetime import date
-from utils.config_loader import get_config_value, get_config_value_as_date
+from typing import Callable, Dict, Tuple, TypeVar
+from utils.config_loader import config_version, get_config_value, get_config_value_as_date
+
+T = TypeVar("T")
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# 分段类型化配置（按 config_version 缓存，配置重新加载后自动重建）
+# ----------------------------------------------------------------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class ExchangeConfig:
+    slippage: float
+    transaction_cost: float
+    exchange_cost: float
+    min_diff_buy_sell_ratio: float
+    rebalance_total_value_reinvest_ratio: float
+
+
+@dataclass(frozen=True)
+class PriceConfig:
+    price_floor: float
+    price_ceiling: float
+    jump_threshold: float
+    jump_ratio_limit: float
+
+
+@dataclass(frozen=True)
+class BacktestConfig:
+    capital: float
+    start_date: date
+    end_date: date
+
+
+_SECTIONS: Dict[str, Tuple[int, object]] = {}
+
+
+def _cached_section(name: str, build: Callable[[], T]) -> T:
+    version = config_version()
+    hit = _SECTIONS.get(name)
+    if hit is None or hit[0] != version:
+        section = build()
+        # build() 可能触发首次加载，使用加载后的版本号
+        hit = _SECTIONS[name] = (config_version(), section)
+    return hit[1]
+
+
+def _opt_float(value):
+    return None if value is None else float(value)
+
+
+def exchange_config() -> ExchangeConfig:
+    return _cached_section(
+        "exchange",
+        lambda: ExchangeConfig(
+            slippage=_opt_float(get_config_value("exchange.slippage")),
+            transaction_cost=_opt_float(get_config_value("exchange.transaction_cost")),
+            exchange_cost=_opt_float(get_config_value("exchange.exchange_cost")),
+            min_diff_buy_sell_ratio=float(get_config_value("exchange.min_diff_buy_sell_ratio", 0.02)),
+            rebalance_total_value_reinvest_ratio=float(
+                get_config_value("exchange.rebalance_total_value_reinvest_ratio", 0.98)
+            ),
+        ),
+    )
+
+
+def price_config() -> PriceConfig:
+    return _cached_section(
+        "price",
+        lambda: PriceConfig(
+            price_floor=float(get_config_value("price.price_floor", 1.5)),
+            price_ceiling=float(get_config_value("price.price_ceiling", 10000.0)),
+            jump_threshold=float(get_config_value("price.jump_threshold", 0.95)),
+            jump_ratio_limit=float(get_config_value("price.jump_ratio_limit", 10.0)),
+        ),
+    )
+
+
+def backtest_config() -> BacktestConfig:
+    return _cached_section(
+        "backtest",
+        lambda: BacktestConfig(
+            capital=_opt_float(get_config_value("backtest.capital")),
+            start_date=get_config_value_as_date("backtest.default_backtest_start_date"),
+            end_date=get_config_value_as_date("backtest.default_backtest_end_date"),
+        ),
+    )
 
 
 # ----------------------------------------------------------------------------------------------------------------------------------------
 # 获取配置: backtest相关默认值
 # ----------------------------------------------------------------------------------------------------------------------------------------
 def DEFAULT_CAPITAL():
-    return get_config_value("backtest.capital")
+    return backtest_config().capital
 
 
 def DEFAULT_BACKTEST_START_DATE() -> date:
-    return get_config_value_as_date("backtest.default_backtest_start_date")
+    return backtest_config().start_date
 
 
 def DEFAULT_BACKTEST_END_DATE() -> date:
-    return get_config_value_as_date("backtest.default_backtest_end_date")
+    return backtest_config().end_date
 
 
 # ----------------------------------------------------------------------------------------------------------------------------------------
 # 获取配置: exchange相关默认值
 # ----------------------------------------------------------------------------------------------------------------------------------------
 def DEFAULT_SLIPPAGE():
-    return get_config_value("exchange.slippage")
+    return exchange_config().slippage
 
 
 def DEFAULT_TRANSACTION_COST():
-    return get_config_value("exchange.transaction_cost")
+    return exchange_config().transaction_cost
 
 
 def DEFAULT_EXCHANGE_COST():
-    return get_config_value("exchange.exchange_cost")
+    return exchange_config().exchange_cost
 
 
 def DEFAULT_MIN_DIFF_BUY_SELL_RATIO():
-    return get_config_value("exchange.min_diff_buy_sell_ratio", 0.02)
+    return exchange_config().min_diff_buy_sell_ratio
 
 
 def DEFAULT_REBALANCE_TOTAL_VALUE_REINVEST_RATIO():
-    return get_config_value("exchange.rebalance_total_value_reinvest_ratio", 0.98)
+    return exchange_config().rebalance_total_value_reinvest_ratio
 
 
 # ----------------------------------------------------------------------------------------------------------------------------------------
@@ -69,16 +155,16 @@ def DEFAULT_END_DATE() -> date:
 # 获取配置: price相关默认值
 # ----------------------------------------------------------------------------------------------------------------------------------------
 def DEFAULT_PRICE_FLOOR() -> float:
-    return get_config_value("price.price_floor", 1.5)
+    return price_config().price_floor
 
 
 def DEFAULT_PRICE_CEILING() -> float:
-    return get_config_value("price.price_ceiling", 10000.0)
+    return price_config().price_ceiling
 
 
 def DEFAULT_JUMP_THRESHOLD() -> float:
-    return get_config_value("price.jump_threshold", 0.95)
+    return price_config().jump_threshold
 
 
 def DEFAULT_JUMP_RATIO_LIMIT() -> float:
-    return get_config_value("price.jump_ratio_limit", 10.0)
+    return price_config().jump_ratio_limit
@@ -16,18 +16,23 @@ import os
 from logging.handlers import RotatingFileHandler
 from utils.config_loader import get_config_value
 
+# 已确认存在的日志目录（每个目录只 makedirs 一次）
+_CREATED_DIRS = set()
+
 
 # ----------------------------------------------------------------------------------------------------------------------------------------
 # 获取日志记录器
 # ----------------------------------------------------------------------------------------------------------------------------------------
 def get_logger(name: str, level=logging.INFO) -> logging.Logger:
-    log_dir = get_config_value("log.log_dir", "logs")  # 获取日志目录配置
-    os.makedirs(log_dir, exist_ok=True)
-
     logger = logging.getLogger(name)
-    if logger.handlers:  # 避免重复添加 handler
+    if logger.handlers:  # 避免重复添加 handler（已配置的 logger 不再读配置/建目录）
         return logger
 
+    log_dir = get_config_value("log.log_dir", "logs")  # 获取日志目录配置
+    if log_dir not in _CREATED_DIRS:
+        os.makedirs(log_dir, exist_ok=True)
+        _CREATED_DIRS.add(log_dir)
+
     log_path = os.path.join(log_dir, f"{name}.log")
 
     handler = RotatingFileHandler(